@@ -3,6 +3,11 @@
 
 模块结构：
 - manager.py: 旧版API管理器（向后兼容）
+- client_pool.py: 长连接异步客户端池
+- response_cache.py: LLM响应持久化缓存
+- single_flight.py: 相同并发请求合并
+- rate_limiter.py: 按提供商的并发/RPM/TPM限流
+- provider_health.py: 提供商健康度与熔断器
 - models.py: AI接口数据模型
 - unified_client.py: 统一AI客户端（新版）
 - prompt_loader.py: Prompt加载器
@@ -11,6 +16,11 @@
 - clients/: 各厂商API客户端
 """
 from .manager import APIManager
+from .client_pool import ProviderClientPool
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
+from .rate_limiter import RateLimiterRegistry, RateLimitConfig, ProviderLimiter
+from .provider_health import ProviderHealthTracker, ProviderHealth, CircuitState, CircuitOpenError
 from .prompts import PromptTemplates
 from .prompt_loader import PromptLoader, get_prompt_loader, load_prompt
 from .models import (
@@ -45,6 +55,16 @@ from .clients import (
 __all__ = [
     # 旧版（向后兼容）
     'APIManager',
+    'ProviderClientPool',
+    'ResponseCache',
+    'SingleFlight',
+    'RateLimiterRegistry',
+    'RateLimitConfig',
+    'ProviderLimiter',
+    'ProviderHealthTracker',
+    'ProviderHealth',
+    'CircuitState',
+    'CircuitOpenError',
     'PromptTemplates',
     # Prompt加载
     'PromptLoader',
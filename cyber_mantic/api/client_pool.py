@@ -0,0 +1,174 @@
+"""
+提供商客户端池 - 复用长连接的异步SDK客户端
+
+每个 (提供商, base_url, api_key) 只创建一个异步客户端，同一SDK的客户端共享
+一个HTTP连接池（keep-alive），避免每次调用都重新握手、占用线程池。
+
+异步客户端的连接绑定在创建它的事件循环上，因此客户端按事件循环分组缓存；
+事件循环关闭后，对应分组会在下次访问时被清理。
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+from utils.logger import get_logger
+
+
+class _LoopClients:
+    """单个事件循环内的客户端集合"""
+
+    def __init__(self):
+        self.sdk_clients: Dict[Tuple[str, str, str], Any] = {}  # (sdk, base_url, api_key) -> client
+        self.http_clients: Dict[str, Any] = {}  # sdk -> 共享HTTP连接池
+        self.gemini_models: Dict[str, Any] = {}  # model -> GenerativeModel
+
+
+class ProviderClientPool:
+    """
+    提供商异步客户端注册表
+
+    用法：
+        pool = ProviderClientPool()
+        client = pool.get_openai_client(api_key, "https://api.deepseek.com")
+        response = await client.chat.completions.create(...)
+        ...
+        await pool.aclose()
+    """
+
+    def __init__(self):
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = weakref.WeakKeyDictionary()
+        self._gemini_api_key: Optional[str] = None
+        self._lock = threading.Lock()
+        self.logger = get_logger()
+
+    def _current_pool(self) -> _LoopClients:
+        """获取当前事件循环的客户端集合（同时清理已关闭事件循环的集合）"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale_loop in [l for l in self._pools.keys() if l.is_closed()]:
+                del self._pools[stale_loop]
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = _LoopClients()
+                self._pools[loop] = pool
+            return pool
+
+    def _shared_http_client(self, pool: _LoopClients, sdk_name: str, sdk_module) -> Optional[Any]:
+        """获取某个SDK共享的HTTP连接池（旧版SDK不支持时返回None，由SDK自行管理）"""
+        if sdk_name not in pool.http_clients:
+            factory = getattr(sdk_module, "DefaultAsyncHttpxClient", None)
+            pool.http_clients[sdk_name] = factory() if factory else None
+        return pool.http_clients[sdk_name]
+
+    def get_anthropic_client(self, api_key: str, base_url: Optional[str] = None):
+        """
+        获取Anthropic异步客户端
+
+        Args:
+            api_key: API密钥
+            base_url: 自定义Base URL（可选）
+
+        Returns:
+            anthropic.AsyncAnthropic 实例
+        """
+        try:
+            import anthropic
+        except ImportError:
+            raise ImportError("需要安装anthropic库: pip install anthropic")
+
+        pool = self._current_pool()
+        key = ("anthropic", base_url or "", api_key)
+        client = pool.sdk_clients.get(key)
+        if client is None:
+            kwargs = {"api_key": api_key}
+            if base_url:
+                kwargs["base_url"] = base_url
+            http_client = self._shared_http_client(pool, "anthropic", anthropic)
+            if http_client is not None:
+                kwargs["http_client"] = http_client
+            client = anthropic.AsyncAnthropic(**kwargs)
+            pool.sdk_clients[key] = client
+            self.logger.debug(f"创建Anthropic异步客户端: {base_url or 'default'}")
+        return client
+
+    def get_openai_client(self, api_key: str, base_url: str):
+        """
+        获取OpenAI兼容异步客户端
+
+        Args:
+            api_key: API密钥
+            base_url: Base URL
+
+        Returns:
+            openai.AsyncOpenAI 实例
+        """
+        try:
+            import openai
+        except ImportError:
+            raise ImportError("需要安装openai库: pip install openai")
+
+        pool = self._current_pool()
+        key = ("openai", base_url or "", api_key)
+        client = pool.sdk_clients.get(key)
+        if client is None:
+            kwargs = {"api_key": api_key, "base_url": base_url}
+            http_client = self._shared_http_client(pool, "openai", openai)
+            if http_client is not None:
+                kwargs["http_client"] = http_client
+            client = openai.AsyncOpenAI(**kwargs)
+            pool.sdk_clients[key] = client
+            self.logger.debug(f"创建OpenAI兼容异步客户端: {base_url}")
+        return client
+
+    def get_gemini_model(self, api_key: str, model: str):
+        """
+        获取Gemini模型对象（API密钥只在变化时重新配置）
+
+        Args:
+            api_key: API密钥
+            model: 模型名称
+
+        Returns:
+            (genai模块, GenerativeModel 实例)
+        """
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise ImportError("需要安装google-generativeai库: pip install google-generativeai")
+
+        pool = self._current_pool()
+        with self._lock:
+            if self._gemini_api_key != api_key:
+                genai.configure(api_key=api_key)
+                self._gemini_api_key = api_key
+                for loop_pool in self._pools.values():
+                    loop_pool.gemini_models.clear()
+
+        generative_model = pool.gemini_models.get(model)
+        if generative_model is None:
+            generative_model = genai.GenerativeModel(model)
+            pool.gemini_models[model] = generative_model
+        return genai, generative_model
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环中的所有客户端和连接池"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.pop(loop, None)
+        if pool is None:
+            return
+
+        for client in pool.sdk_clients.values():
+            try:
+                await client.close()
+            except Exception as e:
+                self.logger.debug(f"关闭API客户端失败: {e}")
+        for http_client in pool.http_clients.values():
+            if http_client is None:
+                continue
+            try:
+                await http_client.aclose()
+            except Exception as e:
+                self.logger.debug(f"关闭HTTP连接池失败: {e}")
+        self.logger.debug(f"已关闭 {len(pool.sdk_clients)} 个API客户端")
@@ -8,18 +8,50 @@ API管理器 - 支持多提供商和双模型验证
 """
 import os
 import asyncio
+import functools
+import hashlib
+import json
 import random
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Set, Tuple, AsyncIterator, Callable, TYPE_CHECKING
 from .prompts import PromptTemplates
+from .client_pool import ProviderClientPool
+from .single_flight import SingleFlight
+from .provider_health import ProviderHealthTracker, CircuitOpenError
+from .rate_limiter import (
+    RateLimiterRegistry,
+    RateLimitConfig,
+    estimate_tokens,
+    extract_retry_after,
+    is_rate_limit_error
+)
+from .response_cache import (
+    ResponseCache,
+    DEFAULT_RESPONSE_CACHE_PATH,
+    DEFAULT_RESPONSE_CACHE_TTL,
+    DEFAULT_RESPONSE_CACHE_MAX_BYTES
+)
 from utils.logger import get_logger, log_api_call, log_performance
+import threading
 import time
 
+if TYPE_CHECKING:
+    from .task_router import TaskRouter
+
 
 # 重试配置
 INITIAL_RETRY_DELAY = 1.0  # 初始重试延迟（秒）
 MAX_RETRY_DELAY = 32.0  # 最大重试延迟（秒）
 RETRY_JITTER = 0.5  # 抖动因子（随机化延迟，避免惊群效应）
 
+# 对冲请求配置
+DEFAULT_HEDGE_TASK_TYPES = ["快速交互问答", "出生信息解析", "输入增强验证"]  # 延迟敏感的任务类型
+DEFAULT_HEDGE_PERCENTILE = 90  # 主API超过其最近延迟的该百分位仍未返回时发出对冲请求
+DEFAULT_HEDGE_DELAY = 3.0  # 没有延迟样本时的对冲等待时间（秒）
+MIN_HEDGE_DELAY = 0.5  # 对冲等待时间下限（秒）
+
+# 双模型验证模式：blocking 等待两个模型都返回；async 主模型返回即返回，验证在后台完成
+DEFAULT_DUAL_VERIFICATION_MODE = "blocking"
+
 
 def calculate_retry_delay(attempt: int, initial_delay: float = INITIAL_RETRY_DELAY) -> float:
     """
@@ -63,13 +95,15 @@ class APIManager:
         "用户反馈处理": "deepseek",     # 快速响应
     }
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], task_router: Optional["TaskRouter"] = None):
         """
         初始化API管理器
 
         Args:
             config: 配置字典，包含API密钥等信息 (扁平格式)
                    例如: claude_api_key, claude_model, openrouter_api_key 等
+            task_router: 任务路由器（可选），其 GlobalAPIConfig.rate_limits 覆盖 config 中的限流，
+                   之后在路由器中修改限流会即时生效
         """
         self.logger = get_logger()
         self.config = config
@@ -102,10 +136,41 @@ class APIManager:
         self.max_retries = config.get("max_retries", 3)
         self.enable_dual_verification = config.get("enable_dual_verification", True)
         self.primary_api = config.get("primary_api", "claude")
+        self.dual_verification_mode = config.get("dual_verification_mode", DEFAULT_DUAL_VERIFICATION_MODE)
+
+        # 异步验证模式下在后台运行的验证任务
+        self._background_tasks: Set[asyncio.Task] = set()
 
         # API优先级：用户设置的优先API排第一，其余按默认顺序
         self.API_PRIORITY = self._build_api_priority()
 
+        # 长连接异步客户端池（每个提供商/base_url复用一个客户端）
+        self.client_pool = ProviderClientPool()
+
+        # LLM响应缓存（默认关闭）
+        self.response_cache = self._create_response_cache(config)
+
+        # 相同的并发请求合并为一次调用
+        self.enable_single_flight = config.get("enable_single_flight", True)
+        self.single_flight = SingleFlight()
+
+        # 按提供商的并发/RPM/TPM限流
+        self.rate_limiters = RateLimiterRegistry(self._load_rate_limits(config))
+        if task_router is not None:
+            task_router.add_rate_limit_listener(self.configure_rate_limits)
+
+        # 提供商健康度（延迟/错误率/熔断器），可选按最低p50延迟选择提供商
+        self.provider_health = ProviderHealthTracker()
+        self.prefer_fastest_provider = config.get("prefer_fastest_provider", False)
+
+        # 对冲请求：延迟敏感任务在主API迟迟未返回时同时请求下一个健康的API（默认关闭）
+        self.enable_hedging = config.get("enable_hedging", False)
+        self.hedge_task_types = set(config.get("hedge_task_types", DEFAULT_HEDGE_TASK_TYPES))
+        self.hedge_percentile = config.get("hedge_percentile", DEFAULT_HEDGE_PERCENTILE)
+        self.hedge_default_delay = config.get("hedge_default_delay", DEFAULT_HEDGE_DELAY)
+        self._hedge_stats = {"requests": 0, "hedged": 0, "primary_wins": 0, "hedge_wins": 0}
+        self._hedge_stats_lock = threading.Lock()
+
         # 检查可用的API
         self.available_apis = [api for api, key in self.api_keys.items() if key]
         self.logger.info(f"可用API: {', '.join(self.available_apis)}")
@@ -114,6 +179,69 @@ class APIManager:
         for api in self.available_apis:
             self.logger.info(f"{api} 使用模型: {self.models.get(api, 'N/A')}")
 
+    def _create_response_cache(self, config: Dict[str, Any]) -> Optional[ResponseCache]:
+        """
+        根据配置创建响应缓存
+
+        配置项：
+            response_cache_enabled: 是否启用（默认False）
+            response_cache_path: SQLite文件路径
+            response_cache_ttl: 过期时间（秒）
+            response_cache_max_bytes: 缓存总字节数上限
+            response_cache_task_types: 启用缓存的任务类型列表（不设置表示全部）
+
+        Returns:
+            ResponseCache 实例，未启用或初始化失败时返回None
+        """
+        if not config.get("response_cache_enabled", False):
+            return None
+
+        try:
+            cache = ResponseCache(
+                db_path=config.get("response_cache_path", DEFAULT_RESPONSE_CACHE_PATH),
+                ttl_seconds=config.get("response_cache_ttl", DEFAULT_RESPONSE_CACHE_TTL),
+                max_bytes=config.get("response_cache_max_bytes", DEFAULT_RESPONSE_CACHE_MAX_BYTES),
+                task_types=config.get("response_cache_task_types")
+            )
+            self.logger.info(f"已启用LLM响应缓存: {cache.db_path}")
+            return cache
+        except Exception as e:
+            self.logger.warning(f"LLM响应缓存初始化失败，已禁用缓存: {e}")
+            return None
+
+    def _load_rate_limits(self, config: Dict[str, Any]) -> Dict[str, RateLimitConfig]:
+        """
+        读取各提供商的限流配置
+
+        支持两种写法（后者覆盖前者）：
+            rate_limits: {"deepseek": {"max_concurrent": 4, "rpm": 60, "tpm": 100000}}
+            deepseek_max_concurrent / deepseek_rpm / deepseek_tpm
+
+        Returns:
+            提供商名称 -> 限流配置
+        """
+        limits = {
+            provider: dict(values)
+            for provider, values in (config.get("rate_limits") or {}).items()
+            if values
+        }
+        for api in self.api_keys:
+            for field_name in ("max_concurrent", "rpm", "tpm"):
+                value = config.get(f"{api}_{field_name}")
+                if value is not None:
+                    limits.setdefault(api, {})[field_name] = value
+        return {provider: RateLimitConfig.from_dict(values) for provider, values in limits.items()}
+
+    def configure_rate_limits(self, rate_limits: Dict[str, Dict[str, Any]]):
+        """
+        更新提供商限流配置（如来自 TaskRouter 的 GlobalAPIConfig.rate_limits）
+
+        Args:
+            rate_limits: 提供商名称 -> {"max_concurrent", "rpm", "tpm"}
+        """
+        for provider, values in rate_limits.items():
+            self.rate_limiters.configure(provider, RateLimitConfig.from_dict(values or {}))
+
     def _get_default_model(self, api: str) -> str:
         """获取API的默认模型"""
         defaults = {
@@ -181,29 +309,56 @@ class APIManager:
         2. API_USAGE_MAP 中的推荐（如果可用）
         3. 第一个可用的API
 
+        熔断中的提供商会被跳过（全部熔断时仍按上述顺序返回）；
+        启用 prefer_fastest_provider 时，在未熔断的提供商中选择该任务类型当前p50延迟最低的。
+
         Args:
             task_type: 任务类型
 
         Returns:
             推荐的API名称
         """
+        candidates = []
+
         # 优先使用用户设置的 primary_api
         if self.primary_api in self.available_apis:
-            return self.primary_api
+            candidates.append(self.primary_api)
 
         # 其次使用任务类型映射的推荐
         recommended = self.API_USAGE_MAP.get(task_type)
-        if recommended and recommended in self.available_apis:
-            return recommended
+        if recommended and recommended in self.available_apis and recommended not in candidates:
+            candidates.append(recommended)
+
+        # 最后是其余可用的API
+        candidates.extend(api for api in self.available_apis if api not in candidates)
+
+        if not candidates:
+            return None
+
+        healthy = [api for api in candidates if self.provider_health.is_available(api)]
+        if not healthy:
+            return candidates[0]
+
+        if self.prefer_fastest_provider:
+            # 优先比较该任务类型的延迟样本，都没有时比较全部样本
+            for fallback_to_all in (False, True):
+                timed = []
+                for index, api in enumerate(healthy):
+                    p50 = self.provider_health.p50(api, task_type, fallback_to_all)
+                    if p50 is not None:
+                        timed.append((p50, index, api))
+                if timed:
+                    return min(timed)[2]
 
-        # 最后返回第一个可用的API
-        return self.available_apis[0] if self.available_apis else None
+        return healthy[0]
 
     async def call_api(
         self,
         task_type: str,
         prompt: str,
         enable_dual_verification: Optional[bool] = None,
+        use_cache: bool = True,
+        verification_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
         **kwargs
     ) -> str:
         """
@@ -213,6 +368,8 @@ class APIManager:
             task_type: 任务类型
             prompt: 提示词
             enable_dual_verification: 是否启用双模型验证（可选，默认使用配置）
+            use_cache: 是否允许使用响应缓存（缓存未启用时无效，False表示强制重新生成）
+            verification_callback: 异步验证模式下，后台验证完成时的回调 callback(verification)
             **kwargs: 其他参数
 
         Returns:
@@ -221,15 +378,137 @@ class APIManager:
         # 如果启用了双模型验证
         use_dual = enable_dual_verification if enable_dual_verification is not None else self.enable_dual_verification
 
-        if use_dual and len(self.available_apis) >= 2:
-            return await self._call_with_dual_verification(task_type, prompt, **kwargs)
-        else:
-            return await self._call_with_failover(task_type, prompt, **kwargs)
+        def start_call():
+            if use_dual and len(self.available_apis) >= 2:
+                if self.dual_verification_mode == "async":
+                    return self._call_with_background_verification(
+                        task_type, prompt, use_cache=use_cache,
+                        verification_callback=verification_callback, **kwargs
+                    )
+                return self._call_with_dual_verification(task_type, prompt, use_cache=use_cache, **kwargs)
+            if self.enable_hedging and task_type in self.hedge_task_types and len(self.available_apis) >= 2:
+                return self._call_with_hedging(task_type, prompt, use_cache=use_cache, **kwargs)
+            return self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
+
+        # 异步验证模式下带验证回调的请求需要各自的回调，不参与合并
+        needs_own_callback = verification_callback is not None and use_dual and self.dual_verification_mode == "async"
+        if not self.enable_single_flight or needs_own_callback:
+            return await start_call()
+
+        # 相同请求正在进行中时，等待同一结果而不是重复调用
+        key = self._make_request_key(task_type, prompt, use_dual, use_cache, kwargs)
+        return await self.single_flight.do(key, start_call)
+
+    @staticmethod
+    def _make_request_key(
+        task_type: str,
+        prompt: str,
+        use_dual: bool,
+        use_cache: bool,
+        kwargs: Dict[str, Any]
+    ) -> str:
+        """生成用于合并并发请求的请求键"""
+        payload = json.dumps(
+            [task_type, prompt, bool(use_dual), bool(use_cache), kwargs],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    async def call_api_stream(
+        self,
+        task_type: str,
+        prompt: str,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        流式调用API，逐段返回生成的文本
+
+        故障转移只发生在收到第一段文本之前：某个API在首段文本前失败时，
+        按与 _call_with_failover 相同的重试/优先级策略切换；一旦开始输出，
+        后续错误直接抛给调用方（已输出的内容无法撤回）。
+
+        Args:
+            task_type: 任务类型
+            prompt: 提示词
+            **kwargs: 其他参数（system, max_tokens）
+
+        Yields:
+            文本增量
+        """
+        primary_api = self.get_api_for_task(task_type)
+
+        if not primary_api:
+            raise ValueError("没有可用的API")
+
+        apis_to_try = self._get_apis_by_priority(primary_api)
+
+        last_error = None
+        for api in apis_to_try:
+            for attempt in range(self.max_retries):
+                if attempt > 0:
+                    delay = calculate_retry_delay(attempt - 1)
+                    self.logger.info(f"{api} API 流式重试 {attempt}/{self.max_retries}，等待 {delay:.2f}秒...")
+                    await asyncio.sleep(delay)
+
+                self.logger.info(f"尝试流式使用 {api} API" + (f" (第{attempt + 1}次)" if attempt > 0 else ""))
+                start_time = time.time()
+                stream = self._stream_api_limited(api, prompt, task_type=task_type, **kwargs)
+
+                try:
+                    first_chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    first_chunk = None
+                except Exception as e:
+                    await stream.aclose()
+                    last_error = e
+                    if self._should_retry_same_api(api, e, attempt):
+                        self.logger.warning(f"{api} API 流式调用失败（可重试）: {e}")
+                        continue
+                    self.logger.warning(f"{api} API 流式调用失败: {e}")
+                    log_api_call(
+                        api_name=api,
+                        endpoint=self._get_endpoint_name(api),
+                        request_data={"task_type": task_type, "stream": True},
+                        response_data=None,
+                        error=str(e),
+                        duration=0
+                    )
+                    break  # 尝试下一个API
+
+                first_token_time = time.time() - start_time
+                self.logger.info(f"{api} API 首段文本到达 (耗时: {first_token_time:.2f}秒)")
+
+                response_length = 0
+                if first_chunk:
+                    response_length += len(first_chunk)
+                    yield first_chunk
+                async for chunk in stream:
+                    if chunk:
+                        response_length += len(chunk)
+                        yield chunk
+
+                duration = time.time() - start_time
+                log_api_call(
+                    api_name=api,
+                    endpoint=self._get_endpoint_name(api),
+                    request_data={"task_type": task_type, "prompt_length": len(prompt), "stream": True},
+                    response_data={"response_length": response_length, "first_token_time": first_token_time},
+                    error=None,
+                    duration=duration
+                )
+                return
+
+        error_msg = f"所有API流式调用都失败了。最后一个错误: {last_error}"
+        self.logger.error(error_msg)
+        raise Exception(error_msg)
 
     async def _call_with_failover(
         self,
         task_type: str,
         prompt: str,
+        use_cache: bool = True,
         **kwargs
     ) -> str:
         """
@@ -238,6 +517,7 @@ class APIManager:
         Args:
             task_type: 任务类型
             prompt: 提示词
+            use_cache: 是否允许使用响应缓存
             **kwargs: 其他参数
 
         Returns:
@@ -265,7 +545,7 @@ class APIManager:
                     self.logger.info(f"尝试使用 {api} API" + (f" (第{attempt + 1}次)" if attempt > 0 else ""))
                     start_time = time.time()
 
-                    response = await self._call_api_by_name(api, prompt, **kwargs)
+                    response = await self._call_api_cached(api, task_type, prompt, use_cache, **kwargs)
 
                     duration = time.time() - start_time
                     log_api_call(
@@ -282,9 +562,8 @@ class APIManager:
 
                 except Exception as e:
                     last_error = e
-                    is_retryable = self._is_retryable_error(e)
 
-                    if attempt < self.max_retries - 1 and is_retryable:
+                    if self._should_retry_same_api(api, e, attempt):
                         self.logger.warning(f"{api} API 调用失败（可重试）: {e}")
                     else:
                         self.logger.warning(f"{api} API 调用失败: {e}")
@@ -303,6 +582,121 @@ class APIManager:
         self.logger.error(error_msg)
         raise Exception(error_msg)
 
+    async def _call_with_hedging(
+        self,
+        task_type: str,
+        prompt: str,
+        use_cache: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        使用对冲请求调用API
+
+        先请求主API；若超过其最近延迟的 hedge_percentile 百分位仍未返回，
+        同样的请求发给下一个健康的API，先完整返回的结果胜出，另一个请求被取消。
+        两个请求都失败时降级到普通故障转移。
+
+        Args:
+            task_type: 任务类型
+            prompt: 提示词
+            use_cache: 是否允许使用响应缓存
+            **kwargs: 其他参数
+
+        Returns:
+            API响应文本
+        """
+        primary_api = self.get_api_for_task(task_type)
+        backup_api = next(
+            (api for api in self._get_apis_by_priority(primary_api)[1:] if self.provider_health.is_available(api)),
+            None
+        )
+        if not primary_api or not backup_api:
+            return await self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
+
+        with self._hedge_stats_lock:
+            self._hedge_stats["requests"] += 1
+
+        hedge_delay = self._get_hedge_delay(primary_api, task_type)
+        start_time = time.monotonic()
+        tasks: Dict[asyncio.Task, str] = {
+            asyncio.create_task(self._call_api_cached(primary_api, task_type, prompt, use_cache, **kwargs)): primary_api
+        }
+
+        try:
+            done, _ = await asyncio.wait(set(tasks), timeout=hedge_delay)
+            if not done:
+                self.logger.info(f"{primary_api} API {hedge_delay:.2f}秒未返回，对冲请求 {backup_api} API")
+                with self._hedge_stats_lock:
+                    self._hedge_stats["hedged"] += 1
+                tasks[asyncio.create_task(
+                    self._call_api_cached(backup_api, task_type, prompt, use_cache, **kwargs)
+                )] = backup_api
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    api = tasks[task]
+                    if task.exception() is not None:
+                        self.logger.warning(f"{api} API 调用失败: {task.exception()}")
+                        continue
+
+                    duration = time.monotonic() - start_time
+                    with self._hedge_stats_lock:
+                        self._hedge_stats["primary_wins" if api == primary_api else "hedge_wins"] += 1
+                    if api != primary_api:
+                        # 被取消的主API请求至少耗时这么久，计入延迟样本，避免百分位被低估
+                        self.provider_health.get(primary_api).record_latency(duration, task_type)
+                    log_api_call(
+                        api_name=api,
+                        endpoint=self._get_endpoint_name(api),
+                        request_data={"task_type": task_type, "prompt_length": len(prompt), "hedged": len(tasks) > 1},
+                        response_data={"response_length": len(task.result())},
+                        error=None,
+                        duration=duration
+                    )
+                    self.logger.info(f"{api} API 调用成功 (耗时: {duration:.2f}秒)")
+                    return task.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        self.logger.warning("对冲请求均失败，降级到故障转移")
+        return await self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
+
+    def _get_hedge_delay(self, api: str, task_type: str) -> float:
+        """获取发出对冲请求前的等待时间（主API最近延迟的百分位）"""
+        latency = self.provider_health.get(api).latency_percentile(self.hedge_percentile, task_type)
+        if latency is None:
+            return self.hedge_default_delay
+        return max(MIN_HEDGE_DELAY, latency)
+
+    def _should_retry_same_api(self, api: str, error: Exception, attempt: int) -> bool:
+        """
+        判断失败后是否继续重试同一API
+
+        提供商熔断器已打开，或通过Retry-After要求的暂停超过最大重试延迟时，直接切换下一个API。
+
+        Args:
+            api: API名称
+            error: 异常对象
+            attempt: 当前重试次数（从0开始）
+
+        Returns:
+            是否重试同一API
+        """
+        if attempt >= self.max_retries - 1 or not self._is_retryable_error(error):
+            return False
+        if not self.provider_health.is_available(api):
+            self.logger.info(f"{api} API 熔断器已打开，切换下一个API")
+            return False
+        cooldown = self.rate_limiters.get(api).cooldown_remaining()
+        if cooldown > MAX_RETRY_DELAY:
+            self.logger.info(f"{api} API 需暂停 {cooldown:.1f}秒，切换下一个API")
+            return False
+        return True
+
     def _is_retryable_error(self, error: Exception) -> bool:
         """
         判断错误是否可重试
@@ -329,6 +723,7 @@ class APIManager:
         self,
         task_type: str,
         prompt: str,
+        use_cache: bool = True,
         **kwargs
     ) -> str:
         """
@@ -337,6 +732,7 @@ class APIManager:
         Args:
             task_type: 任务类型
             prompt: 提示词
+            use_cache: 是否允许使用响应缓存
             **kwargs: 其他参数
 
         Returns:
@@ -346,13 +742,11 @@ class APIManager:
 
         # 获取主副模型
         primary_api = self.get_api_for_task(task_type)
-        available = [api for api in self.API_PRIORITY if api in self.available_apis and api != primary_api]
+        secondary_api = self._get_secondary_api(primary_api)
 
-        if not available:
+        if secondary_api is None:
             self.logger.warning("无法进行双模型验证，只有一个可用API")
-            return await self._call_with_failover(task_type, prompt, **kwargs)
-
-        secondary_api = available[0]
+            return await self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
 
         self.logger.info(f"主模型: {primary_api}, 副模型: {secondary_api}")
 
@@ -360,8 +754,8 @@ class APIManager:
         try:
             start_time = time.time()
 
-            primary_task = self._call_api_by_name(primary_api, prompt, **kwargs)
-            secondary_task = self._call_api_by_name(secondary_api, prompt, **kwargs)
+            primary_task = self._call_api_cached(primary_api, task_type, prompt, use_cache, **kwargs)
+            secondary_task = self._call_api_cached(secondary_api, task_type, prompt, use_cache, **kwargs)
 
             # 等待两个任务完成
             results = await asyncio.gather(primary_task, secondary_task, return_exceptions=True)
@@ -387,11 +781,7 @@ class APIManager:
                 )
 
                 # 构造验证信息
-                verification_note = f"\n\n【双模型验证】\n"
-                verification_note += f"• 主模型: {primary_api}\n"
-                verification_note += f"• 副模型: {secondary_api}\n"
-                verification_note += f"• 一致性: {comparison_result['consistency_level']}\n"
-                verification_note += f"• 分析: {comparison_result['analysis']}"
+                verification_note = self._format_verification_note(comparison_result, primary_api, secondary_api)
 
                 # 如果一致性高，返回主模型结果+验证信息
                 # 如果一致性低，返回两个结果的融合或警告
@@ -417,12 +807,149 @@ class APIManager:
             else:
                 # 两个都失败，尝试故障转移
                 self.logger.error("主副模型都失败，尝试故障转移")
-                return await self._call_with_failover(task_type, prompt, **kwargs)
+                return await self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
 
         except Exception as e:
             self.logger.error(f"双模型验证过程出错: {e}")
             # 降级到单模型故障转移
-            return await self._call_with_failover(task_type, prompt, **kwargs)
+            return await self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
+
+    async def _call_with_background_verification(
+        self,
+        task_type: str,
+        prompt: str,
+        use_cache: bool = True,
+        verification_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        **kwargs
+    ) -> str:
+        """
+        异步双模型验证：主副模型同时调用，主模型响应后立即返回，
+        副模型响应与结果对比在后台完成后通过回调传递验证结果
+
+        Args:
+            task_type: 任务类型
+            prompt: 提示词
+            use_cache: 是否允许使用响应缓存
+            verification_callback: 验证完成时的回调 callback(verification)
+            **kwargs: 其他参数
+
+        Returns:
+            主模型响应文本（不附带验证信息）
+        """
+        primary_api = self.get_api_for_task(task_type)
+        secondary_api = self._get_secondary_api(primary_api)
+
+        if secondary_api is None:
+            self.logger.warning("无法进行双模型验证，只有一个可用API")
+            return await self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
+
+        self.logger.info(f"启用异步双模型验证，主模型: {primary_api}, 副模型: {secondary_api}")
+        secondary_task = asyncio.create_task(
+            self._call_api_cached(secondary_api, task_type, prompt, use_cache, **kwargs)
+        )
+
+        try:
+            primary_response = await self._call_api_cached(primary_api, task_type, prompt, use_cache, **kwargs)
+        except asyncio.CancelledError:
+            secondary_task.cancel()
+            raise
+        except Exception as e:
+            # 主模型失败，使用副模型结果（不再验证）
+            self.logger.warning(f"主模型失败: {e}，使用副模型结果")
+            try:
+                return await secondary_task
+            except Exception as secondary_error:
+                self.logger.error(f"主副模型都失败（副模型: {secondary_error}），尝试故障转移")
+                return await self._call_with_failover(task_type, prompt, use_cache=use_cache, **kwargs)
+
+        task = asyncio.create_task(self._finish_background_verification(
+            primary_api, secondary_api, primary_response, secondary_task, verification_callback
+        ))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return primary_response
+
+    async def _finish_background_verification(
+        self,
+        primary_api: str,
+        secondary_api: str,
+        primary_response: str,
+        secondary_task: "asyncio.Task[str]",
+        verification_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        等待副模型响应并与主模型结果对比，完成后调用回调
+
+        Returns:
+            验证结果，副模型失败时返回None（不调用回调）
+        """
+        try:
+            secondary_response = await secondary_task
+        except Exception as e:
+            self.logger.warning(f"后台验证未完成，副模型 {secondary_api} 失败: {e}")
+            return None
+
+        comparison_result = self._compare_responses(
+            primary_response, secondary_response, primary_api, secondary_api
+        )
+        verification = {
+            "primary_api": primary_api,
+            "secondary_api": secondary_api,
+            "consistency_level": comparison_result["consistency_level"],
+            "consistency_score": comparison_result["consistency_score"],
+            "analysis": comparison_result["analysis"],
+            "differences": comparison_result["differences"],
+            "note": self._format_verification_note(comparison_result, primary_api, secondary_api),
+            "secondary_response": secondary_response
+        }
+        self.logger.info(f"后台双模型验证完成，一致性: {comparison_result['consistency_level']}")
+
+        if verification_callback is not None:
+            try:
+                verification_callback(verification)
+            except Exception as e:
+                self.logger.error(f"验证结果回调出错: {e}")
+        return verification
+
+    async def wait_for_background_verifications(self, timeout: Optional[float] = None) -> int:
+        """
+        等待当前事件循环中的后台验证完成（关闭事件循环前调用）
+
+        Args:
+            timeout: 最长等待秒数，超时后取消未完成的验证；None表示一直等待
+
+        Returns:
+            已完成的后台验证数量
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in list(self._background_tasks) if task.get_loop() is loop]
+        if not tasks:
+            return 0
+
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.logger.warning(f"取消 {len(pending)} 个未完成的后台验证")
+            await asyncio.gather(*pending, return_exceptions=True)
+        return len(done)
+
+    def _get_secondary_api(self, primary_api: str) -> Optional[str]:
+        """选择双模型验证的副模型（优先级最高的其他健康API）"""
+        for api in self.API_PRIORITY:
+            if api in self.available_apis and api != primary_api and self.provider_health.is_available(api):
+                return api
+        return None
+
+    @staticmethod
+    def _format_verification_note(comparison_result: Dict[str, Any], primary_api: str, secondary_api: str) -> str:
+        """生成附加在解读文本后的双模型验证说明"""
+        verification_note = f"\n\n【双模型验证】\n"
+        verification_note += f"• 主模型: {primary_api}\n"
+        verification_note += f"• 副模型: {secondary_api}\n"
+        verification_note += f"• 一致性: {comparison_result['consistency_level']}\n"
+        verification_note += f"• 分析: {comparison_result['analysis']}"
+        return verification_note
 
     def _compare_responses(
         self,
@@ -503,13 +1030,196 @@ class APIManager:
         # 先尝试主API
         result = [primary_api]
 
-        # 然后按优先级顺序添加其他可用API
-        for api in self.API_PRIORITY:
-            if api in self.available_apis and api != primary_api:
-                result.append(api)
+        # 然后按优先级顺序添加其他可用API（熔断中的排在最后）
+        others = [api for api in self.API_PRIORITY if api in self.available_apis and api != primary_api]
+        result.extend(api for api in others if self.provider_health.is_available(api))
+        result.extend(api for api in others if not self.provider_health.is_available(api))
 
         return result
 
+    async def _call_api_cached(
+        self,
+        api_name: str,
+        task_type: str,
+        prompt: str,
+        use_cache: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        按名称调用API，命中响应缓存时直接返回缓存结果
+
+        Args:
+            api_name: API名称
+            task_type: 任务类型
+            prompt: 提示词
+            use_cache: 是否允许读取缓存（False时仍会写入新结果）
+            **kwargs: 其他参数
+
+        Returns:
+            响应文本
+        """
+        cache = self.response_cache
+        if cache is None or not cache.is_enabled_for(task_type):
+            return await self._call_api_limited(api_name, prompt, task_type=task_type, **kwargs)
+
+        model = self.models.get(api_name, "")
+        key = cache.make_key(
+            api_name,
+            model,
+            prompt,
+            system=kwargs.get("system", PromptTemplates.SYSTEM_PROMPT),
+            max_tokens=kwargs.get("max_tokens", 4096)
+        )
+
+        # SQLite读写（含commit）放入线程池执行，不阻塞共享事件循环
+        loop = asyncio.get_running_loop()
+        if use_cache:
+            cached = await loop.run_in_executor(
+                None, functools.partial(cache.get, key, task_type=task_type)
+            )
+            if cached is not None:
+                self.logger.info(f"{api_name} API 命中响应缓存 ({task_type})")
+                return cached
+
+        response = await self._call_api_limited(api_name, prompt, task_type=task_type, **kwargs)
+        if response:
+            await loop.run_in_executor(
+                None,
+                functools.partial(cache.set, key, response, provider=api_name, model=model, task_type=task_type)
+            )
+        return response
+
+    async def _call_api_limited(
+        self,
+        api_name: str,
+        prompt: str,
+        task_type: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """
+        在熔断器和提供商限流器的许可下调用API，并根据结果更新健康度和限流状态
+
+        Args:
+            api_name: API名称
+            prompt: 提示词
+            task_type: 任务类型（用于按任务类型统计延迟）
+            **kwargs: 其他参数
+
+        Returns:
+            响应文本
+
+        Raises:
+            CircuitOpenError: 提供商熔断中，请求未发出
+        """
+        health = self.provider_health.get(api_name)
+        if not health.allow_request():
+            raise CircuitOpenError(api_name, health.retry_in())
+
+        limiter = self.rate_limiters.get(api_name)
+        recorded = False
+        try:
+            await limiter.acquire(self._estimate_input_tokens(prompt, **kwargs))
+        except BaseException:
+            health.release_probe()
+            raise
+
+        output_tokens = 0
+        start_time = time.monotonic()
+        try:
+            response = await self._call_api_by_name(api_name, prompt, **kwargs)
+            output_tokens = estimate_tokens(response)
+            limiter.record_success()
+            health.record_success(time.monotonic() - start_time, task_type)
+            recorded = True
+            return response
+        except Exception as e:
+            recorded = self._record_call_error(api_name, e)
+            raise
+        finally:
+            limiter.release(output_tokens)
+            if not recorded:
+                health.release_probe()
+
+    async def _stream_api_limited(
+        self,
+        api_name: str,
+        prompt: str,
+        task_type: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """在熔断器和提供商限流器的许可下流式调用API（流结束前一直占用并发名额）"""
+        health = self.provider_health.get(api_name)
+        if not health.allow_request():
+            raise CircuitOpenError(api_name, health.retry_in())
+
+        limiter = self.rate_limiters.get(api_name)
+        recorded = False
+        try:
+            await limiter.acquire(self._estimate_input_tokens(prompt, **kwargs))
+        except BaseException:
+            health.release_probe()
+            raise
+
+        output_tokens = 0
+        try:
+            async for chunk in self._stream_api_by_name(api_name, prompt, **kwargs):
+                output_tokens += estimate_tokens(chunk)
+                yield chunk
+            limiter.record_success()
+            health.record_success(task_type=task_type)  # 流式耗时取决于输出长度，不计入延迟统计
+            recorded = True
+        except Exception as e:
+            recorded = self._record_call_error(api_name, e)
+            raise
+        finally:
+            limiter.release(output_tokens)
+            if not recorded:
+                health.release_probe()
+
+    def _record_call_error(self, api_name: str, error: Exception) -> bool:
+        """
+        根据调用错误更新限流和健康状态
+
+        限流（429）只触发该提供商暂停，不计入熔断器的失败次数。
+
+        Returns:
+            是否已计入健康统计
+        """
+        if is_rate_limit_error(error):
+            self.rate_limiters.get(api_name).record_rate_limited(extract_retry_after(error))
+            return False
+        self.provider_health.get(api_name).record_failure()
+        return True
+
+    @staticmethod
+    def _estimate_input_tokens(prompt: str, **kwargs) -> int:
+        """估算请求的输入token数（提示词+系统提示词）"""
+        return estimate_tokens(prompt) + estimate_tokens(kwargs.get("system", PromptTemplates.SYSTEM_PROMPT))
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """获取响应缓存统计（未启用缓存时返回None）"""
+        return self.response_cache.get_stats() if self.response_cache else None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        获取API调用相关的运行指标
+
+        Returns:
+            {"single_flight": 请求合并统计（含等待者数量）, "response_cache": 缓存统计或None,
+             "rate_limits": 各提供商限流统计, "provider_health": 各提供商延迟/错误率/熔断状态,
+             "hedging": 对冲请求统计}
+        """
+        with self._hedge_stats_lock:
+            hedging = dict(self._hedge_stats)
+        hedging["hedge_rate"] = hedging["hedged"] / hedging["requests"] if hedging["requests"] > 0 else 0
+        return {
+            "single_flight": self.single_flight.get_stats(),
+            "response_cache": self.get_cache_stats(),
+            "rate_limits": self.rate_limiters.get_stats(),
+            "provider_health": self.provider_health.get_stats(),
+            "hedging": hedging,
+        }
+
     async def _call_api_by_name(self, api_name: str, prompt: str, **kwargs) -> str:
         """
         按名称调用API
@@ -547,12 +1257,10 @@ class APIManager:
         Returns:
             响应文本
         """
-        try:
-            import anthropic
-        except ImportError:
-            raise ImportError("需要安装anthropic库: pip install anthropic")
-
-        client = anthropic.Anthropic(api_key=self.api_keys["claude"])
+        client = self.client_pool.get_anthropic_client(
+            self.api_keys["claude"],
+            self.base_urls.get("claude") or None
+        )
 
         system_prompt = kwargs.get("system", PromptTemplates.SYSTEM_PROMPT)
         max_tokens = kwargs.get("max_tokens", 4096)
@@ -560,17 +1268,12 @@ class APIManager:
         # 记录使用的模型
         self.logger.info(f"Claude API调用 - 模型: {self.models['claude']}")
 
-        # 异步调用（使用run_in_executor包装同步调用）
-        loop = asyncio.get_event_loop()
-        message = await loop.run_in_executor(
-            None,
-            lambda: client.messages.create(
-                model=self.models["claude"],
-                max_tokens=max_tokens,
-                system=system_prompt,
-                messages=[{"role": "user", "content": prompt}],
-                timeout=self.timeout
-            )
+        message = await client.messages.create(
+            model=self.models["claude"],
+            max_tokens=max_tokens,
+            system=system_prompt,
+            messages=[{"role": "user", "content": prompt}],
+            timeout=self.timeout
         )
 
         return message.content[0].text
@@ -586,12 +1289,10 @@ class APIManager:
         Returns:
             响应文本
         """
-        try:
-            import google.generativeai as genai
-        except ImportError:
-            raise ImportError("需要安装google-generativeai库: pip install google-generativeai")
-
-        genai.configure(api_key=self.api_keys["gemini"])
+        genai, model = self.client_pool.get_gemini_model(
+            self.api_keys["gemini"],
+            self.models["gemini"]
+        )
 
         system_prompt = kwargs.get("system", PromptTemplates.SYSTEM_PROMPT)
         max_tokens = kwargs.get("max_tokens", 4096)
@@ -602,17 +1303,10 @@ class APIManager:
         # 构建完整提示词
         full_prompt = f"{system_prompt}\n\n{prompt}"
 
-        model = genai.GenerativeModel(self.models["gemini"])
-
-        # 异步调用
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: model.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=max_tokens,
-                )
+        response = await model.generate_content_async(
+            full_prompt,
+            generation_config=genai.types.GenerationConfig(
+                max_output_tokens=max_tokens,
             )
         )
 
@@ -634,14 +1328,9 @@ class APIManager:
         Returns:
             响应文本
         """
-        try:
-            import openai
-        except ImportError:
-            raise ImportError("需要安装openai库: pip install openai")
-
-        client = openai.OpenAI(
-            api_key=self.api_keys["deepseek"],
-            base_url="https://api.deepseek.com"
+        client = self.client_pool.get_openai_client(
+            self.api_keys["deepseek"],
+            self.base_urls.get("deepseek") or self.BUILTIN_BASE_URLS["deepseek"]
         )
 
         system_prompt = kwargs.get("system", PromptTemplates.SYSTEM_PROMPT)
@@ -651,6 +1340,30 @@ class APIManager:
         self.logger.info(f"Deepseek API调用 - 模型: {self.models['deepseek']}")
 
         # 针对deepseek-reasoner深度思考模型优化提示词
+        enhanced_prompt, is_reasoner_model = self._build_deepseek_prompt(prompt)
+
+        response = await client.chat.completions.create(
+            model=self.models["deepseek"],
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": enhanced_prompt}
+            ],
+            max_tokens=max_tokens,
+            timeout=self.timeout * 2 if is_reasoner_model else self.timeout  # 深度思考需要更多时间
+        )
+
+        return response.choices[0].message.content
+
+    def _build_deepseek_prompt(self, prompt: str) -> Tuple[str, bool]:
+        """
+        针对deepseek-reasoner深度思考模型优化提示词
+
+        Args:
+            prompt: 原始提示词
+
+        Returns:
+            (优化后的提示词, 是否为深度思考模型)
+        """
         is_reasoner_model = "reasoner" in self.models["deepseek"].lower()
 
         if is_reasoner_model:
@@ -670,22 +1383,7 @@ class APIManager:
             # 普通模型：使用原始提示词
             enhanced_prompt = prompt
 
-        # 异步调用（使用run_in_executor包装同步调用）
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: client.chat.completions.create(
-                model=self.models["deepseek"],
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": enhanced_prompt}
-                ],
-                max_tokens=max_tokens,
-                timeout=self.timeout * 2 if is_reasoner_model else self.timeout  # 深度思考需要更多时间
-            )
-        )
-
-        return response.choices[0].message.content
+        return enhanced_prompt, is_reasoner_model
 
     async def _call_kimi(self, prompt: str, **kwargs) -> str:
         """
@@ -698,14 +1396,9 @@ class APIManager:
         Returns:
             响应文本
         """
-        try:
-            import openai
-        except ImportError:
-            raise ImportError("需要安装openai库: pip install openai")
-
-        client = openai.OpenAI(
-            api_key=self.api_keys["kimi"],
-            base_url="https://api.moonshot.cn/v1"
+        client = self.client_pool.get_openai_client(
+            self.api_keys["kimi"],
+            self.base_urls.get("kimi") or self.BUILTIN_BASE_URLS["kimi"]
         )
 
         system_prompt = kwargs.get("system", PromptTemplates.SYSTEM_PROMPT)
@@ -714,19 +1407,14 @@ class APIManager:
         # 记录使用的模型
         self.logger.info(f"Kimi API调用 - 模型: {self.models['kimi']}")
 
-        # 异步调用（使用run_in_executor包装同步调用）
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: client.chat.completions.create(
-                model=self.models["kimi"],
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                timeout=self.timeout
-            )
+        response = await client.chat.completions.create(
+            model=self.models["kimi"],
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            timeout=self.timeout
         )
 
         return response.choices[0].message.content
@@ -743,11 +1431,6 @@ class APIManager:
         Returns:
             响应文本
         """
-        try:
-            import openai
-        except ImportError:
-            raise ImportError("需要安装openai库: pip install openai")
-
         api_key = self.api_keys.get(api_name)
         base_url = self.base_urls.get(api_name)
         model = self.models.get(api_name)
@@ -759,10 +1442,7 @@ class APIManager:
         if not model:
             raise ValueError(f"模型未配置: {api_name}")
 
-        client = openai.OpenAI(
-            api_key=api_key,
-            base_url=base_url
-        )
+        client = self.client_pool.get_openai_client(api_key, base_url)
 
         system_prompt = kwargs.get("system", PromptTemplates.SYSTEM_PROMPT)
         max_tokens = kwargs.get("max_tokens", 4096)
@@ -770,19 +1450,104 @@ class APIManager:
         # 记录使用的模型
         self.logger.info(f"{api_name} API调用 - 模型: {model}, Base URL: {base_url}")
 
-        # 异步调用（使用run_in_executor包装同步调用）
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                timeout=self.timeout
-            )
+        response = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            timeout=self.timeout
         )
 
         return response.choices[0].message.content
+
+    async def _stream_api_by_name(self, api_name: str, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """
+        按名称流式调用API
+
+        Args:
+            api_name: API名称
+            prompt: 提示词
+            **kwargs: 其他参数
+
+        Yields:
+            文本增量
+        """
+        system_prompt = kwargs.get("system", PromptTemplates.SYSTEM_PROMPT)
+
+        if api_name == "claude":
+            client = self.client_pool.get_anthropic_client(
+                self.api_keys["claude"],
+                self.base_urls.get("claude") or None
+            )
+            self.logger.info(f"Claude API流式调用 - 模型: {self.models['claude']}")
+            async with client.messages.stream(
+                model=self.models["claude"],
+                max_tokens=kwargs.get("max_tokens", 4096),
+                system=system_prompt,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=self.timeout
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+            return
+
+        if api_name == "gemini":
+            genai, model = self.client_pool.get_gemini_model(
+                self.api_keys["gemini"],
+                self.models["gemini"]
+            )
+            self.logger.info(f"Gemini API流式调用 - 模型: {self.models['gemini']}")
+            response = await model.generate_content_async(
+                f"{system_prompt}\n\n{prompt}",
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=kwargs.get("max_tokens", 4096),
+                ),
+                stream=True
+            )
+            async for chunk in response:
+                yield chunk.text
+            return
+
+        # 其余API均为OpenAI兼容格式
+        timeout = self.timeout
+        max_tokens = kwargs.get("max_tokens", 4096)
+        if api_name == "deepseek":
+            base_url = self.base_urls.get("deepseek") or self.BUILTIN_BASE_URLS["deepseek"]
+            prompt, is_reasoner_model = self._build_deepseek_prompt(prompt)
+            max_tokens = kwargs.get("max_tokens", 8192)
+            if is_reasoner_model:
+                timeout = self.timeout * 2
+        elif api_name == "kimi":
+            base_url = self.base_urls.get("kimi") or self.BUILTIN_BASE_URLS["kimi"]
+        elif api_name in self.api_keys:
+            base_url = self.base_urls.get(api_name)
+            if not base_url:
+                raise ValueError(f"Base URL未配置: {api_name}")
+            if not self.models.get(api_name):
+                raise ValueError(f"模型未配置: {api_name}")
+        else:
+            raise ValueError(f"不支持的API: {api_name}")
+
+        client = self.client_pool.get_openai_client(self.api_keys[api_name], base_url)
+        self.logger.info(f"{api_name} API流式调用 - 模型: {self.models[api_name]}")
+        stream = await client.chat.completions.create(
+            model=self.models[api_name],
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            timeout=timeout,
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环中的所有API客户端连接（应用退出或工作线程结束时调用）"""
+        # 未完成的后台验证会继续使用客户端，先取消
+        await self.wait_for_background_verifications(timeout=0)
+        await self.client_pool.aclose()
@@ -0,0 +1,270 @@
+"""
+提供商健康度跟踪 - 延迟EWMA、错误率与熔断器
+
+静态的优先级列表会让一个已经失效的主提供商在每次请求时都先耗尽重试次数才故障转移。
+这里按提供商记录：
+- 延迟的指数加权移动平均（EWMA）和最近延迟窗口（按任务类型计算p50）
+- 错误率（EWMA）和连续失败次数
+- 熔断器：连续失败或错误率过高时打开，冷却后进入半开状态放行一个探测请求，
+  探测成功则关闭，失败则以更长的冷却时间重新打开
+"""
+import statistics
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+from utils.logger import get_logger
+
+
+# 健康度默认配置
+HEALTH_EWMA_ALPHA = 0.2  # EWMA平滑系数
+HEALTH_LATENCY_WINDOW = 50  # 计算p50使用的最近样本数
+CIRCUIT_FAILURE_THRESHOLD = 5  # 连续失败多少次打开熔断器
+CIRCUIT_ERROR_RATE_THRESHOLD = 0.5  # 错误率超过该值打开熔断器
+CIRCUIT_MIN_SAMPLES = 10  # 按错误率熔断前需要的最少样本数
+CIRCUIT_OPEN_SECONDS = 30.0  # 熔断器首次打开的冷却时间（秒）
+CIRCUIT_MAX_OPEN_SECONDS = 300.0  # 熔断器最长冷却时间（秒）
+
+
+class CircuitState(Enum):
+    """熔断器状态"""
+    CLOSED = "closed"        # 正常
+    OPEN = "open"            # 熔断中，拒绝请求
+    HALF_OPEN = "half_open"  # 冷却结束，放行一个探测请求
+
+
+class CircuitOpenError(Exception):
+    """提供商熔断中，请求未发出"""
+
+    def __init__(self, provider: str, retry_in: float):
+        self.provider = provider
+        self.retry_in = retry_in
+        super().__init__(f"{provider} 已熔断，{retry_in:.0f}秒后再探测")
+
+
+class ProviderHealth:
+    """单个提供商的健康状态（线程安全）"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.logger = get_logger()
+        self._lock = threading.Lock()
+
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self._samples = 0
+        self._consecutive_failures = 0
+        self._latencies: Deque[float] = deque(maxlen=HEALTH_LATENCY_WINDOW)
+        self._task_latencies: Dict[str, Deque[float]] = {}
+
+        self.state = CircuitState.CLOSED
+        self._open_until = 0.0
+        self._open_seconds = CIRCUIT_OPEN_SECONDS
+        self._probe_in_flight = False
+
+        self._successes = 0
+        self._failures = 0
+        self._rejected = 0
+
+    def allow_request(self) -> bool:
+        """
+        判断是否放行请求（半开状态下只放行一个探测请求）
+
+        Returns:
+            是否放行
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN and time.monotonic() >= self._open_until:
+                self.state = CircuitState.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self.logger.info(f"{self.name} 熔断器半开，发送探测请求")
+                return True
+            self._rejected += 1
+            return False
+
+    def is_available(self) -> bool:
+        """判断当前是否可以接受请求（不占用探测名额）"""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN:
+                return time.monotonic() >= self._open_until
+            return not self._probe_in_flight
+
+    def retry_in(self) -> float:
+        """熔断器剩余冷却时间（秒）"""
+        with self._lock:
+            if self.state != CircuitState.OPEN:
+                return 0.0
+            return max(0.0, self._open_until - time.monotonic())
+
+    def record_success(self, latency: Optional[float] = None, task_type: Optional[str] = None):
+        """
+        记录成功请求
+
+        Args:
+            latency: 耗时（秒），None表示不计入延迟统计（如流式调用）
+            task_type: 任务类型
+        """
+        with self._lock:
+            self._successes += 1
+            self._update_error_rate(0.0)
+            self._consecutive_failures = 0
+
+            if latency is not None:
+                self._add_latency(latency, task_type)
+
+            if self.state != CircuitState.CLOSED:
+                self.logger.info(f"{self.name} 探测成功，熔断器关闭")
+            self.state = CircuitState.CLOSED
+            self._probe_in_flight = False
+            self._open_seconds = CIRCUIT_OPEN_SECONDS
+
+    def record_latency(self, latency: float, task_type: Optional[str] = None):
+        """
+        只记录延迟样本（如被对冲请求取消的请求，其实际延迟至少为该值）
+
+        Args:
+            latency: 耗时（秒）
+            task_type: 任务类型
+        """
+        with self._lock:
+            self._add_latency(latency, task_type)
+
+    def _add_latency(self, latency: float, task_type: Optional[str]):
+        """更新延迟EWMA和样本窗口（调用方需持有锁）"""
+        self.latency_ewma = latency if self.latency_ewma is None else (
+            HEALTH_EWMA_ALPHA * latency + (1 - HEALTH_EWMA_ALPHA) * self.latency_ewma
+        )
+        self._latencies.append(latency)
+        if task_type:
+            self._task_latencies.setdefault(
+                task_type, deque(maxlen=HEALTH_LATENCY_WINDOW)
+            ).append(latency)
+
+    def record_failure(self):
+        """记录失败请求（可能打开熔断器）"""
+        with self._lock:
+            self._failures += 1
+            self._update_error_rate(1.0)
+            self._consecutive_failures += 1
+
+            if self.state == CircuitState.HALF_OPEN:
+                # 探测失败，加长冷却时间重新打开
+                self._open_seconds = min(self._open_seconds * 2, CIRCUIT_MAX_OPEN_SECONDS)
+                self._open(reason="探测失败")
+            elif self.state == CircuitState.CLOSED and (
+                self._consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+                or (self._samples >= CIRCUIT_MIN_SAMPLES and self.error_rate >= CIRCUIT_ERROR_RATE_THRESHOLD)
+            ):
+                self._open(reason=f"连续失败{self._consecutive_failures}次，错误率{self.error_rate:.0%}")
+
+    def release_probe(self):
+        """探测请求未产生结果（如被取消）时归还探测名额"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self, reason: str):
+        """打开熔断器（调用方需持有锁）"""
+        self.state = CircuitState.OPEN
+        self._open_until = time.monotonic() + self._open_seconds
+        self._probe_in_flight = False
+        self.logger.warning(f"{self.name} 熔断器打开（{reason}），{self._open_seconds:.0f}秒后探测")
+
+    def _update_error_rate(self, value: float):
+        """更新错误率EWMA（调用方需持有锁）"""
+        self._samples += 1
+        if self._samples == 1:
+            self.error_rate = value
+        else:
+            self.error_rate = HEALTH_EWMA_ALPHA * value + (1 - HEALTH_EWMA_ALPHA) * self.error_rate
+
+    def p50(self, task_type: Optional[str] = None, fallback_to_all: bool = True) -> Optional[float]:
+        """
+        最近延迟的中位数
+
+        Args:
+            task_type: 任务类型
+            fallback_to_all: 该任务类型没有样本时是否使用全部样本
+
+        Returns:
+            p50延迟（秒），没有样本时返回None
+        """
+        with self._lock:
+            samples = self._task_latencies.get(task_type) if task_type else None
+            if not samples and (fallback_to_all or not task_type):
+                samples = self._latencies
+            return statistics.median(samples) if samples else None
+
+    def latency_percentile(self, percentile: float, task_type: Optional[str] = None) -> Optional[float]:
+        """
+        最近延迟的百分位数
+
+        Args:
+            percentile: 百分位（0-100）
+            task_type: 任务类型，该任务类型没有样本时使用全部样本
+
+        Returns:
+            延迟（秒），没有样本时返回None
+        """
+        with self._lock:
+            samples = self._task_latencies.get(task_type) if task_type else None
+            if not samples:
+                samples = self._latencies
+            if not samples:
+                return None
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, max(0, round(percentile / 100 * (len(ordered) - 1))))
+            return ordered[index]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取健康统计"""
+        p50 = self.p50()
+        with self._lock:
+            return {
+                "state": self.state.value,
+                "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+                "p50": round(p50, 3) if p50 is not None else None,
+                "error_rate": round(self.error_rate, 3),
+                "consecutive_failures": self._consecutive_failures,
+                "successes": self._successes,
+                "failures": self._failures,
+                "rejected": self._rejected
+            }
+
+
+class ProviderHealthTracker:
+    """所有提供商的健康状态"""
+
+    def __init__(self):
+        self._providers: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> ProviderHealth:
+        """获取提供商的健康状态"""
+        with self._lock:
+            health = self._providers.get(provider)
+            if health is None:
+                health = ProviderHealth(provider)
+                self._providers[provider] = health
+            return health
+
+    def is_available(self, provider: str) -> bool:
+        """提供商当前是否可以接受请求"""
+        return self.get(provider).is_available()
+
+    def p50(self, provider: str, task_type: Optional[str] = None, fallback_to_all: bool = True) -> Optional[float]:
+        """提供商最近延迟的中位数"""
+        return self.get(provider).p50(task_type, fallback_to_all)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各提供商的健康统计"""
+        with self._lock:
+            providers = dict(self._providers)
+        return {name: health.get_stats() for name, health in providers.items()}
@@ -0,0 +1,369 @@
+"""
+提供商限流器 - 按提供商限制并发数、每分钟请求数（RPM）和每分钟token数（TPM）
+
+分析并行运行后，多个请求同时打到同一提供商容易触发429。每个提供商一个限流器：
+- 信号量限制同时进行的请求数
+- 令牌桶限制RPM和TPM
+- 收到429时遵循 Retry-After，没有时按指数退避暂停该提供商
+- 自适应：被限流时RPM减半，之后每次成功逐步恢复到配置值（AIMD）
+"""
+import asyncio
+import re
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from utils.logger import get_logger
+
+
+# 限流默认配置
+DEFAULT_PROVIDER_MAX_CONCURRENT = 4  # 每个提供商默认最多同时4个请求
+RATE_LIMIT_BACKOFF_INITIAL = 1.0  # 无Retry-After时的初始暂停时间（秒）
+RATE_LIMIT_BACKOFF_MAX = 60.0  # 无Retry-After时的最大暂停时间（秒）
+RATE_DECREASE_FACTOR = 0.5  # 被限流时RPM的衰减系数
+RATE_RECOVERY_STEP = 0.1  # 每次成功恢复配置RPM的比例
+
+_CJK_PATTERN = re.compile(r'[㐀-鿿豈-﫿　-〿＀-￯]')
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    本地估算文本的token数（无需调用分词器）
+
+    中日韩字符及全角标点按每字1个token，其余字符按每4个字符1个token估算。
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的token数
+    """
+    if not text:
+        return 0
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    other_count = len(text) - cjk_count
+    return cjk_count + (other_count + 3) // 4
+
+
+def _parse_retry_after(value: Any) -> Optional[float]:
+    """解析Retry-After头（秒数或HTTP日期）"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_retry_after(error: Exception) -> Optional[float]:
+    """
+    从异常中提取提供商建议的重试等待时间
+
+    支持 APIRateLimitError.retry_after 以及 anthropic/openai SDK 异常携带的
+    HTTP响应头（retry-after-ms / retry-after）。
+
+    Args:
+        error: 异常对象
+
+    Returns:
+        等待秒数，无法获取时返回None
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return _parse_retry_after(retry_after)
+
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return max(0.0, float(retry_after_ms) / 1000)
+        return _parse_retry_after(headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """判断异常是否为提供商限流（HTTP 429）"""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status == 429:
+        return True
+    error_str = str(error).lower()
+    return any(p in error_str for p in ('429', 'rate limit', 'rate_limit', 'ratelimit', 'too many requests'))
+
+
+@dataclass
+class RateLimitConfig:
+    """单个提供商的限流配置（None表示不限制）"""
+    max_concurrent: Optional[int] = DEFAULT_PROVIDER_MAX_CONCURRENT  # 最大并发请求数
+    rpm: Optional[int] = None  # 每分钟请求数
+    tpm: Optional[int] = None  # 每分钟token数（输入+输出）
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RateLimitConfig":
+        return cls(
+            max_concurrent=data.get("max_concurrent", DEFAULT_PROVIDER_MAX_CONCURRENT),
+            rpm=data.get("rpm"),
+            tpm=data.get("tpm")
+        )
+
+
+class TokenBucket:
+    """
+    令牌桶（按分钟速率补充）
+
+    预约式扣减：令牌不足时允许透支，返回需要等待的时间，
+    先预约的请求先放行。
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0  # 每秒补充量
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate_per_minute: float):
+        """调整速率（容量随之调整）"""
+        self._refill(time.monotonic())
+        self.capacity = float(rate_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = min(self.tokens, self.capacity)
+
+    def reserve(self, amount: float) -> float:
+        """
+        预约令牌
+
+        Args:
+            amount: 需要的令牌数
+
+        Returns:
+            需要等待的秒数（0表示立即可用）
+        """
+        self._refill(time.monotonic())
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def charge(self, amount: float):
+        """事后扣减令牌（如实际输出token），不等待"""
+        self._refill(time.monotonic())
+        self.tokens -= amount
+
+
+class ProviderLimiter:
+    """
+    单个提供商的限流器
+
+    用法：
+        await limiter.acquire(input_tokens)
+        try:
+            response = await call(...)
+            limiter.record_success()
+        except Exception as e:
+            if is_rate_limit_error(e):
+                limiter.record_rate_limited(extract_retry_after(e))
+            raise
+        finally:
+            limiter.release(output_tokens)
+    """
+
+    def __init__(self, name: str, config: Optional[RateLimitConfig] = None):
+        self.name = name
+        self.config = config or RateLimitConfig()
+        self.logger = get_logger()
+        self._lock = threading.Lock()
+
+        # 信号量绑定在事件循环上，按事件循环分别创建
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+        self.effective_rpm: Optional[float] = self.config.rpm
+        self._request_bucket = TokenBucket(self.config.rpm) if self.config.rpm else None
+        self._token_bucket = TokenBucket(self.config.tpm) if self.config.tpm else None
+
+        self._cooldown_until = 0.0
+        self._consecutive_rate_limits = 0
+
+        # 统计
+        self._in_flight = 0
+        self._waiting = 0
+        self._requests = 0
+        self._rate_limited = 0
+        self._total_wait = 0.0
+
+    def _semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self.config.max_concurrent:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.config.max_concurrent)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    def cooldown_remaining(self) -> float:
+        """提供商暂停剩余时间（秒）"""
+        return max(0.0, self._cooldown_until - time.monotonic())
+
+    async def acquire(self, tokens: int = 0):
+        """
+        获取一次请求许可（等待暂停结束、并发名额和RPM/TPM令牌）
+
+        Args:
+            tokens: 本次请求预计的输入token数
+        """
+        start = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        semaphore = None
+        try:
+            while (remaining := self.cooldown_remaining()) > 0:
+                await asyncio.sleep(remaining)
+
+            semaphore = self._semaphore()
+            if semaphore is not None:
+                await semaphore.acquire()
+
+            try:
+                with self._lock:
+                    wait = 0.0
+                    if self._request_bucket is not None:
+                        wait = max(wait, self._request_bucket.reserve(1))
+                    if self._token_bucket is not None and tokens:
+                        wait = max(wait, self._token_bucket.reserve(tokens))
+                if wait > 0:
+                    self.logger.debug(f"{self.name} 达到速率限制，等待 {wait:.2f}秒")
+                    await asyncio.sleep(wait)
+            except BaseException:
+                # 等待期间被取消，归还并发名额
+                if semaphore is not None:
+                    semaphore.release()
+                raise
+        finally:
+            with self._lock:
+                self._waiting -= 1
+                self._total_wait += time.monotonic() - start
+
+        with self._lock:
+            self._in_flight += 1
+            self._requests += 1
+
+    def release(self, output_tokens: int = 0):
+        """
+        释放请求许可
+
+        Args:
+            output_tokens: 本次响应的输出token数（计入TPM）
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if self._token_bucket is not None and output_tokens:
+                self._token_bucket.charge(output_tokens)
+        semaphore = self._semaphore()
+        if semaphore is not None:
+            semaphore.release()
+
+    def record_success(self):
+        """记录成功响应（逐步恢复速率）"""
+        with self._lock:
+            self._consecutive_rate_limits = 0
+            if self._request_bucket is not None and self.effective_rpm < self.config.rpm:
+                self.effective_rpm = min(
+                    float(self.config.rpm),
+                    self.effective_rpm + self.config.rpm * RATE_RECOVERY_STEP
+                )
+                self._request_bucket.set_rate(self.effective_rpm)
+
+    def record_rate_limited(self, retry_after: Optional[float] = None):
+        """
+        记录被限流（暂停该提供商并降低速率）
+
+        Args:
+            retry_after: 提供商建议的等待秒数，None时按指数退避
+        """
+        with self._lock:
+            self._rate_limited += 1
+            if retry_after is None:
+                retry_after = min(
+                    RATE_LIMIT_BACKOFF_INITIAL * (2 ** self._consecutive_rate_limits),
+                    RATE_LIMIT_BACKOFF_MAX
+                )
+            self._consecutive_rate_limits += 1
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + retry_after)
+
+            if self._request_bucket is not None:
+                self.effective_rpm = max(1.0, self.effective_rpm * RATE_DECREASE_FACTOR)
+                self._request_bucket.set_rate(self.effective_rpm)
+
+        self.logger.warning(f"{self.name} API被限流，暂停 {retry_after:.1f}秒")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取限流统计"""
+        with self._lock:
+            return {
+                "max_concurrent": self.config.max_concurrent,
+                "rpm": self.config.rpm,
+                "tpm": self.config.tpm,
+                "effective_rpm": self.effective_rpm,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "requests": self._requests,
+                "rate_limited": self._rate_limited,
+                "total_wait_seconds": round(self._total_wait, 3),
+                "cooldown_remaining": round(self.cooldown_remaining(), 3)
+            }
+
+
+class RateLimiterRegistry:
+    """所有提供商的限流器"""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, RateLimitConfig]] = None,
+        default: Optional[RateLimitConfig] = None
+    ):
+        """
+        Args:
+            limits: 提供商名称 -> 限流配置
+            default: 未单独配置的提供商使用的限流配置
+        """
+        self._configs: Dict[str, RateLimitConfig] = dict(limits or {})
+        self._default = default or RateLimitConfig()
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> ProviderLimiter:
+        """获取提供商的限流器"""
+        with self._lock:
+            limiter = self._limiters.get(provider)
+            if limiter is None:
+                limiter = ProviderLimiter(provider, self._configs.get(provider, self._default))
+                self._limiters[provider] = limiter
+            return limiter
+
+    def configure(self, provider: str, config: RateLimitConfig):
+        """设置提供商的限流配置（替换现有限流器，进行中的请求不受影响）"""
+        with self._lock:
+            self._configs[provider] = config
+            self._limiters.pop(provider, None)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各提供商的限流统计"""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: limiter.get_stats() for name, limiter in limiters.items()}
@@ -0,0 +1,283 @@
+"""
+LLM响应缓存 - 基于内容寻址的本地持久化缓存
+
+相同的 (提供商, 模型, 系统提示词, 提示词, max_tokens) 必然得到可复用的回答：
+重新打开报告、界面崩溃后重试、同一命盘重复解读等场景直接命中缓存，
+不再消耗网络时间和token。
+
+支持：
+- SQLite本地持久化（进程重启后仍可命中）
+- TTL过期
+- 按字节数的LRU淘汰
+- 按任务类型开关
+- 命中率统计
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from utils.logger import get_logger
+
+
+# 缓存默认配置
+DEFAULT_RESPONSE_CACHE_PATH = "data/user/llm_cache.db"
+DEFAULT_RESPONSE_CACHE_TTL = 7 * 86400  # 默认缓存7天
+DEFAULT_RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 默认最多占用64MB
+
+
+class ResponseCache:
+    """
+    LLM响应缓存（线程安全）
+
+    用法：
+        cache = ResponseCache("data/user/llm_cache.db", task_types=["单理论解读"])
+        key = cache.make_key("claude", model, prompt, system=system, max_tokens=4096)
+        response = cache.get(key, task_type="单理论解读")
+        if response is None:
+            response = await call(...)
+            cache.set(key, response, provider="claude", model=model, task_type="单理论解读")
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_RESPONSE_CACHE_PATH,
+        ttl_seconds: Optional[int] = DEFAULT_RESPONSE_CACHE_TTL,
+        max_bytes: int = DEFAULT_RESPONSE_CACHE_MAX_BYTES,
+        task_types: Optional[Iterable[str]] = None
+    ):
+        """
+        初始化响应缓存
+
+        Args:
+            db_path: SQLite文件路径（":memory:" 表示仅内存）
+            ttl_seconds: 过期时间（秒），None或0表示不过期
+            max_bytes: 缓存响应总字节数上限，超出时淘汰最久未使用的条目
+            task_types: 启用缓存的任务类型，None表示所有任务类型
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds or None
+        self.max_bytes = max_bytes
+        self.task_types = set(task_types) if task_types is not None else None
+        self.logger = get_logger()
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._task_stats: Dict[str, Dict[str, int]] = {}
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._init_database()
+
+    def _init_database(self):
+        """初始化缓存表"""
+        with self._lock:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    model TEXT,
+                    task_type TEXT,
+                    response TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed
+                ON llm_responses(last_accessed)
+            ''')
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        prompt: str,
+        system: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """
+        生成内容寻址的缓存键
+
+        Args:
+            provider: 提供商名称
+            model: 模型名称
+            prompt: 提示词
+            system: 系统提示词
+            max_tokens: 最大输出token数
+
+        Returns:
+            SHA-256十六进制摘要
+        """
+        payload = json.dumps(
+            [provider, model or "", system or "", prompt, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def is_enabled_for(self, task_type: str) -> bool:
+        """检查某个任务类型是否启用缓存"""
+        return self.task_types is None or task_type in self.task_types
+
+    def _record(self, task_type: Optional[str], hit: bool):
+        """记录命中/未命中（调用方需持有锁）"""
+        if hit:
+            self._hits += 1
+        else:
+            self._misses += 1
+        if task_type:
+            stats = self._task_stats.setdefault(task_type, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def get(self, key: str, task_type: Optional[str] = None) -> Optional[str]:
+        """
+        获取缓存的响应
+
+        Args:
+            key: 缓存键
+            task_type: 任务类型（仅用于统计）
+
+        Returns:
+            响应文本，未命中或已过期时返回None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM llm_responses WHERE cache_key = ?',
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                self._record(task_type, hit=False)
+                return None
+
+            response, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute('DELETE FROM llm_responses WHERE cache_key = ?', (key,))
+                self._conn.commit()
+                self._record(task_type, hit=False)
+                return None
+
+            self._conn.execute(
+                'UPDATE llm_responses SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?',
+                (now, key)
+            )
+            self._conn.commit()
+            self._record(task_type, hit=True)
+            return response
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        provider: str = "",
+        model: str = "",
+        task_type: str = ""
+    ):
+        """
+        写入缓存（超出容量时按LRU淘汰）
+
+        Args:
+            key: 缓存键
+            response: 响应文本
+            provider: 提供商名称
+            model: 模型名称
+            task_type: 任务类型
+        """
+        size_bytes = len(response.encode('utf-8'))
+        if size_bytes > self.max_bytes:
+            self.logger.debug(f"响应过大（{size_bytes}字节），不写入缓存")
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                '''
+                INSERT OR REPLACE INTO llm_responses
+                (cache_key, provider, model, task_type, response, size_bytes, created_at, last_accessed, hit_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+                ''',
+                (key, provider, model, task_type, response, size_bytes, now, now)
+            )
+            self._evict_if_needed()
+            self._conn.commit()
+
+    def _evict_if_needed(self):
+        """按最久未使用顺序淘汰条目，直到总字节数不超过上限（调用方需持有锁）"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM llm_responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            'SELECT cache_key, size_bytes FROM llm_responses ORDER BY last_accessed ASC, rowid ASC'
+        ).fetchall()
+        evicted = []
+        for cache_key, size_bytes in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((cache_key,))
+            total -= size_bytes
+
+        self._conn.executemany('DELETE FROM llm_responses WHERE cache_key = ?', evicted)
+        self._evictions += len(evicted)
+        self.logger.debug(f"响应缓存超出容量，淘汰 {len(evicted)} 条")
+
+    def cleanup_expired(self) -> int:
+        """
+        清理所有过期条目
+
+        Returns:
+            清理的条目数
+        """
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM llm_responses WHERE created_at < ?',
+                (time.time() - self.ttl_seconds,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """清空缓存和统计"""
+        with self._lock:
+            self._conn.execute('DELETE FROM llm_responses')
+            self._conn.commit()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._task_stats.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_responses'
+            ).fetchone()
+            total_requests = self._hits + self._misses
+            return {
+                "entries": entries,
+                "total_bytes": total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": self._hits / total_requests if total_requests > 0 else 0,
+                "total_requests": total_requests,
+                "by_task_type": {k: dict(v) for k, v in self._task_stats.items()}
+            }
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
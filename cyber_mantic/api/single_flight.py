@@ -0,0 +1,101 @@
+"""
+单飞请求合并 - 相同请求同时只发出一次
+
+会话流程和分析页同时触发同一解读、用户双击按钮等场景会产生完全相同的并发请求。
+同一事件循环中，键相同的并发调用共享同一个进行中的任务：第一个调用者发起请求，
+其余调用者等待同一结果，不重复消耗配额，也不互相争抢限流额度。
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from utils.logger import get_logger
+
+
+class _Flight:
+    """一个进行中的共享请求"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0  # 当前等待该请求的调用者数量
+
+
+class SingleFlight:
+    """
+    单飞请求合并器
+
+    用法：
+        flights = SingleFlight()
+        result = await flights.do(key, lambda: call_api(...))
+
+    所有等待者都取消时，共享请求才会被取消；单个等待者取消不影响其他等待者。
+    """
+
+    def __init__(self):
+        self._flights: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _Flight] = {}
+        self._lock = threading.Lock()
+        self._leaders = 0     # 实际发出的请求数
+        self._coalesced = 0   # 被合并（未实际发出）的请求数
+        self._max_waiters = 0  # 单个请求同时等待者数量的峰值
+        self.logger = get_logger()
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行请求，相同键的并发调用共享同一结果
+
+        Args:
+            key: 请求键
+            factory: 创建请求协程的函数（只有第一个调用者会执行）
+
+        Returns:
+            请求结果（请求失败时，所有等待者收到相同的异常）
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            if flight is None:
+                flight = _Flight(loop.create_task(factory()))
+                self._flights[flight_key] = flight
+                flight.task.add_done_callback(lambda _, k=flight_key, f=flight: self._finish(k, f))
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+                self.logger.debug(f"合并相同的进行中请求（等待者: {flight.waiters + 1}）")
+            flight.waiters += 1
+            self._max_waiters = max(self._max_waiters, flight.waiters)
+
+        cancelled = False
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0
+            # 最后一个等待者也放弃了，取消共享请求
+            if cancelled and abandoned and not flight.task.done():
+                flight.task.cancel()
+
+    def _finish(self, flight_key: Tuple[asyncio.AbstractEventLoop, Hashable], flight: _Flight):
+        """共享请求完成后移除记录"""
+        with self._lock:
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取合并统计"""
+        with self._lock:
+            total_requests = self._leaders + self._coalesced
+            return {
+                "in_flight": len(self._flights),
+                "waiters": sum(f.waiters for f in self._flights.values()),
+                "max_waiters": self._max_waiters,
+                "leaders": self._leaders,
+                "coalesced": self._coalesced,
+                "coalesce_rate": self._coalesced / total_requests if total_requests > 0 else 0,
+                "total_requests": total_requests
+            }
@@ -9,7 +9,8 @@ V2核心组件：实现环节级API配置
 
 import json
 import os
-from typing import Dict, Any, Optional, List
+import weakref
+from typing import Callable, Dict, Any, Optional, List
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from utils.logger import get_logger
@@ -66,6 +67,8 @@ class GlobalAPIConfig:
     enable_dual_verification: bool = True
     timeout: int = 60
     max_retries: int = 3
+    # 各提供商限流：{"deepseek": {"max_concurrent": 4, "rpm": 60, "tpm": 100000}}
+    rate_limits: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
 
 # 支持的API厂商配置
@@ -204,6 +207,9 @@ class TaskRouter:
         self.global_config = GlobalAPIConfig()
         self.task_configs: Dict[str, TaskConfig] = {}
 
+        # 限流配置变更的订阅者（如 APIManager.configure_rate_limits），弱引用不延长其生命周期
+        self._rate_limit_listeners: List[weakref.WeakMethod] = []
+
         # 加载配置
         self._load_config()
 
@@ -221,7 +227,8 @@ class TaskRouter:
                     fallback_order=global_data.get("fallback_order", ["deepseek", "kimi", "gemini"]),
                     enable_dual_verification=global_data.get("enable_dual_verification", True),
                     timeout=global_data.get("timeout", 60),
-                    max_retries=global_data.get("max_retries", 3)
+                    max_retries=global_data.get("max_retries", 3),
+                    rate_limits=global_data.get("rate_limits", {})
                 )
 
                 # 加载任务配置
@@ -265,7 +272,8 @@ class TaskRouter:
                     "fallback_order": self.global_config.fallback_order,
                     "enable_dual_verification": self.global_config.enable_dual_verification,
                     "timeout": self.global_config.timeout,
-                    "max_retries": self.global_config.max_retries
+                    "max_retries": self.global_config.max_retries,
+                    "rate_limits": self.global_config.rate_limits
                 },
                 "task_overrides": {
                     task_type: config.to_dict() if config else None
@@ -362,7 +370,8 @@ class TaskRouter:
         fallback_order: Optional[List[str]] = None,
         enable_dual_verification: Optional[bool] = None,
         timeout: Optional[int] = None,
-        max_retries: Optional[int] = None
+        max_retries: Optional[int] = None,
+        rate_limits: Optional[Dict[str, Dict[str, int]]] = None
     ):
         """
         设置全局配置
@@ -373,6 +382,7 @@ class TaskRouter:
             enable_dual_verification: 是否启用双模型验证
             timeout: 超时时间
             max_retries: 最大重试次数
+            rate_limits: 各提供商限流 {api: {max_concurrent, rpm, tpm}}
         """
         if primary is not None:
             self.global_config.primary = primary
@@ -384,6 +394,58 @@ class TaskRouter:
             self.global_config.timeout = timeout
         if max_retries is not None:
             self.global_config.max_retries = max_retries
+        if rate_limits is not None:
+            self.global_config.rate_limits = rate_limits
+            self._notify_rate_limits(rate_limits)
+
+    def set_rate_limit(
+        self,
+        api_name: str,
+        max_concurrent: Optional[int] = None,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None
+    ):
+        """
+        设置单个提供商的限流
+
+        Args:
+            api_name: API名称
+            max_concurrent: 最大并发请求数
+            rpm: 每分钟请求数
+            tpm: 每分钟token数
+        """
+        limits = self.global_config.rate_limits.setdefault(api_name, {})
+        if max_concurrent is not None:
+            limits["max_concurrent"] = max_concurrent
+        if rpm is not None:
+            limits["rpm"] = rpm
+        if tpm is not None:
+            limits["tpm"] = tpm
+        self._notify_rate_limits({api_name: dict(limits)})
+
+    def add_rate_limit_listener(self, callback: Callable[[Dict[str, Dict[str, int]]], None]):
+        """
+        订阅限流配置：立即以当前配置调用一次，之后每次修改限流时调用
+
+        Args:
+            callback: 绑定方法，参数为 {api: {max_concurrent, rpm, tpm}}（只含变更的提供商）
+        """
+        self._rate_limit_listeners.append(weakref.WeakMethod(callback))
+        if self.global_config.rate_limits:
+            callback(self.global_config.rate_limits)
+
+    def _notify_rate_limits(self, rate_limits: Dict[str, Dict[str, int]]):
+        alive = []
+        for ref in self._rate_limit_listeners:
+            callback = ref()
+            if callback is None:
+                continue
+            alive.append(ref)
+            try:
+                callback(rate_limits)
+            except Exception as e:
+                self.logger.warning(f"应用限流配置失败: {e}")
+        self._rate_limit_listeners = alive
 
     def get_supported_apis(self) -> Dict[str, Dict[str, Any]]:
         """获取支持的API列表"""
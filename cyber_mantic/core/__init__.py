@@ -3,6 +3,7 @@
 """
 from .decision_engine import DecisionEngine
 from .theory_selector import TheorySelector
+from .report_scheduler import ReportSectionScheduler, ReportSection
 from .constants import (
     JudgmentType,
     QuestionCategory,
@@ -41,6 +42,8 @@ from .shichen_handler import (
 __all__ = [
     'DecisionEngine',
     'TheorySelector',
+    'ReportSectionScheduler',
+    'ReportSection',
     'JudgmentType',
     'QuestionCategory',
     'TheoryType',
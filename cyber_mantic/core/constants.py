@@ -284,8 +284,13 @@ DEFAULT_THEORY_TIMEOUT = 250  # 单个理论分析的总超时时间
 DEFAULT_INTERPRETATION_TIMEOUT = 250  # 主模型解读超时
 DEFAULT_INTERPRETATION_TIMEOUT_SECONDARY = 120  # 副模型（双模型验证）解读超时
 
+# 理论并发分析
+DEFAULT_CONCURRENT_THEORIES = True  # 默认并发运行各理论（排盘入线程池，解读并发发起）
+DEFAULT_MAX_CONCURRENT_INTERPRETATIONS = 3  # 同时进行的LLM解读数量上限
+
 # 报告生成超时
 DEFAULT_REPORT_TIMEOUT = 300  # 综合报告生成超时
+DEFAULT_REPORT_SECTION_TIMEOUT = 180  # 报告附属章节（摘要/建议/时间分析等）生成超时
 
 # API调用超时
 DEFAULT_API_TIMEOUT = 60  # 单次API调用的默认超时
@@ -10,10 +10,10 @@ import uuid
 import time
 import asyncio
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from models import UserInput, TheoryAnalysisResult, ConflictInfo, ComprehensiveReport
 from theories import TheoryRegistry
-from api import APIManager, PromptTemplates
+from api import APIManager, PromptTemplates, get_task_router
 from .theory_selector import TheorySelector
 from .conflict_resolver import ConflictResolver
 from .arbitration_system import ArbitrationSystem
@@ -24,11 +24,15 @@ from .constants import (
     DEFAULT_THEORY_TIMEOUT,
     DEFAULT_INTERPRETATION_TIMEOUT,
     DEFAULT_INTERPRETATION_TIMEOUT_SECONDARY,
-    DEFAULT_REPORT_TIMEOUT
+    DEFAULT_REPORT_TIMEOUT,
+    DEFAULT_CONCURRENT_THEORIES,
+    DEFAULT_MAX_CONCURRENT_INTERPRETATIONS,
+    DEFAULT_REPORT_SECTION_TIMEOUT
 )
 from utils.logger import get_logger, log_calculation, log_conflict_resolution, log_performance
 from utils.mbti_analyzer import MBTIAnalyzer
 from .ai_assistant import AIAssistant
+from .report_scheduler import ReportSectionScheduler
 
 
 class DecisionEngine:
@@ -43,19 +47,27 @@ class DecisionEngine:
         """
         self.config = config
         self.theory_selector = TheorySelector()
-        self.api_manager = APIManager(config.get("api", {}))
+        self.api_manager = APIManager(config.get("api", {}), task_router=get_task_router())
         self.arbitration_system = ArbitrationSystem(self.api_manager)
         self.conflict_resolver = ConflictResolver(self.arbitration_system)
         self.ai_assistant = AIAssistant(self.api_manager)  # 新增AI助手
         self.logger = get_logger()
 
-    async def analyze(self, user_input: UserInput, progress_callback=None) -> ComprehensiveReport:
+    async def analyze(
+        self,
+        user_input: UserInput,
+        progress_callback=None,
+        verification_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> ComprehensiveReport:
         """
         执行完整分析流程
 
         Args:
             user_input: 用户输入
             progress_callback: 可选的进度回调函数 callback(theory_name, status, progress_percent)
+            verification_callback: 可选的验证回调函数 callback(target_name, verification)，
+                异步双模型验证模式下，某个理论解读（target_name为理论名）或综合报告
+                （target_name为"综合报告"）的后台验证完成时调用，此时报告可能已经返回
 
         Returns:
             综合报告
@@ -117,119 +129,12 @@ class DecisionEngine:
         self.logger.debug("\n[步骤2] 运行理论计算...")
         if progress_callback:
             progress_callback("系统", "开始计算", 10, "[步骤2] 运行理论计算...")
-        theory_results = []
-        failed_theories = []  # 记录失败的理论
-        total_theories = len(execution_order)
-
-        for idx, theory_name in enumerate(execution_order):
-            # 计算当前进度（10%-70%分配给理论分析）
-            base_progress = 10 + int((idx / total_theories) * 60)
-
-            self.logger.debug(f"\n正在计算 {theory_name}...")
-            if progress_callback:
-                progress_callback(theory_name, "计算排盘", base_progress, f"正在计算 {theory_name}...")
-
-            theory = TheoryRegistry.get_theory(theory_name)
-            if theory:
-                try:
-                    # 计算排盘
-                    calculation_data = theory.calculate(user_input)
-                    self.logger.debug(f"{theory_name} 计算完成")
-                    if progress_callback:
-                        progress_callback(theory_name, "计算完成", base_progress + int(60 / total_theories / 4), f"{theory_name} 计算完成")
-
-                    # LLM解读
-                    self.logger.debug(f"正在解读 {theory_name}...")
-                    if progress_callback:
-                        progress_callback(theory_name, "AI解读中", base_progress + int(60 / total_theories / 2), f"正在解读 {theory_name}...")
-                        # 如果启用了双模型验证，显示提示
-                        if self.api_manager.enable_dual_verification:
-                            progress_callback(theory_name, "双模型验证", base_progress + int(60 / total_theories / 2) + 1, "启用双模型验证")
-
-                    interpretation = await self._get_interpretation(
-                        theory_name,
-                        calculation_data,
-                        user_input
-                    )
-
-                    # 解读完成后显示验证完成提示
-                    if progress_callback and self.api_manager.enable_dual_verification:
-                        progress_callback(theory_name, "双模型验证", base_progress + int(60 / total_theories * 0.85), "双模型验证完成，两个模型都成功响应")
-
-                    # 创建结果对象
-                    result = TheoryAnalysisResult(
-                        theory_name=theory_name,
-                        calculation_data=calculation_data,
-                        interpretation=interpretation,
-                        judgment=calculation_data.get("judgment", "平"),
-                        judgment_level=calculation_data.get("judgment_level", 0.5),
-                        timing=calculation_data.get("timing"),
-                        advice=calculation_data.get("advice"),
-                        confidence=calculation_data.get("confidence", 0.8)
-                    )
-
-                    theory_results.append(result)
-                    self.logger.debug(f"{theory_name} 解读完成")
-
-                    # 通过 progress_callback 传递完成信息
-                    if progress_callback:
-                        progress_callback(theory_name, "解读完成", base_progress + int(60 / total_theories * 0.9), f"{theory_name} 解读完成")
-                        judgment = calculation_data.get("judgment", "平")
-                        confidence = calculation_data.get("confidence", 0.8)
-                        detail_msg = f"✓ {theory_name} 分析完成 - 判断: {judgment}，置信度: {confidence*100:.1f}%"
-                        progress_callback(theory_name, "分析完成", base_progress + int(60 / total_theories), detail_msg)
-
-                except TheoryCalculationError as e:
-                    # 理论计算错误（已知错误类型）
-                    self.logger.error(f"{theory_name} 计算失败: {e.message}")
-                    failed_theories.append({
-                        "theory": theory_name,
-                        "error_type": "calculation_error",
-                        "error": e.message,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    if progress_callback:
-                        progress_callback(theory_name, "计算失败", base_progress, f"✗ {theory_name} 计算失败")
-                    continue
-
-                except APITimeoutError as e:
-                    # API超时错误
-                    self.logger.warning(f"{theory_name} 解读超时: {e.timeout}秒")
-                    failed_theories.append({
-                        "theory": theory_name,
-                        "error_type": "timeout",
-                        "error": f"API响应超时（{e.timeout}秒）",
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    if progress_callback:
-                        progress_callback(theory_name, "解读超时", base_progress, f"✗ {theory_name} 解读超时")
-                    continue
-
-                except APIError as e:
-                    # API调用错误
-                    self.logger.error(f"{theory_name} API错误: {e.message}")
-                    failed_theories.append({
-                        "theory": theory_name,
-                        "error_type": "api_error",
-                        "error": e.message,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    if progress_callback:
-                        progress_callback(theory_name, "API错误", base_progress, f"✗ {theory_name} API调用失败")
-                    continue
-
-                except Exception as e:
-                    # 未预期的错误（记录完整堆栈）
-                    self.logger.exception(f"{theory_name} 分析时发生未预期的错误")
-                    failed_theories.append({
-                        "theory": theory_name,
-                        "error_type": "unexpected_error",
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    if progress_callback:
-                        progress_callback(theory_name, "分析失败", base_progress, f"✗ {theory_name} 分析失败: {str(e)[:50]}")
-                    continue
+        theory_results, failed_theories = await self._run_theory_analyses(
+            execution_order,
+            user_input,
+            progress_callback,
+            verification_callback
+        )
 
         # 检查是否有成功的理论结果
         if not theory_results:
@@ -358,7 +263,8 @@ class DecisionEngine:
             selected_theories,
             theory_results,
             conflict_info,
-            progress_callback
+            progress_callback,
+            verification_callback
         )
 
         # 记录总耗时
@@ -382,11 +288,229 @@ class DecisionEngine:
 
         return report
 
+    async def _run_theory_analyses(
+        self,
+        execution_order: List[str],
+        user_input: UserInput,
+        progress_callback=None,
+        verification_callback=None
+    ) -> Tuple[List[TheoryAnalysisResult], List[Dict[str, Any]]]:
+        """
+        运行各理论的排盘计算与LLM解读
+
+        并发模式（默认）下，排盘计算放入线程池执行，LLM解读按配置的并发上限同时发起，
+        结果按完成顺序收集，总耗时约等于最慢的单个理论；顺序模式保持逐个执行。
+
+        配置项（analysis节）：
+        - concurrent_theories: 是否启用并发流水线
+        - max_concurrent_interpretations: 同时进行的LLM解读数量上限
+
+        Args:
+            execution_order: 理论执行顺序
+            user_input: 用户输入
+            progress_callback: 进度回调函数
+            verification_callback: 后台验证完成回调函数
+
+        Returns:
+            (成功的理论结果列表, 失败理论记录列表)
+        """
+        analysis_config = self.config.get("analysis", {})
+        concurrent = analysis_config.get("concurrent_theories", DEFAULT_CONCURRENT_THEORIES)
+        max_concurrent = analysis_config.get(
+            "max_concurrent_interpretations",
+            DEFAULT_MAX_CONCURRENT_INTERPRETATIONS
+        )
+
+        theory_results: List[TheoryAnalysisResult] = []
+        failed_theories: List[Dict[str, Any]] = []  # 记录失败的理论
+        total_theories = len(execution_order)
+
+        if not concurrent:
+            limiter = asyncio.Semaphore(1)
+            for idx, theory_name in enumerate(execution_order):
+                result = await self._analyze_theory(
+                    theory_name, idx, total_theories, user_input,
+                    failed_theories, limiter, progress_callback,
+                    verification_callback=verification_callback
+                )
+                if result:
+                    theory_results.append(result)
+            return theory_results, failed_theories
+
+        max_concurrent = max(1, int(max_concurrent))
+        limiter = asyncio.Semaphore(max_concurrent)
+        self.logger.info(f"并发运行 {total_theories} 个理论（解读并发上限：{max_concurrent}）")
+
+        tasks = [
+            asyncio.create_task(self._analyze_theory(
+                theory_name, idx, total_theories, user_input,
+                failed_theories, limiter, progress_callback,
+                verification_callback=verification_callback
+            ))
+            for idx, theory_name in enumerate(execution_order)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                result = await finished
+                if result:
+                    theory_results.append(result)
+        finally:
+            # 外层被取消时，确保未完成的理论任务一并取消
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        return theory_results, failed_theories
+
+    async def _analyze_theory(
+        self,
+        theory_name: str,
+        idx: int,
+        total_theories: int,
+        user_input: UserInput,
+        failed_theories: List[Dict[str, Any]],
+        limiter: asyncio.Semaphore,
+        progress_callback=None,
+        verification_callback=None
+    ) -> Optional[TheoryAnalysisResult]:
+        """
+        分析单个理论：排盘计算 + LLM解读
+
+        Args:
+            theory_name: 理论名称
+            idx: 理论在执行顺序中的位置（用于计算进度）
+            total_theories: 理论总数
+            user_input: 用户输入
+            failed_theories: 失败记录列表（失败时追加）
+            limiter: LLM解读并发限制信号量
+            progress_callback: 进度回调函数
+            verification_callback: 后台验证完成回调函数
+
+        Returns:
+            理论分析结果，失败或理论不存在时返回None
+        """
+        # 计算当前进度（10%-70%分配给理论分析）
+        base_progress = 10 + int((idx / total_theories) * 60)
+
+        self.logger.debug(f"\n正在计算 {theory_name}...")
+        if progress_callback:
+            progress_callback(theory_name, "计算排盘", base_progress, f"正在计算 {theory_name}...")
+
+        theory = TheoryRegistry.get_theory(theory_name)
+        if not theory:
+            return None
+
+        try:
+            # 计算排盘（CPU密集，测字还含同步AI验证）放入线程池，不阻塞共享事件循环
+            loop = asyncio.get_running_loop()
+            calculation_data = await loop.run_in_executor(None, theory.calculate, user_input)
+            self.logger.debug(f"{theory_name} 计算完成")
+            if progress_callback:
+                progress_callback(theory_name, "计算完成", base_progress + int(60 / total_theories / 4), f"{theory_name} 计算完成")
+
+            async with limiter:
+                # LLM解读
+                self.logger.debug(f"正在解读 {theory_name}...")
+                if progress_callback:
+                    progress_callback(theory_name, "AI解读中", base_progress + int(60 / total_theories / 2), f"正在解读 {theory_name}...")
+                    # 如果启用了双模型验证，显示提示
+                    if self.api_manager.enable_dual_verification:
+                        progress_callback(theory_name, "双模型验证", base_progress + int(60 / total_theories / 2) + 1, "启用双模型验证")
+
+                on_verified, bind_verification = self._make_verification_binder(
+                    theory_name, verification_callback
+                )
+                interpretation = await self._get_interpretation(
+                    theory_name,
+                    calculation_data,
+                    user_input,
+                    on_verified=on_verified
+                )
+
+            # 解读完成后显示验证完成提示
+            if progress_callback and self.api_manager.enable_dual_verification:
+                progress_callback(theory_name, "双模型验证", base_progress + int(60 / total_theories * 0.85), "双模型验证完成，两个模型都成功响应")
+
+            # 创建结果对象
+            result = TheoryAnalysisResult(
+                theory_name=theory_name,
+                calculation_data=calculation_data,
+                interpretation=interpretation,
+                judgment=calculation_data.get("judgment", "平"),
+                judgment_level=calculation_data.get("judgment_level", 0.5),
+                timing=calculation_data.get("timing"),
+                advice=calculation_data.get("advice"),
+                confidence=calculation_data.get("confidence", 0.8)
+            )
+            bind_verification(result)
+            self.logger.debug(f"{theory_name} 解读完成")
+
+            # 通过 progress_callback 传递完成信息
+            if progress_callback:
+                progress_callback(theory_name, "解读完成", base_progress + int(60 / total_theories * 0.9), f"{theory_name} 解读完成")
+                judgment = calculation_data.get("judgment", "平")
+                confidence = calculation_data.get("confidence", 0.8)
+                detail_msg = f"✓ {theory_name} 分析完成 - 判断: {judgment}，置信度: {confidence*100:.1f}%"
+                progress_callback(theory_name, "分析完成", base_progress + int(60 / total_theories), detail_msg)
+
+            return result
+
+        except TheoryCalculationError as e:
+            # 理论计算错误（已知错误类型）
+            self.logger.error(f"{theory_name} 计算失败: {e.message}")
+            failed_theories.append({
+                "theory": theory_name,
+                "error_type": "calculation_error",
+                "error": e.message,
+                "timestamp": datetime.now().isoformat()
+            })
+            if progress_callback:
+                progress_callback(theory_name, "计算失败", base_progress, f"✗ {theory_name} 计算失败")
+
+        except APITimeoutError as e:
+            # API超时错误
+            self.logger.warning(f"{theory_name} 解读超时: {e.timeout}秒")
+            failed_theories.append({
+                "theory": theory_name,
+                "error_type": "timeout",
+                "error": f"API响应超时（{e.timeout}秒）",
+                "timestamp": datetime.now().isoformat()
+            })
+            if progress_callback:
+                progress_callback(theory_name, "解读超时", base_progress, f"✗ {theory_name} 解读超时")
+
+        except APIError as e:
+            # API调用错误
+            self.logger.error(f"{theory_name} API错误: {e.message}")
+            failed_theories.append({
+                "theory": theory_name,
+                "error_type": "api_error",
+                "error": e.message,
+                "timestamp": datetime.now().isoformat()
+            })
+            if progress_callback:
+                progress_callback(theory_name, "API错误", base_progress, f"✗ {theory_name} API调用失败")
+
+        except Exception as e:
+            # 未预期的错误（记录完整堆栈）
+            self.logger.exception(f"{theory_name} 分析时发生未预期的错误")
+            failed_theories.append({
+                "theory": theory_name,
+                "error_type": "unexpected_error",
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            })
+            if progress_callback:
+                progress_callback(theory_name, "分析失败", base_progress, f"✗ {theory_name} 分析失败: {str(e)[:50]}")
+
+        return None
+
     async def _get_interpretation(
         self,
         theory_name: str,
         calculation_data: Dict[str, Any],
-        user_input: UserInput
+        user_input: UserInput,
+        on_verified: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> str:
         """
         获取LLM解读（带超时控制和多级降级）
@@ -396,10 +520,14 @@ class DecisionEngine:
         2. 主模型超时 -> 尝试副模型（120秒超时）
         3. 副模型也超时 -> 返回简化解读
 
+        阻塞式双模型验证会让解读等待两个模型，因此理论解读只在异步验证模式下
+        启用双模型验证：主模型结果立即返回，验证完成后调用 on_verified。
+
         Args:
             theory_name: 理论名称
             calculation_data: 计算数据
             user_input: 用户输入
+            on_verified: 后台验证完成回调
 
         Returns:
             解读文本
@@ -434,8 +562,17 @@ class DecisionEngine:
         # 第一步：尝试主模型
         try:
             self.logger.info(f"{theory_name} 使用主模型解读（超时：{primary_timeout}秒）")
+            background_verification = (
+                on_verified is not None
+                and self.api_manager.enable_dual_verification
+                and self.api_manager.dual_verification_mode == "async"
+            )
             interpretation = await asyncio.wait_for(
-                self.api_manager.call_api(task_type, prompt, enable_dual_verification=False),
+                self.api_manager.call_api(
+                    task_type, prompt,
+                    enable_dual_verification=background_verification,
+                    verification_callback=on_verified if background_verification else None
+                ),
                 timeout=primary_timeout
             )
             return interpretation
@@ -524,7 +661,8 @@ class DecisionEngine:
         selected_theories: List[Dict[str, Any]],
         theory_results: List[TheoryAnalysisResult],
         conflict_info: ConflictInfo,
-        progress_callback=None
+        progress_callback=None,
+        verification_callback=None
     ) -> ComprehensiveReport:
         """
         生成综合报告
@@ -535,6 +673,7 @@ class DecisionEngine:
             theory_results: 理论结果
             conflict_info: 冲突信息
             progress_callback: 进度回调函数
+            verification_callback: 后台验证完成回调函数
 
         Returns:
             综合报告
@@ -572,48 +711,13 @@ class DecisionEngine:
             birth_time_certainty=user_input.birth_time_certainty
         )
 
-        if progress_callback:
-            progress_callback("系统", "AI报告生成", 86, f"正在调用AI生成综合报告解读（{len(theory_results)}个理论）...")
-
-        report_text = await self.api_manager.call_api("综合报告解读", prompt)
-
-        if progress_callback:
-            progress_callback("系统", "综合报告", 88, f"综合报告解读生成完成（{len(report_text)}字）")
-
         # 计算综合置信度
         if theory_results:
             overall_confidence = sum(r.confidence for r in theory_results) / len(theory_results)
         else:
             overall_confidence = 0.5
 
-        # ========== 使用AI智能助手生成摘要和建议（后台调用Kimi） ==========
-        self.logger.debug("\n[步骤5] AI智能助手生成摘要和建议...")
-        if progress_callback:
-            progress_callback("系统", "智能摘要生成", 90, "[步骤5] AI智能助手生成摘要和建议...")
-
-        # 智能生成执行摘要（而非硬编码提取）
-        if progress_callback:
-            progress_callback("系统", "生成执行摘要", 90, "正在生成执行摘要...")
-        try:
-            ai_summary = await self.ai_assistant.generate_executive_summary(
-                full_report=report_text,
-                theory_results=theory_results,
-                question_type=user_input.question_type,
-                user_mbti=user_input.mbti_type
-            )
-            self.logger.info("AI智能摘要生成成功")
-            if progress_callback:
-                progress_callback("系统", "执行摘要", 91, f"执行摘要生成成功（{len(ai_summary)}字）")
-        except Exception as e:
-            self.logger.warning(f"AI智能摘要生成失败: {e}，使用原始报告")
-            ai_summary = report_text[:500]  # 降级方案
-            if progress_callback:
-                progress_callback("系统", "执行摘要", 91, f"执行摘要生成失败，使用降级方案")
-
-        if progress_callback:
-            progress_callback("系统", "行动建议生成", 92, "正在生成行动建议...")
-
-        # 创建临时报告对象（用于生成建议）
+        # 创建临时报告对象（供各章节生成使用，章节完成后回填对应字段）
         temp_report = ComprehensiveReport(
             report_id=str(uuid.uuid4()),
             created_at=datetime.now(),
@@ -622,8 +726,8 @@ class DecisionEngine:
             selection_reason=f"基于信息完备度和问题类型匹配度选择",
             theory_results=theory_results,
             conflict_info=conflict_info,
-            executive_summary=ai_summary,
-            detailed_analysis="",  # 稍后生成
+            executive_summary="",  # 稍后生成
+            detailed_analysis="",
             retrospective_analysis="",
             predictive_analysis="",
             comprehensive_advice=[],
@@ -631,27 +735,6 @@ class DecisionEngine:
             limitations=self._extract_limitations(user_input, theory_results)
         )
 
-        # 智能生成行动建议
-        try:
-            ai_advice = await self.ai_assistant.generate_actionable_advice(temp_report)
-            self.logger.info(f"AI行动建议生成成功，共{len(ai_advice)}条")
-            if progress_callback:
-                progress_callback("系统", "行动建议", 93, f"行动建议生成成功，共{len(ai_advice)}条")
-        except Exception as e:
-            self.logger.warning(f"AI行动建议生成失败: {e}，使用默认建议")
-            ai_advice = [
-                {"priority": "高", "content": "仔细阅读各理论的详细分析，理解核心要点"},
-                {"priority": "中", "content": "结合自身实际情况，制定具体行动计划"}
-            ]
-            if progress_callback:
-                progress_callback("系统", "行动建议", 93, f"行动建议生成失败，使用默认建议")
-
-        # 更新临时报告的建议字段（用于生成时间分析）
-        temp_report.comprehensive_advice = ai_advice
-
-        if progress_callback:
-            progress_callback("系统", "时间维度分析", 94, "开始生成时间维度分析...")
-
         # 准备用户出生信息（用于时间维度分析）
         user_birth_info = None
         if user_input.birth_year and user_input.birth_month and user_input.birth_day:
@@ -662,61 +745,111 @@ class DecisionEngine:
                 "birth_hour": user_input.birth_hour
             }
 
-        # 智能生成过去三年回顾分析（根据问题类型判断是否需要）
-        retrospective = ""
-        # 只有命理类、运势类、事业类等需要时间回顾的问题才生成回顾分析
-        time_sensitive_types = ["事业", "财运", "学业", "健康", "综合运势", "职业发展"]
-        if any(qtype in user_input.question_type for qtype in time_sensitive_types):
+        # ========== 按依赖关系并行生成各章节 ==========
+        # 综合报告 -> 执行摘要 -> 行动建议 -> 未来趋势
+        #                     -> 过去回顾
+        # 详细问题解答只依赖理论结果，与综合报告同时开始
+        self.logger.debug("\n[步骤5] AI智能助手生成摘要和建议...")
+        scheduler = ReportSectionScheduler()
+        on_report_verified, bind_report_verification = self._make_verification_binder(
+            "综合报告", verification_callback
+        )
+
+        async def run_main_report(deps):
+            if progress_callback:
+                progress_callback("系统", "AI报告生成", 86, f"正在调用AI生成综合报告解读（{len(theory_results)}个理论）...")
+            report_text = await self.api_manager.call_api(
+                "综合报告解读", prompt, verification_callback=on_report_verified
+            )
+            if progress_callback:
+                progress_callback("系统", "综合报告", 88, f"综合报告解读生成完成（{len(report_text)}字）")
+            return report_text
+
+        async def run_summary(deps):
+            if progress_callback:
+                progress_callback("系统", "生成执行摘要", 90, "正在生成执行摘要...")
+            ai_summary = await self.ai_assistant.generate_executive_summary(
+                full_report=deps["综合报告"],
+                theory_results=theory_results,
+                question_type=user_input.question_type,
+                user_mbti=user_input.mbti_type
+            )
+            self.logger.info("AI智能摘要生成成功")
+            if progress_callback:
+                progress_callback("系统", "执行摘要", 91, f"执行摘要生成成功（{len(ai_summary)}字）")
+            temp_report.executive_summary = ai_summary
+            return ai_summary
+
+        def summary_fallback(deps, error):
+            self.logger.warning(f"AI智能摘要生成失败: {error}，使用原始报告")
+            if progress_callback:
+                progress_callback("系统", "执行摘要", 91, f"执行摘要生成失败，使用降级方案")
+            temp_report.executive_summary = deps["综合报告"][:500]  # 降级方案
+            return temp_report.executive_summary
+
+        async def run_advice(deps):
+            if progress_callback:
+                progress_callback("系统", "行动建议生成", 92, "正在生成行动建议...")
+            ai_advice = await self.ai_assistant.generate_actionable_advice(temp_report)
+            self.logger.info(f"AI行动建议生成成功，共{len(ai_advice)}条")
+            if progress_callback:
+                progress_callback("系统", "行动建议", 93, f"行动建议生成成功，共{len(ai_advice)}条")
+            temp_report.comprehensive_advice = ai_advice
+            return ai_advice
+
+        def advice_fallback(deps, error):
+            self.logger.warning(f"AI行动建议生成失败: {error}，使用默认建议")
+            if progress_callback:
+                progress_callback("系统", "行动建议", 93, f"行动建议生成失败，使用默认建议")
+            temp_report.comprehensive_advice = [
+                {"priority": "高", "content": "仔细阅读各理论的详细分析，理解核心要点"},
+                {"priority": "中", "content": "结合自身实际情况，制定具体行动计划"}
+            ]
+            return temp_report.comprehensive_advice
+
+        async def run_retrospective(deps):
             if progress_callback:
                 progress_callback("系统", "回溯分析", 95, f"正在生成过去三年回顾分析（问题类型：{user_input.question_type}）...")
-            try:
-                retrospective = await self.ai_assistant.generate_retrospective_analysis(
-                    report=temp_report,
-                    user_birth_info=user_birth_info,
-                    question_type=user_input.question_type
-                )
-                self.logger.info("过去三年回顾分析生成成功")
-                if progress_callback:
-                    progress_callback("系统", "回溯分析", 95, f"过去三年回顾分析生成成功（{len(retrospective)}字）")
-            except Exception as e:
-                self.logger.warning(f"过去三年回顾分析生成失败: {e}")
-                if progress_callback:
-                    progress_callback("系统", "回溯分析", 95, f"过去三年回顾分析生成失败：{str(e)}")
-        else:
-            self.logger.info(f"问题类型'{user_input.question_type}'不需要时间回顾分析")
+            retrospective = await self.ai_assistant.generate_retrospective_analysis(
+                report=temp_report,
+                user_birth_info=user_birth_info,
+                question_type=user_input.question_type
+            )
+            self.logger.info("过去三年回顾分析生成成功")
             if progress_callback:
-                progress_callback("系统", "回溯分析", 95, f"问题类型'{user_input.question_type}'不需要时间回顾分析")
+                progress_callback("系统", "回溯分析", 95, f"过去三年回顾分析生成成功（{len(retrospective)}字）")
+            return retrospective
 
-        # 智能生成未来两年趋势分析（根据问题类型判断是否需要）
-        predictive = ""
-        if any(qtype in user_input.question_type for qtype in time_sensitive_types):
+        def retrospective_fallback(deps, error):
+            self.logger.warning(f"过去三年回顾分析生成失败: {error}")
+            if progress_callback:
+                progress_callback("系统", "回溯分析", 95, f"过去三年回顾分析生成失败：{str(error)}")
+            return ""
+
+        async def run_predictive(deps):
             if progress_callback:
                 progress_callback("系统", "预测分析", 96, f"正在生成未来两年趋势分析（问题类型：{user_input.question_type}）...")
-            try:
-                predictive = await self.ai_assistant.generate_predictive_analysis(
-                    report=temp_report,
-                    user_birth_info=user_birth_info,
-                    question_type=user_input.question_type
-                )
-                self.logger.info("未来两年趋势分析生成成功")
-                if progress_callback:
-                    progress_callback("系统", "预测分析", 96, f"未来两年趋势分析生成成功（{len(predictive)}字）")
-            except Exception as e:
-                self.logger.warning(f"未来两年趋势分析生成失败: {e}")
-                if progress_callback:
-                    progress_callback("系统", "预测分析", 96, f"未来两年趋势分析生成失败：{str(e)}")
-        else:
-            self.logger.info(f"问题类型'{user_input.question_type}'不需要未来趋势分析")
+            predictive = await self.ai_assistant.generate_predictive_analysis(
+                report=temp_report,
+                user_birth_info=user_birth_info,
+                question_type=user_input.question_type
+            )
+            self.logger.info("未来两年趋势分析生成成功")
             if progress_callback:
-                progress_callback("系统", "预测分析", 96, f"问题类型'{user_input.question_type}'不需要未来趋势分析")
+                progress_callback("系统", "预测分析", 96, f"未来两年趋势分析生成成功（{len(predictive)}字）")
+            return predictive
 
-        # 智能生成详细问题解答（报告核心内容，直接回答用户问题）
-        if progress_callback:
-            progress_callback("系统", "详细问题解答", 97, f"正在生成详细问题解答（问题：{user_input.question_description[:30]}...）")
+        def predictive_fallback(deps, error):
+            self.logger.warning(f"未来两年趋势分析生成失败: {error}")
+            if progress_callback:
+                progress_callback("系统", "预测分析", 96, f"未来两年趋势分析生成失败：{str(error)}")
+            return ""
 
-        detailed_analysis = ""
-        try:
-            detailed_analysis = await self.ai_assistant.generate_detailed_analysis(
+        async def run_detailed(deps):
+            # 智能生成详细问题解答（报告核心内容，直接回答用户问题）
+            if progress_callback:
+                progress_callback("系统", "详细问题解答", 97, f"正在生成详细问题解答（问题：{user_input.question_description[:30]}...）")
+            detailed = await self.ai_assistant.generate_detailed_analysis(
                 report=temp_report,
                 question_type=user_input.question_type,
                 question_description=user_input.question_description,
@@ -724,15 +857,50 @@ class DecisionEngine:
             )
             self.logger.info("详细问题解答生成成功")
             if progress_callback:
-                progress_callback("系统", "详细问题解答", 98, f"详细问题解答生成成功（{len(detailed_analysis)}字）")
-        except Exception as e:
-            self.logger.warning(f"详细问题解答生成失败: {e}")
+                progress_callback("系统", "详细问题解答", 98, f"详细问题解答生成成功（{len(detailed)}字）")
+            return detailed
+
+        def detailed_fallback(deps, error):
+            self.logger.warning(f"详细问题解答生成失败: {error}")
             # 降级方案：使用各理论解读的简单拼接
-            detailed_analysis = "## 基于术数理论的分析\n\n"
+            detailed = "## 基于术数理论的分析\n\n"
             for result in theory_results:
-                detailed_analysis += f"### {result.theory_name}\n{result.interpretation}\n\n"
+                detailed += f"### {result.theory_name}\n{result.interpretation}\n\n"
             if progress_callback:
                 progress_callback("系统", "详细问题解答", 98, f"详细问题解答生成失败，使用降级方案")
+            return detailed
+
+        scheduler.add_section("综合报告", run_main_report, timeout=DEFAULT_REPORT_TIMEOUT)
+        scheduler.add_section("执行摘要", run_summary, depends_on=("综合报告",),
+                              timeout=DEFAULT_REPORT_SECTION_TIMEOUT, fallback=summary_fallback)
+        scheduler.add_section("行动建议", run_advice, depends_on=("执行摘要",),
+                              timeout=DEFAULT_REPORT_SECTION_TIMEOUT, fallback=advice_fallback)
+        scheduler.add_section("详细问题解答", run_detailed,
+                              timeout=DEFAULT_REPORT_SECTION_TIMEOUT, fallback=detailed_fallback)
+
+        # 只有命理类、运势类、事业类等需要时间回顾的问题才生成时间维度分析
+        time_sensitive_types = ["事业", "财运", "学业", "健康", "综合运势", "职业发展"]
+        if any(qtype in user_input.question_type for qtype in time_sensitive_types):
+            scheduler.add_section("回溯分析", run_retrospective, depends_on=("执行摘要",),
+                                  timeout=DEFAULT_REPORT_SECTION_TIMEOUT, fallback=retrospective_fallback)
+            # 未来趋势分析会参考行动建议
+            scheduler.add_section("预测分析", run_predictive, depends_on=("执行摘要", "行动建议"),
+                                  timeout=DEFAULT_REPORT_SECTION_TIMEOUT, fallback=predictive_fallback)
+        else:
+            self.logger.info(f"问题类型'{user_input.question_type}'不需要时间维度分析")
+            if progress_callback:
+                progress_callback("系统", "回溯分析", 95, f"问题类型'{user_input.question_type}'不需要时间回顾分析")
+                progress_callback("系统", "预测分析", 96, f"问题类型'{user_input.question_type}'不需要未来趋势分析")
+
+        if progress_callback:
+            progress_callback("系统", "智能摘要生成", 86, "[步骤5] 并行生成综合报告、摘要和建议...")
+
+        sections = await scheduler.run()
+        ai_summary = sections["执行摘要"]
+        ai_advice = sections["行动建议"]
+        detailed_analysis = sections["详细问题解答"]
+        retrospective = sections.get("回溯分析", "")
+        predictive = sections.get("预测分析", "")
 
         # 创建最终报告对象
         report = ComprehensiveReport(
@@ -751,9 +919,45 @@ class DecisionEngine:
             overall_confidence=temp_report.overall_confidence,
             limitations=temp_report.limitations
         )
+        bind_report_verification(report)
 
         return report
 
+    def _make_verification_binder(
+        self,
+        target_name: str,
+        verification_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Tuple[Callable[[Dict[str, Any]], None], Callable[[Any], None]]:
+        """
+        创建后台验证结果的回调，把验证结果写入对应结果对象的 verification 字段
+
+        验证可能在结果对象创建之前完成，此时先暂存，绑定结果对象时再写入。
+
+        Args:
+            target_name: 理论名称或"综合报告"
+            verification_callback: 调用方的验证回调 callback(target_name, verification)
+
+        Returns:
+            (on_verified, bind)：on_verified 传给 APIManager.call_api，
+            bind(target) 在结果对象创建后调用
+        """
+        state: Dict[str, Any] = {"target": None, "verification": None}
+
+        def on_verified(verification: Dict[str, Any]):
+            state["verification"] = verification
+            if state["target"] is not None:
+                state["target"].verification = verification
+            self.logger.info(f"{target_name} 双模型验证完成，一致性: {verification.get('consistency_level')}")
+            if verification_callback:
+                verification_callback(target_name, verification)
+
+        def bind(target):
+            state["target"] = target
+            if state["verification"] is not None:
+                target.verification = state["verification"]
+
+        return on_verified, bind
+
     def _extract_summary(self, report_text: str) -> str:
         """从报告文本中提取执行摘要
 
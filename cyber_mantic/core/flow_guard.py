@@ -31,6 +31,8 @@ from enum import Enum
 from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from utils.logger import get_logger
+from utils.input_parser import get_local_parser
+from utils.keyword_matcher import KeywordMatcher
 from api.prompt_loader import load_prompt
 
 if TYPE_CHECKING:
@@ -244,6 +246,52 @@ class FlowGuard:
         "决策": ["决定", "选择", "是否", "要不要", "该不该"],
     }
 
+    # 颜色关键词映射（梅花易数起卦用，取最长命中，"粉红色"→粉 而非 红）
+    COLOR_KEYWORDS = {
+        "粉": ["粉红色", "粉红", "粉色", "粉"],
+        "紫": ["紫红", "紫色", "紫"],
+        "红": ["大红", "朱红", "红色", "红", "赤"],
+        "橙": ["橘色", "橙色", "橙"],
+        "黄": ["金黄", "金色", "黄色", "黄"],
+        "绿": ["青色", "绿色", "绿"],
+        "蓝": ["湛蓝", "蓝色", "蓝"],
+        "白": ["白色", "白"],
+        "黑": ["黑色", "黑"],
+        "灰": ["灰色", "灰"],
+    }
+
+    # 方位关键词映射（按顺序优先，复合方位在前）
+    DIRECTION_KEYWORDS = {
+        "东南": ["东南"],
+        "东北": ["东北"],
+        "西南": ["西南"],
+        "西北": ["西北"],
+        "东": ["东", "东方", "东边", "东面"],
+        "南": ["南", "南方", "南边", "南面"],
+        "西": ["西", "西方", "西边", "西面"],
+        "北": ["北", "北方", "北边", "北面"],
+    }
+
+    # 关键词自动机（按关键词表名缓存，所有实例共享）
+    _keyword_matchers: Dict[str, KeywordMatcher] = {}
+
+    @classmethod
+    def _keyword_matcher(cls, table: str) -> KeywordMatcher:
+        """
+        取关键词表对应的匹配器（首次使用时构建）
+
+        Args:
+            table: 类属性名，如 "CATEGORY_KEYWORDS"；列表形式的关键词表归为同名类别
+        """
+        matcher = cls._keyword_matchers.get(table)
+        if matcher is None:
+            groups = getattr(cls, table)
+            if not isinstance(groups, dict):
+                groups = {table: groups}
+            matcher = KeywordMatcher.from_groups(groups, ignore_case=True)
+            cls._keyword_matchers[table] = matcher
+        return matcher
+
     def __init__(self, api_manager: Optional["APIManager"] = None):
         """
         初始化流程监管器
@@ -343,9 +391,10 @@ class FlowGuard:
         V2重构：使用AI优先的验证（AI优先，代码后备）
 
         流程：
-        1. 如果有AI能力，先用AI验证
-        2. AI失败或提取不完整时，用代码验证补充
-        3. 如果没有AI能力，直接用代码验证
+        1. 本地规则解析，置信度达到阈值时跳过AI
+        2. 如果有AI能力且本地置信度不足，用AI验证
+        3. AI失败或提取不完整时，用代码验证补充
+        4. 如果没有AI能力，直接用代码验证
 
         Args:
             user_message: 用户消息
@@ -363,9 +412,17 @@ class FlowGuard:
                 message="当前阶段无特定要求"
             )
 
-        # ===== AI优先验证 =====
+        # ===== 本地规则解析 =====
+        local_parser = get_local_parser()
+        local_extracted, confidence = self._local_validate(user_message, stage)
+
+        # ===== AI优先验证（本地置信度不足时） =====
         ai_extracted = {}
-        if self.ai_validation_enabled and self.api_manager:
+        use_ai = bool(self.ai_validation_enabled and self.api_manager)
+        if use_ai:
+            use_ai = confidence < local_parser.threshold
+            local_parser.record(f"输入验证:{stage}", not use_ai)
+        if use_ai:
             try:
                 self.logger.debug(f"[FlowGuard] 使用AI验证用户输入: {user_message[:50]}...")
                 ai_extracted = await self._ai_validate(user_message, stage) or {}
@@ -375,10 +432,12 @@ class FlowGuard:
                 self.logger.warning(f"[FlowGuard] AI验证失败，回退到代码验证: {e}")
 
         # ===== 代码后备验证（补充AI未提取的字段） =====
+        # 本地置信度不足时其结果不可靠，仍运行代码验证器，本地结果只补充代码未提取的字段
+        local_confident = confidence >= local_parser.threshold
         code_extracted = {}
         for req in requirements:
-            # 如果AI已提取该字段，跳过代码验证
-            if req.name in ai_extracted:
+            # 如果AI或（置信的）本地规则已提取该字段，跳过代码验证
+            if req.name in ai_extracted or (local_confident and req.name in local_extracted):
                 continue
 
             # 使用代码验证器尝试提取
@@ -390,7 +449,10 @@ class FlowGuard:
                     self.logger.debug(f"[FlowGuard] 代码后备提取: {req.name} = {value}")
 
         # ===== 合并结果 =====
-        merged_data = {**code_extracted, **ai_extracted}  # AI结果优先
+        if local_confident:
+            merged_data = {**code_extracted, **local_extracted, **ai_extracted}  # AI结果优先，其次本地规则
+        else:
+            merged_data = {**local_extracted, **code_extracted, **ai_extracted}  # AI结果优先，其次代码验证
         self.collected_data.update(merged_data)
 
         # 更新需求状态
@@ -429,6 +491,46 @@ class FlowGuard:
                 can_retry=True
             )
 
+    def _local_validate(self, user_message: str, stage: str) -> Tuple[Dict[str, Any], float]:
+        """
+        本地规则解析（破冰、测字、信息收集阶段）
+
+        Returns:
+            (提取的数据, 置信度)，其他阶段返回 ({}, 0.0)
+        """
+        parser = get_local_parser()
+
+        if stage == "STAGE1_ICEBREAK":
+            result = parser.parse_icebreak(user_message)
+            extracted = {}
+            # 未识别的类别（"其他"）不作为提取结果，交给 validate_category
+            if result.data["category"] != "其他":
+                extracted["question_category"] = result.data["category"]
+            if "numbers" not in result.conflicts:
+                extracted["random_numbers"] = result.data["numbers"]
+            return extracted, result.confidence
+
+        if stage == "STAGE2_DEEPEN":
+            result = parser.parse_character(user_message)
+            description = self.validate_description(user_message)
+            if not description or not result.data["character"]:
+                return {}, 0.0
+            return {"question_description": description, "character": result.data["character"]}, result.confidence
+
+        if stage == "STAGE3_COLLECT":
+            result = parser.parse_birth_info(user_message)
+            fields = {
+                "birth_year": "year", "birth_month": "month", "birth_day": "day",
+                "birth_hour": "hour", "gender": "gender", "mbti_type": "mbti",
+            }
+            extracted = {
+                name: result.data[key] for name, key in fields.items()
+                if result.data[key] is not None
+            }
+            return extracted, result.confidence
+
+        return {}, 0.0
+
     async def _ai_validate(
         self,
         user_message: str,
@@ -753,11 +855,9 @@ class FlowGuard:
 
     def validate_category(self, text: str) -> Optional[str]:
         """验证并提取咨询类别"""
-        text_lower = text.lower()
-
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            if any(kw in text_lower for kw in keywords):
-                return category
+        category = self._keyword_matcher("CATEGORY_KEYWORDS").first_label(text, self.CATEGORY_KEYWORDS)
+        if category:
+            return category
 
         # 直接匹配类别名
         for category in self.CATEGORY_KEYWORDS.keys():
@@ -968,36 +1068,10 @@ class FlowGuard:
         """
         V2新增：验证颜色（用于梅花易数起卦）
 
-        注意：按关键词长度降序匹配，确保 "粉红色" 匹配到 "粉" 而非 "红"
+        注意：取最长的命中关键词，确保 "粉红色" 匹配到 "粉" 而非 "红"
         """
-        # 颜色关键词映射（按长度优先匹配）
-        color_keywords = {
-            "粉": ["粉红色", "粉红", "粉色", "粉"],  # 粉红优先于红
-            "紫": ["紫红", "紫色", "紫"],  # 紫红优先于红
-            "红": ["大红", "朱红", "红色", "红", "赤"],
-            "橙": ["橘色", "橙色", "橙"],
-            "黄": ["金黄", "金色", "黄色", "黄"],
-            "绿": ["青色", "绿色", "绿"],
-            "蓝": ["湛蓝", "蓝色", "蓝"],
-            "白": ["白色", "白"],
-            "黑": ["黑色", "黑"],
-            "灰": ["灰色", "灰"],
-        }
-
-        text_lower = text.lower()
-        # 按关键词长度降序检查，更长的匹配优先
-        all_matches = []
-        for color, keywords in color_keywords.items():
-            for kw in keywords:
-                if kw in text_lower:
-                    all_matches.append((len(kw), color))
-
-        if all_matches:
-            # 返回最长匹配对应的颜色
-            all_matches.sort(key=lambda x: -x[0])
-            return all_matches[0][1]
-
-        return None
+        match = self._keyword_matcher("COLOR_KEYWORDS").longest(text)
+        return match.label if match else None
 
     def validate_direction(self, text: str) -> Optional[str]:
         """
@@ -1005,25 +1079,7 @@ class FlowGuard:
 
         注意：复合方位（东南/东北/西南/西北）优先匹配
         """
-        # 复合方位优先检查（长度更长）
-        compound_directions = ["东南", "东北", "西南", "西北"]
-        for direction in compound_directions:
-            if direction in text:
-                return direction
-
-        # 然后检查单一方位
-        simple_direction_keywords = {
-            "东": ["东", "东方", "东边", "东面"],
-            "南": ["南", "南方", "南边", "南面"],
-            "西": ["西", "西方", "西边", "西面"],
-            "北": ["北", "北方", "北边", "北面"],
-        }
-
-        for direction, keywords in simple_direction_keywords.items():
-            if any(kw in text for kw in keywords):
-                return direction
-
-        return None
+        return self._keyword_matcher("DIRECTION_KEYWORDS").first_label(text, self.DIRECTION_KEYWORDS)
 
     # ==================== 用户信息修改（方案B：对话指令） ====================
 
@@ -1049,8 +1105,7 @@ class FlowGuard:
         Returns:
             True 如果用户想修改信息
         """
-        text = user_message.lower()
-        return any(kw in text for kw in self.MODIFY_KEYWORDS)
+        return self._keyword_matcher("MODIFY_KEYWORDS").contains_any(user_message)
 
     async def process_modification(
         self,
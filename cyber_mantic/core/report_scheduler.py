@@ -0,0 +1,147 @@
+"""
+报告章节调度器 - 按依赖关系并行生成综合报告各章节
+
+每个章节声明自己依赖的其他章节，调度器在依赖就绪后立即启动该章节，
+互不依赖的章节同时运行；每个章节可单独设置超时和降级方案。
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+
+SectionRunner = Callable[[Dict[str, Any]], Awaitable[Any]]
+SectionFallback = Callable[[Dict[str, Any], BaseException], Any]
+
+
+@dataclass
+class ReportSection:
+    """报告章节定义"""
+    name: str                                   # 章节名称（唯一）
+    run: SectionRunner                          # 生成函数，参数为依赖章节的结果字典
+    depends_on: Tuple[str, ...] = field(default_factory=tuple)  # 依赖的章节名称
+    timeout: Optional[float] = None             # 超时时间（秒），None表示不限制
+    fallback: Optional[SectionFallback] = None  # 降级函数(依赖结果, 异常) -> 降级值；None表示异常向上抛出
+
+
+class ReportSectionScheduler:
+    """
+    报告章节DAG调度器
+
+    用法：
+        scheduler = ReportSectionScheduler()
+        scheduler.add_section("报告", run_report)
+        scheduler.add_section("摘要", run_summary, depends_on=("报告",), timeout=60,
+                              fallback=lambda deps, e: deps["报告"][:500])
+        results = await scheduler.run()
+    """
+
+    def __init__(self):
+        self._sections: Dict[str, ReportSection] = {}
+        self.logger = get_logger()
+
+    def add_section(
+        self,
+        name: str,
+        run: SectionRunner,
+        depends_on: Tuple[str, ...] = (),
+        timeout: Optional[float] = None,
+        fallback: Optional[SectionFallback] = None
+    ) -> None:
+        """
+        注册章节
+
+        Args:
+            name: 章节名称
+            run: 异步生成函数，接收依赖章节结果字典
+            depends_on: 依赖的章节名称
+            timeout: 超时时间（秒）
+            fallback: 失败或超时时的降级函数
+
+        Raises:
+            ValueError: 章节名称重复
+        """
+        if name in self._sections:
+            raise ValueError(f"报告章节重复注册: {name}")
+        self._sections[name] = ReportSection(
+            name=name,
+            run=run,
+            depends_on=tuple(depends_on),
+            timeout=timeout,
+            fallback=fallback
+        )
+
+    def execution_levels(self) -> List[List[str]]:
+        """
+        按依赖层级返回章节（同一层级的章节可并行）
+
+        Returns:
+            层级列表，每层为章节名称列表
+
+        Raises:
+            ValueError: 依赖不存在或存在循环依赖
+        """
+        for section in self._sections.values():
+            for dep in section.depends_on:
+                if dep not in self._sections:
+                    raise ValueError(f"报告章节 {section.name} 依赖未注册的章节: {dep}")
+
+        remaining = dict(self._sections)
+        done: set = set()
+        levels: List[List[str]] = []
+        while remaining:
+            ready = [name for name, s in remaining.items() if all(d in done for d in s.depends_on)]
+            if not ready:
+                raise ValueError(f"报告章节存在循环依赖: {', '.join(remaining)}")
+            levels.append(ready)
+            done.update(ready)
+            for name in ready:
+                del remaining[name]
+        return levels
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        运行所有章节
+
+        Returns:
+            章节名称 -> 生成结果（或降级值）
+
+        Raises:
+            没有降级方案的章节失败时，抛出其原始异常（其余章节会被取消）
+        """
+        self.execution_levels()  # 校验依赖关系
+
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_section(section: ReportSection) -> Any:
+            deps = {}
+            for dep in section.depends_on:
+                deps[dep] = await tasks[dep]
+
+            try:
+                if section.timeout:
+                    return await asyncio.wait_for(section.run(deps), timeout=section.timeout)
+                return await section.run(deps)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.logger.warning(f"报告章节[{section.name}]超时（{section.timeout}秒）")
+                else:
+                    self.logger.warning(f"报告章节[{section.name}]生成失败: {e}")
+                if section.fallback is None:
+                    raise
+                return section.fallback(deps, e)
+
+        for name, section in self._sections.items():
+            tasks[name] = asyncio.create_task(run_section(section))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+
+        return {name: task.result() for name, task in tasks.items()}
@@ -460,7 +460,10 @@ class ShichenHandler:
     def generate_candidate_analyses(
         self,
         shichen_info: ShichenInfo,
-        max_candidates: int = 3
+        max_candidates: int = 3,
+        birth_date: Optional[Tuple[int, int, int]] = None,
+        gender: Optional[str] = None,
+        calendar_type: str = "solar"
     ) -> List[Dict[str, Any]]:
         """
         生成候选时辰分析列表
@@ -468,6 +471,9 @@ class ShichenHandler:
         Args:
             shichen_info: 时辰信息
             max_candidates: 最大候选数量
+            birth_date: 出生日期 (年, 月, 日)，提供时为每个候选附上八字（"bazi"）
+            gender: 性别（用于排大运）
+            calendar_type: 历法类型
 
         Returns:
             候选分析列表，每个包含时辰信息和权重
@@ -557,6 +563,15 @@ class ShichenHandler:
             for c in candidates:
                 c["weight"] /= total_weight
 
+        if birth_date is not None and candidates:
+            # 同一出生日期的候选共用日期级计算
+            from theories.bazi.calculator import BaZiCalculator
+            charts = BaZiCalculator().calculate_candidates(
+                *birth_date, [c["hour"] for c in candidates], gender, calendar_type
+            )
+            for c, chart in zip(candidates, charts):
+                c["bazi"] = chart
+
         return candidates
 
     def narrow_by_event(
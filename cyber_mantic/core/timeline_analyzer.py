@@ -10,10 +10,11 @@ TimelineAnalyzer - 智能时间线分析器
 """
 
 import re
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from utils.logger import get_logger
+from utils.keyword_matcher import KeywordMatcher
 
 
 class TimeSpan:
@@ -86,6 +87,9 @@ class TimelineAnalyzer:
         TimeSpan.LIFE_LONG: ["一生", "这辈子", "此生", "终生", "一世", "整个人生", "人生"]
     }
 
+    # 关键词自动机（首次分析时构建）
+    _keyword_matcher: Optional[KeywordMatcher] = None
+
     # 时间线模板库
     TIMELINE_TEMPLATES = {
         # 超短期：今天/本周
@@ -174,6 +178,12 @@ class TimelineAnalyzer:
     def __init__(self):
         self.logger = get_logger(__name__)
 
+    @classmethod
+    def _get_keyword_matcher(cls) -> KeywordMatcher:
+        if cls._keyword_matcher is None:
+            cls._keyword_matcher = KeywordMatcher.from_groups(cls.TIME_KEYWORDS)
+        return cls._keyword_matcher
+
     def analyze_question_timespan(self, question: str) -> str:
         """
         分析问题的时间跨度
@@ -184,8 +194,6 @@ class TimelineAnalyzer:
         Returns:
             时间跨度标识（TimeSpan常量）
         """
-        question_lower = question.lower()
-
         # 按优先级从长到短匹配（避免"今年"匹配到"年"）
         priority_order = [
             TimeSpan.LIFE_LONG,
@@ -201,12 +209,11 @@ class TimelineAnalyzer:
             TimeSpan.TODAY,
         ]
 
-        for timespan in priority_order:
-            keywords = self.TIME_KEYWORDS.get(timespan, [])
-            for keyword in keywords:
-                if keyword in question:
-                    self.logger.info(f"识别到时间跨度关键词'{keyword}' → {timespan}")
-                    return timespan
+        timespan = self._get_keyword_matcher().first_label(question, priority_order)
+        if timespan:
+            keyword = next(kw for kw in self.TIME_KEYWORDS[timespan] if kw in question)
+            self.logger.info(f"识别到时间跨度关键词'{keyword}' → {timespan}")
+            return timespan
 
         # 未识别到关键词，使用默认值
         self.logger.info(f"未识别到明确时间跨度，使用默认值: {self.DEFAULT_TIMESPAN}")
@@ -174,6 +174,8 @@ class TheoryAnalysisResultSchema(BaseModel):
     retrospective_answer: Optional[Dict[str, Any]] = Field(None, description="回溯问题答案")
     predictive_answer: Optional[Dict[str, Any]] = Field(None, description="预测问题答案")
 
+    verification: Optional[Dict[str, Any]] = Field(None, description="双模型验证结果")
+
     class Config:
         """Pydantic配置"""
         json_schema_extra = {
@@ -267,6 +269,7 @@ class ComprehensiveReportSchema(BaseModel):
     limitations: List[str] = Field(default_factory=list, description="局限性说明")
 
     user_feedback: Optional[Dict[str, Any]] = Field(None, description="用户反馈")
+    verification: Optional[Dict[str, Any]] = Field(None, description="双模型验证结果")
 
     @model_validator(mode='after')
     def check_theories_consistency(self):
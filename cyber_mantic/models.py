@@ -116,6 +116,9 @@ class TheoryAnalysisResult:
     retrospective_answer: Optional[Dict[str, Any]] = None  # 回溯问题答案
     predictive_answer: Optional[Dict[str, Any]] = None     # 预测问题答案
 
+    # 双模型验证结果（异步验证模式下在后台验证完成后填充）
+    verification: Optional[Dict[str, Any]] = None
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -128,7 +131,8 @@ class TheoryAnalysisResult:
             'advice': self.advice,
             'confidence': self.confidence,
             'retrospective_answer': self.retrospective_answer,
-            'predictive_answer': self.predictive_answer
+            'predictive_answer': self.predictive_answer,
+            'verification': self.verification
         }
 
 
@@ -180,6 +184,9 @@ class ComprehensiveReport:
     # 用户反馈（后续填充）
     user_feedback: Optional[Dict[str, Any]] = None
 
+    # 综合报告解读的双模型验证结果（异步验证模式下在后台验证完成后填充）
+    verification: Optional[Dict[str, Any]] = None
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         return {
@@ -197,7 +204,8 @@ class ComprehensiveReport:
             'comprehensive_advice': self.comprehensive_advice,
             'overall_confidence': self.overall_confidence,
             'limitations': self.limitations,
-            'user_feedback': self.user_feedback
+            'user_feedback': self.user_feedback,
+            'verification': self.verification
         }
 
     def to_json(self) -> str:
@@ -4,7 +4,7 @@ AnalysisService - 分析流程服务
 封装分析流程，将业务逻辑从UI层分离
 """
 
-from typing import Optional, Callable, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 from models import UserInput, ComprehensiveReport
 from core.decision_engine import DecisionEngine
 from utils.logger import get_logger
@@ -20,7 +20,8 @@ class AnalysisService:
     async def analyze(
         self,
         user_input: UserInput,
-        progress_callback: Optional[Callable[[str, str, int], None]] = None
+        progress_callback: Optional[Callable[[str, str, int], None]] = None,
+        verification_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None
     ) -> ComprehensiveReport:
         """
         执行分析
@@ -28,13 +29,15 @@ class AnalysisService:
         Args:
             user_input: 用户输入
             progress_callback: 进度回调函数(theory_name, message, progress)
+            verification_callback: 后台验证完成回调函数(target_name, verification)，
+                异步双模型验证模式下可能在返回报告之后调用
 
         Returns:
             综合报告
         """
         self.logger.info(f"开始分析: {user_input.question_description[:50]}")
 
-        report = await self.engine.analyze(user_input, progress_callback)
+        report = await self.engine.analyze(user_input, progress_callback, verification_callback)
 
         self.logger.info(f"分析完成: 报告ID={report.report_id}")
 
@@ -6,6 +6,7 @@
 - nlp_parser.py: NLP解析器（NLPParser）
 - stage_handlers.py: 阶段处理器（Stage1-4Handler）
 - qa_handler.py: 问答处理器（QAHandler）
+- memory.py: 对话记忆（ConversationMemory，滚动摘要 + token预算）
 - report_generator.py: 报告生成器（ReportGenerator, ConversationExporter）
 
 向后兼容：
@@ -21,6 +22,7 @@ from .stage_handlers import (
     Stage4Handler
 )
 from .qa_handler import QAHandler, DEFAULT_QA_KEYWORDS, FALLBACK_RESPONSES
+from .memory import ConversationMemory
 from .report_generator import ReportGenerator, ConversationExporter
 
 __all__ = [
@@ -40,6 +42,8 @@ __all__ = [
     'QAHandler',
     'DEFAULT_QA_KEYWORDS',
     'FALLBACK_RESPONSES',
+    # 对话记忆
+    'ConversationMemory',
     # 报告生成
     'ReportGenerator',
     'ConversationExporter',
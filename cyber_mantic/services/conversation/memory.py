@@ -0,0 +1,330 @@
+"""
+对话记忆 - 滚动摘要 + 理论结论摘要 + token预算
+
+问答阶段每轮都要把对话历史和分析结果放进prompt。直接注入最近几条原文时，
+一条完整报告就有上千字，会话越长prompt越大，接口延迟和费用随之上涨。
+
+ConversationMemory 把对话分成两部分：
+- 最近几条消息保留原文（单条过长时截断）
+- 更早的消息逐条压缩成一行，增量并入滚动摘要；摘要超出上限时丢弃最早的行，只记条数
+
+理论结果压缩为每个理论一行的结构化摘要（判断、要点、建议）。
+token数用 api.rate_limiter.estimate_tokens 本地估算。问答是唯一注入对话记忆的任务，
+使用统一的prompt预算 PROMPT_TOKEN_BUDGET：调用方扣除固定部分后把剩余额度交给 render()，
+因此无论会话多长，每轮prompt大小基本不变。
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.rate_limiter import estimate_tokens
+from utils.logger import get_logger
+
+
+# 注入对话记忆的prompt（快速交互问答）的token预算（估算值）
+PROMPT_TOKEN_BUDGET = 2400
+
+# 对话记忆块的token上下限（预算扣除固定部分后落在此区间）
+MIN_MEMORY_TOKENS = 300
+MAX_MEMORY_TOKENS = 900
+
+# 理论结果摘要：(显示名, 上下文属性, [(标签, 字段路径)])
+# 路径支持 "用神分析.日主强弱" 形式的嵌套字典，遇到列表时对每一项取值；字典和列表的值展开成文本
+THEORY_DIGEST_FIELDS: List[Tuple[str, str, List[Tuple[str, str]]]] = [
+    ("小六壬", "xiaoliu_result", [("", "时落宫")]),
+    ("测字", "cezi_result", [("", "character")]),
+    ("八字", "bazi_result", [("", "日主"), ("", "用神分析.日主强弱")]),
+    ("紫微斗数", "ziwei_result", [("命宫", "命宫"), ("", "五局"), ("命主", "命主")]),
+    ("奇门遁甲", "qimen_result", [("值符宫", "值符宫"), ("格局", "格局.格局"),
+                              ("综合评分", "综合评分"), ("时机", "时机建议")]),
+    ("大六壬", "liuren_result", [("课体", "课体.名称"), ("三传", "三传.地支")]),
+    ("六爻", "liuyao_result", [("", "本卦.名称"), ("", "用神.六亲")]),
+    ("梅花易数", "meihua_result", [("", "本卦.名称"), ("", "体用关系")]),
+]
+DIGEST_VALUE_CHARS = 30  # 摘要中每个字段保留的字数
+
+_ROLE_NAMES = {"user": "用户", "assistant": "咨询师"}
+_MARKDOWN_RE = re.compile(r"[#*>`|_~]+")
+_SPACE_RE = re.compile(r"\s+")
+_SENTENCE_END_RE = re.compile(r"[。！？!?；;]")
+
+
+def truncate_to_tokens(text: str, max_tokens: int, suffix: str = "…") -> str:
+    """
+    按估算token数截断文本
+
+    Args:
+        text: 文本
+        max_tokens: 最多token数（含后缀）
+        suffix: 截断后追加的后缀
+
+    Returns:
+        不超过 max_tokens 的文本
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return text or ""
+    limit = max_tokens - estimate_tokens(suffix)
+    if limit <= 0:
+        return ""
+    # 二分查找满足预算的最长前缀
+    low, high = 0, min(len(text), limit * 4)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= limit:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + suffix
+
+
+def _compress_line(content: str, max_chars: int) -> str:
+    """去掉Markdown符号和换行，取首句，超长时截断"""
+    text = _SPACE_RE.sub(" ", _MARKDOWN_RE.sub("", content or "")).strip()
+    sentence_end = _SENTENCE_END_RE.search(text)
+    if sentence_end and sentence_end.end() <= max_chars:
+        return text[:sentence_end.end()]
+    return text if len(text) <= max_chars else text[:max_chars] + "…"
+
+
+def _lookup(data: Any, path: str) -> Any:
+    for key in path.split("."):
+        if isinstance(data, list):
+            data = [item.get(key) for item in data if isinstance(item, dict)]
+        elif isinstance(data, dict):
+            data = data.get(key)
+        else:
+            return None
+    return data
+
+
+def _flatten(value: Any) -> str:
+    """把字段值展开成一段文本：数字保留两位小数，字典取各值，列表去重后用顿号连接"""
+    if isinstance(value, bool) or value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.2f}".rstrip("0").rstrip(".")
+    if isinstance(value, (str, int)):
+        return str(value)
+    if isinstance(value, dict):
+        return " ".join(text for text in map(_flatten, value.values()) if text)
+    if isinstance(value, (list, tuple)):
+        texts = [text for text in map(_flatten, value) if text]
+        return "、".join(dict.fromkeys(texts))
+    return ""
+
+
+class ConversationMemory:
+    """对话记忆（每个会话一个实例）"""
+
+    def __init__(
+        self,
+        recent_messages: int = 6,
+        message_max_tokens: int = 200,
+        summary_max_tokens: int = 400,
+        summary_line_chars: int = 40,
+        digest_max_tokens: int = 300
+    ):
+        """
+        Args:
+            recent_messages: 保留原文的最近消息条数
+            message_max_tokens: 单条原文消息的token上限
+            summary_max_tokens: 滚动摘要的token上限
+            summary_line_chars: 摘要中每条消息保留的字数
+            digest_max_tokens: 理论结论摘要的token上限
+        """
+        self.recent_messages = recent_messages
+        self.message_max_tokens = message_max_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_line_chars = summary_line_chars
+        self.digest_max_tokens = digest_max_tokens
+        self.logger = get_logger(__name__)
+
+        self._context: Any = None  # 当前跟踪的上下文对象（切换会话时重置）
+        self._last_folded: Optional[Dict[str, str]] = None  # 最后一条已并入摘要的消息
+        self._last_seen: Optional[Dict[str, str]] = None  # 上次更新时的最新消息
+        self._summary_lines: List[Tuple[str, int]] = []  # (摘要行, token数)
+        self._summary_tokens = 0
+        self._omitted = 0  # 超出摘要上限而丢弃的行数
+        self._digest_key: Optional[Tuple[int, ...]] = None
+        self._digest = ""
+
+    # ==================== 滚动摘要 ====================
+
+    def reset(self):
+        """清空记忆（新会话）"""
+        self._context = None
+        self._digest_key = None
+        self._digest = ""
+        self._clear_summary()
+
+    def _clear_summary(self):
+        self._last_folded = None
+        self._last_seen = None
+        self._summary_lines = []
+        self._summary_tokens = 0
+        self._omitted = 0
+
+    def update(self, context: Any) -> List[Dict[str, str]]:
+        """
+        把最近窗口之外、尚未摘要的消息并入滚动摘要
+
+        Args:
+            context: 对话上下文（ConversationContext）
+
+        Returns:
+            最近窗口内的消息（原文）
+        """
+        if context is not self._context:
+            self.reset()
+            self._context = context
+
+        history = context.conversation_history
+        cutoff = max(0, len(history) - self.recent_messages)
+        start = self._resume_index(history)
+
+        previous = self._last_folded
+        for message in history[start:cutoff]:
+            if not self._same_message(message, previous):
+                self._fold(message)
+            previous = message
+        if cutoff > start:
+            self._last_folded = history[cutoff - 1]
+        self._last_seen = history[-1] if history else None
+
+        recent = []
+        for message in history[max(start, cutoff):]:
+            if not self._same_message(message, previous):
+                recent.append(message)
+            previous = message
+        return recent
+
+    def _resume_index(self, history: List[Dict[str, str]]) -> int:
+        """上次摘要到的位置之后的下标"""
+        if self._last_folded is None:
+            return 0
+        for index in range(len(history) - 1, -1, -1):
+            if history[index] is self._last_folded:
+                return index + 1
+        # 上次摘要到的消息已不在历史中：历史只是被截断（上次的最新消息还在）时从头并入，
+        # 否则历史整体被替换，重新摘要
+        if not any(message is self._last_seen for message in history):
+            self.logger.debug("对话历史已被替换，重新生成滚动摘要")
+            self._clear_summary()
+        return 0
+
+    @staticmethod
+    def _same_message(message: Dict[str, str], previous: Optional[Dict[str, str]]) -> bool:
+        """连续两条相同的消息只算一次（问答回答会被处理器和服务各记录一次）"""
+        return previous is not None and message.get("role") == previous.get("role") \
+            and message.get("content") == previous.get("content")
+
+    def _fold(self, message: Dict[str, str]):
+        role = _ROLE_NAMES.get(message.get("role"), message.get("role", ""))
+        line = f"{role}：{_compress_line(message.get('content', ''), self.summary_line_chars)}"
+        tokens = estimate_tokens(line)
+        self._summary_lines.append((line, tokens))
+        self._summary_tokens += tokens
+        while self._summary_tokens > self.summary_max_tokens and len(self._summary_lines) > 1:
+            _, dropped = self._summary_lines.pop(0)
+            self._summary_tokens -= dropped
+            self._omitted += 1
+
+    @property
+    def summary(self) -> str:
+        """滚动摘要文本（没有更早对话时为空）"""
+        if not self._summary_lines:
+            return ""
+        lines = [line for line, _ in self._summary_lines]
+        if self._omitted:
+            lines.insert(0, f"（更早的{self._omitted}条消息已省略）")
+        return "\n".join(lines)
+
+    # ==================== 理论结论摘要 ====================
+
+    def theory_digest(self, context: Any) -> str:
+        """
+        各理论结论的结构化摘要，每个理论一行
+
+        结果对象不变时直接返回缓存。
+        """
+        results = [getattr(context, attr, None) for _, attr, _ in THEORY_DIGEST_FIELDS]
+        key = tuple(id(result) for result in results)
+        if key == self._digest_key:
+            return self._digest
+
+        lines = []
+        for (name, _, fields), result in zip(THEORY_DIGEST_FIELDS, results):
+            if not isinstance(result, dict) or result.get("error"):
+                continue
+            parts = []
+            for label, path in fields:
+                text = _flatten(_lookup(result, path))
+                if text:
+                    parts.append(label + _compress_line(text, DIGEST_VALUE_CHARS))
+            judgment = result.get("judgment") or result.get("吉凶判断")
+            if judgment and isinstance(judgment, str):
+                parts.append(f"判断{_compress_line(judgment, 20)}")
+            advice = result.get("advice") or result.get("建议")
+            if advice and isinstance(advice, str):
+                parts.append(f"建议：{_compress_line(advice, 30)}")
+            lines.append(f"- {name}：{'，'.join(parts) if parts else '已分析'}")
+
+        self._digest_key = key
+        self._digest = truncate_to_tokens("\n".join(lines), self.digest_max_tokens)
+        return self._digest
+
+    # ==================== prompt渲染 ====================
+
+    def render(self, context: Any, max_tokens: int) -> str:
+        """
+        生成放入prompt的记忆块：理论结论摘要、早前对话摘要、最近对话
+
+        最近对话从最新一条往前取，超出预算的较早消息不再逐条列出；
+        早前对话摘要只保留最新的若干行。
+
+        Args:
+            context: 对话上下文
+            max_tokens: 记忆块的token预算
+
+        Returns:
+            记忆块文本（无内容时为空字符串）
+        """
+        recent = self.update(context)
+        remaining = max_tokens - 20  # 预留给各段标题
+        sections = []
+
+        digest = self.theory_digest(context)
+        if digest:
+            digest = truncate_to_tokens(digest, remaining // 3)
+            sections.append(f"【各理论结论】\n{digest}")
+            remaining -= estimate_tokens(sections[-1])
+
+        recent_lines: List[str] = []
+        recent_budget = remaining * 2 // 3
+        for message in reversed(recent):
+            role = _ROLE_NAMES.get(message.get("role"), message.get("role", ""))
+            line = f"{role}：{truncate_to_tokens(message.get('content', ''), self.message_max_tokens)}"
+            tokens = estimate_tokens(line)
+            if tokens > recent_budget:
+                if recent_lines:
+                    break
+                line = truncate_to_tokens(line, recent_budget)  # 最新一条至少保留开头
+                tokens = estimate_tokens(line)
+            recent_lines.insert(0, line)
+            recent_budget -= tokens
+            remaining -= tokens
+
+        summary_lines = []
+        for line, tokens in reversed(self._summary_lines):
+            if tokens > remaining:
+                break
+            summary_lines.insert(0, line)
+            remaining -= tokens
+        if summary_lines:
+            omitted = self._omitted + len(self._summary_lines) - len(summary_lines)
+            if omitted:
+                summary_lines.insert(0, f"（更早的{omitted}条消息已省略）")
+            sections.append("【早前对话摘要】\n" + "\n".join(summary_lines))
+
+        if recent_lines:
+            sections.append("【最近对话】\n" + "\n".join(recent_lines))
+        return "\n\n".join(sections)
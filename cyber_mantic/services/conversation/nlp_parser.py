@@ -16,6 +16,7 @@ from api.manager import APIManager
 from api.prompt_loader import load_prompt
 from core.exceptions import APIError, APITimeoutError, DataParsingError
 from utils.logger import get_logger
+from utils.input_parser import get_local_parser
 
 # AI增强任务类型（与TaskRouter统一）
 TASK_TYPE_INPUT_ENHANCE = "输入增强验证"
@@ -27,11 +28,14 @@ class NLPParser:
 
     使用AI（主要是Kimi）进行自然语言解析，
     并提供代码备用解析方案
+
+    出生信息和破冰输入先用本地规则解析，置信度足够时不再调用AI
     """
 
     def __init__(self, api_manager: APIManager):
         self.api_manager = api_manager
         self.logger = get_logger(__name__)
+        self.local_parser = get_local_parser()
 
     def extract_json_from_response(self, response: str) -> Optional[Dict[str, Any]]:
         """
@@ -168,6 +172,13 @@ class NLPParser:
         Returns:
             解析结果字典，包含category, description, numbers
         """
+        # 本地规则优先：格式规整的输入无需调用AI
+        local = self.local_parser.parse_icebreak(user_message)
+        self.local_parser.record("破冰", self.local_parser.is_confident(local))
+        if self.local_parser.is_confident(local):
+            self.logger.info(f"破冰输入本地解析成功: {local.data}")
+            return local.data
+
         prompt = f"""你是一个智能解析助手。请从用户输入中提取：1. 事项分类 2. 3个随机数字
 
 用户输入：
@@ -236,10 +247,17 @@ class NLPParser:
         解析出生信息
 
         流程：
-        1. 使用Kimi进行自然语言解析
-        2. 进行基本合法性验证
-        3. 如果失败，使用代码备用解析
+        1. 本地规则解析，置信度达到阈值直接返回
+        2. 使用Kimi进行自然语言解析
+        3. 进行基本合法性验证
+        4. 如果失败，使用代码备用解析
         """
+        local = self.local_parser.parse_birth_info(user_message)
+        self.local_parser.record("出生信息", self.local_parser.is_confident(local))
+        if self.local_parser.is_confident(local):
+            self.logger.info(f"出生信息本地解析成功: {local.data}")
+            return local.data
+
         prompt = f"""你是一个专业的出生信息解析助手，精通中国传统命理学。请从用户的输入中提取出生信息。
 
 用户输入：
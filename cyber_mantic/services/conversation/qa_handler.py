@@ -4,7 +4,7 @@
 处理对话QA阶段的所有问答逻辑：
 - 问题类型识别
 - 上下文数据准备
-- 智能prompt构建
+- 智能prompt构建（对话记忆 + 按任务token预算裁剪）
 - 降级回答生成
 """
 
@@ -12,7 +12,17 @@ import json
 from typing import Dict, Any, Optional, Callable, TYPE_CHECKING
 from datetime import datetime
 
+from api.rate_limiter import estimate_tokens
 from utils.logger import get_logger
+from utils.keyword_matcher import KeywordMatcher
+
+from .memory import (
+    ConversationMemory,
+    MAX_MEMORY_TOKENS,
+    MIN_MEMORY_TOKENS,
+    PROMPT_TOKEN_BUDGET,
+    truncate_to_tokens,
+)
 
 if TYPE_CHECKING:
     from api.manager import APIManager
@@ -170,7 +180,8 @@ class QAHandler:
         self,
         api_manager: "APIManager",
         context: "ConversationContext",
-        qa_keywords: Optional[Dict[str, list]] = None
+        qa_keywords: Optional[Dict[str, list]] = None,
+        memory: Optional[ConversationMemory] = None
     ):
         """
         初始化问答处理器
@@ -179,16 +190,20 @@ class QAHandler:
             api_manager: API管理器
             context: 对话上下文
             qa_keywords: 问题分类关键词（可选，使用默认值）
+            memory: 对话记忆（可选，默认新建）
         """
         self.api_manager = api_manager
         self.context = context
         self.qa_keywords = qa_keywords or DEFAULT_QA_KEYWORDS
+        self.keyword_matcher = KeywordMatcher.from_groups(self.qa_keywords)
+        self.memory = memory or ConversationMemory()
         self.logger = get_logger(__name__)
 
     async def handle(
         self,
         user_message: str,
-        progress_callback: Optional[Callable[[str, str, int], None]] = None
+        progress_callback: Optional[Callable[[str, str, int], None]] = None,
+        stream_callback: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         处理问答阶段（增强版）
@@ -203,6 +218,7 @@ class QAHandler:
         Args:
             user_message: 用户消息
             progress_callback: 进度回调函数
+            stream_callback: 流式输出回调（可选），每收到一段文本调用一次
 
         Returns:
             AI回答内容
@@ -221,11 +237,14 @@ class QAHandler:
             if progress_callback:
                 progress_callback("问答", "正在思考您的问题...", 50)
 
-            answer = await self.api_manager.call_api(
-                task_type="快速交互问答",
-                prompt=prompt,
-                enable_dual_verification=False
-            )
+            if stream_callback:
+                answer = await self._stream_answer(prompt, stream_callback)
+            else:
+                answer = await self.api_manager.call_api(
+                    task_type="快速交互问答",
+                    prompt=prompt,
+                    enable_dual_verification=False
+                )
 
             # 保存对话历史
             self.context.conversation_history.append({
@@ -240,6 +259,35 @@ class QAHandler:
             self.logger.error(f"QA回答失败: {e}")
             return self.generate_fallback_response(question_type)
 
+    async def _stream_answer(self, prompt: str, stream_callback: Callable[[str], None]) -> str:
+        """
+        流式获取回答
+
+        已经输出部分内容后中途出错时，保留已输出内容并附加提示，
+        未输出任何内容时抛出异常，由调用方走降级回答。
+
+        Args:
+            prompt: 提示词
+            stream_callback: 流式输出回调
+
+        Returns:
+            完整回答内容
+        """
+        chunks = []
+        try:
+            async for delta in self.api_manager.call_api_stream(
+                task_type="快速交互问答",
+                prompt=prompt
+            ):
+                chunks.append(delta)
+                stream_callback(delta)
+        except Exception as e:
+            if not chunks:
+                raise
+            self.logger.warning(f"QA流式回答中断: {e}")
+            chunks.append("\n\n（回答因网络原因中断，您可以重新提问获取完整回答）")
+        return "".join(chunks)
+
     def identify_question_type(self, user_message: str) -> str:
         """
         识别用户问题类型（配置化版本 - 支持自定义关键词）
@@ -264,14 +312,8 @@ class QAHandler:
             - other: 其他类型
             - general: 通用（兜底）
         """
-        # 按优先级检查每种问题类型
-        for qtype in QUESTION_TYPE_PRIORITY:
-            keywords = self.qa_keywords.get(qtype, [])
-            if any(kw in user_message for kw in keywords):
-                return qtype
-
-        # 默认为一般咨询（如果都不匹配）
-        return "general"
+        # 一次扫描得到全部命中类型，按优先级取第一个；都不匹配时为一般咨询
+        return self.keyword_matcher.first_label(user_message, QUESTION_TYPE_PRIORITY) or "general"
 
     def prepare_context(self, question_type: str) -> Dict[str, Any]:
         """
@@ -310,8 +352,8 @@ class QAHandler:
 
         elif question_type == "prediction":
             # 提供预测分析
-            context_data["predictive_analysis"] = self.context.predictive_analysis
-            context_data["retrospective_analysis"] = self.context.retrospective_analysis
+            context_data["predictive_analysis"] = truncate_to_tokens(self.context.predictive_analysis, 500)
+            context_data["retrospective_analysis"] = truncate_to_tokens(self.context.retrospective_analysis, 300)
 
         elif question_type == "compatibility":
             # 合婚/人际关系 - 提供命理匹配分析
@@ -389,9 +431,6 @@ class QAHandler:
                 "description": self.context.question_description
             }
 
-        # 始终包含的通用信息
-        context_data["recent_conversation"] = self.context.conversation_history[-5:]
-
         return context_data
 
     def build_prompt(
@@ -423,16 +462,23 @@ class QAHandler:
 """
 
         # 根据问题类型添加特定上下文和指令
-        prompt = base_prompt + self._build_type_specific_prompt(question_type, context_data)
+        type_prompt = self._build_type_specific_prompt(question_type, context_data)
 
-        prompt += """
+        closing = """
 重要提示：
 - 如果信息不足，诚实说明并建议如何获取更多信息
 - 避免过度承诺或绝对化表述
 - 保持专业、客观、友善的态度
 """
 
-        return prompt
+        # 对话记忆占用预算扣除固定部分后的剩余额度，prompt大小不随会话长度增长
+        fixed_tokens = sum(estimate_tokens(part) for part in (base_prompt, type_prompt, closing))
+        memory_tokens = min(MAX_MEMORY_TOKENS, max(MIN_MEMORY_TOKENS, PROMPT_TOKEN_BUDGET - fixed_tokens))
+        memory_block = self.memory.render(self.context, memory_tokens)
+        if memory_block:
+            base_prompt += f"\n对话记忆：\n{memory_block}\n"
+
+        return base_prompt + type_prompt + closing
 
     def _build_type_specific_prompt(
         self,
@@ -645,9 +691,6 @@ class QAHandler:
 - 类别：{context_data.get('question_info', {}).get('category')}
 - 描述：{context_data.get('question_info', {}).get('description')}
 
-最近对话：
-{json.dumps(context_data.get('recent_conversation', [])[-3:], ensure_ascii=False)}
-
 请回答用户的问题（150-200字），要求：
 1. 基于报告内容回答
 2. 温和、专业
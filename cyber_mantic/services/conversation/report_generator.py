@@ -10,7 +10,7 @@
 """
 
 import json
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Dict, Any, Optional, Callable, TYPE_CHECKING
 from datetime import datetime
 
 from utils.logger import get_logger
@@ -58,10 +58,16 @@ class ReportGenerator:
         self.logger = get_logger(__name__)
         self.timeline_analyzer = TimelineAnalyzer()  # 初始化时间线分析器
 
-    async def generate_final_report(self) -> str:
+    async def generate_final_report(
+        self,
+        stream_callback: Optional[Callable[[str], None]] = None
+    ) -> str:
         """
         生成最终详细报告（使用AI综合分析）
 
+        Args:
+            stream_callback: 流式输出回调（可选），报告头和AI生成内容逐段回调
+
         Returns:
             完整的分析报告文本
         """
@@ -81,18 +87,8 @@ class ReportGenerator:
             verification_summary
         )
 
-        try:
-            response = await self.api_manager.call_api(
-                task_type="综合报告解读",  # 使用Claude进行深度分析
-                prompt=prompt,
-                enable_dual_verification=False
-            )
-
-            # 保存综合分析
-            self.context.comprehensive_analysis = response
-
-            # 构建完整报告
-            report_header = f"""# 🔮 赛博玄数 - 智能分析报告
+        # 构建报告头
+        report_header = f"""# 🔮 赛博玄数 - 智能分析报告
 
 ## 📋 基本信息
 
@@ -105,6 +101,28 @@ class ReportGenerator:
 
 """
 
+        try:
+            if stream_callback:
+                stream_callback(report_header)
+                chunks = []
+                async for delta in self.api_manager.call_api_stream(
+                    task_type="综合报告解读",  # 使用Claude进行深度分析
+                    prompt=prompt
+                ):
+                    chunks.append(delta)
+                    stream_callback(delta)
+                response = "".join(chunks)
+            else:
+                response = await self.api_manager.call_api(
+                    task_type="综合报告解读",  # 使用Claude进行深度分析
+                    prompt=prompt,
+                    enable_dual_verification=False
+                )
+
+            # 保存综合分析
+            self.context.comprehensive_analysis = response
+
+            # 构建完整报告
             full_report = report_header + response
 
             return full_report.strip()
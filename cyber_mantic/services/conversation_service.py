@@ -21,8 +21,9 @@ V2流程（5阶段8步骤）：
 - DynamicVerificationGenerator: 回溯问题生成（V2）
 """
 
+import asyncio
 import json
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple
 from core.constants import DEFAULT_MAX_THEORIES, DEFAULT_MIN_THEORIES
 from datetime import datetime
 
@@ -226,7 +227,8 @@ class ConversationService:
         self,
         user_message: str,
         progress_callback: Optional[Callable[[str, str, int], None]] = None,
-        theory_callback: Optional[Callable[[str, str, dict], None]] = None
+        theory_callback: Optional[Callable[[str, str, dict], None]] = None,
+        stream_callback: Optional[Callable[[str], None]] = None
     ) -> str:
         """处理用户输入（路由到对应阶段）
 
@@ -234,6 +236,8 @@ class ConversationService:
             user_message: 用户输入
             progress_callback: 进度回调 (stage, message, progress)
             theory_callback: 理论分析回调 (event_type, theory_name, data)
+            stream_callback: 流式输出回调 (text_delta)，问答回答和最终报告逐段输出；
+                返回值仍为完整回复
         """
         self._add_message("user", user_message)
         stage = self.context.stage
@@ -266,15 +270,15 @@ class ConversationService:
 
             # V2: 阶段4 验证
             elif stage == ConversationStage.STAGE4_VERIFY:
-                response = await self._handle_stage4_verify(user_message, progress_callback, theory_callback)
+                response = await self._handle_stage4_verify(user_message, progress_callback, theory_callback, stream_callback)
 
             # V2: 阶段5 报告
             elif stage == ConversationStage.STAGE5_REPORT:
-                response = await self._handle_stage5_report(progress_callback, theory_callback)
+                response = await self._handle_stage5_report(progress_callback, theory_callback, stream_callback)
 
             # 问答阶段
             elif stage in (ConversationStage.QA, ConversationStage.COMPLETED):
-                response = await self._handle_qa(user_message, progress_callback)
+                response = await self._handle_qa(user_message, progress_callback, stream_callback)
 
             # 向后兼容：旧阶段枚举（可能来自旧的保存数据）
             elif hasattr(ConversationStage, 'STAGE2_BASIC_INFO') and stage == ConversationStage.STAGE2_BASIC_INFO:
@@ -282,9 +286,9 @@ class ConversationService:
             elif hasattr(ConversationStage, 'STAGE3_SUPPLEMENT') and stage == ConversationStage.STAGE3_SUPPLEMENT:
                 response = await self._handle_stage3_collect(user_message, progress_callback, theory_callback)
             elif hasattr(ConversationStage, 'STAGE4_VERIFICATION') and stage == ConversationStage.STAGE4_VERIFICATION:
-                response = await self._handle_stage4_verify(user_message, progress_callback, theory_callback)
+                response = await self._handle_stage4_verify(user_message, progress_callback, theory_callback, stream_callback)
             elif hasattr(ConversationStage, 'STAGE5_FINAL_REPORT') and stage == ConversationStage.STAGE5_FINAL_REPORT:
-                response = await self._handle_stage5_report(progress_callback, theory_callback)
+                response = await self._handle_stage5_report(progress_callback, theory_callback, stream_callback)
 
             else:
                 response = "系统错误：未知的对话阶段"
@@ -469,7 +473,9 @@ class ConversationService:
             # 测字术需要 character 字段
             cezi_user_input.character = self.context.character
 
-            cezi_result = self.cezi_theory.calculate(cezi_user_input)
+            # 测字含同步AI验证，放入线程池执行，不阻塞共享事件循环
+            loop = asyncio.get_running_loop()
+            cezi_result = await loop.run_in_executor(None, self.cezi_theory.calculate, cezi_user_input)
             self.context.cezi_result = cezi_result
 
             # V2: 通知理论完成
@@ -573,6 +579,11 @@ class ConversationService:
         - 使用 STAGE3_COLLECT FlowGuard验证
         - 生成六爻自动起卦数字
         - 直接转到 STAGE4_VERIFY（不再有补充阶段）
+
+        流水线执行：
+        - FlowGuard验证与出生信息解析互不依赖，同时发起
+        - 理论排盘在线程池中并发计算
+        - 第一个理论出结果后即开始生成回溯验证问题，与其余理论重叠
         """
         # 更新会话阶段
         self._update_session_stage('stage3_collect')
@@ -580,47 +591,58 @@ class ConversationService:
         if progress_callback:
             progress_callback("阶段3", "正在解析您的出生信息...", 60)
 
-        # V2: FlowGuard输入验证
-        validation_result = await self.flow_guard.validate_input_with_ai(user_message, "STAGE3_COLLECT")
-        if validation_result.status == InputStatus.VALID:
-            self.logger.info(f"FlowGuard验证通过，提取数据: {validation_result.extracted_data}")
-            # 提取颜色/方位（用于梅花易数）
-            if validation_result.extracted_data.get("favorite_color"):
-                self.context.favorite_color = validation_result.extracted_data["favorite_color"]
-            if validation_result.extracted_data.get("current_direction"):
-                self.context.current_direction = validation_result.extracted_data["current_direction"]
-
-        birth_info = await self.nlp_parser.parse_birth_info(user_message)
-        if not birth_info or "error" in birth_info:
-            return self._retry_msg("stage3")
-
-        self.context.birth_info = birth_info
-        self.context.gender = birth_info.get("gender")
-        self.context.mbti_type = birth_info.get("mbti")
-        self.context.time_certainty = birth_info.get("time_certainty", "unknown")
-
-        # V2: 生成六爻自动起卦数字
-        self.context.generate_liuyao_numbers()
-        self.logger.info(f"六爻自动起卦数字: {self.context.liuyao_numbers}")
-
-        if progress_callback:
-            progress_callback("理论选择", "正在选择最适合的理论...", 70)
-
-        # V2修复: 必须先选择理论，再运行分析
-        theory_selection_result = await self._calculate_theory_fitness(theory_callback)
-        self.logger.info(f"选中的理论: {[t.get('theory') if isinstance(t, dict) else t for t in self.context.selected_theories]}")
-
-        if progress_callback:
-            progress_callback("多理论分析", "正在计算多理论结果...", 75)
+        # V2: FlowGuard输入验证（与出生信息解析并发，结果只影响梅花易数起卦方式）
+        validation_task = asyncio.create_task(
+            self.flow_guard.validate_input_with_ai(user_message, "STAGE3_COLLECT")
+        )
+        questions_task: Optional[asyncio.Task] = None
+        try:
+            birth_info = await self.nlp_parser.parse_birth_info(user_message)
+            if not birth_info or "error" in birth_info:
+                await self._apply_stage3_validation(validation_task)
+                return self._retry_msg("stage3")
+
+            self.context.birth_info = birth_info
+            self.context.gender = birth_info.get("gender")
+            self.context.mbti_type = birth_info.get("mbti")
+            self.context.time_certainty = birth_info.get("time_certainty", "unknown")
+
+            # V2: 生成六爻自动起卦数字
+            self.context.generate_liuyao_numbers()
+            self.logger.info(f"六爻自动起卦数字: {self.context.liuyao_numbers}")
+
+            if progress_callback:
+                progress_callback("理论选择", "正在选择最适合的理论...", 70)
+
+            # V2修复: 必须先选择理论，再运行分析
+            await self._calculate_theory_fitness(theory_callback)
+            self.logger.info(f"选中的理论: {[t.get('theory') if isinstance(t, dict) else t for t in self.context.selected_theories]}")
+
+            if progress_callback:
+                progress_callback("多理论分析", "正在计算多理论结果...", 75)
+
+            def start_questions(theory_results: Dict[str, Dict[str, str]]):
+                # V2: 生成回溯验证问题（第一个理论完成即开始）
+                nonlocal questions_task
+                if progress_callback:
+                    progress_callback("验证问题", "正在生成回溯验证问题...", 85)
+                questions_task = asyncio.create_task(
+                    self._generate_verification_questions(theory_results)
+                )
 
-        # 运行多理论分析
-        await self._run_deep_analysis(progress_callback, theory_callback)
+            # 运行多理论分析
+            await self._run_deep_analysis(progress_callback, theory_callback, on_first_result=start_questions)
+            if questions_task is None:
+                start_questions({})
 
-        # V2: 生成回溯验证问题
-        if progress_callback:
-            progress_callback("验证问题", "正在生成回溯验证问题...", 85)
+            verification_questions = await questions_task
+            await self._apply_stage3_validation(validation_task)
+        finally:
+            # 出错或被取消时不留下悬空的AI调用
+            for task in (validation_task, questions_task):
+                if task is not None and not task.done():
+                    task.cancel()
 
-        verification_questions = await self._generate_verification_questions()
         self.context.verification_questions = verification_questions
 
         # V2: 直接转到阶段4验证
@@ -658,7 +680,17 @@ MBTI：{self.context.mbti_type or '未提供'}
 
         return response
 
-    async def _handle_stage4_verify(self, user_message: str, progress_callback, theory_callback=None) -> str:
+    async def _apply_stage3_validation(self, validation_task: asyncio.Task):
+        """等待阶段3的FlowGuard验证结果，提取颜色/方位（用于梅花易数）"""
+        validation_result = await validation_task
+        if validation_result.status == InputStatus.VALID:
+            self.logger.info(f"FlowGuard验证通过，提取数据: {validation_result.extracted_data}")
+            if validation_result.extracted_data.get("favorite_color"):
+                self.context.favorite_color = validation_result.extracted_data["favorite_color"]
+            if validation_result.extracted_data.get("current_direction"):
+                self.context.current_direction = validation_result.extracted_data["current_direction"]
+
+    async def _handle_stage4_verify(self, user_message: str, progress_callback, theory_callback=None, stream_callback=None) -> str:
         """
         V2：阶段4 验证 - 处理回溯验证问题回答
 
@@ -678,7 +710,7 @@ MBTI：{self.context.mbti_type or '未提供'}
         if any(kw in user_message for kw in skip_keywords):
             self.logger.info("用户选择跳过验证，直接生成报告")
             self.context.stage = ConversationStage.STAGE5_REPORT
-            return await self._handle_stage5_report(progress_callback, theory_callback)
+            return await self._handle_stage5_report(progress_callback, theory_callback, stream_callback)
 
         # 解析验证反馈
         feedback = await self.nlp_parser.parse_verification_feedback(
@@ -713,9 +745,9 @@ MBTI：{self.context.mbti_type or '未提供'}
         # V2: 转到阶段5报告
         self.context.stage = ConversationStage.STAGE5_REPORT
 
-        return await self._handle_stage5_report(progress_callback, theory_callback)
+        return await self._handle_stage5_report(progress_callback, theory_callback, stream_callback)
 
-    async def _handle_stage5_report(self, progress_callback, theory_callback=None) -> str:
+    async def _handle_stage5_report(self, progress_callback, theory_callback=None, stream_callback=None) -> str:
         """
         V2：阶段5 报告 - 生成综合分析报告
 
@@ -726,7 +758,7 @@ MBTI：{self.context.mbti_type or '未提供'}
             progress_callback("报告生成", "正在生成综合分析报告...", 95)
 
         self.report_generator.context = self.context
-        report = await self.report_generator.generate_final_report()
+        report = await self.report_generator.generate_final_report(stream_callback)
         self.context.stage = ConversationStage.QA
 
         if progress_callback:
@@ -760,10 +792,10 @@ MBTI：{self.context.mbti_type or '未提供'}
 
         return report
 
-    async def _handle_qa(self, user_message: str, progress_callback) -> str:
+    async def _handle_qa(self, user_message: str, progress_callback, stream_callback=None) -> str:
         """处理问答阶段"""
         self.qa_handler.context = self.context
-        return await self.qa_handler.handle(user_message, progress_callback)
+        return await self.qa_handler.handle(user_message, progress_callback, stream_callback)
 
     # ==================== 辅助方法 ====================
 
@@ -782,8 +814,13 @@ MBTI：{self.context.mbti_type or '未提供'}
             except Exception as e:
                 self.logger.warning(f"更新会话阶段失败: {e}")
 
-    async def _generate_verification_questions(self):
-        """V2: 生成回溯验证问题"""
+    async def _generate_verification_questions(self, theory_results: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        V2: 生成回溯验证问题
+
+        Args:
+            theory_results: 已完成理论的摘要 {理论名: {"summary", "judgment"}}
+        """
         try:
             # 准备用户信息
             user_info = {
@@ -796,6 +833,8 @@ MBTI：{self.context.mbti_type or '未提供'}
             analysis_results = {}
             if self.context.xiaoliu_result:
                 analysis_results["小六壬"] = self.context.xiaoliu_result
+            if theory_results:
+                analysis_results.update(theory_results)
 
             # 生成3个验证问题
             questions = await self.verification_generator.generate_questions(
@@ -918,25 +957,30 @@ MBTI：{self.context.mbti_type or '未提供'}
                 theory_name = str(theory_item)
             self.context.theory_confidence_adjustment[theory_name] = adj
 
-    def _process_theory(
+    async def _process_theory(
         self,
         theory_name: str,
         user_input: UserInput,
         progress_callback: Optional[Callable] = None,
         theory_callback: Optional[Callable] = None
-    ) -> None:
+    ) -> Optional[Tuple[str, Dict[str, str]]]:
         """
         统一处理单个理论的计算流程（消除重复代码）
 
+        排盘计算放入线程池执行，不阻塞事件循环；回调仍在事件循环线程中发出。
+
         Args:
             theory_name: 理论名称
             user_input: 用户输入
             progress_callback: 进度回调
             theory_callback: 理论状态回调
+
+        Returns:
+            (显示名, {"summary", "judgment"})，计算失败或理论未知时返回None
         """
         if theory_name not in self.THEORY_CONFIGS:
             self.logger.warning(f"未知理论: {theory_name}")
-            return
+            return None
 
         config = self.THEORY_CONFIGS[theory_name]
 
@@ -955,30 +999,31 @@ MBTI：{self.context.mbti_type or '未提供'}
         # 3. 执行计算
         try:
             theory_instance = config["theory_class"]()
-            result = theory_instance.calculate(user_input)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, theory_instance.calculate, user_input)
 
             # 保存结果到上下文
             setattr(self.context, config["context_attr"], result)
 
-            # 4. 完成回调
-            if theory_callback:
-                # 获取summary和judgment
-                if config.get("has_summary"):
-                    summary_method_name = f"_get_{config['context_attr'].replace('_result', '')}_summary"
-                    summary = getattr(self, summary_method_name)(result)
-                else:
-                    summary = config.get("default_summary", "计算完成")
+            # 4. 获取summary和judgment
+            if config.get("has_summary"):
+                summary_method_name = f"_get_{config['context_attr'].replace('_result', '')}_summary"
+                summary = getattr(self, summary_method_name)(result)
+            else:
+                summary = config.get("default_summary", "计算完成")
 
-                if config.get("has_judgment"):
-                    judgment_method_name = f"_get_{config['context_attr'].replace('_result', '')}_judgment"
-                    judgment = getattr(self, judgment_method_name)(result)
-                else:
-                    judgment = config.get("default_judgment", "平")
+            if config.get("has_judgment"):
+                judgment_method_name = f"_get_{config['context_attr'].replace('_result', '')}_judgment"
+                judgment = getattr(self, judgment_method_name)(result)
+            else:
+                judgment = config.get("default_judgment", "平")
 
-                theory_callback('completed', config["display_name"], {
-                    'summary': summary,
-                    'judgment': judgment
-                })
+            brief = {'summary': summary, 'judgment': judgment}
+
+            # 5. 完成回调
+            if theory_callback:
+                theory_callback('completed', config["display_name"], brief)
+            return config["display_name"], brief
 
         except Exception as e:
             self.logger.error(f"{theory_name}计算失败: {e}")
@@ -986,9 +1031,24 @@ MBTI：{self.context.mbti_type or '未提供'}
                 theory_callback('error', config["display_name"], {
                     'error': str(e)
                 })
+            return None
 
-    async def _run_deep_analysis(self, progress_callback, theory_callback=None):
-        """执行深度分析（重构版：使用统一的理论处理函数）"""
+    async def _run_deep_analysis(
+        self,
+        progress_callback,
+        theory_callback=None,
+        on_first_result: Optional[Callable[[Dict[str, Dict[str, str]]], None]] = None
+    ):
+        """
+        执行深度分析（重构版：使用统一的理论处理函数）
+
+        各理论并发计算，按完成顺序发出回调。
+
+        Args:
+            progress_callback: 进度回调
+            theory_callback: 理论状态回调
+            on_first_result: 第一个理论成功完成时调用，参数为 {显示名: {"summary", "judgment"}}
+        """
         if not self.context.birth_info:
             self.logger.warning("_run_deep_analysis: birth_info 为空，跳过分析")
             return
@@ -1019,27 +1079,44 @@ MBTI：{self.context.mbti_type or '未提供'}
                 selected_theory_names.append(str(t))
 
         # 统计执行情况
-        executed_count = 0
+        tasks = []
         skipped_theories = []
 
         # 使用统一方法处理所有理论
         for theory_name in selected_theory_names:
             if theory_name in self.THEORY_CONFIGS:
-                self._process_theory(
+                tasks.append(asyncio.create_task(self._process_theory(
                     theory_name,
                     user_input,
                     progress_callback,
                     theory_callback
-                )
-                executed_count += 1
+                )))
             else:
                 # 记录被跳过的理论（小六壬/测字术已在前面阶段执行，属于正常情况）
                 if theory_name not in ("小六壬", "测字术"):
                     skipped_theories.append(theory_name)
                     self.logger.warning(f"理论 '{theory_name}' 不在 THEORY_CONFIGS 中，已跳过")
 
+        completed_count = 0
+        try:
+            for finished in asyncio.as_completed(tasks):
+                outcome = await finished
+                if outcome is None:
+                    continue
+                completed_count += 1
+                if completed_count == 1 and on_first_result:
+                    display_name, brief = outcome
+                    on_first_result({display_name: brief})
+        finally:
+            # 外层被取消时，确保未完成的理论任务一并取消
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
         # 记录执行统计
-        self.logger.info(f"深度分析完成: 执行了 {executed_count}/{len(selected_theory_names)} 个理论")
+        self.logger.info(
+            f"深度分析完成: 执行了 {len(tasks)}/{len(selected_theory_names)} 个理论，成功 {completed_count} 个"
+        )
         if skipped_theories:
             self.logger.warning(f"被跳过的理论: {skipped_theories}")
 
@@ -0,0 +1,216 @@
+"""
+八字模块 - 批量四柱计算
+
+用 NumPy 对成批的时刻一次算出四柱六十甲子序号、五行个数和十神，
+供候选时辰扫描、批量导入档案、"某年所有某日柱的日子"等场景使用，避免逐个调用 calculate_full_bazi。
+
+所有时刻先换算为距节气表起点（utils.solar_terms）的分钟数：
+- 年柱、月柱：在精确节气时刻表上 searchsorted，精确到分钟（立春换年，节换月）
+- 日柱：按日序数推算，与 calculate_day_pillar 一致（0点换日）
+- 时柱：日上起时，23点为子时，与 calculate_hour_pillar 一致
+
+输入可以是 datetime 序列或 datetime64 数组（北京时间、不带时区）；
+长时间范围用 iter_pillars_range 分块生成，内存占用与块大小成正比。
+"""
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from utils import ganzhi
+from utils.solar_terms import get_solar_term_table
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_JIAZI = np.arange(60)
+# 每个甲子的五行贡献（干、支各一），(60, 5)
+_JIAZI_WUXING = (
+    (np.array(ganzhi.GAN_WUXING)[_JIAZI % 10, None] == np.arange(5)).astype(np.int8)
+    + (np.array(ganzhi.ZHI_WUXING)[_JIAZI % 12, None] == np.arange(5)).astype(np.int8)
+)
+_JIAZI_WUXING_PACKED = np.zeros((60, 8), dtype=np.int8)
+_JIAZI_WUXING_PACKED[:, :5] = _JIAZI_WUXING
+_JIAZI_WUXING_PACKED = _JIAZI_WUXING_PACKED.view(np.int64).ravel()
+# 日柱甲子 × 他柱甲子 -> 他柱天干的十神，展平为 日柱 × 60 + 他柱
+_JIAZI_TEN_GOD_FLAT = np.array(ganzhi.TEN_GOD, dtype=np.int8)[_JIAZI[:, None] % 10, _JIAZI[None, :] % 10].ravel()
+# 日柱甲子 × 当日分钟 -> 时柱甲子（日上起时，23点为子时），(60, 1440)
+_HOUR_ZHI_BY_MINUTE = (np.arange(1440) // 60 + 1) // 2 % 12
+_HOUR_JIAZI = np.array([
+    [ganzhi.jiazi(ganzhi.hour_gan(day % 10, zhi), zhi) for zhi in _HOUR_ZHI_BY_MINUTE]
+    for day in range(60)
+], dtype=np.int8).ravel()
+
+DatetimesLike = Union[Sequence[datetime], np.ndarray]
+
+
+class PillarBatch(NamedTuple):
+    """
+    批量四柱结果（第 i 行对应第 i 个时刻）
+
+    四柱为六十甲子序号（0=甲子），五行计数按木火土金水排列，
+    十神按年干、月干、日干、时干排列（序号见 utils.ganzhi.TEN_GOD_NAMES，日干恒为比肩）。
+    """
+    year: np.ndarray      # (n,) int8
+    month: np.ndarray     # (n,) int8
+    day: np.ndarray       # (n,) int8
+    hour: np.ndarray      # (n,) int8
+    wuxing: np.ndarray    # (n, 5) int8
+    ten_gods: np.ndarray  # (n, 4) int8
+
+    def __len__(self) -> int:
+        return len(self.year)
+
+    def pillars(self) -> np.ndarray:
+        """四柱序号矩阵 (n, 4)：年、月、日、时"""
+        return np.stack([self.year, self.month, self.day, self.hour], axis=1)
+
+    def names(self, row: int) -> list:
+        """第 row 个时刻的四柱文字，如 ['庚午', '辛巳', '壬寅', '丁未']"""
+        return [ganzhi.JIAZI_NAMES[index] for index in self.pillars()[row]]
+
+
+def _epoch() -> np.datetime64:
+    return np.datetime64(get_solar_term_table().epoch, "m")
+
+
+class _TermIndex(NamedTuple):
+    """按日预先展开的节气位置索引（两个节气不会落在同一天）"""
+    table: object
+    day_position: np.ndarray      # 每日0点所在节气的位置（首个节气之前为-1）
+    day_next_term: np.ndarray     # 当日之后下一个节气的分钟数
+    year_by_position: np.ndarray  # 节气位置 -> 年柱甲子序号
+    month_by_position: np.ndarray  # 节气位置 -> 月柱甲子序号
+
+
+_term_index: Optional[_TermIndex] = None
+
+
+def _get_term_index() -> _TermIndex:
+    """节气表对应的按日索引（节气表替换后重建）"""
+    global _term_index
+    table = get_solar_term_table()
+    if _term_index is None or _term_index.table is not table:
+        terms = np.frombuffer(table.minutes(), dtype=np.uint32).astype(np.int64)
+        midnights = np.arange(terms[-1] // 1440 + 1, dtype=np.int64) * 1440
+        day_position = np.searchsorted(terms, midnights, side="right") - 1
+        next_terms = np.append(terms, np.iinfo(np.int64).max)
+        day_next_term = next_terms[day_position + 1]
+
+        position = np.arange(len(terms))
+        term_index = position % 24
+        year = table.start_year + position // 24 - (term_index < 2)
+        month_index = ((term_index - 2) // 2) % 12
+        month_gan = ((year - 4) % 10 % 5 * 2 + 2 + month_index) % 10
+        month_zhi = (month_index + 2) % 12
+        _term_index = _TermIndex(
+            table, day_position, day_next_term,
+            ((year - 4) % 60).astype(np.int8),
+            ((6 * month_gan - 5 * month_zhi) % 60).astype(np.int8)
+        )
+    return _term_index
+
+
+def to_table_minutes(datetimes: DatetimesLike) -> np.ndarray:
+    """时刻转为距节气表起点的分钟数（int64，秒以下舍去）"""
+    values = np.asarray(datetimes)
+    if values.dtype.kind != "M":
+        values = np.array(list(datetimes), dtype="datetime64[m]")
+    return (values.astype("datetime64[m]") - _epoch()).astype(np.int64)
+
+
+def calculate_pillars_from_minutes(minutes: np.ndarray) -> PillarBatch:
+    """
+    按距节气表起点的分钟数批量计算四柱
+
+    Args:
+        minutes: 分钟数数组（int64）
+
+    Returns:
+        批量四柱结果
+    """
+    index = _get_term_index()
+    table = index.table
+    minutes = np.asarray(minutes, dtype=np.int64)
+    count = len(minutes)
+    if count == 0:
+        empty = np.zeros(0, dtype=np.int8)
+        return PillarBatch(empty, empty, empty, empty,
+                           np.zeros((0, 5), dtype=np.int8), np.zeros((0, 4), dtype=np.int8))
+
+    days, minute_of_day = np.divmod(minutes, 1440)
+    if days.min() < 0 or days.max() >= len(index.day_position):
+        raise ValueError(f"时刻超出节气表范围（{table.start_year}-{table.end_year}年）")
+
+    # 年柱、月柱：所在节气的位置（与 SolarTermTable.position 一致）
+    position = index.day_position[days]
+    position += minutes >= index.day_next_term[days]
+    if position.min() < 0 or position.max() >= len(index.year_by_position) - 1:
+        raise ValueError(f"时刻超出节气表范围（{table.start_year}-{table.end_year}年）")
+
+    pillars = np.empty((count, 4), dtype=np.int8)
+    pillars[:, 0] = index.year_by_position[position]
+    pillars[:, 1] = index.month_by_position[position]
+
+    # 日柱：0点换日；时柱：日上起时
+    day_jiazi = (days + ganzhi.day_jiazi(table.epoch.date())) % 60
+    pillars[:, 2] = day_jiazi
+    pillars[:, 3] = _HOUR_JIAZI[day_jiazi * 1440 + minute_of_day]
+
+    # 五行：每柱的五行计数按字节打包在一个 int64 里，相加即得四柱合计（每项不超过8，不会进位）
+    packed = _JIAZI_WUXING_PACKED[pillars[:, 0]]
+    for column in range(1, 4):
+        packed += _JIAZI_WUXING_PACKED[pillars[:, column]]
+    wuxing = packed.view(np.int8).reshape(count, 8)[:, :5]
+
+    ten_gods = np.empty((count, 4), dtype=np.int8)
+    day_row = day_jiazi * 60
+    for column in range(4):
+        ten_gods[:, column] = _JIAZI_TEN_GOD_FLAT[day_row + pillars[:, column]]
+
+    return PillarBatch(
+        year=pillars[:, 0], month=pillars[:, 1], day=pillars[:, 2], hour=pillars[:, 3],
+        wuxing=wuxing, ten_gods=ten_gods
+    )
+
+
+def calculate_pillars_batch(datetimes: DatetimesLike) -> PillarBatch:
+    """
+    批量计算四柱、五行个数和十神
+
+    Args:
+        datetimes: datetime 序列或 datetime64 数组（北京时间）
+
+    Returns:
+        批量四柱结果
+    """
+    return calculate_pillars_from_minutes(to_table_minutes(datetimes))
+
+
+def iter_pillars_range(
+    start: datetime,
+    end: datetime,
+    step: timedelta = timedelta(minutes=1),
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple]:
+    """
+    分块计算 [start, end) 内等间隔时刻的四柱
+
+    Args:
+        start: 起始时刻（含）
+        end: 结束时刻（不含）
+        step: 间隔（整分钟）
+        chunk_size: 每块时刻数
+
+    Yields:
+        (块内第一个时刻距 start 的步数, PillarBatch)
+    """
+    step_minutes, remainder = divmod(step, timedelta(minutes=1))
+    if remainder or step_minutes <= 0:
+        raise ValueError("间隔必须为正的整分钟数")
+    first = int(to_table_minutes([start])[0])
+    count = -(-int(to_table_minutes([end])[0] - first) // step_minutes)
+
+    for offset in range(0, max(count, 0), chunk_size):
+        steps = np.arange(offset, min(offset + chunk_size, count), dtype=np.int64)
+        yield offset, calculate_pillars_from_minutes(first + steps * step_minutes)
@@ -7,13 +7,28 @@ V2增强：
 - 多时辰并行计算
 - 时辰处理器集成
 """
-from datetime import datetime, timedelta
-from typing import Tuple, Dict, List, Any, Optional
+from datetime import date, datetime, timedelta
+from typing import Tuple, Dict, List, Any, Optional, Sequence
 from .constants import *
+from .batch import DatetimesLike, PillarBatch, calculate_pillars_batch
+from .candidates import BaZiCandidateSet, DateContext, ShenshaRule
+from .pillar_index import PillarsLike, PillarWindow, find_datetimes
+from utils import ganzhi
+from utils.ganzhi import GAN_INDEX, GAN_NAMES, ZHI_NAMES, WUXING_NAMES, TEN_GOD, TEN_GOD_NAMES
 from utils.lunar_calendar import LunarCalendar
+from utils.solar_terms import get_jie_month
 from utils.cache_manager import cached, performance_monitor
 
 
+# 按六十甲子序号排列的纳音
+NA_YIN_BY_JIAZI = tuple(NA_YIN[name] for name in ganzhi.JIAZI_NAMES)
+
+
+def _split(index: int) -> Tuple[str, str]:
+    """六十甲子序号转 (天干, 地支) 文字"""
+    return GAN_NAMES[index % 10], ZHI_NAMES[index % 12]
+
+
 class BaZiCalculator:
     """八字计算器"""
 
@@ -55,58 +70,117 @@ class BaZiCalculator:
             except ValueError as e:
                 raise ValueError(f"农历日期转换失败：{e}")
 
-        # 计算四柱
-        year_pillar = self.calculate_year_pillar(year, month, day)
-        month_pillar = self.calculate_month_pillar(year, month, day)
-        day_pillar = self.calculate_day_pillar(year, month, day)
-        hour_pillar = None
-        if hour is not None:
-            hour_pillar = self.calculate_hour_pillar(day_pillar[0], hour)
+        # 计算四柱（六十甲子序号，输出时再转文字）
+        year_index, month_index, day_index, hour_index = self.calculate_pillar_indices(year, month, day, hour)
+        context = self._build_date_context(year, month, day, year_index, month_index, day_index, gender)
+        return self._assemble_bazi(context, hour, hour_index)
+
+    def calculate_candidates(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        candidate_hours: Sequence[int],
+        gender: Optional[str] = None,
+        calendar_type: str = "solar"
+    ) -> List[Dict[str, Any]]:
+        """
+        计算同一出生日期多个候选时辰的八字（日期级部分只算一次）
+
+        Args:
+            year: 出生年
+            month: 出生月
+            day: 出生日
+            candidate_hours: 候选小时列表
+            gender: 性别
+            calendar_type: 历法类型
+
+        Returns:
+            与 candidate_hours 顺序一致的结果列表，每项带 candidate_hour；
+            出错的时辰为 {"candidate_hour", "error"}
+        """
+        try:
+            candidate_set = BaZiCandidateSet(self, year, month, day, gender, calendar_type)
+        except ValueError as e:
+            return [{"candidate_hour": hour, "error": str(e)} for hour in candidate_hours]
+        return candidate_set.calculate_all(candidate_hours)
+
+    def _build_date_context(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        year_index: int,
+        month_index: int,
+        day_index: int,
+        gender: Optional[str]
+    ) -> DateContext:
+        """与时辰无关的部分：大运、神煞规则"""
+        year_pillar, month_pillar, day_pillar = _split(year_index), _split(month_index), _split(day_index)
+
+        # 计算大运（如果有性别）
+        dayun = ()
+        if gender:
+            dayun = tuple(self.calculate_dayun(year_pillar, month_pillar, gender, year, month, day))
+
+        shensha_rules = self._shensha_rules(
+            year_gan=year_pillar[0],
+            year_zhi=year_pillar[1],
+            month_zhi=month_pillar[1],
+            day_gan=day_pillar[0]
+        )
+
+        return DateContext(
+            year, month, day, year_index, month_index, day_index, gender, dayun, tuple(shensha_rules)
+        )
+
+    def _assemble_bazi(
+        self,
+        context: DateContext,
+        hour: Optional[int],
+        hour_index: Optional[int]
+    ) -> Dict[str, Any]:
+        """在日期上下文上补算时柱相关部分，组装完整八字"""
+        year_pillar, month_pillar, day_pillar = (
+            _split(i) for i in (context.year_index, context.month_index, context.day_index)
+        )
+        hour_pillar = _split(hour_index) if hour_index is not None else None
+        present = [context.year_index, context.month_index, context.day_index]
+        if hour_index is not None:
+            present.append(hour_index)
 
         # 构建四柱列表
-        four_pillars = [
-            f"{year_pillar[0]}{year_pillar[1]}",
-            f"{month_pillar[0]}{month_pillar[1]}",
-            f"{day_pillar[0]}{day_pillar[1]}"
-        ]
-        if hour_pillar:
-            four_pillars.append(f"{hour_pillar[0]}{hour_pillar[1]}")
+        four_pillars = [ganzhi.JIAZI_NAMES[i] for i in present]
 
         # 日主
-        day_master = day_pillar[0]
+        day_master_index = context.day_index % 10
+        day_master = GAN_NAMES[day_master_index]
 
         # 计算十神
-        ten_gods = self.calculate_ten_gods(day_master, year_pillar[0], month_pillar[0], day_pillar[0], hour_pillar[0] if hour_pillar else None)
+        ten_gods = {
+            position: TEN_GOD_NAMES[TEN_GOD[day_master_index][index % 10]]
+            for position, index in zip(("年干", "月干", "日干", "时干"), present)
+        }
 
         # 计算五行
-        wuxing_count = self.calculate_wuxing_count([year_pillar, month_pillar, day_pillar, hour_pillar] if hour_pillar else [year_pillar, month_pillar, day_pillar])
+        wuxing_count = self._summarize_wuxing(
+            ganzhi.count_wuxing([i % 10 for i in present], [i % 12 for i in present])
+        )
 
         # 分析用神
         useful_god_analysis = self.analyze_useful_god(day_master, wuxing_count)
 
         # 计算纳音
         nayin = {
-            "年柱": NA_YIN.get(f"{year_pillar[0]}{year_pillar[1]}", "未知"),
-            "月柱": NA_YIN.get(f"{month_pillar[0]}{month_pillar[1]}", "未知"),
-            "日柱": NA_YIN.get(f"{day_pillar[0]}{day_pillar[1]}", "未知")
+            position: NA_YIN_BY_JIAZI[index]
+            for position, index in zip(("年柱", "月柱", "日柱", "时柱"), present)
         }
-        if hour_pillar:
-            nayin["时柱"] = NA_YIN.get(f"{hour_pillar[0]}{hour_pillar[1]}", "未知")
-
-        # 计算大运（如果有性别）
-        dayun_list = []
-        if gender:
-            dayun_list = self.calculate_dayun(year_pillar, month_pillar, gender, year, month, day)
 
         # 计算神煞
-        shensha = self.calculate_shensha(
-            year_gan=year_pillar[0],
-            year_zhi=year_pillar[1],
-            month_zhi=month_pillar[1],
-            day_gan=day_pillar[0],
-            day_zhi=day_pillar[1],
-            hour_zhi=hour_pillar[1] if hour_pillar else None
-        )
+        pillars_zhi = [year_pillar[1], month_pillar[1], day_pillar[1]]
+        if hour_pillar:
+            pillars_zhi.append(hour_pillar[1])
+        shensha = self._place_shensha(context.shensha_rules, pillars_zhi)
 
         # 分析神煞影响
         shensha_analysis = self.analyze_shensha_influence(shensha)
@@ -126,63 +200,118 @@ class BaZiCalculator:
             "用神分析": useful_god_analysis,
             "神煞": shensha,
             "神煞分析": shensha_analysis,
-            "大运": dayun_list,
+            "大运": [dict(step) for step in context.dayun],
             "置信度": confidence
         }
 
-    def calculate_year_pillar(self, year: int, month: int, day: int) -> Tuple[str, str]:
+    def calculate_year_pillar(self, year: int, month: int, day: int, hour: Optional[int] = None) -> Tuple[str, str]:
         """
-        计算年柱（注意立春换年）
+        计算年柱（按立春精确时刻换年）
 
         Args:
             year: 年份
             month: 月份
             day: 日期
+            hour: 小时（0-23），未知时按当日正午判断节气
 
         Returns:
             (年干, 年支)
         """
-        # 简化处理：立春一般在2月4-5日
-        # 如果在立春前，年份减1
-        actual_year = year
-        if month < 2 or (month == 2 and day < 4):
-            actual_year -= 1
+        actual_year, _ = get_jie_month(self._solar_term_moment(year, month, day, hour))
+        return _split(ganzhi.year_jiazi(actual_year))
+
+    def calculate_month_pillar(self, year: int, month: int, day: int, hour: Optional[int] = None) -> Tuple[str, str]:
+        """
+        计算月柱（按节的精确时刻换月）
+
+        Args:
+            year: 年份
+            month: 月份
+            day: 日期
+            hour: 小时（0-23），未知时按当日正午判断节气
+
+        Returns:
+            (月干, 月支)
+        """
+        actual_year, month_index = get_jie_month(self._solar_term_moment(year, month, day, hour))
+        return _split(self._month_jiazi(actual_year, month_index))
+
+    @staticmethod
+    def _month_jiazi(actual_year: int, month_index: int) -> int:
+        """
+        月柱甲子序号（年上起月）
 
-        # 计算年干（从甲子年1984年开始）
-        year_gan_index = (actual_year - 4) % 10
-        year_zhi_index = (actual_year - 4) % 12
+        Args:
+            actual_year: 干支纪年的年份
+            month_index: 月序号，0=寅月（立春-惊蛰）... 11=丑月（小寒-立春）
+        """
+        year_gan = ganzhi.year_jiazi(actual_year) % 10
+        return ganzhi.jiazi(ganzhi.month_gan(year_gan, month_index), ganzhi.month_zhi(month_index))
 
-        return (TIAN_GAN[year_gan_index], DI_ZHI[year_zhi_index])
+    @staticmethod
+    def _hour_jiazi(day_gan: int, hour: int) -> int:
+        """时柱甲子序号（日上起时），小时超出0-23时按子时"""
+        zhi = ganzhi.hour_zhi(hour) if 0 <= hour <= 23 else 0
+        return ganzhi.jiazi(ganzhi.hour_gan(day_gan, zhi), zhi)
 
-    def calculate_month_pillar(self, year: int, month: int, day: int) -> Tuple[str, str]:
+    def calculate_pillar_indices(
+        self,
+        year: int,
+        month: int,
+        day: int,
+        hour: Optional[int] = None
+    ) -> Tuple[int, int, int, Optional[int]]:
         """
-        计算月柱（注意节气换月）
+        计算四柱的六十甲子序号（0=甲子）
 
         Args:
             year: 年份
             month: 月份
             day: 日期
+            hour: 小时（0-23），未知时时柱为None
 
         Returns:
-            (月干, 月支)
+            (年柱, 月柱, 日柱, 时柱)
         """
-        # 简化处理：根据公历月份大致确定月支
-        # 实际应该根据节气精确计算
-        month_zhi_index = (month + 1) % 12  # 正月从寅开始
+        actual_year, month_index = get_jie_month(self._solar_term_moment(year, month, day, hour))
+        day_index = ganzhi.day_jiazi(date(year, month, day))
+        return (
+            ganzhi.year_jiazi(actual_year),
+            self._month_jiazi(actual_year, month_index),
+            day_index,
+            self._hour_jiazi(day_index % 10, hour) if hour is not None else None
+        )
 
-        # 获取年干
-        year_pillar = self.calculate_year_pillar(year, month, day)
-        year_gan = year_pillar[0]
+    def calculate_pillars_batch(self, datetimes: DatetimesLike) -> PillarBatch:
+        """
+        批量计算四柱、五行个数和十神（NumPy 向量化，见 theories.bazi.batch）
 
-        # 根据年干起月干
-        month_gan_base = MONTH_GAN_BASE.get(year_gan, "丙")
-        month_gan_base_index = TIAN_GAN.index(month_gan_base)
-        month_gan_index = (month_gan_base_index + month_zhi_index) % 10
+        年柱、月柱按精确节气时刻（精确到分钟）换年换月。
 
-        month_zhi = MONTH_ZHI[month_zhi_index]
-        month_gan = TIAN_GAN[month_gan_index]
+        Args:
+            datetimes: datetime 序列或 datetime64 数组（北京时间）
+
+        Returns:
+            批量四柱结果，四柱为六十甲子序号
+        """
+        return calculate_pillars_batch(datetimes)
+
+    def find_datetimes(self, pillars: PillarsLike) -> List[PillarWindow]:
+        """
+        由四柱（或缺时柱的三柱）反查1900-2100年间对应的公历时段
+
+        Args:
+            pillars: 四柱文字，如 "庚午 辛巳 壬寅 丁未" 或 ["庚午", "辛巳", "壬寅", "丁未"]
+
+        Returns:
+            按时间排序的 (开始, 结束) 时段列表，结束时刻不含；没有对应时段时为空列表
+        """
+        return find_datetimes(pillars)
 
-        return (month_gan, month_zhi)
+    @staticmethod
+    def _solar_term_moment(year: int, month: int, day: int, hour: Optional[int] = None) -> datetime:
+        """与节气比较的时刻（时辰未知时取当日正午）"""
+        return datetime(year, month, day, 12 if hour is None else hour)
 
     def calculate_day_pillar(self, year: int, month: int, day: int) -> Tuple[str, str]:
         """
@@ -196,21 +325,8 @@ class BaZiCalculator:
         Returns:
             (日干, 日支)
         """
-        # 使用蔡勒公式的变体计算日柱
-        # 基准日：2000年1月1日为庚辰日（JIA_ZI_60中的索引16）
-
-        base_date = datetime(2000, 1, 1)
-        target_date = datetime(year, month, day)
-        days_diff = (target_date - base_date).days
-
-        # 基准日的甲子索引（庚辰）
-        base_index = 16
-
-        # 计算目标日的甲子索引
-        target_index = (base_index + days_diff) % 60
-
-        jiazi = JIA_ZI_60[target_index]
-        return (jiazi[0], jiazi[1])
+        # 基准日：2000年1月1日为庚辰日
+        return _split(ganzhi.day_jiazi(date(year, month, day)))
 
     def calculate_hour_pillar(self, day_gan: str, hour: int) -> Tuple[str, str]:
         """
@@ -223,18 +339,7 @@ class BaZiCalculator:
         Returns:
             (时干, 时支)
         """
-        # 确定时支
-        hour_zhi = HOUR_ZHI_MAP.get(hour, "子")
-        hour_zhi_index = DI_ZHI.index(hour_zhi)
-
-        # 根据日干起时干
-        hour_gan_base = HOUR_GAN_BASE.get(day_gan, "甲")
-        hour_gan_base_index = TIAN_GAN.index(hour_gan_base)
-        hour_gan_index = (hour_gan_base_index + hour_zhi_index) % 10
-
-        hour_gan = TIAN_GAN[hour_gan_index]
-
-        return (hour_gan, hour_zhi)
+        return _split(self._hour_jiazi(GAN_INDEX[day_gan], hour))
 
     def calculate_ten_gods(
         self,
@@ -257,14 +362,15 @@ class BaZiCalculator:
         Returns:
             十神字典
         """
+        gods = TEN_GOD[GAN_INDEX[day_master]]
         result = {
-            "年干": SHI_SHEN[day_master][year_gan],
-            "月干": SHI_SHEN[day_master][month_gan],
-            "日干": SHI_SHEN[day_master][day_gan]
+            "年干": TEN_GOD_NAMES[gods[GAN_INDEX[year_gan]]],
+            "月干": TEN_GOD_NAMES[gods[GAN_INDEX[month_gan]]],
+            "日干": TEN_GOD_NAMES[gods[GAN_INDEX[day_gan]]]
         }
 
         if hour_gan:
-            result["时干"] = SHI_SHEN[day_master][hour_gan]
+            result["时干"] = TEN_GOD_NAMES[gods[GAN_INDEX[hour_gan]]]
 
         return result
 
@@ -278,22 +384,17 @@ class BaZiCalculator:
         Returns:
             五行统计信息
         """
-        wuxing_count = {"木": 0, "火": 0, "土": 0, "金": 0, "水": 0}
-
-        for gan, zhi in pillars:
-            if gan and gan in TIAN_GAN_WUXING:
-                wuxing_count[TIAN_GAN_WUXING[gan]] += 1
-            if zhi and zhi in DI_ZHI_WUXING:
-                wuxing_count[DI_ZHI_WUXING[zhi]] += 1
-
-        # 找出最旺和最弱
-        max_wuxing = max(wuxing_count, key=wuxing_count.get)
-        min_wuxing = min(wuxing_count, key=wuxing_count.get)
+        gans = [GAN_INDEX[gan] for gan, _ in pillars if gan in GAN_INDEX]
+        zhis = [ganzhi.ZHI_INDEX[zhi] for _, zhi in pillars if zhi in ganzhi.ZHI_INDEX]
+        return self._summarize_wuxing(ganzhi.count_wuxing(gans, zhis))
 
+    @staticmethod
+    def _summarize_wuxing(counts: List[int]) -> Dict[str, Any]:
+        """五行计数（按木火土金水排列）转为统计结果，并找出最旺和最弱"""
         return {
-            "统计": wuxing_count,
-            "最旺": max_wuxing,
-            "最弱": min_wuxing
+            "统计": dict(zip(WUXING_NAMES, counts)),
+            "最旺": WUXING_NAMES[counts.index(max(counts))],
+            "最弱": WUXING_NAMES[counts.index(min(counts))]
         }
 
     def analyze_useful_god(self, day_master: str, wuxing_count: Dict[str, Any]) -> Dict[str, Any]:
@@ -307,23 +408,23 @@ class BaZiCalculator:
         Returns:
             用神分析结果
         """
-        day_master_wuxing = TIAN_GAN_WUXING[day_master]
+        day_master_wuxing = ganzhi.GAN_WUXING[GAN_INDEX[day_master]]
         count = wuxing_count["统计"]
 
         # 简化判断：日主五行过旺则身强，过弱则身弱
-        day_master_count = count[day_master_wuxing]
+        day_master_count = count[WUXING_NAMES[day_master_wuxing]]
 
         if day_master_count >= 4:
             strength = "身强"
             # 身强需要克泄耗
-            ke_wuxing = WUXING_KE[day_master_wuxing]
-            xie_wuxing = WUXING_SHENG[day_master_wuxing]
+            ke_wuxing = ganzhi.KE_TARGET[day_master_wuxing]
+            xie_wuxing = ganzhi.SHENG_TARGET[day_master_wuxing]
             useful_god = ke_wuxing
             favorable = [ke_wuxing, xie_wuxing]
         elif day_master_count <= 1:
             strength = "身弱"
             # 身弱需要生扶
-            sheng_wuxing = [w for w, v in WUXING_SHENG.items() if v == day_master_wuxing][0]
+            sheng_wuxing = ganzhi.SHENG_SOURCE[day_master_wuxing]
             useful_god = sheng_wuxing
             favorable = [sheng_wuxing, day_master_wuxing]
         else:
@@ -332,13 +433,13 @@ class BaZiCalculator:
             favorable = [day_master_wuxing]
 
         # 忌神为用神所克的五行
-        unfavorable = [WUXING_KE[useful_god]] if useful_god in WUXING_KE else []
+        unfavorable = [ganzhi.KE_TARGET[useful_god]]
 
         return {
             "日主强弱": strength,
-            "用神": useful_god,
-            "喜神": favorable,
-            "忌神": unfavorable
+            "用神": WUXING_NAMES[useful_god],
+            "喜神": [WUXING_NAMES[w] for w in favorable],
+            "忌神": [WUXING_NAMES[w] for w in unfavorable]
         }
 
     def calculate_dayun(
@@ -365,13 +466,12 @@ class BaZiCalculator:
             大运列表
         """
         # 判断顺逆（阳男阴女顺排，阴男阳女逆排）
-        year_gan_yinyang = TIAN_GAN_YINYANG[year_pillar[0]]
-        is_forward = (year_gan_yinyang == "阳" and gender == "male") or \
-                    (year_gan_yinyang == "阴" and gender == "female")
+        year_gan_is_yang = GAN_INDEX[year_pillar[0]] % 2 == 0
+        is_forward = (year_gan_is_yang and gender == "male") or \
+                    (not year_gan_is_yang and gender == "female")
 
         # 获取月柱的甲子索引
-        month_jiazi = f"{month_pillar[0]}{month_pillar[1]}"
-        month_index = JIA_ZI_60.index(month_jiazi)
+        month_index = ganzhi.jiazi(GAN_INDEX[month_pillar[0]], ganzhi.ZHI_INDEX[month_pillar[1]])
 
         # 计算起运年龄（简化为8岁）
         start_age = 8
@@ -384,9 +484,8 @@ class BaZiCalculator:
             else:
                 dayun_index = (month_index - i - 1) % 60
 
-            dayun_jiazi = JIA_ZI_60[dayun_index]
-            dayun_gan = dayun_jiazi[0]
-            dayun_zhi = dayun_jiazi[1]
+            dayun_jiazi = ganzhi.JIAZI_NAMES[dayun_index]
+            dayun_gan, dayun_zhi = _split(dayun_index)
 
             dayun_list.append({
                 "大运": dayun_jiazi,
@@ -394,7 +493,7 @@ class BaZiCalculator:
                 "地支": dayun_zhi,
                 "起始年龄": start_age + i * 10,
                 "结束年龄": start_age + (i + 1) * 10 - 1,
-                "五行": TIAN_GAN_WUXING[dayun_gan]
+                "五行": WUXING_NAMES[ganzhi.GAN_WUXING[dayun_index % 10]]
             })
 
         return dayun_list
@@ -427,190 +526,96 @@ class BaZiCalculator:
         if hour_zhi:
             pillars_zhi.append(hour_zhi)
 
-        # 构建四柱天干列表（用于天德月德查询）
-        # 这里只需要年干和日干
-        pillars_gan = [year_gan, None, day_gan]  # 月干和时干在此不需要
-        if hour_zhi:
-            pillars_gan.append(None)
+        rules = self._shensha_rules(year_gan, year_zhi, month_zhi, day_gan)
+        return self._place_shensha(rules, pillars_zhi)
 
-        shensha_found = {
-            "贵人": [],
-            "吉星": [],
-            "中性": [],
-            "凶星": []
-        }
+    def _shensha_rules(
+        self,
+        year_gan: str,
+        year_zhi: str,
+        month_zhi: str,
+        day_gan: str
+    ) -> List[ShenshaRule]:
+        """
+        按年干支、月支、日干列出各神煞要找的目标（与时辰无关，候选时辰间共用）
+
+        Returns:
+            按输出顺序排列的神煞规则；天德、月德为天干时只查年干日干，已在此定位
+        """
+        rules = []
 
         # 1. 天乙贵人（日干查四柱地支）
-        tianyi_zhi_list = TIANYI_GUIREN.get(day_gan, [])
-        for zhi in tianyi_zhi_list:
-            if zhi in pillars_zhi:
-                position = self._get_pillar_position(zhi, pillars_zhi)
-                shensha_found["贵人"].append({
-                    "名称": "天乙贵人",
-                    "位置": position,
-                    "地支": zhi,
-                    "属性": SHENSHA_PROPERTIES["天乙贵人"]
-                })
+        for zhi in TIANYI_GUIREN.get(day_gan, []):
+            rules.append(ShenshaRule("贵人", "天乙贵人", "地支", zhi))
 
         # 2. 文昌贵人（日干查四柱地支）
         wenchang_zhi = WENCHANG_GUIREN.get(day_gan)
-        if wenchang_zhi and wenchang_zhi in pillars_zhi:
-            position = self._get_pillar_position(wenchang_zhi, pillars_zhi)
-            shensha_found["贵人"].append({
-                "名称": "文昌贵人",
-                "位置": position,
-                "地支": wenchang_zhi,
-                "属性": SHENSHA_PROPERTIES["文昌贵人"]
-            })
-
-        # 3. 天德贵人（月支查四柱天干或地支）
-        tiande = TIANDE_GUIREN.get(month_zhi)
-        if tiande:
-            # 天德可能是天干或地支
-            if tiande in TIAN_GAN:
-                # 查天干
-                if tiande == year_gan:
-                    shensha_found["贵人"].append({
-                        "名称": "天德贵人",
-                        "位置": "年柱",
-                        "天干": tiande,
-                        "属性": SHENSHA_PROPERTIES["天德贵人"]
-                    })
-                elif tiande == day_gan:
-                    shensha_found["贵人"].append({
-                        "名称": "天德贵人",
-                        "位置": "日柱",
-                        "天干": tiande,
-                        "属性": SHENSHA_PROPERTIES["天德贵人"]
-                    })
+        if wenchang_zhi:
+            rules.append(ShenshaRule("贵人", "文昌贵人", "地支", wenchang_zhi))
+
+        # 3. 天德贵人、4. 月德贵人（月支查四柱天干或地支）
+        for name, table in (("天德贵人", TIANDE_GUIREN), ("月德贵人", YUEDE_GUIREN)):
+            target = table.get(month_zhi)
+            if not target:
+                continue
+            if target in TIAN_GAN:
+                # 查天干（只查年干、日干）
+                if target == year_gan:
+                    rules.append(ShenshaRule("贵人", name, "天干", target, "年柱"))
+                elif target == day_gan:
+                    rules.append(ShenshaRule("贵人", name, "天干", target, "日柱"))
             else:
-                # 查地支
-                if tiande in pillars_zhi:
-                    position = self._get_pillar_position(tiande, pillars_zhi)
-                    shensha_found["贵人"].append({
-                        "名称": "天德贵人",
-                        "位置": position,
-                        "地支": tiande,
-                        "属性": SHENSHA_PROPERTIES["天德贵人"]
-                    })
-
-        # 4. 月德贵人（月支查四柱天干或地支）
-        yuede = YUEDE_GUIREN.get(month_zhi)
-        if yuede:
-            # 月德可能是天干或地支
-            if yuede in TIAN_GAN:
-                # 查天干
-                if yuede == year_gan:
-                    shensha_found["贵人"].append({
-                        "名称": "月德贵人",
-                        "位置": "年柱",
-                        "天干": yuede,
-                        "属性": SHENSHA_PROPERTIES["月德贵人"]
-                    })
-                elif yuede == day_gan:
-                    shensha_found["贵人"].append({
-                        "名称": "月德贵人",
-                        "位置": "日柱",
-                        "天干": yuede,
-                        "属性": SHENSHA_PROPERTIES["月德贵人"]
-                    })
-            else:
-                # 查地支
-                if yuede in pillars_zhi:
-                    position = self._get_pillar_position(yuede, pillars_zhi)
-                    shensha_found["贵人"].append({
-                        "名称": "月德贵人",
-                        "位置": position,
-                        "地支": yuede,
-                        "属性": SHENSHA_PROPERTIES["月德贵人"]
-                    })
-
-        # 5. 将星（年支查四柱地支）
-        jiangxing_zhi = JIANGXING.get(year_zhi)
-        if jiangxing_zhi and jiangxing_zhi in pillars_zhi:
-            position = self._get_pillar_position(jiangxing_zhi, pillars_zhi)
-            shensha_found["吉星"].append({
-                "名称": "将星",
-                "位置": position,
-                "地支": jiangxing_zhi,
-                "属性": SHENSHA_PROPERTIES["将星"]
-            })
-
-        # 6. 金舆（年支查四柱地支）
-        jinyu_zhi = JINYU.get(year_zhi)
-        if jinyu_zhi and jinyu_zhi in pillars_zhi:
-            position = self._get_pillar_position(jinyu_zhi, pillars_zhi)
-            shensha_found["吉星"].append({
-                "名称": "金舆",
-                "位置": position,
-                "地支": jinyu_zhi,
-                "属性": SHENSHA_PROPERTIES["金舆"]
-            })
-
-        # 7. 桃花（年支查四柱地支）
-        taohua_zhi = TAOHUA.get(year_zhi)
-        if taohua_zhi and taohua_zhi in pillars_zhi:
-            position = self._get_pillar_position(taohua_zhi, pillars_zhi)
-            shensha_found["中性"].append({
-                "名称": "桃花",
-                "位置": position,
-                "地支": taohua_zhi,
-                "属性": SHENSHA_PROPERTIES["桃花"]
-            })
-
-        # 8. 驿马（年支查四柱地支）
-        yima_zhi = YIMA.get(year_zhi)
-        if yima_zhi and yima_zhi in pillars_zhi:
-            position = self._get_pillar_position(yima_zhi, pillars_zhi)
-            shensha_found["中性"].append({
-                "名称": "驿马",
-                "位置": position,
-                "地支": yima_zhi,
-                "属性": SHENSHA_PROPERTIES["驿马"]
-            })
-
-        # 9. 华盖（年支查四柱地支）
-        huagai_zhi = HUAGAI.get(year_zhi)
-        if huagai_zhi and huagai_zhi in pillars_zhi:
-            position = self._get_pillar_position(huagai_zhi, pillars_zhi)
-            shensha_found["中性"].append({
-                "名称": "华盖",
-                "位置": position,
-                "地支": huagai_zhi,
-                "属性": SHENSHA_PROPERTIES["华盖"]
-            })
+                rules.append(ShenshaRule("贵人", name, "地支", target))
+
+        # 5-9. 将星、金舆（吉星），桃花、驿马、华盖（中性）：年支查四柱地支
+        for category, name, table in (
+            ("吉星", "将星", JIANGXING),
+            ("吉星", "金舆", JINYU),
+            ("中性", "桃花", TAOHUA),
+            ("中性", "驿马", YIMA),
+            ("中性", "华盖", HUAGAI)
+        ):
+            target = table.get(year_zhi)
+            if target:
+                rules.append(ShenshaRule(category, name, "地支", target))
 
         # 10. 羊刃（日干查四柱地支）
         yangren_zhi = YANGREN.get(day_gan)
-        if yangren_zhi and yangren_zhi in pillars_zhi:
-            position = self._get_pillar_position(yangren_zhi, pillars_zhi)
-            shensha_found["凶星"].append({
-                "名称": "羊刃",
-                "位置": position,
-                "地支": yangren_zhi,
-                "属性": SHENSHA_PROPERTIES["羊刃"]
-            })
+        if yangren_zhi:
+            rules.append(ShenshaRule("凶星", "羊刃", "地支", yangren_zhi))
 
-        # 11. 劫煞（年支查四柱地支）
-        jiesha_zhi = JIESHA.get(year_zhi)
-        if jiesha_zhi and jiesha_zhi in pillars_zhi:
-            position = self._get_pillar_position(jiesha_zhi, pillars_zhi)
-            shensha_found["凶星"].append({
-                "名称": "劫煞",
-                "位置": position,
-                "地支": jiesha_zhi,
-                "属性": SHENSHA_PROPERTIES["劫煞"]
-            })
+        # 11-12. 劫煞、灾煞（年支查四柱地支）
+        for name, table in (("劫煞", JIESHA), ("灾煞", ZAISHA)):
+            target = table.get(year_zhi)
+            if target:
+                rules.append(ShenshaRule("凶星", name, "地支", target))
+
+        return rules
 
-        # 12. 灾煞（年支查四柱地支）
-        zaisha_zhi = ZAISHA.get(year_zhi)
-        if zaisha_zhi and zaisha_zhi in pillars_zhi:
-            position = self._get_pillar_position(zaisha_zhi, pillars_zhi)
-            shensha_found["凶星"].append({
-                "名称": "灾煞",
+    def _place_shensha(
+        self,
+        rules: Sequence[ShenshaRule],
+        pillars_zhi: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """把神煞规则落到四柱上，地支类神煞取其在四柱中首次出现的位置"""
+        shensha_found = {
+            "贵人": [],
+            "吉星": [],
+            "中性": [],
+            "凶星": []
+        }
+
+        for rule in rules:
+            position = rule.position
+            if position is None:
+                if rule.target not in pillars_zhi:
+                    continue
+                position = self._get_pillar_position(rule.target, pillars_zhi)
+            shensha_found[rule.category].append({
+                "名称": rule.name,
                 "位置": position,
-                "地支": zaisha_zhi,
-                "属性": SHENSHA_PROPERTIES["灾煞"]
+                rule.field: rule.target,
+                "属性": SHENSHA_PROPERTIES[rule.name]
             })
 
         return shensha_found
@@ -1190,31 +1195,14 @@ class BaZiCalculator:
         Returns:
             包含所有候选八字分析的结果
         """
-        results = []
-        base_result = None
-
-        for hour in candidate_hours:
-            try:
-                # 计算该时辰的完整八字
-                bazi_result = self.calculate_full_bazi(
-                    year, month, day, hour, gender, calendar_type
-                )
-
-                # 保存第一个作为基准对比
-                if base_result is None:
-                    base_result = bazi_result
-
+        # 日期级部分（农历换算、年月日三柱、大运、神煞规则）各候选只算一次
+        results = self.calculate_candidates(
+            year, month, day, candidate_hours, gender, calendar_type
+        )
+        for bazi_result in results:
+            if "error" not in bazi_result:
                 # 标记该时辰的八字
-                bazi_result["candidate_hour"] = hour
-                bazi_result["hour_zhi"] = HOUR_ZHI_MAP.get(hour, "子")
-
-                results.append(bazi_result)
-
-            except Exception as e:
-                results.append({
-                    "candidate_hour": hour,
-                    "error": str(e)
-                })
+                bazi_result["hour_zhi"] = HOUR_ZHI_MAP.get(bazi_result["candidate_hour"], "子")
 
         # 分析不同时辰之间的差异
         differences = self._analyze_hour_differences(results) if len(results) > 1 else []
@@ -0,0 +1,142 @@
+"""
+八字模块 - 候选时辰共享计算
+
+时辰不确定时要为多个候选小时各排一盘，而农历换算、年月日三柱、大运、
+只与年月日相关的神煞规则在各候选之间完全相同。
+BaZiCandidateSet 对同一出生日期只算一次日期级部分（DateContext），
+每个候选只补算时柱及其影响的十神、五行、用神、神煞，
+十二时辰全排的开销与单排一盘相当。
+
+节气当天年柱、月柱可能随时辰变化：先比较当日0点与23点的节气月，
+相同则全天共用一个 DateContext，不同才按小时分别建立。
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from utils.lunar_calendar import LunarCalendar
+
+
+class ShenshaRule(NamedTuple):
+    """神煞规则：target 为天干时已按年干、日干定位（position），为地支时待查四柱地支"""
+    category: str
+    name: str
+    field: str  # "天干" / "地支"
+    target: str
+    position: Optional[str] = None
+
+
+class DateContext(NamedTuple):
+    """出生日期级的共享计算结果（与时辰无关）"""
+    year: int
+    month: int
+    day: int
+    year_index: int
+    month_index: int
+    day_index: int
+    gender: Optional[str]
+    dayun: Tuple[Dict[str, Any], ...]
+    shensha_rules: Tuple[ShenshaRule, ...]
+
+
+class BaZiCandidateSet:
+    """同一出生日期、多个候选时辰的八字"""
+
+    def __init__(
+        self,
+        calculator,
+        year: int,
+        month: int,
+        day: int,
+        gender: Optional[str] = None,
+        calendar_type: str = "solar"
+    ):
+        """
+        初始化候选集（农历只换算一次）
+
+        Args:
+            calculator: BaZiCalculator 实例
+            year: 出生年
+            month: 出生月
+            day: 出生日
+            gender: 性别 "male"/"female"
+            calendar_type: 历法类型 "solar"/"lunar"
+
+        Raises:
+            ValueError: 农历日期转换失败
+        """
+        if calendar_type == "lunar":
+            try:
+                solar_date = LunarCalendar.lunar_to_solar(year, month, day, is_leap_month=False)
+            except ValueError as e:
+                raise ValueError(f"农历日期转换失败：{e}")
+            year, month, day = solar_date.year, solar_date.month, solar_date.day
+
+        self.calculator = calculator
+        self.year = year
+        self.month = month
+        self.day = day
+        self.gender = gender
+        self._contexts: Dict[Tuple[int, int, int], DateContext] = {}
+
+        first = calculator.calculate_pillar_indices(year, month, day, 0)
+        last = calculator.calculate_pillar_indices(year, month, day, 23)
+        # 全天不跨节时所有小时共用一个上下文
+        self._shared = self._context(first[:3]) if first[:2] == last[:2] else None
+
+    def _context(self, indices: Tuple[int, int, int]) -> DateContext:
+        context = self._contexts.get(indices)
+        if context is None:
+            context = self.calculator._build_date_context(
+                self.year, self.month, self.day, *indices, self.gender
+            )
+            self._contexts[indices] = context
+        return context
+
+    def context_for(self, hour: Optional[int]) -> DateContext:
+        """
+        取某小时所用的日期上下文
+
+        Args:
+            hour: 小时（0-23），None表示时辰未知（按当日正午判断节气）
+        """
+        if self._shared is not None:
+            return self._shared
+        indices = self.calculator.calculate_pillar_indices(self.year, self.month, self.day, hour)
+        return self._context(indices[:3])
+
+    def calculate(self, hour: Optional[int]) -> Dict[str, Any]:
+        """
+        单个候选时辰的完整八字，结果与 calculate_full_bazi 相同
+
+        Args:
+            hour: 小时（0-23）或None
+
+        Raises:
+            ValueError: 小时超出0-23
+        """
+        if hour is not None and not 0 <= hour <= 23:
+            raise ValueError(f"小时超出范围（0-23）：{hour}")
+        context = self.context_for(hour)
+        hour_index = None
+        if hour is not None:
+            hour_index = self.calculator._hour_jiazi(context.day_index % 10, hour)
+        return self.calculator._assemble_bazi(context, hour, hour_index)
+
+    def calculate_all(self, hours: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        计算全部候选时辰，出错的时辰返回 {"candidate_hour", "error"}
+
+        Args:
+            hours: 候选小时列表
+
+        Returns:
+            与 hours 顺序一致的结果列表，每项带 candidate_hour
+        """
+        return [self._calculate_candidate(hour) for hour in hours]
+
+    def _calculate_candidate(self, hour: int) -> Dict[str, Any]:
+        try:
+            result = self.calculate(hour)
+        except Exception as e:
+            return {"candidate_hour": hour, "error": str(e)}
+        result["candidate_hour"] = hour
+        return result
@@ -0,0 +1,152 @@
+"""
+八字模块 - 四柱反查
+
+由四柱（或缺时柱的三柱）反查1900-2100年间所有对应的公历时段。
+
+年柱、月柱只随节换：以精确节气时刻表（utils.solar_terms）为基础，建立
+(年柱, 月柱) -> 节气月时段 的倒排索引（约2400个节气月，按需一次建成，约几毫秒）。
+一个节气月不足60天，同一日柱在其中至多出现一次，因此日柱、时柱在每个候选节气月内
+直接按日序数推算，不需要逐日或逐时枚举。
+
+换日、换时规则与 BaZiCalculator 一致：0点换日，23点为子时（日干仍取当日），
+年柱、月柱在节气时刻（精确到分钟）切换。
+"""
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from utils import ganzhi
+from utils.solar_terms import get_solar_term_table
+
+
+SEARCH_START = datetime(1900, 1, 1)
+SEARCH_END = datetime(2101, 1, 1)  # 不含
+
+_MINUTES_PER_DAY = 1440
+
+PillarsLike = Union[str, Sequence[str]]
+
+
+class PillarWindow(NamedTuple):
+    """与四柱对应的一个公历时段 [start, end)"""
+    start: datetime
+    end: datetime
+
+
+def parse_pillars(pillars: PillarsLike) -> List[int]:
+    """
+    解析四柱（或三柱）为六十甲子序号
+
+    Args:
+        pillars: "庚午 辛巳 壬寅 丁未"、"庚午辛巳壬寅丁未" 或 ["庚午", "辛巳", "壬寅", "丁未"]
+
+    Returns:
+        [年柱, 月柱, 日柱, (时柱)]
+    """
+    if isinstance(pillars, str):
+        text = re.sub(r"[\s,，、/|年月日时柱]+", "", pillars)
+        names = [text[i:i + 2] for i in range(0, len(text), 2)]
+    else:
+        names = [name.strip() for name in pillars]
+    if len(names) not in (3, 4):
+        raise ValueError(f"需要三柱或四柱，得到{len(names)}柱：{pillars}")
+    return [ganzhi.parse_jiazi(name) for name in names]
+
+
+class PillarIndex:
+    """四柱反查索引"""
+
+    def __init__(self, table=None):
+        table = table or get_solar_term_table()
+        self.epoch = table.epoch
+        self._first_minute = (SEARCH_START - self.epoch) // timedelta(minutes=1)
+        self._last_minute = (SEARCH_END - self.epoch) // timedelta(minutes=1)
+        self._epoch_day_jiazi = ganzhi.day_jiazi(self.epoch.date())
+        self._months: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+        minutes = table.minutes()
+        for position in range(2, len(minutes) - 2, 2):  # 偶数位置为"节"
+            start, end = minutes[position], minutes[position + 2]
+            if end <= self._first_minute or start >= self._last_minute:
+                continue
+            year = table.start_year + position // 24 - (position % 24 == 0)
+            month_index = ((position % 24 - 2) // 2) % 12
+            key = (ganzhi.year_jiazi(year), self._month_jiazi(year, month_index))
+            self._months.setdefault(key, []).append((start, end))
+
+    @staticmethod
+    def _month_jiazi(year: int, month_index: int) -> int:
+        month_gan = ganzhi.month_gan(ganzhi.year_jiazi(year) % 10, month_index)
+        return ganzhi.jiazi(month_gan, ganzhi.month_zhi(month_index))
+
+    @staticmethod
+    def _hour_spans(hour: Optional[int]) -> List[Tuple[int, int]]:
+        """时柱在一天内对应的分钟区间（子时分在0点和23点两段）"""
+        if hour is None:
+            return [(0, _MINUTES_PER_DAY)]
+        zhi = hour % 12
+        if zhi == 0:
+            return [(0, 60), (23 * 60, _MINUTES_PER_DAY)]
+        return [((2 * zhi - 1) * 60, (2 * zhi + 1) * 60)]
+
+    def find(self, year: int, month: int, day: int, hour: Optional[int] = None) -> List[PillarWindow]:
+        """
+        按六十甲子序号反查
+
+        Args:
+            year: 年柱序号
+            month: 月柱序号
+            day: 日柱序号
+            hour: 时柱序号（None 表示不限时辰）
+
+        Returns:
+            按时间排序的时段列表；干支组合不可能出现（如月干与年干不配、时干与日干不配）时为空
+        """
+        if hour is not None and ganzhi.hour_gan(day % 10, hour % 12) != hour % 10:
+            return []
+
+        windows = []
+        for month_start, month_end in self._months.get((year, month), ()):
+            month_start = max(month_start, self._first_minute)
+            month_end = min(month_end, self._last_minute)
+
+            first_day = month_start // _MINUTES_PER_DAY
+            day_number = first_day + (day - self._epoch_day_jiazi - first_day) % 60
+            day_start = day_number * _MINUTES_PER_DAY
+            for span_start, span_end in self._hour_spans(hour):
+                start = max(day_start + span_start, month_start)
+                end = min(day_start + span_end, month_end)
+                if start < end:
+                    windows.append(PillarWindow(
+                        self.epoch + timedelta(minutes=start),
+                        self.epoch + timedelta(minutes=end)
+                    ))
+        return windows
+
+
+_index: Optional[PillarIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_pillar_index() -> PillarIndex:
+    """获取全局四柱反查索引"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = PillarIndex()
+    return _index
+
+
+def find_datetimes(pillars: PillarsLike) -> List[PillarWindow]:
+    """
+    由四柱（或三柱）反查1900-2100年间对应的公历时段
+
+    Args:
+        pillars: 四柱文字，如 "庚午 辛巳 壬寅 丁未"
+
+    Returns:
+        按时间排序的时段列表
+    """
+    return get_pillar_index().find(*parse_pillars(pillars))
@@ -3,8 +3,11 @@
 使用Kimi AI验证和校正字的笔画、结构等信息
 """
 import asyncio
+import concurrent.futures
+import threading
 from typing import Dict, Any, Optional, Tuple
 from utils.logger import get_logger
+from utils.loop_service import get_loop_service
 
 
 class CeZiAIValidator:
@@ -140,57 +143,40 @@ class CeZiAIValidator:
         Returns:
             验证结果
         """
+        # 在全局后台事件循环上执行，复用其中的API连接；
+        # 调用方处于事件循环中或工作线程中（如问道流程经 run_in_executor 调用）时最多阻塞5秒
+        service = get_loop_service()
+        if service.in_loop_thread():
+            # 由后台事件循环中的协程同步调用，阻塞等待会死锁
+            self.logger.warning(f"字'{character}'在后台事件循环中无法同步等待AI验证，使用代码结果")
+            return self._code_result(code_stroke_count, code_structure, "事件循环内无法同步验证")
+
         try:
-            # 尝试获取当前事件循环
-            loop = asyncio.get_event_loop()
-            # 检查循环是否正在运行
-            if loop.is_running():
-                # 如果已经在事件循环中运行（如PyQt环境），使用线程池执行异步任务
-                import concurrent.futures
-
-                self.logger.info(f"字'{character}'使用线程池执行AI验证（PyQt环境）")
-
-                def run_async_in_thread():
-                    """在新线程中运行异步任务"""
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(
-                            self.validate_character_async(character, code_stroke_count, code_structure)
-                        )
-                    finally:
-                        new_loop.close()
-
-                # 使用线程池执行（设置超时5秒）
-                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(run_async_in_thread)
-                    try:
-                        return future.result(timeout=5.0)
-                    except concurrent.futures.TimeoutError:
-                        self.logger.warning(f"字'{character}'AI验证超时，使用代码结果")
-                        return {
-                            "validation_success": False,
-                            "use_code_result": True,
-                            "error": "AI验证超时",
-                            "final_stroke_count": code_stroke_count,
-                            "final_structure": code_structure,
-                            "confidence": 0.7
-                        }
-            else:
-                # 事件循环存在但未运行，可以使用 run_until_complete
-                return loop.run_until_complete(
-                    self.validate_character_async(character, code_stroke_count, code_structure)
-                )
+            asyncio.get_running_loop()
+            timeout = 5.0
         except RuntimeError:
-            # 没有事件循环，创建新的
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(
-                    self.validate_character_async(character, code_stroke_count, code_structure)
-                )
-            finally:
-                loop.close()
+            timeout = None if threading.current_thread() is threading.main_thread() else 5.0
+
+        try:
+            return service.run(
+                self.validate_character_async(character, code_stroke_count, code_structure),
+                timeout=timeout
+            )
+        except concurrent.futures.TimeoutError:
+            self.logger.warning(f"字'{character}'AI验证超时，使用代码结果")
+            return self._code_result(code_stroke_count, code_structure, "AI验证超时")
+
+    @staticmethod
+    def _code_result(code_stroke_count: int, code_structure: str, error: str) -> Dict[str, Any]:
+        """AI验证不可用时回退到代码计算结果"""
+        return {
+            "validation_success": False,
+            "use_code_result": True,
+            "error": error,
+            "final_stroke_count": code_stroke_count,
+            "final_structure": code_structure,
+            "confidence": 0.7
+        }
 
     async def _get_ai_parse(self, character: str) -> Optional[Dict[str, Any]]:
         """
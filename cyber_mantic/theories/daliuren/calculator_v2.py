@@ -10,9 +10,19 @@
 作者：赛博玄数团队
 日期：2026-01-04
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Dict, Any, List, Tuple, Optional
 from .constants import *
+from .ke_table import get_ke_table
+from utils import ganzhi
+from utils.ganzhi import GAN_NAMES, ZHI_NAMES, ZHI_INDEX
+from utils.solar_terms import get_last_zhongqi
+
+# 干支文字 -> 五行序号（天干、地支共用一张表）
+_WUXING_OF = {
+    **{name: ganzhi.GAN_WUXING[i] for i, name in enumerate(GAN_NAMES)},
+    **{name: ganzhi.ZHI_WUXING[i] for i, name in enumerate(ZHI_NAMES)}
+}
 
 
 class DaLiuRenCalculatorV2:
@@ -61,26 +71,16 @@ class DaLiuRenCalculatorV2:
         # 2. 计算时支
         hour_zhi = self._calculate_hour_zhi(hour)
 
-        # 3. 计算月将（正月登明在亥）
-        month_jiang = self._calculate_month_jiang(month)
+        # 3. 计算月将（按中气过宫）
+        month_jiang = self._calculate_month_jiang(datetime(year, month, day, hour))
 
-        # 4. 起四课（月将加时，寻地盘天盘）
-        si_ke = self._calculate_si_ke_accurate(day_gan, day_zhi, hour_zhi, month_jiang)
-
-        # 5. 取三传（九宗门发用规则）
-        san_chuan, fa_yong_method = self._calculate_san_chuan_complete(
-            si_ke, day_gan, day_zhi, hour_zhi
-        )
-
-        # 6. 配天将（昼夜顺逆）
-        tian_jiang_config = self._configure_tian_jiang_complete(
-            san_chuan, day_gan, hour_zhi, hour
-        )
-
-        # 7. 判断课体（九宗门分类）
-        ke_ti = self._determine_ke_ti_complete(
-            si_ke, san_chuan, day_gan, day_zhi, fa_yong_method
-        )
+        # 4-7. 取课：四课、三传、天将、课体只取决于日干支、月将和时支，从课表中取出
+        ke = get_ke_table().lookup(day_gan, day_zhi, hour_zhi, month_jiang)
+        si_ke = ke["四课"]
+        san_chuan = ke["三传"]
+        fa_yong_method = ke["发用方法"]
+        tian_jiang_config = ke["天将"]
+        ke_ti = ke["课体"]
 
         # 8. 吉凶分析
         judgment = self._analyze_judgment_complete(
@@ -109,6 +109,52 @@ class DaLiuRenCalculatorV2:
             "confidence": 0.85  # 提升置信度
         }
 
+    def _calculate_ke_reference(
+        self,
+        day_gan: str,
+        day_zhi: str,
+        hour_zhi: str,
+        month_jiang: str
+    ) -> Dict[str, Any]:
+        """
+        逐步起课（参考实现，用于生成课表和校验课表）
+
+        Args:
+            day_gan: 日干
+            day_zhi: 日支
+            hour_zhi: 时支
+            month_jiang: 月将
+
+        Returns:
+            {四课, 三传, 发用方法, 天将, 课体}
+        """
+        # 起四课（月将加时，寻地盘天盘）
+        si_ke = self._calculate_si_ke_accurate(day_gan, day_zhi, hour_zhi, month_jiang)
+
+        # 取三传（九宗门发用规则）
+        san_chuan, fa_yong_method = self._calculate_san_chuan_complete(
+            si_ke, day_gan, day_zhi, hour_zhi
+        )
+
+        # 配天将（昼夜顺逆）：昼夜只取决于时支，取该时辰的第二个小时代表
+        hour = (ZHI_INDEX[hour_zhi] * 2) % 24
+        tian_jiang_config = self._configure_tian_jiang_complete(
+            san_chuan, day_gan, hour_zhi, hour
+        )
+
+        # 判断课体（九宗门分类）
+        ke_ti = self._determine_ke_ti_complete(
+            si_ke, san_chuan, day_gan, day_zhi, fa_yong_method
+        )
+
+        return {
+            "四课": si_ke,
+            "三传": san_chuan,
+            "发用方法": fa_yong_method,
+            "天将": tian_jiang_config,
+            "课体": ke_ti
+        }
+
     # ============ 干支计算 ============
 
     def _calculate_day_ganzhi_accurate(
@@ -122,50 +168,21 @@ class DaLiuRenCalculatorV2:
 
         使用基准日法：2000-01-01为庚辰日
         """
-        base_date = datetime(2000, 1, 1)
-        target_date = datetime(year, month, day)
-        days_diff = (target_date - base_date).days
-
-        # 构造六十甲子表（与奇门遁甲V2相同）
-        sixty_jiazi = []
-        for i in range(60):
-            gan = TIAN_GAN[i % 10]
-            zhi = DI_ZHI[i % 12]
-            sixty_jiazi.append(f"{gan}{zhi}")
-
-        # 基准日的甲子索引（庚辰 = 16）
-        base_index = 16
-
-        # 计算目标日的甲子索引
-        target_index = (base_index + days_diff) % 60
-        ganzhi = sixty_jiazi[target_index]
-
-        return ganzhi[0], ganzhi[1]
+        index = ganzhi.day_jiazi(date(year, month, day))
+        return GAN_NAMES[index % 10], ZHI_NAMES[index % 12]
 
     def _calculate_hour_zhi(self, hour: int) -> str:
         """计算时支"""
-        hour_zhi_map = {
-            23: 0, 0: 0, 1: 1, 2: 1,
-            3: 2, 4: 2, 5: 3, 6: 3,
-            7: 4, 8: 4, 9: 5, 10: 5,
-            11: 6, 12: 6, 13: 7, 14: 7,
-            15: 8, 16: 8, 17: 9, 18: 9,
-            19: 10, 20: 10, 21: 11, 22: 11
-        }
-        zhi_index = hour_zhi_map.get(hour, 0)
-        return DI_ZHI[zhi_index]
+        return ZHI_NAMES[ganzhi.hour_zhi(hour) if 0 <= hour <= 23 else 0]
 
-    def _calculate_month_jiang(self, month: int) -> str:
+    def _calculate_month_jiang(self, moment: datetime) -> str:
         """
-        计算月将（正月登明在亥）
+        计算月将（按最近一个中气的精确时刻过宫）
 
-        正月亥，二月戌，三月酉...逆行
+        雨水后亥，春分后戌，谷雨后酉...逆行
         """
-        month_jiang_map = {
-            1: "亥", 2: "戌", 3: "酉", 4: "申", 5: "未", 6: "午",
-            7: "巳", 8: "辰", 9: "卯", 10: "寅", 11: "丑", 12: "子"
-        }
-        return month_jiang_map.get(month, "亥")
+        zhongqi, _ = get_last_zhongqi(moment)
+        return ZHONGQI_MONTH_JIANG[zhongqi]
 
     # ============ 四课排盘 ============
 
@@ -187,57 +204,22 @@ class DaLiuRenCalculatorV2:
 
         关键：月将加时 - 月将加在时支上，形成天盘
         """
-        # 计算月将加时（地盘）
-        month_jiang_index = DI_ZHI.index(month_jiang)
-        hour_zhi_index = DI_ZHI.index(hour_zhi)
-
-        # 地盘起始：月将在时支位置
-        # 例如：月将=亥(10)，时支=子(0)，则地盘从亥开始，亥在子位
-        # 地盘顺序：子丑寅卯辰巳午未申酉戌亥
-        # 天盘从月将开始顺排
-
-        # 建立地盘天盘对应关系
-        # 地盘固定：子(0)丑(1)寅(2)...亥(11)
-        # 天盘：从月将开始顺排，月将落在时支位置
-
-        # 计算偏移量
-        offset = (hour_zhi_index - month_jiang_index) % 12
-
-        def get_tian_pan_zhi(di_pan_zhi: str) -> str:
-            """根据地盘地支，查找天盘地支"""
-            di_pan_index = DI_ZHI.index(di_pan_zhi)
-            tian_pan_index = (di_pan_index + offset) % 12
-            return DI_ZHI[tian_pan_index]
-
-        # 第一课：日干上神
-        # 日干寻对应地支（天干纳地支）
-        day_gan_index = TIAN_GAN.index(day_gan)
-        # 甲乙配寅卯，丙丁配巳午，戊己配辰戌丑未，庚辛配申酉，壬癸配亥子
-        # 简化：直接映射到地支
-        gan_na_zhi_map = {
-            "甲": "寅", "乙": "卯",
-            "丙": "巳", "丁": "午",
-            "戊": "辰", "己": "未",
-            "庚": "申", "辛": "酉",
-            "壬": "亥", "癸": "子"
-        }
-        gan_di_pan_zhi = gan_na_zhi_map.get(day_gan, "子")
-        gan_shang_shen = get_tian_pan_zhi(gan_di_pan_zhi)
+        # 月将加时：月将落在时支上形成天盘，地盘固定为子丑寅...亥
+        # 天盘地支 = 地盘地支 + 偏移量（模12）
+        offset = (ZHI_INDEX[hour_zhi] - ZHI_INDEX[month_jiang]) % 12
 
-        # 第二课：干上神之下（干上神在地盘的位置）
-        # 干上神是天盘的某个地支，现在要找它在地盘的位置，反查天盘对应地盘
-        # 天盘A -> 地盘B，现在gan_shang_shen是天盘，要找对应的地盘位置
-        gan_shang_shen_index = DI_ZHI.index(gan_shang_shen)
-        gan_xia_shen_index = (gan_shang_shen_index - offset) % 12
-        gan_xia_shen = DI_ZHI[gan_xia_shen_index]
+        # 第一课：日干上神（日干寄宫：甲寅乙卯丙巳丁午戊辰己未庚申辛酉壬亥癸子）
+        gan_di_pan = ZHI_INDEX[self._gan_to_zhi(day_gan)]
+        gan_shang = (gan_di_pan + offset) % 12
 
         # 第三课：日支上神
-        zhi_shang_shen = get_tian_pan_zhi(day_zhi)
+        zhi_shang = (ZHI_INDEX[day_zhi] + offset) % 12
 
-        # 第四课：支上神之下
-        zhi_shang_shen_index = DI_ZHI.index(zhi_shang_shen)
-        zhi_xia_shen_index = (zhi_shang_shen_index - offset) % 12
-        zhi_xia_shen = DI_ZHI[zhi_xia_shen_index]
+        # 第二课、第四课：干上神、支上神之下（天盘反查地盘的位置）
+        gan_shang_shen = ZHI_NAMES[gan_shang]
+        gan_xia_shen = ZHI_NAMES[(gan_shang - offset) % 12]
+        zhi_shang_shen = ZHI_NAMES[zhi_shang]
+        zhi_xia_shen = ZHI_NAMES[(zhi_shang - offset) % 12]
 
         si_ke = [
             {
@@ -276,45 +258,22 @@ class DaLiuRenCalculatorV2:
         上克下：克
         无克：比、生等
         """
-        # 获取五行
-        xia_wuxing = self._get_wuxing(xia)
-        shang_wuxing = self._get_wuxing(shang)
-
-        # 判断克关系（金克木，木克土，土克水，水克火，火克金）
-        ke_map = {
-            "金": "木",
-            "木": "土",
-            "土": "水",
-            "水": "火",
-            "火": "金"
-        }
+        # 获取五行序号，查五行相克矩阵
+        xia_wuxing = _WUXING_OF.get(xia, ganzhi.EARTH)
+        shang_wuxing = _WUXING_OF.get(shang, ganzhi.EARTH)
 
-        if ke_map.get(xia_wuxing) == shang_wuxing:
+        if ganzhi.KE[xia_wuxing][shang_wuxing]:
             return "贼"  # 下克上
-        elif ke_map.get(shang_wuxing) == xia_wuxing:
+        elif ganzhi.KE[shang_wuxing][xia_wuxing]:
             return "克"  # 上克下
         elif xia == shang:
             return "比"
         else:
             return "无克"
 
-    def _get_wuxing(self, ganzhi: str) -> str:
+    def _get_wuxing(self, name: str) -> str:
         """获取干支的五行属性"""
-        wuxing_map = {
-            # 天干
-            "甲": "木", "乙": "木",
-            "丙": "火", "丁": "火",
-            "戊": "土", "己": "土",
-            "庚": "金", "辛": "金",
-            "壬": "水", "癸": "水",
-            # 地支
-            "子": "水", "亥": "水",
-            "寅": "木", "卯": "木",
-            "巳": "火", "午": "火",
-            "申": "金", "酉": "金",
-            "辰": "土", "戌": "土", "丑": "土", "未": "土"
-        }
-        return wuxing_map.get(ganzhi, "土")
+        return ganzhi.WUXING_NAMES[_WUXING_OF.get(name, ganzhi.EARTH)]
 
     # ============ 九宗门取三传 ============
 
@@ -412,7 +371,7 @@ class DaLiuRenCalculatorV2:
             xia_zhi = ke["下"]
             shang_zhi = ke["上"]
             # 判断是否相冲
-            if DI_ZHI_CHONG.get(xia_zhi) == shang_zhi:
+            if xia_zhi in ZHI_INDEX and ganzhi.CHONG[ZHI_INDEX[xia_zhi]] == ZHI_INDEX[shang_zhi]:
                 fan_yin_count += 1
 
         # 如果4课中有3课以上返吟，判定为返吟课
@@ -517,12 +476,12 @@ class DaLiuRenCalculatorV2:
         max_ke_shen = max(ke_count, key=ke_count.get)
 
         # 从max_ke_shen开始顺数三传
-        max_ke_index = DI_ZHI.index(max_ke_shen)
+        max_ke_index = ZHI_INDEX[max_ke_shen]
 
         return [
-            {"传名": "初传", "地支": DI_ZHI[max_ke_index], "来源": "涉害"},
-            {"传名": "中传", "地支": DI_ZHI[(max_ke_index + 1) % 12], "来源": "涉害顺数"},
-            {"传名": "末传", "地支": DI_ZHI[(max_ke_index + 2) % 12], "来源": "涉害顺数"}
+            {"传名": "初传", "地支": ZHI_NAMES[max_ke_index], "来源": "涉害"},
+            {"传名": "中传", "地支": ZHI_NAMES[(max_ke_index + 1) % 12], "来源": "涉害顺数"},
+            {"传名": "末传", "地支": ZHI_NAMES[(max_ke_index + 2) % 12], "来源": "涉害顺数"}
         ]
 
     def _fa_yong_ba_zhuan(self, si_ke: List[Dict[str, str]]) -> List[Dict[str, str]]:
@@ -560,8 +519,7 @@ class DaLiuRenCalculatorV2:
     ) -> List[Dict[str, str]]:
         """返吟法取三传"""
         # 返吟：取冲位
-        day_zhi_index = DI_ZHI.index(day_zhi)
-        chong_zhi = DI_ZHI[(day_zhi_index + 6) % 12]
+        chong_zhi = ZHI_NAMES[ganzhi.CHONG[ZHI_INDEX[day_zhi]]]
 
         return [
             {"传名": "初传", "地支": chong_zhi, "来源": "返吟"},
@@ -593,7 +551,7 @@ class DaLiuRenCalculatorV2:
         """
         # 获取贵人起始地支
         guiren_start_zhi = GUIREN_START.get(day_gan, "丑")
-        guiren_index = DI_ZHI.index(guiren_start_zhi)
+        guiren_index = ZHI_INDEX[guiren_start_zhi]
 
         # 判断昼夜（简化：7-19点为昼，其他为夜）
         is_day = 7 <= hour < 19
@@ -601,7 +559,7 @@ class DaLiuRenCalculatorV2:
         result = []
         for i, chuan in enumerate(san_chuan):
             zhi = chuan["地支"]
-            zhi_index = DI_ZHI.index(zhi)
+            zhi_index = ZHI_INDEX[zhi]
 
             # 计算天将索引
             if is_day:
@@ -663,7 +621,7 @@ class DaLiuRenCalculatorV2:
 
         # 进一步判断三传特征
         zhi_list = [c["地支"] for c in san_chuan]
-        zhi_indices = [DI_ZHI.index(z) for z in zhi_list]
+        zhi_indices = [ZHI_INDEX[z] for z in zhi_list]
 
         # 判断是否连茹
         if zhi_indices[1] == (zhi_indices[0] + 1) % 12 and \
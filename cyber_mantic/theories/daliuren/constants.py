@@ -99,3 +99,10 @@ KE_TI_SIMPLE = {
     "返吟": "日辰返吟，反复不定",
     "一般": "一般课体，平常之象"
 }
+
+# 月将（中气过宫）：雨水后登明亥将，春分后河魁戌将……大寒后神后子将
+ZHONGQI_MONTH_JIANG = {
+    "雨水": "亥", "春分": "戌", "谷雨": "酉", "小满": "申",
+    "夏至": "未", "大暑": "午", "处暑": "巳", "秋分": "辰",
+    "霜降": "卯", "小雪": "寅", "冬至": "丑", "大寒": "子"
+}
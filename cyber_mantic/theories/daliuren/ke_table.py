@@ -0,0 +1,188 @@
+"""
+大六壬 - 课表
+
+四课、三传、天将、课体只取决于日干支、月将和时支（昼夜也由时支决定），
+共 60 × 12 × 12 = 8640 课。课表由 DaLiuRenCalculatorV2 的参考实现逐课排出，
+写入紧凑的二进制表（data/constants/daliuren_ke.bin），运行时按下标直接取课。
+
+二进制格式：
+- 表头：魔数、版本、字符串数、记录数、记录长度
+- 字符串表：课中出现的全部文字（地支、课名、关系、来源、天将、课体说明等），
+  每项为1字节长度 + UTF-8 编码
+- 记录：每课一条定长记录，每个字段存字符串表序号（1字节）；
+  第 n 条记录对应 日干支序号 × 144 + 月将序号 × 12 + 时支序号
+
+表文件由 tools/generate_daliuren_table.py 生成；文件缺失、损坏或版本不符时
+用参考实现在内存中现算（约0.5秒）。起课规则修改后需递增 KE_TABLE_VERSION 并重新生成。
+"""
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .constants import TIAN_JIANG_PROPERTIES
+from utils.ganzhi import GAN_INDEX, GAN_NAMES, ZHI_INDEX, ZHI_NAMES, jiazi
+from utils.logger import get_logger
+
+
+KE_TABLE_VERSION = 1
+KE_COUNT = 60 * 12 * 12
+
+TABLE_PATH = Path(__file__).resolve().parents[2] / "data" / "constants" / "daliuren_ke.bin"
+_TABLE_MAGIC = b"DLRK"
+_TABLE_HEADER = struct.Struct("<4sHHIH")  # 魔数, 版本, 字符串数, 记录数, 记录长度
+
+# 记录字段布局（按顺序存放）
+SI_KE_FIELDS = ("课名", "下", "上", "关系")
+SAN_CHUAN_FIELDS = ("传名", "地支", "来源")
+TIAN_JIANG_FIELDS = ("天将", "昼夜")  # 传名、地支与三传相同
+KE_TI_FIELDS = ("名称", "说明", "发用方法")
+RECORD_SIZE = 4 * len(SI_KE_FIELDS) + 3 * len(SAN_CHUAN_FIELDS) + 3 * len(TIAN_JIANG_FIELDS) + len(KE_TI_FIELDS)
+
+# 参考实现：(日干, 日支, 时支, 月将) -> {四课, 三传, 发用方法, 天将, 课体}
+KeBuilder = Callable[[str, str, str, str], Dict[str, Any]]
+
+
+def ke_index(day_gan: str, day_zhi: str, hour_zhi: str, month_jiang: str) -> int:
+    """课在表中的序号"""
+    day_ganzhi = jiazi(GAN_INDEX[day_gan], ZHI_INDEX[day_zhi])
+    return (day_ganzhi * 12 + ZHI_INDEX[month_jiang]) * 12 + ZHI_INDEX[hour_zhi]
+
+
+def ke_key(index: int) -> Tuple[str, str, str, str]:
+    """序号对应的 (日干, 日支, 时支, 月将)"""
+    day_ganzhi, rest = divmod(index, 144)
+    jiang, hour = divmod(rest, 12)
+    return GAN_NAMES[day_ganzhi % 10], ZHI_NAMES[day_ganzhi % 12], ZHI_NAMES[hour], ZHI_NAMES[jiang]
+
+
+class DaLiuRenKeTable:
+    """大六壬课表"""
+
+    def __init__(self, strings: List[str], records: bytes):
+        if len(records) != KE_COUNT * RECORD_SIZE:
+            raise ValueError("大六壬课表数据不完整")
+        self.strings = strings
+        self._records = records
+
+    @classmethod
+    def build(cls, builder: KeBuilder) -> "DaLiuRenKeTable":
+        """用参考实现逐课排出课表"""
+        strings: List[str] = []
+        string_ids: Dict[str, int] = {}
+
+        def string_id(text: str) -> int:
+            if text not in string_ids:
+                string_ids[text] = len(strings)
+                strings.append(text)
+            return string_ids[text]
+
+        records = bytearray()
+        for index in range(KE_COUNT):
+            ke = builder(*ke_key(index))
+            fields = []
+            for item in ke["四课"]:
+                fields.extend(item[name] for name in SI_KE_FIELDS)
+            for item in ke["三传"]:
+                fields.extend(item[name] for name in SAN_CHUAN_FIELDS)
+            for item in ke["天将"]:
+                fields.extend(item[name] for name in TIAN_JIANG_FIELDS)
+            fields.extend(ke["课体"][name] for name in KE_TI_FIELDS)
+            records.extend(string_id(text) for text in fields)
+
+        if len(strings) > 255:
+            raise ValueError("大六壬课表字符串过多，无法用单字节编码")
+        return cls(strings, bytes(records))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DaLiuRenKeTable":
+        """从二进制表解析"""
+        try:
+            magic, version, string_count, record_count, record_size = _TABLE_HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError("大六壬课表格式错误")
+        if magic != _TABLE_MAGIC or record_count != KE_COUNT or record_size != RECORD_SIZE:
+            raise ValueError("大六壬课表格式错误")
+        if version != KE_TABLE_VERSION:
+            raise ValueError(f"大六壬课表版本不符（{version}，需要{KE_TABLE_VERSION}）")
+
+        strings = []
+        offset = _TABLE_HEADER.size
+        for _ in range(string_count):
+            length = data[offset]
+            strings.append(data[offset + 1:offset + 1 + length].decode("utf-8"))
+            offset += 1 + length
+        return cls(strings, data[offset:])
+
+    def to_bytes(self) -> bytes:
+        """序列化为二进制表"""
+        parts = [_TABLE_HEADER.pack(_TABLE_MAGIC, KE_TABLE_VERSION, len(self.strings), KE_COUNT, RECORD_SIZE)]
+        for text in self.strings:
+            encoded = text.encode("utf-8")
+            parts.append(bytes([len(encoded)]) + encoded)
+        parts.append(self._records)
+        return b"".join(parts)
+
+    def lookup(self, day_gan: str, day_zhi: str, hour_zhi: str, month_jiang: str) -> Dict[str, Any]:
+        """
+        取课（每次返回新的字典，可以随意修改）
+
+        Args:
+            day_gan: 日干
+            day_zhi: 日支
+            hour_zhi: 时支
+            month_jiang: 月将
+
+        Returns:
+            {四课, 三传, 发用方法, 天将, 课体}
+        """
+        start = ke_index(day_gan, day_zhi, hour_zhi, month_jiang) * RECORD_SIZE
+        texts = [self.strings[i] for i in self._records[start:start + RECORD_SIZE]]
+        pos = 0
+
+        def take(names) -> Dict[str, str]:
+            nonlocal pos
+            item = dict(zip(names, texts[pos:pos + len(names)]))
+            pos += len(names)
+            return item
+
+        si_ke = [take(SI_KE_FIELDS) for _ in range(4)]
+        san_chuan = [take(SAN_CHUAN_FIELDS) for _ in range(3)]
+        tian_jiang = []
+        for chuan in san_chuan:
+            item = take(TIAN_JIANG_FIELDS)
+            tian_jiang.append({
+                "传名": chuan["传名"],
+                "地支": chuan["地支"],
+                "天将": item["天将"],
+                "属性": TIAN_JIANG_PROPERTIES.get(item["天将"], {}),
+                "昼夜": item["昼夜"]
+            })
+        ke_ti = take(KE_TI_FIELDS)
+
+        return {
+            "四课": si_ke,
+            "三传": san_chuan,
+            "发用方法": ke_ti["发用方法"],
+            "天将": tian_jiang,
+            "课体": ke_ti
+        }
+
+
+_table: Optional[DaLiuRenKeTable] = None
+_table_lock = threading.Lock()
+
+
+def get_ke_table() -> DaLiuRenKeTable:
+    """获取大六壬课表（首次调用时加载二进制表，缺失或版本不符时用参考实现现算）"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                try:
+                    _table = DaLiuRenKeTable.from_bytes(TABLE_PATH.read_bytes())
+                except (OSError, ValueError, IndexError, UnicodeDecodeError) as e:
+                    get_logger().warning(f"大六壬课表加载失败（{e}），使用参考实现现算")
+                    from .calculator_v2 import DaLiuRenCalculatorV2
+                    _table = DaLiuRenKeTable.build(DaLiuRenCalculatorV2()._calculate_ke_reference)
+    return _table
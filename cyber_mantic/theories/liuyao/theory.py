@@ -5,6 +5,8 @@ from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from models import UserInput
 from theories.base import BaseTheory
+from utils import hexagram
+from utils.ganzhi import JIAZI_NAMES, WUXING_NAMES, ZHI_WUXING
 
 
 class LiuYaoTheory(BaseTheory):
@@ -22,13 +24,6 @@ class LiuYaoTheory(BaseTheory):
         "坤": {"五行": "土", "序号": 7},
     }
 
-    # 六十四卦世应表（简化版）
-    SHI_YING_MAP = {
-        # 八纯卦：世在上爻
-        ("乾", "乾"): 6, ("坤", "坤"): 6, ("震", "震"): 6, ("巽", "巽"): 6,
-        ("坎", "坎"): 6, ("离", "离"): 6, ("艮", "艮"): 6, ("兑", "兑"): 6,
-    }
-
     # 六亲关系（简化）
     LIU_QIN_MAP = {
         "父母": {"主事": "文书、房屋、长辈", "旺衰影响": "文书有利"},
@@ -79,7 +74,7 @@ class LiuYaoTheory(BaseTheory):
         # 求本卦和变卦
         ben_gua, bian_gua = self._get_hexagrams(yao_list)
 
-        # 装卦（装世应、六亲、六神）
+        # 装卦（装世应、纳甲、六亲、六神）
         装卦_result = self._zhuang_gua(ben_gua, yao_list)
 
         # 分析用神
@@ -235,64 +230,30 @@ class LiuYaoTheory(BaseTheory):
         Returns:
             (本卦, 变卦)
         """
-        # 本卦：根据六爻的阴阳组成
-        ben_gua_binary = ''.join(['1' if yao["阴阳"] == "阳" else '0' for yao in yao_list])
-
-        # 简化处理：根据下三爻和上三爻确定卦名
-        lower_gua = self._binary_to_gua(ben_gua_binary[:3])
-        upper_gua = self._binary_to_gua(ben_gua_binary[3:])
-
-        ben_gua = {
-            "上卦": upper_gua,
-            "下卦": lower_gua,
-            "名称": f"{upper_gua}{lower_gua}"
-        }
+        ben = hexagram.from_lines(yao["阴阳"] == "阳" for yao in yao_list)
+        ben_gua = self._gua_info(ben)
 
-        # 变卦：如果有动爻，则计算变卦
-        has_dong_yao = any(yao["动静"] == "动" for yao in yao_list)
-
-        if has_dong_yao:
-            bian_yao_list = []
-            for yao in yao_list:
-                if yao["动静"] == "动":
-                    # 动爻变化（阳变阴，阴变阳）
-                    bian_yao_list.append("阴" if yao["阴阳"] == "阳" else "阳")
-                else:
-                    bian_yao_list.append(yao["阴阳"])
-
-            bian_binary = ''.join(['1' if y == "阳" else '0' for y in bian_yao_list])
-            bian_lower_gua = self._binary_to_gua(bian_binary[:3])
-            bian_upper_gua = self._binary_to_gua(bian_binary[3:])
-
-            bian_gua = {
-                "上卦": bian_upper_gua,
-                "下卦": bian_lower_gua,
-                "名称": f"{bian_upper_gua}{bian_lower_gua}"
-            }
-        else:
-            bian_gua = None
+        # 变卦：动爻阴阳互变
+        moving = hexagram.line_mask(yao["位置"] for yao in yao_list if yao["动静"] == "动")
+        bian_gua = self._gua_info(hexagram.changed(ben, moving)) if moving else None
 
         return ben_gua, bian_gua
 
-    def _binary_to_gua(self, binary: str) -> str:
-        """
-        将三位二进制转换为卦名
-
-        Args:
-            binary: 三位二进制字符串
-
-        Returns:
-            卦名
-        """
-        gua_map = {
-            "111": "乾", "110": "兑", "101": "离", "100": "震",
-            "011": "巽", "010": "坎", "001": "艮", "000": "坤"
+    @staticmethod
+    def _gua_info(gua: int) -> Dict[str, Any]:
+        """卦的基本信息（上下卦、卦名、所属卦宫）"""
+        palace = hexagram.TRIGRAM_NAMES[hexagram.PALACE[gua]]
+        return {
+            "上卦": hexagram.TRIGRAM_NAMES[hexagram.upper(gua)],
+            "下卦": hexagram.TRIGRAM_NAMES[hexagram.lower(gua)],
+            "名称": hexagram.name(gua),
+            "卦宫": f"{palace}宫{hexagram.GENERATION_NAMES[hexagram.GENERATION[gua]]}",
+            "编码": gua
         }
-        return gua_map.get(binary, "乾")
 
     def _zhuang_gua(self, ben_gua: Dict[str, Any], yao_list: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        装卦（装世应、六亲、六神）
+        装卦（按京房八宫装世应、纳甲、六亲，六神从初爻起按顺序装）
 
         Args:
             ben_gua: 本卦
@@ -301,31 +262,25 @@ class LiuYaoTheory(BaseTheory):
         Returns:
             装卦结果
         """
-        # 确定世应（简化处理）
-        shi_yao = self.SHI_YING_MAP.get((ben_gua["上卦"], ben_gua["下卦"]), 5)
-        ying_yao = (shi_yao + 3) % 6
-        ying_yao = ying_yao if ying_yao > 0 else 6
+        gua = ben_gua["编码"]
+        na_jia = hexagram.NA_JIA[gua]
+        liu_qin = hexagram.LIU_QIN[gua]
 
-        # 装六亲（简化处理：根据位置循环）
-        liu_qin_order = ["父母", "兄弟", "子孙", "妻财", "官鬼"]
-
-        # 装六神（从初爻开始按顺序装）
         liu_yao_details = []
         for i, yao in enumerate(yao_list):
-            liu_qin = liu_qin_order[i % 5]
-            liu_shen = self.LIU_SHEN[i % 6]
-
             liu_yao_details.append({
                 "位置": yao["位置"],
                 "阴阳": yao["阴阳"],
                 "动静": yao["动静"],
-                "六亲": liu_qin,
-                "六神": liu_shen
+                "纳甲": JIAZI_NAMES[na_jia[i]],
+                "五行": WUXING_NAMES[ZHI_WUXING[na_jia[i] % 12]],
+                "六亲": hexagram.LIU_QIN_NAMES[liu_qin[i]],
+                "六神": self.LIU_SHEN[i % 6]
             })
 
         return {
-            "世爻": shi_yao,
-            "应爻": ying_yao,
+            "世爻": hexagram.SHI[gua],
+            "应爻": hexagram.YING[gua],
             "六爻详情": liu_yao_details
         }
 
@@ -4,6 +4,7 @@
 from typing import Dict, Any, List, Optional, Tuple
 from models import UserInput
 from theories.base import BaseTheory
+from utils import hexagram
 from .constants import *
 
 
@@ -54,18 +55,21 @@ class MeiHuaTheory(BaseTheory):
         # 确定起卦方式
         upper_num, lower_num, dong_yao = self._get_numbers(user_input)
 
-        # 起卦
-        upper_gua = self._number_to_gua(upper_num)
-        lower_gua = self._number_to_gua(lower_num)
+        # 起卦（动爻数按6取余落在1-6爻）
+        qigua_numbers = [upper_num, lower_num, dong_yao]
+        dong_yao = hexagram.normalize_line(dong_yao)
+        gua = hexagram.make(hexagram.trigram_from_number(upper_num), hexagram.trigram_from_number(lower_num))
+        upper_gua = hexagram.TRIGRAM_NAMES[hexagram.upper(gua)]
+        lower_gua = hexagram.TRIGRAM_NAMES[hexagram.lower(gua)]
 
         # 本卦
-        original_gua = self._create_gua(upper_gua, lower_gua)
+        original_gua = self._create_gua(gua)
 
         # 互卦
-        mutual_gua = self._get_mutual_gua(upper_gua, lower_gua)
+        mutual_gua = self._get_mutual_gua(gua)
 
         # 变卦
-        changed_gua = self._get_changed_gua(upper_gua, lower_gua, dong_yao)
+        changed_gua = self._get_changed_gua(gua, dong_yao)
 
         # 体用分析
         ti_yong = self._analyze_ti_yong(dong_yao, upper_gua, lower_gua)
@@ -78,7 +82,7 @@ class MeiHuaTheory(BaseTheory):
 
         return {
             "起卦方式": self._get_qigua_method(user_input),
-            "起卦数字": [upper_num, lower_num, dong_yao],
+            "起卦数字": qigua_numbers,
             "本卦": original_gua,
             "互卦": mutual_gua,
             "变卦": changed_gua,
@@ -137,76 +141,42 @@ class MeiHuaTheory(BaseTheory):
             dong_yao = dong_yao if dong_yao > 0 else 6
             return upper_num, lower_num, dong_yao
 
-    def _number_to_gua(self, num: int) -> str:
-        """将数字转换为卦名"""
-        index = (num - 1) % 8
-        return BA_GUA_ORDER[index]
-
-    def _create_gua(self, upper_gua: str, lower_gua: str) -> Dict[str, Any]:
+    def _create_gua(self, gua: int) -> Dict[str, Any]:
         """
         创建卦象
 
         Args:
-            upper_gua: 上卦
-            lower_gua: 下卦
+            gua: 六爻卦编码（见 utils.hexagram）
 
         Returns:
             卦象信息
         """
-        gua_name = GUA_64_NAMES.get((upper_gua, lower_gua), f"{upper_gua}{lower_gua}")
+        upper_gua = hexagram.upper(gua)
+        lower_gua = hexagram.lower(gua)
         return {
-            "名称": gua_name,
-            "上卦": upper_gua,
-            "下卦": lower_gua,
-            "卦象": f"{BA_GUA[upper_gua]['卦象']}{BA_GUA[lower_gua]['卦象']}",
-            "上卦五行": BA_GUA[upper_gua]["五行"],
-            "下卦五行": BA_GUA[lower_gua]["五行"]
+            "名称": hexagram.name(gua),
+            "上卦": hexagram.TRIGRAM_NAMES[upper_gua],
+            "下卦": hexagram.TRIGRAM_NAMES[lower_gua],
+            "卦象": f"{hexagram.TRIGRAM_SYMBOLS[upper_gua]}{hexagram.TRIGRAM_SYMBOLS[lower_gua]}",
+            "上卦五行": BA_GUA[hexagram.TRIGRAM_NAMES[upper_gua]]["五行"],
+            "下卦五行": BA_GUA[hexagram.TRIGRAM_NAMES[lower_gua]]["五行"]
         }
 
-    def _get_mutual_gua(self, upper_gua: str, lower_gua: str) -> Dict[str, Any]:
+    def _get_mutual_gua(self, gua: int) -> Dict[str, Any]:
         """
         求互卦
 
         互卦取法：本卦2、3、4爻为下卦，3、4、5爻为上卦
-        简化处理：根据上下卦的五行属性推算
         """
-        # 简化实现：根据上下卦序号计算
-        upper_num = BA_GUA[upper_gua]["序号"]
-        lower_num = BA_GUA[lower_gua]["序号"]
-
-        # 互卦上卦
-        mutual_upper_num = ((upper_num + lower_num) // 2) % 8
-        mutual_upper_num = mutual_upper_num if mutual_upper_num > 0 else 8
-        mutual_upper = BA_GUA_ORDER[mutual_upper_num - 1]
-
-        # 互卦下卦
-        mutual_lower_num = ((upper_num + lower_num + 1) // 2) % 8
-        mutual_lower_num = mutual_lower_num if mutual_lower_num > 0 else 8
-        mutual_lower = BA_GUA_ORDER[mutual_lower_num - 1]
+        return self._create_gua(hexagram.mutual(gua))
 
-        return self._create_gua(mutual_upper, mutual_lower)
-
-    def _get_changed_gua(self, upper_gua: str, lower_gua: str, dong_yao: int) -> Dict[str, Any]:
+    def _get_changed_gua(self, gua: int, dong_yao: int) -> Dict[str, Any]:
         """
         求变卦
 
-        变卦：动爻所在的卦变化
+        变卦：动爻阴阳互变
         """
-        # 动爻在下卦（1-3爻）
-        if dong_yao <= 3:
-            # 下卦变化
-            lower_num = BA_GUA[lower_gua]["序号"]
-            changed_lower_num = (lower_num + dong_yao) % 8
-            changed_lower_num = changed_lower_num if changed_lower_num > 0 else 8
-            changed_lower = BA_GUA_ORDER[changed_lower_num - 1]
-            return self._create_gua(upper_gua, changed_lower)
-        else:
-            # 上卦变化
-            upper_num = BA_GUA[upper_gua]["序号"]
-            changed_upper_num = (upper_num + dong_yao) % 8
-            changed_upper_num = changed_upper_num if changed_upper_num > 0 else 8
-            changed_upper = BA_GUA_ORDER[changed_upper_num - 1]
-            return self._create_gua(changed_upper, lower_gua)
+        return self._create_gua(hexagram.changed(gua, hexagram.line_mask([dong_yao])))
 
     def _analyze_ti_yong(self, dong_yao: int, upper_gua: str, lower_gua: str) -> Dict[str, Any]:
         """
@@ -15,6 +15,9 @@
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Tuple, Optional
 from .constants import *
+from .chart_table import copy_chart, get_chart_table
+from utils import ganzhi
+from utils.ganzhi import GAN_INDEX, GAN_NAMES, ZHI_NAMES
 from utils.time_utils import TimeUtils, TimestampValidator
 
 
@@ -89,65 +92,94 @@ class QiMenCalculatorV2:
         # 9. 计算局数
         ju_number = self._calculate_ju_number_precise(solar_term, yuan)
 
-        # 10. 排地盘（九星、八门、八神的原始位置）
+        # 10. 取盘面（只取决于阴阳遁、局数和时干支，从排盘表中取出副本）
+        chart = copy_chart(get_chart_table().get(dun_type, ju_number, hour_ganzhi))
+        nine_palaces = chart["九宫"]
+        zhishi_palace = chart["值使宫"]
+
+        # 11. 分析用神
+        event_palace = self._analyze_event_palace(event_category, nine_palaces)
+
+        # 12. 时机建议
+        timing_advice = self._analyze_timing(nine_palaces, true_time, zhishi_palace)
+
+        return {
+            "起局时间": TimeUtils.format_chinese_time(actual_time),
+            "真太阳时": TimeUtils.format_chinese_time(true_time) if use_true_solar_time else None,
+            "时间说明": time_note,
+            "时间验证": validation_message,
+            "节气": solar_term,
+            "节气后天数": days_after_term,
+            "阴阳遁": dun_type,
+            "日干支": day_ganzhi,
+            "时干支": hour_ganzhi,
+            "元": yuan,
+            "局数": ju_number,
+            "九宫": nine_palaces,
+            "值符宫": chart["值符宫"],
+            "值使宫": zhishi_palace,
+            "用神宫位": event_palace,
+            "吉利方位": chart["吉利方位"],
+            "不利方位": chart["不利方位"],
+            "时机建议": timing_advice,
+            "格局": chart["格局"],
+            "综合评分": chart["综合评分"],
+            "基础排盘信息": chart["基础排盘信息"],  # 新增：排盘摘要
+            "计算说明": "使用完整版奇门遁甲排盘算法（V2）",
+            "confidence": 0.90  # 提高置信度
+        }
+
+    def _build_chart(self, dun_type: str, ju_number: int, hour_gan: str, hour_zhi: str) -> Dict[str, Any]:
+        """
+        排盘（不含起局时间相关的内容），供排盘表缓存
+
+        Args:
+            dun_type: 阴遁或阳遁
+            ju_number: 局数（1-9）
+            hour_gan: 时干
+            hour_zhi: 时支
+
+        Returns:
+            盘面字典：九宫、值符宫、值使宫、吉利方位、不利方位、格局、综合评分、基础排盘信息
+        """
+        # 排地盘（九星、八门、八神的原始位置）
         di_pan = self._arrange_di_pan()
 
-        # 11. 排天盘（根据局数转盘）
+        # 排天盘（根据局数转盘）
         tian_pan = self._arrange_tian_pan(di_pan, ju_number, dun_type)
 
-        # 12. 排人盘（值符值使）
+        # 排人盘（值符值使）
         ren_pan = self._arrange_ren_pan(tian_pan, hour_gan, hour_zhi, dun_type)
 
-        # 13. 合并九宫信息
+        # 合并九宫信息
         nine_palaces = self._merge_palaces(di_pan, tian_pan, ren_pan)
 
-        # 14. 确定值符值使宫位
+        # 确定值符值使宫位
         zhifu_palace, zhishi_palace = self._locate_zhifu_zhishi(ren_pan)
 
-        # 15. 分析用神
-        event_palace = self._analyze_event_palace(event_category, nine_palaces)
-
-        # 16. 分析吉凶方位
+        # 分析吉凶方位
         lucky_directions, unlucky_directions = self._analyze_directions(nine_palaces)
 
-        # 17. 时机建议
-        timing_advice = self._analyze_timing(nine_palaces, true_time, zhishi_palace)
-
-        # 18. 格局分析（完整版）
+        # 格局分析（完整版）
         patterns = self._analyze_patterns_complete(nine_palaces, ren_pan, dun_type)
 
-        # 19. 综合评分
+        # 综合评分
         overall_score = self._calculate_overall_score(nine_palaces, patterns)
 
-        # 生成基础排盘摘要（供专业人士参考）
+        # 基础排盘摘要（供专业人士参考）
         paipan_summary = self._generate_paipan_summary(
             ju_number, dun_type, zhifu_palace, zhishi_palace, nine_palaces
         )
 
         return {
-            "起局时间": TimeUtils.format_chinese_time(actual_time),
-            "真太阳时": TimeUtils.format_chinese_time(true_time) if use_true_solar_time else None,
-            "时间说明": time_note,
-            "时间验证": validation_message,
-            "节气": solar_term,
-            "节气后天数": days_after_term,
-            "阴阳遁": dun_type,
-            "日干支": day_ganzhi,
-            "时干支": hour_ganzhi,
-            "元": yuan,
-            "局数": ju_number,
             "九宫": nine_palaces,
             "值符宫": zhifu_palace,
             "值使宫": zhishi_palace,
-            "用神宫位": event_palace,
             "吉利方位": lucky_directions,
             "不利方位": unlucky_directions,
-            "时机建议": timing_advice,
             "格局": patterns,
             "综合评分": overall_score,
-            "基础排盘信息": paipan_summary,  # 新增：排盘摘要
-            "计算说明": "使用完整版奇门遁甲排盘算法（V2）",
-            "confidence": 0.90  # 提高置信度
+            "基础排盘信息": paipan_summary
         }
 
     # ============ 干支计算 ============
@@ -158,19 +190,8 @@ class QiMenCalculatorV2:
 
         使用基准日法：2000-01-01为庚辰日
         """
-        base_date = datetime(2000, 1, 1)
-        days_diff = (date - base_date).days
-
-        # 基准日的甲子索引（庚辰）
-        base_index = 16  # 庚辰在六十甲子中的索引
-
-        # 计算目标日的甲子索引
-        target_index = (base_index + days_diff) % 60
-
-        # 从六十甲子表中获取
-        ganzhi = SIXTY_JIAZI[target_index]
-
-        return ganzhi[0], ganzhi[1] if len(ganzhi) > 1 else ganzhi[0]
+        gan, zhi = ganzhi.split_jiazi(ganzhi.day_jiazi(date))
+        return GAN_NAMES[gan], ZHI_NAMES[zhi]
 
     def _calculate_hour_ganzhi(self, time: datetime, day_gan: str) -> Tuple[str, str]:
         """
@@ -178,40 +199,10 @@ class QiMenCalculatorV2:
 
         时支由时辰决定，时干由日干和时支共同决定（日上起时法）
         """
-        # 计算时支
-        hour = time.hour
-        hour_zhi_map = {
-            23: "子", 0: "子", 1: "丑", 2: "丑", 3: "寅", 4: "寅",
-            5: "卯", 6: "卯", 7: "辰", 8: "辰", 9: "巳", 10: "巳",
-            11: "午", 12: "午", 13: "未", 14: "未", 15: "申", 16: "申",
-            17: "酉", 18: "酉", 19: "戌", 20: "戌", 21: "亥", 22: "亥"
-        }
-        hour_zhi = hour_zhi_map.get(hour, "子")
-        hour_zhi_index = TWELVE_BRANCHES.index(hour_zhi)
-
-        # 计算时干（日上起时法）
         # 甲己日子时起甲子，乙庚日子时起丙子，丙辛日子时起戊子，丁壬日子时起庚子，戊癸日子时起壬子
-        day_gan_index = TEN_STEMS.index(day_gan)
-
-        # 子时起干表
-        zi_shi_gan_map = {
-            0: 0,  # 甲日子时起甲
-            1: 2,  # 乙日子时起丙
-            2: 4,  # 丙日子时起戊
-            3: 6,  # 丁日子时起庚
-            4: 8,  # 戊日子时起壬
-            5: 0,  # 己日子时起甲
-            6: 2,  # 庚日子时起丙
-            7: 4,  # 辛日子时起戊
-            8: 6,  # 壬日子时起庚
-            9: 8   # 癸日子时起壬
-        }
-
-        zi_shi_gan_index = zi_shi_gan_map[day_gan_index]
-        hour_gan_index = (zi_shi_gan_index + hour_zhi_index) % 10
-        hour_gan = TEN_STEMS[hour_gan_index]
-
-        return hour_gan, hour_zhi
+        zhi = ganzhi.hour_zhi(time.hour)
+        gan = ganzhi.hour_gan(GAN_INDEX[day_gan], zhi)
+        return GAN_NAMES[gan], ZHI_NAMES[zhi]
 
     # ============ 节气与元的计算 ============
 
@@ -333,7 +324,7 @@ class QiMenCalculatorV2:
 
             # 计算该宫位对应的九星
             star_index = (STAR_INDEX["天蓬"] + star_offset) % 9
-            star = list(STAR_INDEX.keys())[list(STAR_INDEX.values()).index(star_index)]
+            star = STAR_BY_INDEX[star_index]
 
             # 计算该九星落在哪个宫
             palace_index = (tian_peng_palace + star_offset) % 9
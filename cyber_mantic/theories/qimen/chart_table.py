@@ -0,0 +1,105 @@
+"""
+奇门遁甲 - 排盘表
+
+盘面（地盘、天盘、人盘、九宫、值符值使、吉凶方位、格局、综合评分、排盘摘要）
+只取决于阴阳遁、局数（1-9）和时干支，共 2 × 9 × 60 = 1080 种组合。
+排盘表按 (阴阳遁, 局数, 时干支) 缓存已排好的盘面，首次用到某个组合时排盘，
+之后直接取用；build_all() 可一次排完全部组合，用于批量扫描时段前预热。
+
+盘面由 QiMenCalculatorV2._build_chart 排出，排盘算法或格局规则修改后需递增
+CHART_TABLE_VERSION，使持有旧版本盘面的调用方（如持久化缓存）能够识别失效。
+"""
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .constants import SIXTY_JIAZI
+
+
+CHART_TABLE_VERSION = 1
+
+DUN_TYPES = ("阳遁", "阴遁")
+JU_NUMBERS = tuple(range(1, 10))
+
+ChartKey = Tuple[str, int, str]  # (阴阳遁, 局数, 时干支)
+
+
+def iter_chart_keys() -> Iterator[ChartKey]:
+    """全部 1080 种盘面组合"""
+    for dun_type in DUN_TYPES:
+        for ju_number in JU_NUMBERS:
+            for hour_ganzhi in SIXTY_JIAZI:
+                yield dun_type, ju_number, hour_ganzhi
+
+
+def copy_chart(chart: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    复制盘面供单次调用修改
+
+    九宫和格局逐项浅拷贝；宫内的九星属性、八门属性与排盘时一样引用常量表，不再复制。
+    """
+    copied = dict(chart)
+    copied["九宫"] = [dict(palace) for palace in chart["九宫"]]
+    copied["格局"] = [dict(pattern) for pattern in chart["格局"]]
+    copied["吉利方位"] = list(chart["吉利方位"])
+    copied["不利方位"] = list(chart["不利方位"])
+    return copied
+
+
+class QiMenChartTable:
+    """奇门排盘表（线程安全，按需排盘）"""
+
+    def __init__(self, builder: Callable[[str, int, str, str], Dict[str, Any]]):
+        """
+        Args:
+            builder: 排盘函数 (阴阳遁, 局数, 时干, 时支) -> 盘面
+        """
+        self.version = CHART_TABLE_VERSION
+        self._builder = builder
+        self._charts: Dict[ChartKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._charts)
+
+    def get(self, dun_type: str, ju_number: int, hour_ganzhi: str) -> Dict[str, Any]:
+        """
+        取盘面（只读，需要修改时用 copy_chart 复制）
+
+        Args:
+            dun_type: 阴遁或阳遁
+            ju_number: 局数（1-9）
+            hour_ganzhi: 时干支
+
+        Returns:
+            盘面字典
+        """
+        key = (dun_type, ju_number, hour_ganzhi)
+        chart = self._charts.get(key)
+        if chart is None:
+            with self._lock:
+                chart = self._charts.get(key)
+                if chart is None:
+                    chart = self._builder(dun_type, ju_number, hour_ganzhi[0], hour_ganzhi[1])
+                    self._charts[key] = chart
+        return chart
+
+    def build_all(self) -> int:
+        """排完全部组合，返回盘面数"""
+        for key in iter_chart_keys():
+            self.get(*key)
+        return len(self._charts)
+
+
+_table: Optional[QiMenChartTable] = None
+_table_lock = threading.Lock()
+
+
+def get_chart_table() -> QiMenChartTable:
+    """获取全局奇门排盘表"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                from .calculator_v2 import QiMenCalculatorV2
+                _table = QiMenChartTable(QiMenCalculatorV2()._build_chart)
+    return _table
@@ -86,6 +86,7 @@ STAR_INDEX = {
     "天蓬": 0, "天芮": 1, "天冲": 2, "天辅": 3, "天禽": 4,
     "天心": 5, "天柱": 6, "天任": 7, "天英": 8
 }
+STAR_BY_INDEX = {index: star for star, index in STAR_INDEX.items()}
 
 # 九星属性
 STAR_PROPERTIES = {
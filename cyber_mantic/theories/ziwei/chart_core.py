@@ -0,0 +1,392 @@
+"""
+紫微斗数 - 命盘核心
+
+星曜排布只取决于（年干支、农历月、农历日、时辰地支、性别），与公历年份、
+问题内容都无关。命盘核心把命宫、身宫、五局、十二宫星曜算成不可变结构，
+按这组真实输入作为键做有界LRU缓存，可选持久化到磁盘。
+同一命盘重复起盘、家庭成员批量起盘时，只有第一次真正排盘。
+
+安星规则或命盘核心结构修改后需递增 CHART_CORE_VERSION，旧版本的缓存文件载入时会被忽略。
+"""
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from .constants import (
+    DI_ZHI_ORDER, MING_ZHU_TABLE, PALACE_CHARACTERISTICS, SHEN_ZHU_TABLE,
+    TRANSFORMATION_TABLE, TWELVE_PALACES, WU_JU_TABLE, ZIWEI_POSITIONS
+)
+from utils.ganzhi import ZHI_INDEX, hour_zhi
+from utils.logger import get_logger
+
+
+CHART_CORE_VERSION = 1
+
+
+class ChartKey(NamedTuple):
+    """命盘核心的键：决定星曜排布的全部输入"""
+    year_gan_zhi: str
+    lunar_month: int
+    lunar_day: int
+    hour_zhi: int  # 时辰地支序号 0-11（子=0）
+    gender: str
+
+
+class PalaceCore(NamedTuple):
+    """单宫（星曜均为元组，不可修改）"""
+    name: str
+    dizhi: str
+    is_ming: bool
+    is_shen: bool
+    main_stars: Tuple[str, ...]
+    minor_stars: Tuple[str, ...]
+    malefic_stars: Tuple[str, ...]
+    transformations: Tuple[str, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转为计算结果中的宫位字典（每次返回新列表，调用方可随意修改）"""
+        return {
+            "宫位": self.name,
+            "地支": self.dizhi,
+            "是命宫": self.is_ming,
+            "是身宫": self.is_shen,
+            "主星": list(self.main_stars),
+            "辅星": list(self.minor_stars),
+            "煞星": list(self.malefic_stars),
+            "四化": list(self.transformations),
+            "特质": PALACE_CHARACTERISTICS.get(self.name, "")
+        }
+
+
+class ChartCore(NamedTuple):
+    """命盘核心"""
+    key: ChartKey
+    ming_gong: str
+    shen_gong: str
+    wu_ju: str
+    ming_zhu: str
+    shen_zhu: str
+    palaces: Tuple[PalaceCore, ...]  # 自命宫起按十二宫顺序
+
+    @property
+    def ming_palace(self) -> Optional[PalaceCore]:
+        """命宫"""
+        for palace in self.palaces:
+            if palace.is_ming:
+                return palace
+        return None
+
+    def palace(self, name: str) -> Optional[PalaceCore]:
+        """按宫位名称取宫"""
+        for palace in self.palaces:
+            if palace.name == name:
+                return palace
+        return None
+
+
+def make_chart_key(
+    year_gan_zhi: str,
+    lunar_month: int,
+    lunar_day: int,
+    birth_hour: int,
+    gender: str
+) -> ChartKey:
+    """由出生时（0-23）构造命盘键，同一时辰内的小时得到同一个键"""
+    return ChartKey(year_gan_zhi, lunar_month, lunar_day, hour_zhi(birth_hour), gender)
+
+
+def _ming_gong_index(lunar_month: int, hour_zhi_index: int) -> int:
+    """命宫：正月起寅宫顺数到出生月，再逆数到出生时辰"""
+    month_pos = (2 + lunar_month - 1) % 12
+    return (month_pos - hour_zhi_index) % 12
+
+
+def _shen_gong_index(lunar_month: int, hour_zhi_index: int) -> int:
+    """身宫：正月起寅宫顺数到出生月，再顺数到出生时辰"""
+    month_pos = (2 + lunar_month - 1) % 12
+    return (month_pos + hour_zhi_index) % 12
+
+
+def _wu_ju(ming_gong_dizhi: str) -> str:
+    """五局（简化：取命宫地支五行）"""
+    nayin_map = {
+        "子": "水", "丑": "土", "寅": "木", "卯": "木",
+        "辰": "土", "巳": "火", "午": "火", "未": "土",
+        "申": "金", "酉": "金", "戌": "土", "亥": "水"
+    }
+
+    nayin = nayin_map.get(ming_gong_dizhi, "土")
+    ju_number = WU_JU_TABLE.get(nayin, 5)
+
+    return f"{nayin}{['', '', '二', '三', '四', '五', '六'][ju_number]}局"
+
+
+def _ziwei_ju_key(wu_ju: str) -> str:
+    """五局对应的紫微定位表"""
+    if "二局" in wu_ju:
+        return "水二局"
+    if "三局" in wu_ju:
+        return "木三局"
+    if "四局" in wu_ju:
+        return "金四局"
+    if "五局" in wu_ju:
+        return "土五局"
+    return "火六局"
+
+
+# 主星相对紫微的宫位偏移（简化排布，天府、太阴需另行安星，暂不排）
+_MAIN_STAR_OFFSETS = (
+    ("天机", 1), ("太阳", 4), ("武曲", 5), ("天同", 6), ("廉贞", 7),
+    ("贪狼", 2), ("巨门", 3), ("天相", 8), ("天梁", 9), ("七杀", 10), ("破军", 11)
+)
+
+
+def build_chart_core(key: ChartKey) -> ChartCore:
+    """
+    排盘（不经缓存）
+
+    Args:
+        key: 命盘键
+
+    Returns:
+        命盘核心
+    """
+    ming_index = _ming_gong_index(key.lunar_month, key.hour_zhi)
+    shen_index = _shen_gong_index(key.lunar_month, key.hour_zhi)
+    ming_gong = DI_ZHI_ORDER[ming_index]
+    shen_gong = DI_ZHI_ORDER[shen_index]
+    wu_ju = _wu_ju(ming_gong)
+
+    # 十二宫自命宫起顺排，第 i 宫地支为命宫地支后第 i 位
+    dizhis = [DI_ZHI_ORDER[(ming_index + i) % 12] for i in range(12)]
+    main_stars = [[] for _ in range(12)]
+    minor_stars = [[] for _ in range(12)]
+    transformations = [[] for _ in range(12)]
+
+    # 安主星
+    ziwei_dizhi = ZIWEI_POSITIONS[_ziwei_ju_key(wu_ju)].get(key.lunar_day, "寅")
+    ziwei_index = (ZHI_INDEX[ziwei_dizhi] - ming_index) % 12
+    main_stars[ziwei_index].append("紫微")
+    for star, offset in _MAIN_STAR_OFFSETS:
+        stars = main_stars[(ziwei_index + offset) % 12]
+        if star not in stars:
+            stars.append(star)
+
+    # 安四化：化在该星所在宫
+    for transformation_type, star_name in TRANSFORMATION_TABLE.get(key.year_gan_zhi[0], {}).items():
+        for index, stars in enumerate(main_stars):
+            if star_name in stars:
+                transformation_full = f"化{transformation_type}"
+                if transformation_full not in transformations[index]:
+                    transformations[index].append(transformation_full)
+                break
+
+    # 安辅星（简化）：文昌、文曲按时辰，左辅、右弼按月
+    for star, index in (
+        ("文昌", (key.hour_zhi + 2) % 12),
+        ("文曲", (key.hour_zhi + 8) % 12),
+        ("左辅", (key.lunar_month - 1) % 12),
+        ("右弼", (12 - key.lunar_month + 1) % 12)
+    ):
+        if star not in minor_stars[index]:
+            minor_stars[index].append(star)
+
+    palaces = tuple(
+        PalaceCore(
+            name=TWELVE_PALACES[i],
+            dizhi=dizhis[i],
+            is_ming=dizhis[i] == ming_gong,
+            is_shen=dizhis[i] == shen_gong,
+            main_stars=tuple(main_stars[i]),
+            minor_stars=tuple(minor_stars[i]),
+            malefic_stars=(),
+            transformations=tuple(transformations[i])
+        )
+        for i in range(12)
+    )
+
+    return ChartCore(
+        key=key,
+        ming_gong=ming_gong,
+        shen_gong=shen_gong,
+        wu_ju=wu_ju,
+        ming_zhu=MING_ZHU_TABLE.get(ming_gong, "贪狼"),
+        shen_zhu=SHEN_ZHU_TABLE.get(key.year_gan_zhi[1], "火星"),
+        palaces=palaces
+    )
+
+
+def _core_to_json(core: ChartCore) -> list:
+    return [list(core.key), core.ming_gong, core.shen_gong, core.wu_ju, core.ming_zhu, core.shen_zhu,
+            [list(palace) for palace in core.palaces]]
+
+
+def _core_from_json(data: list) -> ChartCore:
+    key, ming_gong, shen_gong, wu_ju, ming_zhu, shen_zhu, palaces = data
+    return ChartCore(
+        key=ChartKey(*key),
+        ming_gong=ming_gong,
+        shen_gong=shen_gong,
+        wu_ju=wu_ju,
+        ming_zhu=ming_zhu,
+        shen_zhu=shen_zhu,
+        palaces=tuple(
+            PalaceCore(name, dizhi, is_ming, is_shen, *(tuple(stars) for stars in star_lists))
+            for name, dizhi, is_ming, is_shen, *star_lists in palaces
+        )
+    )
+
+
+class ChartCoreCache:
+    """命盘核心LRU缓存（线程安全，可选磁盘持久化）"""
+
+    def __init__(self, max_size: int = 4096, persist_path: Optional[str] = None):
+        """
+        初始化缓存
+
+        Args:
+            max_size: 最大命盘数
+            persist_path: 持久化JSON文件路径，None表示只在内存中缓存
+        """
+        self.max_size = max_size
+        self.persist_path = persist_path
+        self._cores: "OrderedDict[ChartKey, ChartCore]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self.logger = get_logger(__name__)
+
+        if persist_path:
+            self.load()
+            atexit.register(self.save)
+
+    def get(self, key: ChartKey) -> ChartCore:
+        """取命盘核心，未命中时排盘并缓存"""
+        with self._lock:
+            core = self._cores.get(key)
+            if core is not None:
+                self._cores.move_to_end(key)
+                self._hits += 1
+                return core
+            self._misses += 1
+
+        core = build_chart_core(key)
+
+        with self._lock:
+            self._put(key, core)
+        return core
+
+    def _put(self, key: ChartKey, core: ChartCore):
+        self._cores[key] = core
+        self._cores.move_to_end(key)
+        while len(self._cores) > self.max_size:
+            self._cores.popitem(last=False)
+        self._dirty = True
+
+    def clear(self):
+        """清空缓存（不删除磁盘文件）"""
+        with self._lock:
+            self._cores.clear()
+            self._hits = 0
+            self._misses = 0
+            self._dirty = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """缓存统计"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._cores),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0
+            }
+
+    def load(self) -> int:
+        """
+        从磁盘载入命盘（文件不存在、损坏或版本不符时忽略）
+
+        Returns:
+            载入的命盘数
+        """
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return 0
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            version = data.get("version") if isinstance(data, dict) else None
+            if version != CHART_CORE_VERSION:
+                self.logger.info(f"紫微命盘缓存文件版本不符（{version}，需要{CHART_CORE_VERSION}），已忽略")
+                return 0
+            cores = [_core_from_json(item) for item in data["cores"]]
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            self.logger.warning(f"紫微命盘缓存文件无法读取，已忽略: {e}")
+            return 0
+
+        with self._lock:
+            for core in cores[-self.max_size:]:
+                if core.key not in self._cores:
+                    self._put(core.key, core)
+            self._dirty = False
+        return len(cores)
+
+    def save(self):
+        """把缓存写入磁盘（先写临时文件再替换，避免写一半的文件）"""
+        if not self.persist_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": CHART_CORE_VERSION,
+                "cores": [_core_to_json(core) for core in self._cores.values()]
+            }
+            self._dirty = False
+
+        try:
+            directory = os.path.dirname(self.persist_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.persist_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.persist_path)
+        except OSError as e:
+            self.logger.warning(f"紫微命盘缓存写入失败: {e}")
+
+
+_cache: Optional[ChartCoreCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_chart_core_cache() -> ChartCoreCache:
+    """获取全局命盘核心缓存（默认只在内存中）"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ChartCoreCache()
+    return _cache
+
+
+def configure_chart_core_cache(max_size: int = 4096, persist_path: Optional[str] = None) -> ChartCoreCache:
+    """
+    替换全局命盘核心缓存，如开启磁盘持久化：
+    configure_chart_core_cache(persist_path=str(Path.home() / ".cyber_mantic" / "ziwei_charts.json"))
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.save()
+        _cache = ChartCoreCache(max_size=max_size, persist_path=persist_path)
+    return _cache
+
+
+def get_chart_core(key: ChartKey) -> ChartCore:
+    """从全局缓存取命盘核心"""
+    return get_chart_core_cache().get(key)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+关键词分类基准测试工具
+
+对比每条消息的分类开销：
+- 逐关键词 `kw in text` 扫描（原实现的写法，作为基线）
+- KeywordMatcher（Aho–Corasick 自动机，单遍扫描）
+
+覆盖 QuestionClassifier、QAHandler.identify_question_type、
+TimelineAnalyzer.analyze_question_timespan、FlowGuard 的类别/颜色/方位/修改意图识别。
+
+使用方法：
+    python tools/benchmark_keyword_matcher.py
+    python tools/benchmark_keyword_matcher.py --repeat 5000 --length 200
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from core.flow_guard import FlowGuard  # noqa: E402
+from core.timeline_analyzer import TimelineAnalyzer  # noqa: E402
+from services.conversation.qa_handler import DEFAULT_QA_KEYWORDS, QUESTION_TYPE_PRIORITY, QAHandler  # noqa: E402
+from utils.keyword_matcher import KeywordMatcher  # noqa: E402
+from utils.question_classifier import QuestionClassifier  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "最近工作压力很大，想知道今年适不适合跳槽，还有明年的财运怎么样",
+    "我和对象在一起三年了，最近总是吵架，想问问我们俩的缘分还能不能继续",
+    "孩子明年高考，想知道考试运势如何，选什么专业比较好",
+    "请帮我看看八字里的用神是什么，大运走到哪一步了",
+    "其实是1991年出生的，刚才写错了，麻烦改成1991年",
+    "我喜欢粉红色，现在面向东南方向坐着",
+]
+
+
+def _naive_scores(groups, text):
+    """基线：逐个关键词做子串判断"""
+    text = text.lower()
+    return {label: sum(len(kw) for kw in keywords if kw in text) for label, keywords in groups.items()}
+
+
+def _naive_first(groups, priority, text):
+    for label in priority:
+        if any(kw in text for kw in groups.get(label, [])):
+            return label
+    return None
+
+
+def build_cases():
+    """(名称, 基线函数, 自动机函数)"""
+    guard = FlowGuard()
+    qa = QAHandler(None, None)
+    timeline = TimelineAnalyzer()
+    time_priority = list(reversed(list(TimelineAnalyzer.TIME_KEYWORDS)))
+
+    def naive_color(text):
+        # 原实现：收集全部命中后取最长
+        hits = [(len(kw), color) for color, keywords in FlowGuard.COLOR_KEYWORDS.items()
+                for kw in keywords if kw in text]
+        return max(hits, key=lambda hit: hit[0])[1] if hits else None
+
+    def flow_guard_naive(text):
+        text = text.lower()
+        return [_naive_first(FlowGuard.CATEGORY_KEYWORDS, list(FlowGuard.CATEGORY_KEYWORDS), text),
+                naive_color(text),
+                _naive_first(FlowGuard.DIRECTION_KEYWORDS, list(FlowGuard.DIRECTION_KEYWORDS), text),
+                any(kw in text for kw in FlowGuard.MODIFY_KEYWORDS)]
+
+    def flow_guard_matcher(text):
+        return [guard.validate_category(text), guard.validate_color(text),
+                guard.validate_direction(text), guard.detect_modification_intent(text)]
+
+    return [
+        ("QuestionClassifier.classify",
+         lambda text: _naive_scores(QuestionClassifier.KEYWORDS_MAP, text),
+         QuestionClassifier.classify),
+        ("QAHandler.identify_question_type",
+         lambda text: _naive_first(DEFAULT_QA_KEYWORDS, QUESTION_TYPE_PRIORITY, text),
+         qa.identify_question_type),
+        ("TimelineAnalyzer.analyze_question_timespan",
+         lambda text: _naive_first(TimelineAnalyzer.TIME_KEYWORDS, time_priority, text),
+         timeline.analyze_question_timespan),
+        ("FlowGuard 类别/颜色/方位/修改意图", flow_guard_naive, flow_guard_matcher),
+    ]
+
+
+def make_messages(length: int, count: int = 50):
+    """按目标长度拼接样例消息"""
+    rng = random.Random(0)
+    messages = []
+    for _ in range(count):
+        text = ""
+        while len(text) < length:
+            text += rng.choice(SAMPLE_MESSAGES) + "。"
+        messages.append(text[:length])
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="关键词分类基准测试")
+    parser.add_argument("--repeat", type=int, default=2000, help="每条消息重复次数")
+    parser.add_argument("--length", type=int, default=60, help="消息长度（字符）")
+    args = parser.parse_args()
+
+    logger.remove()  # 分析器逐条记录日志，基准测试时关闭
+
+    messages = make_messages(args.length)
+    matcher = KeywordMatcher.from_groups(QuestionClassifier.KEYWORDS_MAP, ignore_case=True)
+    build_us = timeit.timeit(
+        lambda: KeywordMatcher.from_groups(QuestionClassifier.KEYWORDS_MAP, ignore_case=True), number=20
+    ) / 20 * 1e6
+    print(f"消息长度 {args.length} 字符，每项 {args.repeat} 次")
+    print(f"QuestionClassifier 自动机：{len(matcher)} 个关键词，构建耗时 {build_us:.0f} µs（只构建一次）\n")
+    print(f"{'分类器':<44}{'逐词扫描':>10}{'自动机':>10}{'加速':>8}")
+
+    for name, naive, fast in build_cases():
+        fast(messages[0])  # 预热：构建自动机
+        calls = args.repeat * len(messages)
+        naive_us = timeit.timeit(lambda: [naive(m) for m in messages], number=args.repeat) / calls * 1e6
+        fast_us = timeit.timeit(lambda: [fast(m) for m in messages], number=args.repeat) / calls * 1e6
+        print(f"{name:<44}{naive_us:>8.2f}µs{fast_us:>8.2f}µs{naive_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+大六壬课表生成工具
+
+用 DaLiuRenCalculatorV2 的参考实现逐课排出全部 8640 课
+（60日干支 × 12月将 × 12时支）的四课、三传、天将和课体，
+写入紧凑的二进制课表（data/constants/daliuren_ke.bin），供 theories.daliuren.ke_table 运行时加载。
+
+使用方法：
+    python tools/generate_daliuren_table.py
+    python tools/generate_daliuren_table.py --output /tmp/daliuren_ke.bin
+    python tools/generate_daliuren_table.py --check
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from theories.daliuren.calculator_v2 import DaLiuRenCalculatorV2  # noqa: E402
+from theories.daliuren.ke_table import KE_COUNT, TABLE_PATH, DaLiuRenKeTable  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成大六壬课表")
+    parser.add_argument("--output", default=str(TABLE_PATH), help="输出文件路径")
+    parser.add_argument("--check", action="store_true", help="只检查现有课表是否与参考实现一致")
+    args = parser.parse_args()
+
+    table = DaLiuRenKeTable.build(DaLiuRenCalculatorV2()._calculate_ke_reference)
+    data = table.to_bytes()
+    output = Path(args.output)
+
+    if args.check:
+        if not output.exists():
+            print(f"❌ 大六壬课表不存在: {output}")
+            sys.exit(1)
+        if output.read_bytes() != data:
+            print(f"❌ 大六壬课表与参考实现不一致: {output}")
+            sys.exit(1)
+        print(f"✅ 大六壬课表一致（{KE_COUNT} 课）")
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(data)
+    print(f"✅ 已生成大六壬课表: {output}（{KE_COUNT} 课，{len(table.strings)} 个字符串，{len(data)} 字节）")
+
+
+if __name__ == "__main__":
+    main()
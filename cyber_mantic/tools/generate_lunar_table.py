@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+农历日表生成工具
+
+用 cnlunar 逐日计算 1900-01-31 至 2100-02-08 的农历日期和年月日干支，
+写入定长记录的二进制表（data/constants/lunar_days.bin），供 utils.lunar_table 运行时映射。
+
+cnlunar 只在生成表时需要，运行时不再依赖。
+
+使用方法：
+    python tools/generate_lunar_table.py
+    python tools/generate_lunar_table.py --output /tmp/lunar_days.bin
+    python tools/generate_lunar_table.py --check
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.lunar_table import TABLE_PATH, LunarDayTable  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成农历日二进制表")
+    parser.add_argument("--output", default=str(TABLE_PATH), help="输出文件路径")
+    parser.add_argument("--check", action="store_true", help="只检查现有表是否与重新计算的结果一致")
+    args = parser.parse_args()
+
+    try:
+        data = LunarDayTable.build_bytes()
+    except ImportError:
+        print("❌ 生成农历日表需要 cnlunar：pip install cnlunar")
+        sys.exit(1)
+    table = LunarDayTable(data)
+    output = Path(args.output)
+
+    if args.check:
+        if not output.exists():
+            print(f"❌ 农历日表不存在: {output}")
+            sys.exit(1)
+        if output.read_bytes() != data:
+            print(f"❌ 农历日表与重新计算的结果不一致: {output}")
+            sys.exit(1)
+        print(f"✅ 农历日表一致（{table.day_count} 天）")
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(data)
+    print(
+        f"✅ 已生成 {table.start_date:%Y-%m-%d} 至 {table.end_date:%Y-%m-%d} 农历日表: "
+        f"{output}（{table.day_count} 天，{len(data)} 字节）"
+    )
+
+
+if __name__ == "__main__":
+    main()
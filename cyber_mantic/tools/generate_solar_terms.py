@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+节气表生成工具
+
+用天文算法计算 1899-2101 年全部节气的精确时刻，写入紧凑的二进制表
+（data/constants/solar_terms.bin），供 utils.solar_terms 运行时加载。
+
+使用方法：
+    python tools/generate_solar_terms.py
+    python tools/generate_solar_terms.py --output /tmp/solar_terms.bin
+    python tools/generate_solar_terms.py --check
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.solar_terms import (  # noqa: E402
+    TABLE_END_YEAR,
+    TABLE_PATH,
+    TABLE_START_YEAR,
+    SolarTermTable
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成节气时刻二进制表")
+    parser.add_argument("--output", default=str(TABLE_PATH), help="输出文件路径")
+    parser.add_argument("--start-year", type=int, default=TABLE_START_YEAR, help="起始年份")
+    parser.add_argument("--end-year", type=int, default=TABLE_END_YEAR, help="结束年份")
+    parser.add_argument("--check", action="store_true", help="只检查现有表是否与重新计算的结果一致")
+    args = parser.parse_args()
+
+    table = SolarTermTable.build(args.start_year, args.end_year)
+    data = table.to_bytes()
+    output = Path(args.output)
+
+    if args.check:
+        if not output.exists():
+            print(f"❌ 节气表不存在: {output}")
+            sys.exit(1)
+        if output.read_bytes() != data:
+            print(f"❌ 节气表与重新计算的结果不一致: {output}")
+            sys.exit(1)
+        print(f"✅ 节气表一致（{len(table)} 个节气）")
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(data)
+    print(f"✅ 已生成 {args.start_year}-{args.end_year} 年节气表: {output}（{len(table)} 个节气，{len(data)} 字节）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+AsyncWorker - 在后台事件循环上执行的Qt工作对象
+
+取代"QThread + 每次 new_event_loop()"的写法：子类实现 run_async() 协程，
+start() 把它提交到全局后台事件循环（utils.loop_service），不再创建线程和事件循环。
+在协程里 emit 的信号跨线程发出，由Qt排队到接收者所在的主线程执行。
+
+保留了调用方常用的 QThread 接口：start() / isRunning() / wait()，
+完成时发出 done 信号（相当于 QThread.finished）。
+"""
+import concurrent.futures
+from typing import Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from utils.loop_service import get_loop_service
+from utils.logger import get_logger
+
+
+class AsyncWorker(QObject):
+    """后台事件循环工作对象基类"""
+
+    done = pyqtSignal()  # 协程结束（无论成功、失败或取消）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._future: Optional[concurrent.futures.Future] = None
+        self._is_cancelled = False
+
+    async def run_async(self):
+        """子类实现：要执行的协程，结果通过子类自己的信号发出"""
+        raise NotImplementedError
+
+    def start(self):
+        """提交到后台事件循环"""
+        if self.isRunning():
+            return
+        self._future = get_loop_service().submit(self.run_async())
+        self._future.add_done_callback(self._on_future_done)
+
+    def _on_future_done(self, future: concurrent.futures.Future):
+        if not future.cancelled() and future.exception() is not None:
+            get_logger(__name__).error(f"{type(self).__name__} 执行失败: {future.exception()}")
+        self.done.emit()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._is_cancelled
+
+    def cancel(self):
+        """请求取消：之后不再发出结果信号，协程继续运行至结束"""
+        self._is_cancelled = True
+
+    def abort(self):
+        """立即取消协程（协程内收到 CancelledError）"""
+        self._is_cancelled = True
+        if self._future is not None:
+            self._future.cancel()
+
+    def isRunning(self) -> bool:
+        """协程是否仍在执行"""
+        return self._future is not None and not self._future.done()
+
+    def wait(self, msecs: Optional[int] = None) -> bool:
+        """
+        阻塞等待协程结束
+
+        Args:
+            msecs: 最长等待毫秒数，None表示一直等待
+
+        Returns:
+            是否已结束
+        """
+        if self._future is None:
+            return True
+        try:
+            self._future.result(timeout=None if msecs is None else msecs / 1000)
+        except concurrent.futures.TimeoutError:
+            return False
+        except Exception:
+            pass  # 协程的异常由子类自行处理并通过信号报告
+        return True
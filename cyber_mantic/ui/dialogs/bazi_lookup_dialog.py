@@ -0,0 +1,130 @@
+"""
+八字反查对话框
+输入四柱（或三柱），列出1900-2100年间对应的公历时段，选中后回填出生时间
+"""
+from datetime import datetime
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout,
+    QLabel, QLineEdit, QListWidget, QListWidgetItem, QPushButton
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from theories.bazi.calculator import BaZiCalculator
+
+
+class BaZiLookupDialog(QDialog):
+    """八字反查对话框"""
+
+    datetime_selected = pyqtSignal(object)  # 选中时段的开始时刻（datetime）
+
+    def __init__(self, parent=None):
+        """初始化对话框"""
+        super().__init__(parent)
+        self.calculator = BaZiCalculator()
+
+        self.setWindowTitle("按八字反查出生时间")
+        self.setModal(True)
+        self.setMinimumSize(500, 400)
+
+        self._init_ui()
+
+    def _init_ui(self):
+        """初始化UI"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        hint_label = QLabel("输入年、月、日、时四柱（不知时柱可只填三柱），如：庚午 辛巳 壬寅 丁未")
+        hint_label.setWordWrap(True)
+        layout.addWidget(hint_label)
+
+        # 输入区域
+        input_layout = QHBoxLayout()
+        input_layout.setSpacing(10)
+
+        self.pillars_input = QLineEdit()
+        self.pillars_input.setPlaceholderText("庚午 辛巳 壬寅 丁未")
+        self.pillars_input.setMinimumHeight(32)
+        self.pillars_input.returnPressed.connect(self._search)
+        input_layout.addWidget(self.pillars_input)
+
+        search_btn = QPushButton("反查")
+        search_btn.setMinimumHeight(32)
+        search_btn.clicked.connect(self._search)
+        input_layout.addWidget(search_btn)
+
+        layout.addLayout(input_layout)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: gray; font-size: 11px;")
+        layout.addWidget(self.status_label)
+
+        # 结果列表
+        self.result_list = QListWidget()
+        self.result_list.setMinimumHeight(220)
+        self.result_list.itemDoubleClicked.connect(self._use_selected)
+        self.result_list.itemSelectionChanged.connect(self._on_selection_changed)
+        layout.addWidget(self.result_list)
+
+        # 按钮区域
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(10)
+
+        self.use_btn = QPushButton("填入出生时间")
+        self.use_btn.setMinimumHeight(36)
+        self.use_btn.setEnabled(False)
+        self.use_btn.clicked.connect(self._use_selected)
+        button_layout.addWidget(self.use_btn)
+
+        button_layout.addStretch()
+
+        close_btn = QPushButton("关闭")
+        close_btn.setMinimumSize(100, 36)
+        close_btn.clicked.connect(self.reject)
+        button_layout.addWidget(close_btn)
+
+        layout.addLayout(button_layout)
+
+    def _search(self):
+        """反查并刷新结果列表"""
+        self.result_list.clear()
+        self.use_btn.setEnabled(False)
+
+        text = self.pillars_input.text().strip()
+        if not text:
+            return
+
+        try:
+            windows = self.calculator.find_datetimes(text)
+        except ValueError as e:
+            self.status_label.setText(f"输入有误：{e}")
+            return
+
+        if not windows:
+            self.status_label.setText("1900-2100年间没有与此八字对应的时间")
+            return
+
+        self.status_label.setText(f"找到 {len(windows)} 个时段（双击填入）")
+        for window in windows:
+            item = QListWidgetItem(self._format_window(window.start, window.end))
+            item.setData(Qt.ItemDataRole.UserRole, window.start)
+            self.result_list.addItem(item)
+
+    @staticmethod
+    def _format_window(start: datetime, end: datetime) -> str:
+        """时段显示文字（结束时刻不含，次日0点显示为24:00）"""
+        end_text = "24:00" if end.date() > start.date() else f"{end:%H:%M}"
+        return f"{start:%Y年%m月%d日 %H:%M} - {end_text}"
+
+    def _on_selection_changed(self):
+        """列表选择改变"""
+        self.use_btn.setEnabled(self.result_list.currentItem() is not None)
+
+    def _use_selected(self):
+        """回填选中的时段"""
+        item = self.result_list.currentItem()
+        if item is None:
+            return
+        self.datetime_selected.emit(item.data(Qt.ItemDataRole.UserRole))
+        self.accept()
@@ -9,18 +9,18 @@ from PyQt6.QtWidgets import (
     QGroupBox, QTextEdit, QPushButton, QFrame,
     QSplitter, QScrollArea, QWidget
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 from typing import Optional
-import asyncio
 
+from ui.async_worker import AsyncWorker
 from models import ComprehensiveReport
 from services.report_service import ReportService
 from utils.logger import get_logger
 
 
-class CompareWorker(QThread):
-    """对比异步工作线程"""
+class CompareWorker(AsyncWorker):
+    """对比异步任务"""
     finished = pyqtSignal(str)  # AI对比分析结果
     error = pyqtSignal(str)
 
@@ -32,18 +32,11 @@ class CompareWorker(QThread):
         self.report1 = report1
         self.report2 = report2
 
-    def run(self):
+    async def run_async(self):
         """执行异步对比"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # 调用对比服务
-            comparison = loop.run_until_complete(
-                self.report_service.compare_reports(self.report1, self.report2)
-            )
-
-            loop.close()
+            comparison = await self.report_service.compare_reports(self.report1, self.report2)
 
             self.finished.emit(comparison)
 
@@ -10,18 +10,18 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QListWidget, QListWidgetItem,
     QGroupBox, QMessageBox, QInputDialog, QSplitter
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 from typing import Optional
-import asyncio
 
+from ui.async_worker import AsyncWorker
 from utils.template_manager import TemplateManager, ReportTemplate
 from api.manager import APIManager
 from utils.logger import get_logger
 
 
-class TemplateGeneratorWorker(QThread):
-    """模板生成异步工作线程"""
+class TemplateGeneratorWorker(AsyncWorker):
+    """模板生成异步任务"""
     finished = pyqtSignal(str)  # AI生成的prompt模板
     error = pyqtSignal(str)
 
@@ -30,18 +30,11 @@ class TemplateGeneratorWorker(QThread):
         self.api_manager = api_manager
         self.user_requirements = user_requirements
 
-    def run(self):
+    async def run_async(self):
         """执行异步生成"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # 调用AI生成模板
-            prompt_template = loop.run_until_complete(
-                self._generate_template()
-            )
-
-            loop.close()
+            prompt_template = await self._generate_template()
 
             self.finished.emit(prompt_template)
 
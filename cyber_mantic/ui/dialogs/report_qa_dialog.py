@@ -8,18 +8,18 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTextEdit,
     QPushButton, QLabel, QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 from typing import Optional
-import asyncio
 
+from ui.async_worker import AsyncWorker
 from ui.widgets.chat_widget import ChatWidget, MessageRole
 from services.report_service import ReportService
 from models import ComprehensiveReport
 
 
-class QAWorker(QThread):
-    """问答异步工作线程"""
+class QAWorker(AsyncWorker):
+    """问答异步任务"""
     finished = pyqtSignal(str)  # AI回答
     error = pyqtSignal(str)
 
@@ -29,17 +29,10 @@ class QAWorker(QThread):
         self.question = question
         self.report = report
 
-    def run(self):
+    async def run_async(self):
         """执行异步问答"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            answer = loop.run_until_complete(
-                self.report_service.answer_question(self.question, self.report)
-            )
-
-            loop.close()
+            answer = await self.report_service.answer_question(self.question, self.report)
 
             self.finished.emit(answer)
 
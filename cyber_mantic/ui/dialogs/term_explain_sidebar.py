@@ -9,17 +9,17 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea,
     QPushButton, QFrame, QTextEdit
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
 from typing import Optional, Tuple
-import asyncio
 
+from ui.async_worker import AsyncWorker
 from services.report_service import ReportService
 from models import ComprehensiveReport
 
 
-class ExplainWorker(QThread):
-    """术语解释异步工作线程"""
+class ExplainWorker(AsyncWorker):
+    """术语解释异步任务"""
     finished = pyqtSignal(str, str)  # (professional_explain, simple_explain)
     error = pyqtSignal(str)
 
@@ -29,18 +29,11 @@ class ExplainWorker(QThread):
         self.term = term
         self.report = report
 
-    def run(self):
+    async def run_async(self):
         """执行异步解释"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # 调用AI获取解释
-            explanation = loop.run_until_complete(
-                self.report_service.explain_term(self.term, self.report)
-            )
-
-            loop.close()
+            explanation = await self.report_service.explain_term(self.term, self.report)
 
             # 解析专业+通俗解释
             professional, simple = self._parse_explanation(explanation)
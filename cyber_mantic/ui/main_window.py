@@ -28,6 +28,7 @@ if HAS_PYQT6:
     from utils.config_manager import get_config_manager, reload_config
     from utils.history_manager import get_history_manager
     from utils.logger import get_logger
+    from utils.loop_service import get_loop_service, shutdown_loop_service
 
     # 服务层
     from services.conversation_service import ConversationService
@@ -375,7 +376,8 @@ if HAS_PYQT6:
                 self.config = self.config_manager.get_all_config()
                 self.engine = DecisionEngine(self.config)
 
-                # 更新服务层的API Manager
+                # 更新服务层的API Manager（旧实例的连接在后台事件循环中关闭）
+                get_loop_service().submit(self.api_manager.aclose())
                 self.api_manager = self.engine.api_manager
                 self.conversation_service = ConversationService(self.api_manager)
                 self.report_service = ReportService(self.api_manager)
@@ -654,6 +656,9 @@ if HAS_PYQT6:
                     except Exception as e:
                         self.logger.warning(f"清理设置标签页失败: {e}")
 
+                # 关闭API连接并停止后台事件循环
+                shutdown_loop_service(self.api_manager.aclose)
+
                 self.logger.info("资源清理完成，窗口即将关闭")
                 event.accept()
 
@@ -14,13 +14,12 @@ try:
         QLabel, QStackedWidget, QMessageBox, QTextEdit, QPushButton,
         QApplication, QProgressBar
     )
-    from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+    from PyQt6.QtCore import Qt, QTimer, pyqtSignal
     from PyQt6.QtGui import QFont, QIcon
     HAS_PYQT6 = True
 except ImportError:
     HAS_PYQT6 = False
 
-import asyncio
 
 from datetime import datetime
 from typing import Optional
@@ -30,9 +29,11 @@ if HAS_PYQT6:
     # 导入后端服务
     from models import ComprehensiveReport, TheoryAnalysisResult, ConflictInfo
     from core import DecisionEngine
+    from core.constants import PROGRESS_UPDATE_INTERVAL
     from utils.config_manager import get_config_manager, reload_config
     from utils.history_manager import get_history_manager
     from utils.logger import get_logger
+    from utils.loop_service import get_loop_service, shutdown_loop_service
 
     # 服务层
     from services.conversation_service import ConversationService
@@ -49,6 +50,7 @@ if HAS_PYQT6:
     from ui.widgets.stage_indicator import StageIndicatorBar
     from ui.widgets.theory_card_panel import TheoryCardPanel
     from ui.tabs.settings_tab_v2 import SettingsTabV2
+    from ui.async_worker import AsyncWorker
 
     # 原有标签页（暂时保留）
     from ui.tabs import (
@@ -72,10 +74,11 @@ if HAS_PYQT6:
             super().keyPressEvent(event)
 
 
-    class ConversationWorker(QThread):
-        """异步对话工作线程"""
+    class ConversationWorker(AsyncWorker):
+        """异步对话任务（在全局后台事件循环上执行）"""
         # 信号
         response_ready = pyqtSignal(str)
+        message_delta = pyqtSignal(str)               # AI回复流式片段
         progress_updated = pyqtSignal(str, str, int)  # stage, message, progress
         theory_updated = pyqtSignal(str, str, dict)   # event_type, theory_name, data
         error_occurred = pyqtSignal(str)
@@ -85,37 +88,27 @@ if HAS_PYQT6:
             self.conversation_service = conversation_service
             self.user_message = user_message
             self.is_start = is_start
-            self._loop = None
 
-        def run(self):
+        async def run_async(self):
             """执行异步操作"""
             try:
-                self._loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(self._loop)
-
                 if self.is_start:
                     # 开始新对话
-                    result = self._loop.run_until_complete(
-                        self.conversation_service.start_conversation(
-                            progress_callback=self._progress_callback,
-                            theory_callback=self._theory_callback
-                        )
+                    result = await self.conversation_service.start_conversation(
+                        progress_callback=self._progress_callback,
+                        theory_callback=self._theory_callback
                     )
                 else:
                     # 处理用户输入
-                    result = self._loop.run_until_complete(
-                        self.conversation_service.process_user_input(
-                            self.user_message,
-                            progress_callback=self._progress_callback,
-                            theory_callback=self._theory_callback
-                        )
+                    result = await self.conversation_service.process_user_input(
+                        self.user_message,
+                        progress_callback=self._progress_callback,
+                        theory_callback=self._theory_callback,
+                        stream_callback=self._stream_callback
                     )
                 self.response_ready.emit(result)
             except Exception as e:
                 self.error_occurred.emit(str(e))
-            finally:
-                if self._loop:
-                    self._loop.close()
 
         def _progress_callback(self, stage: str, message: str, progress: int):
             """进度回调"""
@@ -125,6 +118,10 @@ if HAS_PYQT6:
             """理论状态回调"""
             self.theory_updated.emit(event_type, theory_name, data or {})
 
+        def _stream_callback(self, delta: str):
+            """流式片段回调"""
+            self.message_delta.emit(delta)
+
 
     class MainWindowV2(QMainWindow):
         """主窗口 V2 - 默认白色主题"""
@@ -172,6 +169,14 @@ if HAS_PYQT6:
             self.conversation_worker: Optional[ConversationWorker] = None
             self.is_processing = False
 
+            # 流式输出状态（按 PROGRESS_UPDATE_INTERVAL 节流刷新气泡）
+            self._streaming_text = ""
+            self._streaming_active = False
+            self._stream_flush_timer = QTimer(self)
+            self._stream_flush_timer.setSingleShot(True)
+            self._stream_flush_timer.setInterval(PROGRESS_UPDATE_INTERVAL)
+            self._stream_flush_timer.timeout.connect(self._flush_streaming_message)
+
             # 信息面板引用
             self.progress_bar: Optional[QProgressBar] = None
             self.progress_label: Optional[QLabel] = None
@@ -721,6 +726,8 @@ if HAS_PYQT6:
                 self.config_manager = reload_config()
                 self.config = self.config_manager.get_all_config()
                 self.engine = DecisionEngine(self.config)
+                # 旧API Manager的连接在后台事件循环中关闭
+                get_loop_service().submit(self.api_manager.aclose())
                 self.api_manager = self.engine.api_manager
                 self.conversation_service = ConversationService(self.api_manager)
                 self.logger.info("配置已重新加载")
@@ -744,6 +751,7 @@ if HAS_PYQT6:
                     return
 
             # 清空界面
+            self._end_streaming()
             self.chat_widget.clear_messages()
             self.conversation_service.reset()
             self.save_btn.setEnabled(False)
@@ -767,10 +775,11 @@ if HAS_PYQT6:
                 is_start=True
             )
             self.conversation_worker.response_ready.connect(self._on_conversation_response)
+            self.conversation_worker.message_delta.connect(self._on_message_delta)
             self.conversation_worker.progress_updated.connect(self._on_progress_updated)
             self.conversation_worker.theory_updated.connect(self._on_theory_updated)
             self.conversation_worker.error_occurred.connect(self._on_conversation_error)
-            self.conversation_worker.finished.connect(self._on_worker_finished)
+            self.conversation_worker.done.connect(self._on_worker_finished)
             self.conversation_worker.start()
 
         def _on_send_message(self):
@@ -802,15 +811,48 @@ if HAS_PYQT6:
                 is_start=False
             )
             self.conversation_worker.response_ready.connect(self._on_conversation_response)
+            self.conversation_worker.message_delta.connect(self._on_message_delta)
             self.conversation_worker.progress_updated.connect(self._on_progress_updated)
             self.conversation_worker.theory_updated.connect(self._on_theory_updated)
             self.conversation_worker.error_occurred.connect(self._on_conversation_error)
-            self.conversation_worker.finished.connect(self._on_worker_finished)
+            self.conversation_worker.done.connect(self._on_worker_finished)
             self.conversation_worker.start()
 
+        def _on_message_delta(self, delta: str):
+            """接收AI流式片段"""
+            self._streaming_text += delta
+            if not self._streaming_active:
+                # 首个片段：立即创建气泡，缩短首字等待时间
+                self._streaming_active = True
+                self.chat_widget.add_assistant_message(self._streaming_text, animated=False)
+            elif not self._stream_flush_timer.isActive():
+                self._stream_flush_timer.start()
+
+        def _flush_streaming_message(self):
+            """将累积的流式文本刷新到最后一个气泡"""
+            if self._streaming_active:
+                self.chat_widget.update_last_message(self._streaming_text, is_complete=False)
+
+        def _end_streaming(self) -> bool:
+            """
+            结束流式输出
+
+            Returns:
+                本轮是否产生过流式气泡
+            """
+            was_streaming = self._streaming_active
+            self._stream_flush_timer.stop()
+            self._streaming_active = False
+            self._streaming_text = ""
+            return was_streaming
+
         def _on_conversation_response(self, response: str):
             """处理对话响应"""
-            self.chat_widget.add_assistant_message(response, animated=True)
+            # 流式输出时用完整回复替换流式气泡
+            if self._end_streaming():
+                self.chat_widget.update_last_message(response)
+            else:
+                self.chat_widget.add_assistant_message(response, animated=True)
             self.logger.debug(f"对话响应: {response[:100]}...")
 
         def _on_progress_updated(self, stage: str, message: str, progress: int):
@@ -842,6 +884,7 @@ if HAS_PYQT6:
         def _on_conversation_error(self, error_msg: str):
             """处理对话错误"""
             self.logger.error(f"对话错误: {error_msg}")
+            self._end_streaming()
             self.chat_widget.add_assistant_message(
                 f"⚠️ 抱歉，处理过程中遇到问题：{error_msg}\n\n请重试或检查网络连接。",
                 animated=False
@@ -949,6 +992,9 @@ if HAS_PYQT6:
                     except Exception as e:
                         self.logger.warning(f"清理标签页失败: {e}")
 
+            # 关闭API连接并停止后台事件循环
+            shutdown_loop_service(self.api_manager.aclose)
+
             event.accept()
 
 
@@ -22,12 +22,12 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QTextBrowser,
     QPushButton, QSplitter, QLabel, QGroupBox, QFrame, QMessageBox, QScrollArea
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, QEvent
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QTimer
 from PyQt6.QtGui import QFont, QKeyEvent
 from typing import Optional
-import asyncio
 import json
 
+from ui.async_worker import AsyncWorker
 from ui.widgets.chat_widget import ChatWidget
 from ui.widgets.progress_widget import ProgressWidget
 from ui.widgets.quick_result_card import QuickResultPanel
@@ -38,13 +38,15 @@ from api.manager import APIManager
 from utils.logger import get_logger
 from utils.warning_manager import get_warning_manager, WarningLevel
 from utils.theme_manager import ThemeManager  # V2: 主题管理
+from core.constants import PROGRESS_UPDATE_INTERVAL
 from ui.dialogs.warning_dialogs import show_warning_dialog, ForcedCoolingDialog
 
 
-class ConversationWorker(QThread):
-    """对话异步工作线程"""
+class ConversationWorker(AsyncWorker):
+    """对话异步任务（在全局后台事件循环上执行）"""
     # 现有信号
     message_received = pyqtSignal(str)  # AI回复消息
+    message_delta = pyqtSignal(str)  # AI回复流式片段
     progress_updated = pyqtSignal(str, str, int)  # (stage, message, progress)
     error = pyqtSignal(str)
 
@@ -59,41 +61,28 @@ class ConversationWorker(QThread):
         self.service = service
         self.user_message = user_message
         self.is_start = is_start
-        self._is_cancelled = False  # 取消标志
 
-    def cancel(self):
-        """取消任务"""
-        self._is_cancelled = True
-
-    def run(self):
+    async def run_async(self):
         """执行异步对话"""
         try:
             # 检查是否已取消
             if self._is_cancelled:
                 return
 
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             # 如果是开始新对话，调用start_conversation
             if self.is_start:
-                response = loop.run_until_complete(
-                    self.service.start_conversation(
-                        progress_callback=self.emit_progress,
-                        theory_callback=self.emit_theory_update
-                    )
+                response = await self.service.start_conversation(
+                    progress_callback=self.emit_progress,
+                    theory_callback=self.emit_theory_update
                 )
             else:
-                response = loop.run_until_complete(
-                    self.service.process_user_input(
-                        self.user_message,
-                        progress_callback=self.emit_progress,
-                        theory_callback=self.emit_theory_update
-                    )
+                response = await self.service.process_user_input(
+                    self.user_message,
+                    progress_callback=self.emit_progress,
+                    theory_callback=self.emit_theory_update,
+                    stream_callback=self.emit_delta
                 )
 
-            loop.close()
-
             # 检查是否已取消
             if self._is_cancelled:
                 return
@@ -108,6 +97,11 @@ class ConversationWorker(QThread):
         """发送进度信号"""
         self.progress_updated.emit(stage, message, progress)
 
+    def emit_delta(self, delta: str):
+        """发送流式片段信号"""
+        if not self._is_cancelled:
+            self.message_delta.emit(delta)
+
     def emit_theory_update(self, event_type: str, theory_name: str, data: dict = None):
         """
         发送理论分析更新信号
@@ -149,6 +143,14 @@ class AIConversationTab(QWidget):
         self.logger = get_logger(__name__)
         self.worker = None  # 当前工作线程
 
+        # 流式输出状态：累积文本 + 节流刷新（避免每个片段都重建气泡）
+        self._streaming_text = ""
+        self._streaming_active = False
+        self._stream_flush_timer = QTimer(self)
+        self._stream_flush_timer.setSingleShot(True)
+        self._stream_flush_timer.setInterval(PROGRESS_UPDATE_INTERVAL)
+        self._stream_flush_timer.timeout.connect(self._flush_streaming_message)
+
         # V2: 获取主题管理器和当前主题
         self.theme_manager = ThemeManager()
         self.current_theme = self._get_current_theme()
@@ -650,6 +652,7 @@ class AIConversationTab(QWidget):
         # 启动异步处理
         self.worker = ConversationWorker(self.conversation_service, user_message)
         self.worker.message_received.connect(self._on_message_received)
+        self.worker.message_delta.connect(self._on_message_delta)
         self.worker.progress_updated.connect(self._on_progress_updated)
         self.worker.error.connect(self._on_error)
         # V2: 连接理论分析信号
@@ -657,10 +660,41 @@ class AIConversationTab(QWidget):
         self.worker.quick_result.connect(self._on_quick_result)
         self.worker.start()
 
+    def _on_message_delta(self, delta: str):
+        """接收AI流式片段"""
+        self._streaming_text += delta
+        if not self._streaming_active:
+            # 首个片段：立即创建气泡，缩短首字等待时间
+            self._streaming_active = True
+            self.chat_widget.add_assistant_message(self._streaming_text, animated=False)
+        elif not self._stream_flush_timer.isActive():
+            self._stream_flush_timer.start()
+
+    def _flush_streaming_message(self):
+        """将累积的流式文本刷新到最后一个气泡"""
+        if self._streaming_active:
+            self.chat_widget.update_last_message(self._streaming_text)
+
+    def _end_streaming(self) -> bool:
+        """
+        结束流式输出
+
+        Returns:
+            本轮是否产生过流式气泡
+        """
+        was_streaming = self._streaming_active
+        self._stream_flush_timer.stop()
+        self._streaming_active = False
+        self._streaming_text = ""
+        return was_streaming
+
     def _on_message_received(self, message: str):
         """接收AI消息"""
-        # 添加AI消息到聊天
-        self.chat_widget.add_assistant_message(message)
+        # 添加AI消息到聊天（流式输出时用完整回复替换流式气泡）
+        if self._end_streaming():
+            self.chat_widget.update_last_message(message)
+        else:
+            self.chat_widget.add_assistant_message(message)
 
         # 更新关键信息面板
         self._update_right_panel()
@@ -723,6 +757,7 @@ class AIConversationTab(QWidget):
     def _on_error(self, error_msg: str):
         """错误处理"""
         self.logger.error(f"AI对话出错: {error_msg}")
+        self._end_streaming()
 
         error_response = f"😅 抱歉，处理时遇到了一些问题：{error_msg}\n\n请稍后再试，或重新发起对话。"
         self.chat_widget.add_assistant_message(error_response)
@@ -1021,18 +1056,19 @@ class AIConversationTab(QWidget):
             # 断开信号连接，防止后续触发
             try:
                 self.worker.message_received.disconnect()
+                self.worker.message_delta.disconnect()
                 self.worker.progress_updated.disconnect()
                 self.worker.error.disconnect()
             except TypeError:
                 pass  # 信号未连接时忽略
-            # 等待线程结束（最多2秒）
+            # 等待任务结束（最多2秒）
             if not self.worker.wait(2000):
-                self.logger.warning("工作线程未能在2秒内结束，强制终止")
-                self.worker.terminate()  # 强制终止线程
-                self.worker.wait()  # 等待终止完成
+                self.logger.warning("对话任务未能在2秒内结束，强制取消")
+                self.worker.abort()
             # Qt对象清理
             self.worker.deleteLater()
             self.worker = None
+        self._end_streaming()
 
     def eventFilter(self, obj, event):
         """
@@ -191,6 +191,7 @@ class AnalysisTab(QWidget):
         self.worker.progress.connect(self._on_progress)
         self.worker.finished.connect(self._on_finished)
         self.worker.error.connect(self._on_error)
+        self.worker.verification_completed.connect(self._on_verification_completed)
         self.worker.start()
 
     def _collect_user_input(self) -> Optional[UserInput]:
@@ -369,6 +370,21 @@ class AnalysisTab(QWidget):
 
         QMessageBox.information(self, "完成", "分析完成！请查看结果标签页")
 
+    def _on_verification_completed(self, target_name: str, verification: dict):
+        """后台双模型验证完成（验证结果已写入报告对象），刷新显示并更新历史记录"""
+        report = self.current_report
+        if report is None:
+            return
+
+        # 只处理当前显示报告的验证结果（报告交付前完成的验证已包含在报告中）
+        targets = [report] + list(report.theory_results)
+        if not any(getattr(target, 'verification', None) is verification for target in targets):
+            return
+
+        self.logger.info(f"{target_name} 双模型验证完成，一致性: {verification.get('consistency_level')}")
+        self.result_panel.update_verification(report)
+        self.history_manager.save_report(report)
+
     def _on_error(self, error_msg: str):
         """错误处理"""
         self.progress_panel.set_failed()
@@ -403,6 +419,7 @@ class AnalysisTab(QWidget):
                 self.worker.progress.disconnect()
                 self.worker.finished.disconnect()
                 self.worker.error.disconnect()
+                self.worker.verification_completed.disconnect()
             except Exception as e:
                 self.logger.debug(f"清理worker信号失败: {e}")
 
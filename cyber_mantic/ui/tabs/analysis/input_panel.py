@@ -15,6 +15,7 @@ from utils.logger import get_logger
 from utils.profile_manager import get_profile_manager
 from ui.dialogs.person_birth_info_dialog import PersonBirthInfoDialog
 from ui.dialogs.profile_manager_dialog import ProfileManagerDialog
+from ui.dialogs.bazi_lookup_dialog import BaZiLookupDialog
 
 from .workers import GeocodeWorker
 
@@ -180,6 +181,13 @@ class InputPanel(QGroupBox):
         self.birth_day.setMinimumHeight(32)
         birth_datetime_layout.addWidget(self.birth_day)
         birth_datetime_layout.addWidget(QLabel("日"))
+
+        self.bazi_lookup_btn = QPushButton("按八字反查")
+        self.bazi_lookup_btn.setMinimumHeight(32)
+        self.bazi_lookup_btn.setEnabled(False)
+        self.bazi_lookup_btn.setToolTip("只有八字（如旧命书）时，反查对应的出生时间")
+        self.bazi_lookup_btn.clicked.connect(self._lookup_bazi)
+        birth_datetime_layout.addWidget(self.bazi_lookup_btn)
         birth_datetime_layout.addStretch()
         layout.addLayout(birth_datetime_layout)
 
@@ -433,6 +441,7 @@ class InputPanel(QGroupBox):
         self.birth_year.setEnabled(enabled)
         self.birth_month.setEnabled(enabled)
         self.birth_day.setEnabled(enabled)
+        self.bazi_lookup_btn.setEnabled(enabled)
         self.birth_time_certainty.setEnabled(enabled)
 
         if enabled:
@@ -544,6 +553,21 @@ class InputPanel(QGroupBox):
             mbti_type=mbti_type
         )
 
+    def _lookup_bazi(self):
+        """按八字反查出生时间"""
+        dialog = BaZiLookupDialog(self)
+        dialog.datetime_selected.connect(self._apply_birth_datetime)
+        dialog.exec()
+
+    def _apply_birth_datetime(self, birth_datetime):
+        """将反查到的出生时间（阳历）填入表单"""
+        self.calendar_type.setCurrentIndex(0)
+        self.birth_year.setValue(birth_datetime.year)
+        self.birth_month.setValue(birth_datetime.month)
+        self.birth_day.setValue(birth_datetime.day)
+        self.birth_hour.setValue(birth_datetime.hour)
+        self.birth_minute.setValue(birth_datetime.minute)
+
     def _load_profile(self):
         """加载常用档案"""
         dialog = ProfileManagerDialog(self)
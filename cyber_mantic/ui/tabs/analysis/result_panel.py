@@ -135,25 +135,7 @@ class ResultPanel(QGroupBox):
             report: 综合分析报告
         """
         # 摘要
-        summary_content = self._extract_summary_content(report.executive_summary)
-        summary_formatted = f"""# 赛博玄数分析报告
-
-**报告ID**: {report.report_id[:16]}
-**生成时间**: {report.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-**问题类别**: {report.user_input_summary.get('question_type', '未知')}
-**使用理论**: {', '.join(report.selected_theories)}
-
----
-
-## 核心摘要
-
-{summary_content}
-
----
-
-**置信度**: {report.overall_confidence:.0%} | **局限性**: {report.limitations}
-"""
-        self.summary_text.setMarkdown(summary_formatted)
+        self.summary_text.setMarkdown(self._format_summary_markdown(report))
         self.summary_text.verticalScrollBar().setValue(0)
 
         # 详细分析
@@ -214,6 +196,60 @@ class ResultPanel(QGroupBox):
         self.detail_text.verticalScrollBar().setValue(0)
 
         # 各理论分析
+        self.theories_text.setMarkdown(self._format_theories_markdown(report))
+        self.theories_text.verticalScrollBar().setValue(0)
+
+        # 更新可视化图表
+        try:
+            self._update_visualizations(report)
+        except Exception as e:
+            self.logger.error(f"更新可视化图表失败: {e}", exc_info=True)
+
+        # 显示结果区域
+        self.setVisible(True)
+
+    def update_verification(self, report: ComprehensiveReport):
+        """后台双模型验证完成后刷新验证信息（保持当前滚动位置）
+
+        Args:
+            report: 已显示的综合分析报告
+        """
+        for text_edit, markdown in (
+            (self.summary_text, self._format_summary_markdown(report)),
+            (self.theories_text, self._format_theories_markdown(report)),
+        ):
+            scroll_bar = text_edit.verticalScrollBar()
+            position = scroll_bar.value()
+            text_edit.setMarkdown(markdown)
+            scroll_bar.setValue(position)
+
+    def _format_summary_markdown(self, report: ComprehensiveReport) -> str:
+        """生成摘要页Markdown"""
+        summary_content = self._extract_summary_content(report.executive_summary)
+        summary_formatted = f"""# 赛博玄数分析报告
+
+**报告ID**: {report.report_id[:16]}
+**生成时间**: {report.created_at.strftime('%Y-%m-%d %H:%M:%S')}
+**问题类别**: {report.user_input_summary.get('question_type', '未知')}
+**使用理论**: {', '.join(report.selected_theories)}
+
+---
+
+## 核心摘要
+
+{summary_content}
+
+---
+
+**置信度**: {report.overall_confidence:.0%} | **局限性**: {report.limitations}
+"""
+        verification = self._format_verification_markdown(getattr(report, 'verification', None))
+        if verification:
+            summary_formatted += f"\n{verification}"
+        return summary_formatted
+
+    def _format_theories_markdown(self, report: ComprehensiveReport) -> str:
+        """生成各理论分析页Markdown"""
         theories_text = f"""# 各理论分析详情
 
 *共使用 **{len(report.theory_results)}** 个术数理论进行分析*
@@ -230,20 +266,23 @@ class ResultPanel(QGroupBox):
 
 {result.interpretation}
 
+{self._format_verification_markdown(getattr(result, 'verification', None))}
 ---
 
 """
-        self.theories_text.setMarkdown(theories_text)
-        self.theories_text.verticalScrollBar().setValue(0)
-
-        # 更新可视化图表
-        try:
-            self._update_visualizations(report)
-        except Exception as e:
-            self.logger.error(f"更新可视化图表失败: {e}", exc_info=True)
-
-        # 显示结果区域
-        self.setVisible(True)
+        return theories_text
+
+    def _format_verification_markdown(self, verification: Optional[Dict[str, Any]]) -> str:
+        """格式化双模型验证结果（无验证结果时返回空字符串）"""
+        if not verification:
+            return ""
+        text = (
+            f"> 🔍 **双模型验证**（{verification.get('primary_api')} / {verification.get('secondary_api')}）："
+            f"一致性 **{verification.get('consistency_level')}**，{verification.get('analysis')}\n"
+        )
+        for difference in verification.get('differences') or []:
+            text += f">\n> - {difference}\n"
+        return text
 
     def _extract_summary_content(self, executive_summary: str) -> str:
         """提取执行摘要的核心内容"""
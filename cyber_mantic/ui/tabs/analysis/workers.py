@@ -4,37 +4,36 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from models import UserInput, ComprehensiveReport
+from ui.async_worker import AsyncWorker
 from services.analysis_service import AnalysisService
 
 
-class AnalysisWorker(QThread):
-    """分析工作线程"""
+class AnalysisWorker(AsyncWorker):
+    """分析任务（在全局后台事件循环上执行）"""
 
     progress = pyqtSignal(str, str, int, str)  # 理论名, 状态, 进度, 详细信息
     quick_result = pyqtSignal(str)  # 快速结果
     finished = pyqtSignal(object)  # 完成信号，传递报告
     error = pyqtSignal(str)  # 错误信号
+    verification_completed = pyqtSignal(str, object)  # 后台双模型验证完成（理论名或"综合报告", 验证结果）
 
     def __init__(self, analysis_service: AnalysisService, user_input: UserInput):
         super().__init__()
         self.analysis_service = analysis_service
         self.user_input = user_input
 
-    def run(self):
+    async def run_async(self):
         """执行分析"""
         try:
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             def progress_callback(theory_name: str, message: str, progress: int, detail: str = ""):
                 self.progress.emit(theory_name, message, progress, detail)
 
-            report = loop.run_until_complete(
-                self.analysis_service.analyze(self.user_input, progress_callback)
-            )
+            def verification_callback(target_name: str, verification: dict):
+                self.verification_completed.emit(target_name, verification)
 
-            loop.close()
+            report = await self.analysis_service.analyze(self.user_input, progress_callback, verification_callback)
+            # 异步验证模式下后台验证由 APIManager 持有、在全局事件循环上继续运行，
+            # 报告显示后陆续通过 verification_completed 送达，任务本身到此结束
             self.finished.emit(report)
         except Exception as e:
             self.error.emit(str(e))
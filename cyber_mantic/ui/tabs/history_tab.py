@@ -393,6 +393,7 @@ class HistoryTab(QWidget):
             from utils.config_manager import get_config_manager
             from services.report_service import ReportService
             from api.manager import APIManager
+            from api.task_router import get_task_router
 
             report1 = self.history_manager.get_report_by_id(self.selected_report_ids[0])
             report2 = self.history_manager.get_report_by_id(self.selected_report_ids[1])
@@ -403,7 +404,7 @@ class HistoryTab(QWidget):
 
             # 创建ReportService实例
             config = get_config_manager().get_all_config()
-            api_manager = APIManager(config.get("api", {}))
+            api_manager = APIManager(config.get("api", {}), task_router=get_task_router())
             report_service = ReportService(api_manager)
 
             # 正确传递参数：report1, report2, report_service, parent
@@ -417,6 +418,7 @@ class HistoryTab(QWidget):
         try:
             from ui.dialogs.report_qa_dialog import ReportQADialog
             from api.manager import APIManager
+            from api.task_router import get_task_router
             
             report = self.history_manager.get_report_by_id(report_id)
             if not report:
@@ -427,7 +429,7 @@ class HistoryTab(QWidget):
             from utils.config_manager import get_config_manager
             from services.report_service import ReportService
             config = get_config_manager().get_all_config()
-            api_manager = APIManager(config.get("api", {}))
+            api_manager = APIManager(config.get("api", {}), task_router=get_task_router())
             report_service = ReportService(api_manager)
 
             dialog = ReportQADialog(report, report_service, self)
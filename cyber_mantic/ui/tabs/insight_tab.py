@@ -20,9 +20,8 @@ from PyQt6.QtWidgets import (
     QGroupBox, QMessageBox, QDialog, QTextEdit,
     QProgressDialog, QSizePolicy
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QPixmap
-import asyncio
 import json
 from datetime import datetime, timedelta
 from io import BytesIO
@@ -41,10 +40,11 @@ except ImportError:
 from utils.usage_stats_manager import get_usage_stats_manager
 from utils.notes_manager import get_notes_manager
 from utils.logger import get_logger
+from ui.async_worker import AsyncWorker
 
 
-class ProfileAnalysisWorker(QThread):
-    """用户画像分析工作线程"""
+class ProfileAnalysisWorker(AsyncWorker):
+    """用户画像分析异步任务"""
     finished = pyqtSignal(str)  # 分析结果
     error = pyqtSignal(str)  # 错误信息
 
@@ -53,23 +53,18 @@ class ProfileAnalysisWorker(QThread):
         self.profile_data = profile_data
         self.api_manager = api_manager
 
-    def run(self):
+    async def run_async(self):
         """执行AI分析"""
         try:
             # 构建分析prompt
             prompt = self._build_analysis_prompt()
 
             # 调用AI API (使用APIManager的call_api方法)
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(
-                self.api_manager.call_api(
-                    task_type="快速交互问答",  # 使用deepseek进行分析
-                    prompt=prompt,
-                    enable_dual_verification=False  # 禁用双模型验证以加速
-                )
+            result = await self.api_manager.call_api(
+                task_type="快速交互问答",  # 使用deepseek进行分析
+                prompt=prompt,
+                enable_dual_verification=False  # 禁用双模型验证以加速
             )
-            loop.close()
 
             if result:
                 self.finished.emit(result)
@@ -968,7 +963,6 @@ class InsightTab(QWidget):
         self._ai_refresh_btn.setText("刷新分析")
 
         # 更新时间
-        from datetime import datetime
         self._ai_update_label.setText(f"更新于 {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
     def _on_analysis_error(self, error_msg: str):
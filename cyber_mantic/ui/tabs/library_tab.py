@@ -19,13 +19,14 @@ from PyQt6.QtWidgets import (
     QDialog, QTextEdit, QLineEdit, QMessageBox,
     QFileDialog, QInputDialog, QMenu, QScrollArea
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QThread, QTimer, QObject
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QObject
 from PyQt6.QtGui import QFont, QWheelEvent
 
 from utils.logger import get_logger
 from utils.notes_manager import get_notes_manager
 from utils.usage_stats_manager import get_usage_stats_manager
 from utils.rag_manager import get_rag_manager
+from ui.async_worker import AsyncWorker
 from ui.widgets.document_viewer import DocumentViewer
 from ui.dialogs.rag_qa_dialog import RAGQADialog
 
@@ -169,8 +170,8 @@ class ReadingTracker(QObject):
         return self._is_active
 
 
-class AIAssistantWorker(QThread):
-    """AI学习助手工作线程"""
+class AIAssistantWorker(AsyncWorker):
+    """AI学习助手异步任务"""
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
 
@@ -179,27 +180,18 @@ class AIAssistantWorker(QThread):
         self.api_manager = api_manager
         self.prompt = prompt
 
-    def run(self):
+    async def run_async(self):
         """执行AI分析"""
-        import asyncio
         try:
-            # 创建新的事件循环
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                # 使用API进行分析
-                response = loop.run_until_complete(
-                    self.api_manager.call_api(
-                        task_type="library_assistant",
-                        prompt=self.prompt
-                    )
-                )
-                if response:
-                    self.finished.emit(response)
-                else:
-                    self.error.emit("AI返回结果为空")
-            finally:
-                loop.close()
+            # 使用API进行分析
+            response = await self.api_manager.call_api(
+                task_type="library_assistant",
+                prompt=self.prompt
+            )
+            if response:
+                self.finished.emit(response)
+            else:
+                self.error.emit("AI返回结果为空")
         except Exception as e:
             self.error.emit(str(e))
 
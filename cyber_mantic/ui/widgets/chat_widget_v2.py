@@ -552,6 +552,17 @@ class ChatBubble(QFrame):
         if self.typewriter and self.typewriter.is_running():
             self.typewriter.stop()
 
+    def set_content(self, content: str, is_complete: bool = True):
+        """替换AI气泡内容（用于流式输出）"""
+        self.content = content
+        if self.role != MessageRole.ASSISTANT:
+            return
+        if self.typewriter:
+            self.typewriter.timer.stop()
+            self.typewriter = None
+        renderer = ProgressiveMarkdownRenderer(self.theme)
+        self.content_browser.setHtml(renderer.render(content, is_complete=is_complete))
+
     def set_theme(self, theme: str):
         """更新主题"""
         self.theme = theme
@@ -632,6 +643,19 @@ class ChatWidgetV2(QWidget):
         self._add_bubble(bubble)
         self.message_added.emit("assistant", content)
 
+    def update_last_message(self, content: str, is_complete: bool = True):
+        """
+        更新最后一条AI消息的内容（用于流式输出）
+
+        Args:
+            content: 新的消息内容
+            is_complete: 内容是否已完整（未完整时按渐进模式渲染Markdown）
+        """
+        if not self.messages or self.messages[-1].role != MessageRole.ASSISTANT:
+            return
+        self.messages[-1].set_content(content, is_complete=is_complete)
+        self._scroll_to_bottom()
+
     def _add_bubble(self, bubble: ChatBubble):
         """添加气泡到布局"""
         self.messages.append(bubble)
@@ -0,0 +1,128 @@
+"""
+干支整数编码核心
+
+天干、地支、六十甲子、五行、十神和冲合关系统一用小整数表示，关系预先算成矩阵，
+计算器内部用整数运算，只在输出时转成文字，避免热循环中的 list.index() 线性查找和字符串哈希。
+
+编码约定：
+- 天干 0-9：甲乙丙丁戊己庚辛壬癸（偶数为阳）
+- 地支 0-11：子丑寅卯辰巳午未申酉戌亥（偶数为阳）
+- 六十甲子 0-59：0=甲子，干 = n % 10，支 = n % 12
+- 五行 0-4：木火土金水（i 生 i+1，i 克 i+2）
+- 十神 0-9：比肩 劫财 食神 伤官 偏财 正财 七杀 正官 偏印 正印
+"""
+from datetime import date
+from typing import Dict, List, Tuple
+
+
+GAN_NAMES = ("甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸")
+ZHI_NAMES = ("子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥")
+WUXING_NAMES = ("木", "火", "土", "金", "水")
+ZODIAC_NAMES = ("鼠", "牛", "虎", "兔", "龙", "蛇", "马", "羊", "猴", "鸡", "狗", "猪")
+YINYANG_NAMES = ("阳", "阴")
+TEN_GOD_NAMES = ("比肩", "劫财", "食神", "伤官", "偏财", "正财", "七杀", "正官", "偏印", "正印")
+
+JIAZI_NAMES = tuple(GAN_NAMES[i % 10] + ZHI_NAMES[i % 12] for i in range(60))
+
+GAN_INDEX: Dict[str, int] = {name: i for i, name in enumerate(GAN_NAMES)}
+ZHI_INDEX: Dict[str, int] = {name: i for i, name in enumerate(ZHI_NAMES)}
+WUXING_INDEX: Dict[str, int] = {name: i for i, name in enumerate(WUXING_NAMES)}
+JIAZI_INDEX: Dict[str, int] = {name: i for i, name in enumerate(JIAZI_NAMES)}
+
+WOOD, FIRE, EARTH, METAL, WATER = range(5)
+
+# 天干、地支的五行
+GAN_WUXING = (WOOD, WOOD, FIRE, FIRE, EARTH, EARTH, METAL, METAL, WATER, WATER)
+ZHI_WUXING = (WATER, EARTH, WOOD, WOOD, EARTH, FIRE, FIRE, EARTH, METAL, METAL, EARTH, WATER)
+
+# 五行生克矩阵：SHENG[a][b] 为 a 生 b，KE[a][b] 为 a 克 b
+SHENG = tuple(tuple((a + 1) % 5 == b for b in range(5)) for a in range(5))
+KE = tuple(tuple((a + 2) % 5 == b for b in range(5)) for a in range(5))
+SHENG_TARGET = tuple((a + 1) % 5 for a in range(5))   # a 所生
+KE_TARGET = tuple((a + 2) % 5 for a in range(5))      # a 所克
+SHENG_SOURCE = tuple((a - 1) % 5 for a in range(5))   # 生 a 者
+
+# 十神矩阵：TEN_GOD[日主][他干]
+# 他干五行减日主五行（模5）依次为 同我、我生、我克、克我、生我，乘2后按阴阳异同区分偏正
+TEN_GOD = tuple(
+    tuple((GAN_WUXING[other] - GAN_WUXING[me]) % 5 * 2 + (me % 2 != other % 2) for other in range(10))
+    for me in range(10)
+)
+
+# 冲合刑害（按地支/天干序号直接查表）
+CHONG = tuple((z + 6) % 12 for z in range(12))        # 六冲
+LIU_HE = tuple((13 - z) % 12 for z in range(12))      # 六合：子丑、寅亥、卯戌、辰酉、巳申、午未
+LIU_HAI = tuple((7 - z) % 12 for z in range(12))      # 六害：子未、丑午、寅巳、卯辰、申亥、酉戌
+GAN_HE = tuple((g + 5) % 10 for g in range(10))       # 天干五合：甲己、乙庚、丙辛、丁壬、戊癸
+GAN_HE_WUXING = tuple((EARTH, METAL, WATER, WOOD, FIRE)[g % 5] for g in range(10))  # 合化五行
+SAN_HE_GROUP = tuple(z % 4 for z in range(12))        # 三合局：0=申子辰 1=巳酉丑 2=寅午戌 3=亥卯未
+SAN_HE_WUXING = (WATER, METAL, FIRE, WOOD)
+
+# 2000-01-01 为庚辰日（甲子序号16）
+_DAY_EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+_DAY_EPOCH_JIAZI = 16
+
+
+def jiazi(gan: int, zhi: int) -> int:
+    """干支序号组合为六十甲子序号（阴阳不配时抛出ValueError）"""
+    if gan % 2 != zhi % 2:
+        raise ValueError(f"无效的干支组合：{GAN_NAMES[gan]}{ZHI_NAMES[zhi]}")
+    return (6 * gan - 5 * zhi) % 60
+
+
+def split_jiazi(index: int) -> Tuple[int, int]:
+    """六十甲子序号拆为 (天干, 地支)"""
+    return index % 10, index % 12
+
+
+def parse_jiazi(name: str) -> int:
+    """干支文字转六十甲子序号"""
+    index = JIAZI_INDEX.get(name)
+    if index is None:
+        raise ValueError(f"无效的干支：{name}")
+    return index
+
+
+def year_jiazi(year: int) -> int:
+    """干支纪年的年份对应的年柱甲子序号（1984为甲子年）"""
+    return (year - 4) % 60
+
+
+def day_jiazi(day: date) -> int:
+    """公历日期的日柱甲子序号"""
+    return (_DAY_EPOCH_JIAZI + day.toordinal() - _DAY_EPOCH_ORDINAL) % 60
+
+
+def hour_zhi(hour: int) -> int:
+    """小时（0-23）对应的时支，23点起为子时"""
+    return ((hour + 1) // 2) % 12
+
+
+def month_gan(year_gan: int, month_index: int) -> int:
+    """年上起月：年干和月序号（0=寅月）求月干"""
+    return (year_gan % 5 * 2 + 2 + month_index) % 10
+
+
+def hour_gan(day_gan: int, zhi: int) -> int:
+    """日上起时：日干和时支求时干"""
+    return (day_gan % 5 * 2 + zhi) % 10
+
+
+def month_zhi(month_index: int) -> int:
+    """月序号（0=寅月）对应的月支"""
+    return (month_index + 2) % 12
+
+
+def jiazi_name(index: int) -> str:
+    """六十甲子序号转文字"""
+    return JIAZI_NAMES[index % 60]
+
+
+def count_wuxing(gans: List[int], zhis: List[int]) -> List[int]:
+    """统计天干地支的五行个数，返回按木火土金水排列的计数"""
+    counts = [0] * 5
+    for gan in gans:
+        counts[GAN_WUXING[gan]] += 1
+    for zhi in zhis:
+        counts[ZHI_WUXING[zhi]] += 1
+    return counts
@@ -0,0 +1,184 @@
+"""
+卦象整数编码核心（六爻、梅花易数共用）
+
+一卦用6位整数表示，第 i 位（0起）为第 i+1 爻，1为阳、0为阴；
+低3位为下卦（内卦），高3位为上卦（外卦），八卦同样用3位整数表示。
+
+变卦、互卦、综卦、错卦都是位运算；卦名、八宫、世应、纳甲、六亲预先算成64项表，
+起卦和装卦不再拼接字符串、查字典，适合成千上万次的批量模拟起卦。
+
+编码约定：
+- 八卦 0-7：坤0 震1 坎2 兑3 艮4 离5 巽6 乾7（初爻为最低位）
+- 六亲 0-4：兄弟 子孙 妻财 官鬼 父母（爻支五行减卦宫五行，模5）
+- 世代 0-7：本宫 一世 二世 三世 四世 五世 游魂 归魂
+"""
+from typing import Iterable, Tuple
+
+from utils.ganzhi import GAN_INDEX, ZHI_INDEX, ZHI_WUXING, WOOD, FIRE, EARTH, METAL, WATER, jiazi
+
+
+KUN, ZHEN, KAN, DUI, GEN, LI, XUN, QIAN = range(8)
+
+TRIGRAM_NAMES = ("坤", "震", "坎", "兑", "艮", "离", "巽", "乾")
+TRIGRAM_SYMBOLS = ("☷", "☳", "☵", "☱", "☶", "☲", "☴", "☰")
+TRIGRAM_IMAGES = ("地", "雷", "水", "泽", "山", "火", "风", "天")
+TRIGRAM_WUXING = (EARTH, WOOD, WATER, METAL, EARTH, FIRE, WOOD, METAL)
+TRIGRAM_INDEX = {name: code for code, name in enumerate(TRIGRAM_NAMES)}
+
+# 先天八卦数 1-8：乾1 兑2 离3 震4 巽5 坎6 艮7 坤8
+XIANTIAN_ORDER = (QIAN, DUI, LI, ZHEN, XUN, KAN, GEN, KUN)
+
+LIU_QIN_NAMES = ("兄弟", "子孙", "妻财", "官鬼", "父母")
+GENERATION_NAMES = ("本宫", "一世", "二世", "三世", "四世", "五世", "游魂", "归魂")
+_GENERATION_SHI = (6, 1, 2, 3, 4, 5, 4, 3)
+
+ALL_YANG = 0b111111
+
+# 六十四卦名（按先天序：行为上卦，列为下卦）
+_NAMES_BY_XIANTIAN = (
+    ("乾为天", "天泽履", "天火同人", "天雷无妄", "天风姤", "天水讼", "天山遁", "天地否"),
+    ("泽天夬", "兑为泽", "泽火革", "泽雷随", "泽风大过", "泽水困", "泽山咸", "泽地萃"),
+    ("火天大有", "火泽睽", "离为火", "火雷噬嗑", "火风鼎", "火水未济", "火山旅", "火地晋"),
+    ("雷天大壮", "雷泽归妹", "雷火丰", "震为雷", "雷风恒", "雷水解", "雷山小过", "雷地豫"),
+    ("风天小畜", "风泽中孚", "风火家人", "风雷益", "巽为风", "风水涣", "风山渐", "风地观"),
+    ("水天需", "水泽节", "水火既济", "水雷屯", "水风井", "坎为水", "水山蹇", "水地比"),
+    ("山天大畜", "山泽损", "山火贲", "山雷颐", "山风蛊", "山水蒙", "艮为山", "山地剥"),
+    ("地天泰", "地泽临", "地火明夷", "地雷复", "地风升", "地水师", "地山谦", "坤为地"),
+)
+
+# 纳甲：(内卦天干, 外卦天干, 内卦三爻地支, 外卦三爻地支)
+_NA_JIA_RULES = {
+    QIAN: ("甲", "壬", "子寅辰", "午申戌"),
+    KUN: ("乙", "癸", "未巳卯", "丑亥酉"),
+    ZHEN: ("庚", "庚", "子寅辰", "午申戌"),
+    XUN: ("辛", "辛", "丑亥酉", "未巳卯"),
+    KAN: ("戊", "戊", "寅辰午", "申戌子"),
+    LI: ("己", "己", "卯丑亥", "酉未巳"),
+    GEN: ("丙", "丙", "辰午申", "戌子寅"),
+    DUI: ("丁", "丁", "巳卯丑", "亥酉未"),
+}
+
+
+def make(upper: int, lower: int) -> int:
+    """上卦、下卦组成六爻卦"""
+    return lower | upper << 3
+
+
+def upper(hexagram: int) -> int:
+    """上卦（外卦）"""
+    return hexagram >> 3
+
+
+def lower(hexagram: int) -> int:
+    """下卦（内卦）"""
+    return hexagram & 7
+
+
+def from_lines(lines: Iterable) -> int:
+    """由初爻到上爻的阴阳（真值为阳）组成卦"""
+    hexagram = 0
+    for position, yang in enumerate(lines):
+        if yang:
+            hexagram |= 1 << position
+    return hexagram
+
+
+def is_yang(hexagram: int, position: int) -> bool:
+    """第 position 爻（1-6）是否为阳"""
+    return bool(hexagram >> (position - 1) & 1)
+
+
+def line_mask(positions: Iterable[int]) -> int:
+    """爻位（1-6）集合转为掩码"""
+    mask = 0
+    for position in positions:
+        mask |= 1 << (position - 1)
+    return mask
+
+
+def normalize_line(number: int) -> int:
+    """任意正整数按6取余为爻位（1-6，余0为上爻）"""
+    return (number - 1) % 6 + 1
+
+
+def trigram_from_number(number: int) -> int:
+    """先天八卦数（按8取余，余0为坤）转八卦"""
+    return XIANTIAN_ORDER[(number - 1) % 8]
+
+
+def changed(hexagram: int, moving: int) -> int:
+    """变卦：动爻掩码所在的爻阴阳互变"""
+    return hexagram ^ moving
+
+
+def mutual(hexagram: int) -> int:
+    """互卦：二三四爻为下卦，三四五爻为上卦"""
+    return (hexagram >> 1 & 7) | (hexagram >> 2 & 7) << 3
+
+
+def opposite(hexagram: int) -> int:
+    """错卦：六爻阴阳全变"""
+    return hexagram ^ ALL_YANG
+
+
+def inverted(hexagram: int) -> int:
+    """综卦：六爻上下颠倒"""
+    return INVERTED[hexagram]
+
+
+def name(hexagram: int) -> str:
+    """卦名，如 "天地否" """
+    return HEXAGRAM_NAMES[hexagram]
+
+
+def _build_names() -> Tuple[str, ...]:
+    names = [""] * 64
+    for row, upper_trigram in enumerate(XIANTIAN_ORDER):
+        for column, lower_trigram in enumerate(XIANTIAN_ORDER):
+            names[make(upper_trigram, lower_trigram)] = _NAMES_BY_XIANTIAN[row][column]
+    return tuple(names)
+
+
+def _build_palaces() -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """京房八宫：每宫由纯卦自初爻起逐爻变出一世至五世，再变四爻为游魂，内卦复原为归魂"""
+    palace = [0] * 64
+    generation = [0] * 64
+    for trigram in range(8):
+        current = make(trigram, trigram)
+        members = [current]
+        for position in range(5):
+            current ^= 1 << position
+            members.append(current)
+        wandering = current ^ 1 << 3
+        members.append(wandering)
+        members.append((wandering & 0b111000) | trigram)
+        for index, member in enumerate(members):
+            palace[member] = trigram
+            generation[member] = index
+    return tuple(palace), tuple(generation)
+
+
+def _build_na_jia() -> Tuple[Tuple[int, ...], ...]:
+    """每卦六爻纳甲的六十甲子序号（内卦取下卦内三爻，外卦取上卦外三爻）"""
+    table = []
+    for hexagram in range(64):
+        inner_gan, _, inner_zhis, _ = _NA_JIA_RULES[lower(hexagram)]
+        _, outer_gan, _, outer_zhis = _NA_JIA_RULES[upper(hexagram)]
+        table.append(tuple(
+            [jiazi(GAN_INDEX[inner_gan], ZHI_INDEX[zhi]) for zhi in inner_zhis]
+            + [jiazi(GAN_INDEX[outer_gan], ZHI_INDEX[zhi]) for zhi in outer_zhis]
+        ))
+    return tuple(table)
+
+
+HEXAGRAM_NAMES = _build_names()
+HEXAGRAM_INDEX = {hexagram_name: hexagram for hexagram, hexagram_name in enumerate(HEXAGRAM_NAMES)}
+INVERTED = tuple(int(format(hexagram, "06b")[::-1], 2) for hexagram in range(64))
+PALACE, GENERATION = _build_palaces()
+SHI = tuple(_GENERATION_SHI[generation] for generation in GENERATION)
+YING = tuple((shi + 2) % 6 + 1 for shi in SHI)
+NA_JIA = _build_na_jia()
+LIU_QIN = tuple(
+    tuple((ZHI_WUXING[gz % 12] - TRIGRAM_WUXING[PALACE[hexagram]]) % 5 for gz in NA_JIA[hexagram])
+    for hexagram in range(64)
+)
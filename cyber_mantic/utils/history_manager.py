@@ -419,7 +419,8 @@ class HistoryManager:
                 advice=tr_data.get('advice'),
                 confidence=tr_data.get('confidence', 0.8),
                 retrospective_answer=tr_data.get('retrospective_answer'),
-                predictive_answer=tr_data.get('predictive_answer')
+                predictive_answer=tr_data.get('predictive_answer'),
+                verification=tr_data.get('verification')
             )
             theory_results.append(tr)
 
@@ -457,7 +458,8 @@ class HistoryManager:
             comprehensive_advice=data['comprehensive_advice'],
             overall_confidence=data['overall_confidence'],
             limitations=data['limitations'],
-            user_feedback=data.get('user_feedback')
+            user_feedback=data.get('user_feedback'),
+            verification=data.get('verification')
         )
 
         return report
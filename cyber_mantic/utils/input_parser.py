@@ -0,0 +1,429 @@
+"""
+本地规则解析器 - 出生信息与意图的快速解析
+
+问道流程中几乎每条用户消息都会先发给大模型做解析，而大多数输入
+（"1990年5月15日下午3点，男"、"事业，3 5 7"）格式规整，正则即可准确提取。
+本模块先用预编译的规则解析并给出置信度，调用方只在置信度低于阈值时才请求大模型，
+规整输入的解析从秒级降到微秒级。
+
+支持：
+- 日期：1990年5月15日 / 1990-5-15 / 19900515 / 90年 / 一九九〇年八月十五 / 正月初三
+- 历法：农历/阴历/旧历 与 公历/阳历/新历，正月、冬月、腊月、初X等农历写法
+- 时间：15点 / 15:30 / 下午3点半 / 子时 / 上午（时段） / 不记得
+- 模糊修饰：大概、左右、点多 等 → uncertain
+- 时间范围：3点到5点、子时至丑时、X点之间 → uncertain，且不计时间得分（交给大模型）
+- 性别、MBTI、咨询类别、3个随机数字、测字用字
+
+置信度规则（0-1）：
+- 出生信息：日期完整且合法 0.5，性别 0.25，时间有明确表述 0.25（未提及 0.15，时间范围 0），
+  出现互相矛盾的信息（两个日期、两种性别、两种历法）每项扣 0.3
+- 破冰输入：恰好3个1-9数字 0.6，单一类别 0.4（多个类别或未识别 0.1）
+- 测字：测X字/引号/"字是X" 0.9，句尾单字 0.6，其余 0.3
+"""
+import re
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.logger import get_logger
+
+
+# 置信度达到此值时直接采用本地解析结果，不再调用大模型
+LOCAL_CONFIDENCE_THRESHOLD = 0.8
+
+
+class ParseResult(NamedTuple):
+    """本地解析结果"""
+    data: Dict[str, Any]
+    confidence: float
+    conflicts: Tuple[str, ...] = ()
+
+
+# ==================== 数字 ====================
+
+_CN_DIGITS = {
+    "〇": 0, "零": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4,
+    "五": 5, "六": 6, "七": 7, "八": 8, "九": 9,
+}
+_FULLWIDTH = str.maketrans("０１２３４５６７８９：／．－", "0123456789:/.-")
+
+_CN_NUM = "[〇零一二两三四五六七八九十廿]"
+
+
+def chinese_to_int(text: str) -> Optional[int]:
+    """
+    把阿拉伯数字或中文数字（十五、廿三、初八、一九九〇）转为整数
+
+    Returns:
+        整数，无法识别时返回None
+    """
+    if not text:
+        return None
+    if text.isdigit():
+        return int(text)
+    if text.startswith("初"):
+        text = text[1:]
+    text = text.replace("廿", "二十")
+
+    if "十" not in text:
+        # 逐位读法：一九九〇
+        if all(ch in _CN_DIGITS for ch in text):
+            value = 0
+            for ch in text:
+                value = value * 10 + _CN_DIGITS[ch]
+            return value
+        return None
+
+    tens, _, ones = text.partition("十")
+    if tens and tens not in _CN_DIGITS or ones and ones not in _CN_DIGITS:
+        return None
+    return (_CN_DIGITS[tens] if tens else 1) * 10 + (_CN_DIGITS[ones] if ones else 0)
+
+
+# ==================== 预编译规则 ====================
+
+_LUNAR_MONTH_NAMES = {"正": 1, "冬": 11, "腊": 12}
+
+_YEAR_RE = re.compile(
+    r"(?<!\d)(?P<year>(?:19|20)\d{2})\s*年"
+    r"|(?P<cn_year>[〇零一二三四五六七八九]{4})\s*年"
+    r"|(?<!\d)(?P<short_year>\d{2})\s*年"
+)
+_NUMERIC_DATE_RE = re.compile(
+    r"(?<!\d)(?P<year>(?:19|20)\d{2})\s*[-/.]\s*(?P<month>\d{1,2})\s*[-/.]\s*(?P<day>\d{1,2})(?!\d)"
+    r"|(?<!\d)(?P<compact>(?:19|20)\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01]))(?!\d)"
+)
+_MONTH_DAY_RE = re.compile(
+    rf"(?P<month>\d{{1,2}}|十[一二]?|[一二三四五六七八九]|[正冬腊])\s*月(?:份)?\s*"
+    rf"(?P<day>\d{{1,2}}|初{_CN_NUM}{{1,2}}|{_CN_NUM}{{1,3}})\s*(?:日|号)?"
+)
+_CLOCK_RE = re.compile(
+    r"(?P<period>凌晨|清晨|早上|早晨|上午|中午|下午|傍晚|晚上|夜里|半夜|深夜)?\s*"
+    r"(?:(?P<hour>\d{1,2})\s*[:]\s*(?P<minute>\d{2})"
+    rf"|(?P<hour2>\d{{1,2}}|{_CN_NUM}{{1,3}})\s*(?:点钟?|时)(?!辰)\s*"
+    rf"(?P<minute2>半|一刻|三刻|\d{{1,2}}|{_CN_NUM}{{1,3}})?\s*分?)"
+)
+_SHICHEN_RE = re.compile(r"(?<![中上下孩])(?P<zhi>[子丑寅卯辰巳午未申酉戌亥])时")
+_PERIOD_RE = re.compile(r"凌晨|清晨|早上|早晨|上午|中午|下午|傍晚|黄昏|晚上|夜里|半夜|深夜")
+_FUZZY_RE = re.compile(r"大概|大约|左右|可能|好像|差不多|前后|点多|多点|估计")
+_RANGE_BEFORE_RE = re.compile(r"(?:到|至|~|～|—)\s*$")
+_RANGE_AFTER_RE = re.compile(r"^\s*(?:到|至|~|～|—)|之间")
+_UNKNOWN_TIME_RE = re.compile(r"不记得|忘了|不知道|不清楚|没印象|不详|不确定")
+_LUNAR_RE = re.compile(r"农历|阴历|旧历|正月|冬月|腊月|初[一二三四五六七八九十]|廿")
+_SOLAR_RE = re.compile(r"公历|阳历|新历|国历")
+_MALE_RE = re.compile(r"男(?!朋友|友|票|方|同事)|先生|小伙")
+_FEMALE_RE = re.compile(r"女(?!朋友|友|儿|方|同事)|小姐|姑娘")
+_MBTI_RE = re.compile(r"(?<![A-Za-z])([IEie][NSns][TFtf][JPjp])(?![A-Za-z])")
+
+_DIGIT_RE = re.compile(r"\d+")
+_CN_SINGLE_RE = re.compile(r"[一二三四五六七八九壹贰叁肆伍陆柒捌玖]")
+_CN_SINGLE = {
+    "一": 1, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9,
+    "壹": 1, "贰": 2, "叁": 3, "肆": 4, "伍": 5, "陆": 6, "柒": 7, "捌": 8, "玖": 9,
+}
+
+_CHAR_EXPLICIT_RES = (
+    re.compile(r"测\s*[「『\"'“‘]?([一-龥])[」』\"'”’]?\s*字"),
+    re.compile(r"[「『\"'“‘]([一-龥])[」』\"'”’]"),
+    re.compile(r"字(?:是|为|：|:)\s*([一-龥])"),
+)
+_CHAR_TAIL_RE = re.compile(r"[，。！？,.!?]\s*([一-龥])[\s，。！？,.!?]*$")
+_CHAR_PARTICLES = set("啊吧呢吗哦嗯")
+_CHAR_EXCLUDE = set("的了吧呢啊哦嗯是不我你他她它们这那问请想能会")
+
+# 时段默认小时（与代码备用解析一致）
+_PERIOD_HOURS = {
+    "凌晨": 3, "清晨": 6, "早上": 8, "早晨": 8, "上午": 10, "中午": 12,
+    "下午": 15, "傍晚": 18, "黄昏": 18, "晚上": 20, "夜里": 22, "半夜": 0, "深夜": 23,
+}
+_AFTERNOON_PERIODS = {"下午", "傍晚", "晚上", "夜里"}
+_ZHI_ORDER = "子丑寅卯辰巳午未申酉戌亥"
+
+# 破冰类别关键词（与 NLPParser 备用解析一致）
+CATEGORY_KEYWORDS = {
+    "事业": ["事业", "工作", "职业", "跳槽", "升职", "创业", "面试", "岗位"],
+    "感情": ["感情", "恋爱", "婚姻", "桃花", "分手", "复合", "结婚", "对象"],
+    "财运": ["财运", "赚钱", "投资", "理财", "收入", "金钱"],
+    "健康": ["健康", "身体", "疾病", "病"],
+    "学业": ["学业", "考试", "学习", "成绩", "升学"],
+    "决策": ["决策", "选择", "决定", "是否", "要不要", "该不该"],
+}
+_CATEGORY_MATCHER = KeywordMatcher.from_groups(CATEGORY_KEYWORDS)
+
+
+class LocalInputParser:
+    """本地规则解析器（线程安全，可全局共享）"""
+
+    def __init__(self, threshold: float = LOCAL_CONFIDENCE_THRESHOLD):
+        """
+        Args:
+            threshold: 采用本地结果所需的最低置信度
+        """
+        self.threshold = threshold
+        self.logger = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def is_confident(self, result: ParseResult) -> bool:
+        """置信度是否达到阈值"""
+        return result.confidence >= self.threshold
+
+    # ==================== 出生信息 ====================
+
+    def parse_birth_info(self, text: str) -> ParseResult:
+        """
+        解析出生信息，字段与 NLPParser.parse_birth_info 一致
+
+        Returns:
+            ParseResult，年月日缺失时 data 中对应字段为None
+        """
+        text = text.translate(_FULLWIDTH)
+        conflicts: List[str] = []
+        data: Dict[str, Any] = {
+            "year": None, "month": None, "day": None, "hour": None, "minute": 0,
+            "calendar_type": "solar", "time_certainty": "unknown",
+            "gender": None, "mbti": None, "birth_place": None,
+        }
+
+        dates = self._find_dates(text)
+        if len(set(dates)) > 1:
+            conflicts.append("date")
+        if dates:
+            data["year"], data["month"], data["day"] = dates[0]
+
+        lunar, solar = _LUNAR_RE.search(text), _SOLAR_RE.search(text)
+        if lunar and solar:
+            conflicts.append("calendar")
+        elif lunar:
+            data["calendar_type"] = "lunar"
+
+        time_score = self._parse_time(text, data)
+
+        male, female = _MALE_RE.search(text), _FEMALE_RE.search(text)
+        if male and female:
+            conflicts.append("gender")
+        elif male or female:
+            data["gender"] = "male" if male else "female"
+
+        mbti = _MBTI_RE.search(text)
+        if mbti:
+            data["mbti"] = mbti.group(1).upper()
+
+        confidence = 0.0
+        if self._date_is_valid(data):
+            confidence += 0.5 + (0.25 if data["gender"] else 0.0) + time_score
+        elif data["year"] or data["month"]:
+            confidence = 0.2
+        confidence = max(0.0, confidence - 0.3 * len(conflicts))
+        return ParseResult(data, round(confidence, 2), tuple(conflicts))
+
+    def _find_dates(self, text: str) -> List[Tuple[Optional[int], Optional[int], Optional[int]]]:
+        """提取所有日期（年可能为None）"""
+        dates = []
+        for match in _NUMERIC_DATE_RE.finditer(text):
+            if match.group("compact"):
+                compact = match.group("compact")
+                dates.append((int(compact[:4]), int(compact[4:6]), int(compact[6:])))
+            else:
+                dates.append((int(match.group("year")), int(match.group("month")), int(match.group("day"))))
+
+        year = self._find_year(text)
+        for match in _MONTH_DAY_RE.finditer(text):
+            month_text = match.group("month")
+            month = _LUNAR_MONTH_NAMES.get(month_text) or chinese_to_int(month_text)
+            day = chinese_to_int(match.group("day"))
+            if month and day:
+                dates.append((year, month, day))
+        if not dates and year:
+            dates.append((year, None, None))
+        return dates
+
+    @staticmethod
+    def _find_year(text: str) -> Optional[int]:
+        match = _YEAR_RE.search(text)
+        if not match:
+            return None
+        if match.group("year"):
+            return int(match.group("year"))
+        if match.group("cn_year"):
+            return chinese_to_int(match.group("cn_year"))
+        short_year = int(match.group("short_year"))
+        return 1900 + short_year if short_year >= 30 else 2000 + short_year
+
+    @staticmethod
+    def _date_is_valid(data: Dict[str, Any]) -> bool:
+        year, month, day = data["year"], data["month"], data["day"]
+        if not (year and month and day) or not 1900 <= year <= datetime.now().year:
+            return False
+        if data["calendar_type"] == "lunar":
+            return 1 <= month <= 12 and 1 <= day <= 30
+        try:
+            return date(year, month, day) <= date.today()
+        except ValueError:
+            return False
+
+    def _parse_time(self, text: str, data: Dict[str, Any]) -> float:
+        """提取时间写入 data，返回时间部分的置信度得分"""
+        fuzzy = bool(_FUZZY_RE.search(text))
+
+        for match in _CLOCK_RE.finditer(text):
+            hour = chinese_to_int(match.group("hour") or match.group("hour2"))
+            if hour is None or hour > 24:
+                continue
+            period = match.group("period")
+            if period in ("凌晨", "半夜", "晚上", "夜里") and hour == 12:
+                hour = 0
+            elif period in _AFTERNOON_PERIODS and hour < 12:
+                hour += 12
+            elif period == "中午" and hour < 6:
+                hour += 12
+            data["hour"] = hour % 24
+            data["minute"] = self._parse_minute(match.group("minute") or match.group("minute2"))
+            return self._time_score(text, match, fuzzy, data)
+
+        shichen = _SHICHEN_RE.search(text)
+        if shichen:
+            # 取时辰的中间整点（子时取0点）
+            data["hour"] = _ZHI_ORDER.index(shichen.group("zhi")) * 2
+            return self._time_score(text, shichen, fuzzy, data)
+
+        period = _PERIOD_RE.search(text)
+        if period:
+            data["hour"] = _PERIOD_HOURS[period.group()]
+            data["time_certainty"] = "uncertain"
+            return 0.25
+
+        if _UNKNOWN_TIME_RE.search(text):
+            return 0.25
+        return 0.15
+
+    @staticmethod
+    def _time_score(text: str, match: re.Match, fuzzy: bool, data: Dict[str, Any]) -> float:
+        """
+        标记时间确定性并返回得分
+
+        "3点到5点"、"X点之间" 这类范围只取到一端，不能当作确定时间：
+        标记为 uncertain 且不计分，使整体置信度低于阈值，交给大模型解析。
+        """
+        if (_RANGE_BEFORE_RE.search(text, 0, match.start())
+                or _RANGE_AFTER_RE.search(text[match.end():])):
+            data["time_certainty"] = "uncertain"
+            return 0.0
+        data["time_certainty"] = "uncertain" if fuzzy else "certain"
+        return 0.25
+
+    @staticmethod
+    def _parse_minute(text: Optional[str]) -> int:
+        if not text:
+            return 0
+        special = {"半": 30, "一刻": 15, "三刻": 45}
+        if text in special:
+            return special[text]
+        minute = chinese_to_int(text)
+        return minute if minute is not None and minute < 60 else 0
+
+    # ==================== 破冰输入 ====================
+
+    def parse_icebreak(self, text: str) -> ParseResult:
+        """
+        解析破冰输入（事项分类 + 3个随机数字），字段与 NLPParser.parse_icebreak_input 一致
+        """
+        text = text.translate(_FULLWIDTH)
+        conflicts: List[str] = []
+
+        tokens = _DIGIT_RE.findall(text)
+        if tokens:
+            numbers = [int(token) for token in tokens]
+        else:
+            numbers = [_CN_SINGLE[ch] for ch in _CN_SINGLE_RE.findall(text)]
+
+        hit = _CATEGORY_MATCHER.labels(text)
+        categories = [category for category in CATEGORY_KEYWORDS if category in hit]
+        if len(categories) > 1:
+            conflicts.append("category")
+
+        description = _DIGIT_RE.sub("", text) if tokens else _CN_SINGLE_RE.sub("", text)
+        description = re.sub(r"[、，,\s]+", " ", description).strip(" ：:。") or text
+
+        data = {
+            "category": categories[0] if categories else "其他",
+            "description": description,
+            "numbers": numbers[:3],
+        }
+
+        confidence = 0.0
+        if len(numbers) == 3 and all(1 <= n <= 9 for n in numbers):
+            confidence += 0.6
+        else:
+            conflicts.append("numbers")
+        confidence += 0.4 if len(categories) == 1 else 0.1
+        return ParseResult(data, round(confidence, 2), tuple(conflicts))
+
+    # ==================== 测字 ====================
+
+    def parse_character(self, text: str) -> ParseResult:
+        """提取测字用的汉字，data 为 {"character": 字}"""
+        for pattern in _CHAR_EXPLICIT_RES:
+            match = pattern.search(text)
+            if match:
+                return ParseResult({"character": match.group(1)}, 0.9)
+
+        match = _CHAR_TAIL_RE.search(text)
+        if match and match.group(1) not in _CHAR_PARTICLES:
+            return ParseResult({"character": match.group(1)}, 0.6)
+
+        for ch in text:
+            if "一" <= ch <= "龥" and ch not in _CHAR_EXCLUDE:
+                return ParseResult({"character": ch}, 0.3)
+        return ParseResult({"character": None}, 0.0)
+
+    # ==================== 命中率统计 ====================
+
+    def record(self, task: str, hit: bool):
+        """
+        记录一次解析是否由本地规则完成
+
+        Args:
+            task: 解析任务名（如"出生信息"、"破冰"）
+            hit: True 表示本地命中，False 表示回退到大模型
+        """
+        with self._lock:
+            counter = self._hits if hit else self._misses
+            counter[task] = counter.get(task, 0) + 1
+        self.logger.debug(f"本地解析[{task}] {'命中' if hit else '回退大模型'}")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各任务的本地命中次数、回退次数和命中率"""
+        with self._lock:
+            tasks = set(self._hits) | set(self._misses)
+            stats = {}
+            for task in sorted(tasks):
+                hits, misses = self._hits.get(task, 0), self._misses.get(task, 0)
+                stats[task] = {
+                    "local_hits": hits,
+                    "llm_fallbacks": misses,
+                    "hit_rate": hits / (hits + misses),
+                }
+            return stats
+
+    def reset_stats(self):
+        """清空统计"""
+        with self._lock:
+            self._hits.clear()
+            self._misses.clear()
+
+
+_parser: Optional[LocalInputParser] = None
+_parser_lock = threading.Lock()
+
+
+def get_local_parser() -> LocalInputParser:
+    """获取全局本地解析器"""
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = LocalInputParser()
+    return _parser
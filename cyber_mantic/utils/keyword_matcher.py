@@ -0,0 +1,277 @@
+"""
+关键词多模式匹配 - Aho–Corasick 自动机
+
+问题分类、问答类型识别、时间跨度分析、修改意图检测等都要判断一段文本
+命中了哪些关键词。逐个关键词做 `kw in text` 的开销随关键词数线性增长，
+每条消息要扫描文本几十到上百遍。
+
+KeywordMatcher 对一组关键词只构建一次自动机，之后每条消息只扫描一遍文本，
+即可得到全部命中（含重叠命中）及其所属类别和权重。
+
+自动机逐字符扫描在Python层执行，而 `kw in text` 在C层完成。实测两者开销之比与文本长度
+基本无关，关键词约90个时持平，因此关键词少于 AUTOMATON_MIN_KEYWORDS 的匹配器仍逐词查找，
+两种方式结果一致。
+
+用法：
+    matcher = KeywordMatcher.from_groups({"事业": ["工作", "跳槽"], "财运": ["投资"]})
+    matcher.scores("想跳槽去做投资工作")   # {"事业": 4, "财运": 2}（默认权重为关键词长度）
+    matcher.labels("想跳槽")               # {"事业"}
+    matcher.first_label("想跳槽", ["财运", "事业"])  # 按给定优先级取第一个命中的类别
+"""
+from collections import deque
+from typing import Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    """一次关键词命中"""
+    keyword: str
+    label: Hashable
+    weight: float
+    start: int  # 在文本中的起始下标
+    order: int  # 关键词加入顺序，用于稳定排序
+
+
+class KeywordMatcher:
+    """Aho–Corasick 多模式匹配器（构建后只读，可在线程间共享）"""
+
+    # 关键词数达到此值才用自动机扫描，否则逐词查找（按优先级取类别时逐词查找可提前返回，门槛加倍）
+    AUTOMATON_MIN_KEYWORDS = 96
+
+    def __init__(
+        self,
+        patterns: Iterable[Tuple[str, Hashable, float]],
+        ignore_case: bool = False
+    ):
+        """
+        构建自动机
+
+        Args:
+            patterns: (关键词, 类别, 权重) 序列，同一关键词可属于多个类别
+            ignore_case: 是否忽略大小写（关键词和文本都转小写后匹配）
+        """
+        self.ignore_case = ignore_case
+        self._patterns: List[Tuple[str, Hashable, float]] = []
+        # 构建用的字典树转移；扫描用的每个状态输出（模式下标）
+        goto: List[Dict[str, int]] = [{}]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for keyword, label, weight in patterns:
+            if not keyword:
+                continue
+            if ignore_case:
+                keyword = keyword.lower()
+            self._add(goto, keyword, len(self._patterns))
+            self._patterns.append((keyword, label, weight))
+
+        self._root, self._delta = self._build_transitions(goto)
+        self._keywords = [keyword for keyword, _, _ in self._patterns]
+        self._use_automaton = len(self._patterns) >= self.AUTOMATON_MIN_KEYWORDS
+        # 类别 → 该类别关键词下标（按加入顺序），供逐词查找和优先级查找使用
+        self._by_label: Dict[Hashable, List[int]] = {}
+        for index, (_, label, _) in enumerate(self._patterns):
+            self._by_label.setdefault(label, []).append(index)
+        # 优先级序列 → 每个模式下标的优先级名次（first_label 用，按需构建）
+        self._rank_cache: Dict[Tuple[Hashable, ...], List[Optional[int]]] = {}
+
+    @classmethod
+    def from_groups(
+        cls,
+        groups: Mapping[Hashable, Iterable[str]],
+        weight: Callable[[str], float] = len,
+        ignore_case: bool = False
+    ) -> "KeywordMatcher":
+        """
+        从 {类别: [关键词...]} 构建
+
+        Args:
+            groups: 类别到关键词列表的映射，类别顺序即关键词加入顺序
+            weight: 关键词权重函数，默认取关键词长度（越长越精确）
+            ignore_case: 是否忽略大小写
+        """
+        return cls(
+            ((keyword, label, weight(keyword)) for label, keywords in groups.items() for keyword in keywords),
+            ignore_case=ignore_case
+        )
+
+    def _add(self, goto: List[Dict[str, int]], keyword: str, index: int):
+        state = 0
+        for ch in keyword:
+            next_state = goto[state].get(ch)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][ch] = next_state
+                goto.append({})
+                self._output.append(())
+            state = next_state
+        self._output[state] += (index,)
+
+    def _build_transitions(self, goto: List[Dict[str, int]]) -> Tuple[Dict[str, int], List[Dict[str, int]]]:
+        """
+        由字典树和失败指针展开为确定性转移表
+
+        扫描时每个字符只查一次表，不再沿失败链回溯。与根状态相同的转移不重复存储，
+        查不到时退回根状态的转移表。
+        """
+        root = goto[0]
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        queue = deque(root.values())
+        while queue:
+            state = queue.popleft()
+            # 失败状态更浅，已先于当前状态展开
+            inherited = delta[fail[state]]
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fallback = inherited.get(ch)
+                fail[child] = fallback if fallback is not None else root.get(ch, 0)
+                # 合并失败链上的输出，扫描时无需再沿失败链回溯
+                self._output[child] += self._output[fail[child]]
+            transitions = dict(inherited)
+            for ch, child in goto[state].items():
+                if root.get(ch) != child:
+                    transitions[ch] = child
+            delta[state] = transitions
+        return root, delta
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _scan(self, text: str) -> Iterable[Tuple[int, int]]:
+        """单遍扫描，逐个产生 (模式下标, 结束位置)"""
+        if self.ignore_case:
+            text = text.lower()
+        root_get, delta, output = self._root.get, self._delta, self._output
+        state = 0
+        for position, ch in enumerate(text):
+            next_state = delta[state].get(ch)
+            state = root_get(ch, 0) if next_state is None else next_state
+            for index in output[state]:
+                yield index, position
+
+    def _first_ends(self, text: str) -> Dict[int, int]:
+        """每个命中关键词首次出现的结束位置 {模式下标: 结束位置}"""
+        if self.ignore_case:
+            text = text.lower()
+        if not self._use_automaton:
+            return {
+                index: text.find(keyword) + len(keyword) - 1
+                for index, keyword in enumerate(self._keywords) if keyword in text
+            }
+        root_get, delta, output = self._root.get, self._delta, self._output
+        seen: Dict[int, int] = {}
+        state = 0
+        for position, ch in enumerate(text):
+            next_state = delta[state].get(ch)
+            state = root_get(ch, 0) if next_state is None else next_state
+            if output[state]:
+                for index in output[state]:
+                    seen.setdefault(index, position)
+        return seen
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """
+        全部命中（含重叠和重复出现），按出现位置排序
+
+        Returns:
+            KeywordMatch 列表
+        """
+        matches = []
+        for index, end in self._scan(text):
+            keyword, label, weight = self._patterns[index]
+            matches.append(KeywordMatch(keyword, label, weight, end - len(keyword) + 1, index))
+        matches.sort(key=lambda match: (match.start, match.order))
+        return matches
+
+    def matched_keywords(self, text: str) -> List[KeywordMatch]:
+        """
+        命中的关键词（每个关键词只计一次，与 `kw in text` 语义一致），按关键词加入顺序排列
+        """
+        result = []
+        for index, end in sorted(self._first_ends(text).items()):
+            keyword, label, weight = self._patterns[index]
+            result.append(KeywordMatch(keyword, label, weight, end - len(keyword) + 1, index))
+        return result
+
+    def contains_any(self, text: str) -> bool:
+        """是否命中任意关键词"""
+        if not self._use_automaton:
+            text = text.lower() if self.ignore_case else text
+            return any(keyword in text for keyword in self._keywords)
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def labels(self, text: str) -> Set[Hashable]:
+        """命中的类别集合"""
+        patterns = self._patterns
+        return {patterns[index][1] for index in self._first_ends(text)}
+
+    def scores(self, text: str) -> Dict[Hashable, float]:
+        """
+        各类别得分：命中关键词（每个只计一次）的权重之和，只包含有命中的类别
+        """
+        scores: Dict[Hashable, float] = {}
+        for index in sorted(self._first_ends(text)):
+            _, label, weight = self._patterns[index]
+            scores[label] = scores.get(label, 0) + weight
+        return scores
+
+    def first_label(self, text: str, priority: Iterable[Hashable]) -> Optional[Hashable]:
+        """
+        按优先级顺序返回第一个命中的类别
+
+        Args:
+            text: 文本
+            priority: 类别优先级（从高到低）
+
+        Returns:
+            命中的类别，均未命中时返回None
+        """
+        if len(self._patterns) < 2 * self.AUTOMATON_MIN_KEYWORDS:
+            # 逐词查找：按优先级检查，命中即返回
+            text = text.lower() if self.ignore_case else text
+            keywords = self._keywords
+            for label in priority:
+                if any(keywords[index] in text for index in self._by_label.get(label, ())):
+                    return label
+            return None
+
+        priority = tuple(priority)
+        ranks = self._ranks(priority)
+        if self.ignore_case:
+            text = text.lower()
+        root_get, delta, output = self._root.get, self._delta, self._output
+        best = len(priority)
+        state = 0
+        for ch in text:
+            next_state = delta[state].get(ch)
+            state = root_get(ch, 0) if next_state is None else next_state
+            for index in output[state]:
+                rank = ranks[index]
+                if rank is not None and rank < best:
+                    best = rank
+            if best == 0:
+                break  # 最高优先级已命中，无需扫描剩余文本
+        return priority[best] if best < len(priority) else None
+
+    def _ranks(self, priority: Tuple[Hashable, ...]) -> List[Optional[int]]:
+        ranks = self._rank_cache.get(priority)
+        if ranks is None:
+            position = {}
+            for rank, label in enumerate(priority):
+                position.setdefault(label, rank)
+            ranks = [position.get(label) for _, label, _ in self._patterns]
+            self._rank_cache[priority] = ranks
+        return ranks
+
+    def longest(self, text: str) -> Optional[KeywordMatch]:
+        """最长的命中关键词（等长时取先加入的关键词）"""
+        best_index, best_end, best_length = -1, -1, 0
+        for index, end in sorted(self._first_ends(text).items()):
+            if len(self._keywords[index]) > best_length:
+                best_index, best_end, best_length = index, end, len(self._keywords[index])
+        if best_index < 0:
+            return None
+        keyword, label, weight = self._patterns[best_index]
+        return KeywordMatch(keyword, label, weight, best_end - best_length + 1, best_index)
+
@@ -0,0 +1,174 @@
+"""
+后台事件循环服务 - 全应用共用一个长期运行的asyncio事件循环
+
+Qt工作线程、测字AI验证等同步代码不再各自 new_event_loop()，而是把协程提交到
+这个后台线程里的事件循环上执行。绑定在事件循环上的API客户端连接池、限流信号量、
+single-flight 等状态因此在多次调用之间得以保留，也省去了每条消息创建线程和事件循环的开销。
+
+用法：
+    service = get_loop_service()
+    future = service.submit(api_manager.call_api(...))   # concurrent.futures.Future
+    result = service.run(api_manager.call_api(...), timeout=30)  # 阻塞等待
+
+应用退出时调用 shutdown_loop_service(api_manager.aclose) 关闭连接并停止事件循环。
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+from utils.logger import get_logger
+
+
+class EventLoopService:
+    """后台事件循环服务（线程安全）"""
+
+    def __init__(self, name: str = "cyber-mantic-asyncio"):
+        """
+        初始化服务（事件循环在首次使用时才启动）
+
+        Args:
+            name: 事件循环线程名
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.logger = get_logger(__name__)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """后台事件循环（未启动时先启动）"""
+        return self.start()
+
+    def is_running(self) -> bool:
+        """事件循环线程是否在运行"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop_thread(self) -> bool:
+        """当前是否在事件循环线程中"""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """启动事件循环线程（已启动时直接返回）"""
+        with self._lock:
+            if self.is_running():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                try:
+                    loop.run_forever()
+                finally:
+                    try:
+                        loop.run_until_complete(loop.shutdown_asyncgens())
+                    finally:
+                        loop.close()
+
+            thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self.logger.debug(f"后台事件循环已启动: {self.name}")
+            return loop
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        把协程提交到后台事件循环
+
+        Args:
+            coro: 协程对象
+
+        Returns:
+            concurrent.futures.Future，可在任意线程中等待结果或取消
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        在后台事件循环中执行协程并阻塞等待结果（供同步代码调用）
+
+        Args:
+            coro: 协程对象
+            timeout: 最长等待秒数，超时后取消协程并抛出 concurrent.futures.TimeoutError
+
+        Raises:
+            RuntimeError: 在事件循环线程内调用（会死锁）
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("不能在后台事件循环线程内同步等待协程，请直接 await")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(
+        self,
+        cleanup: Optional[Callable[[], Awaitable]] = None,
+        timeout: float = 5.0
+    ):
+        """
+        停止事件循环（应用退出时调用）
+
+        Args:
+            cleanup: 停止前在事件循环中执行的清理协程函数，如 api_manager.aclose
+            timeout: 清理和等待线程结束的最长秒数
+        """
+        if self.in_loop_thread():
+            raise RuntimeError("不能在后台事件循环线程内停止事件循环")
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+
+        async def finish():
+            if cleanup is not None:
+                try:
+                    await cleanup()
+                except Exception as e:
+                    self.logger.warning(f"后台事件循环清理失败: {e}")
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(finish(), loop).result(timeout=timeout)
+        except Exception as e:
+            self.logger.warning(f"后台事件循环未能按时完成清理: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+        self.logger.debug(f"后台事件循环已停止: {self.name}")
+
+
+_service: Optional[EventLoopService] = None
+_service_lock = threading.Lock()
+
+
+def get_loop_service() -> EventLoopService:
+    """获取全局后台事件循环服务"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EventLoopService()
+    return _service
+
+
+def shutdown_loop_service(cleanup: Optional[Callable[[], Awaitable]] = None, timeout: float = 5.0):
+    """停止全局后台事件循环（之后再次使用会重新启动）"""
+    if _service is not None:
+        _service.shutdown(cleanup, timeout)
@@ -1,5 +1,5 @@
 """
-农历转换模块 - 基于cnlunar精确实现
+农历转换模块 - 基于预生成的农历日表
 
 支持：
 - 阳历 ↔ 农历转换
@@ -11,19 +11,20 @@
 修复记录：
 - 2026-01-04: 替换自研算法为cnlunar库，修复月份计算错误
 - 2026-01-04: 添加缓存机制，提升重复查询性能
+- 改为查询内存映射的农历日表（utils.lunar_table，由cnlunar预生成），
+  阳历转农历O(1)，农历转阳历按月索引定位，运行时不再导入cnlunar
 """
-from datetime import datetime, timedelta
-from typing import Tuple, Optional, Dict, Any
-import math
-from cnlunar import Lunar
-from utils.cache_manager import cached, performance_monitor
+from datetime import datetime
+from typing import Optional, Dict, Any
+from utils import ganzhi
+from utils.lunar_table import ganzhi_name, lookup_lunar_day, get_lunar_table
 
 
 class LunarCalendar:
     """
-    农历转换器（基于cnlunar库）
+    农历转换器（基于农历日表）
 
-    支持1900-2100年的精确转换
+    支持1900-01-31至2100-02-08的精确转换
     """
 
     # 天干
@@ -50,14 +51,12 @@ class LunarCalendar:
     BASE_YEAR = 1900
 
     @classmethod
-    @cached(cache_name="lunar_conversion", max_size=500, ttl=86400)  # 缓存24小时
-    @performance_monitor(log_threshold_ms=50.0)
     def solar_to_lunar(cls, solar_date: datetime) -> Dict[str, Any]:
         """
-        阳历转农历（使用cnlunar库，带缓存）
+        阳历转农历（查农历日表）
 
         Args:
-            solar_date: 阳历日期
+            solar_date: 阳历日期（23点起日柱算作次日）
 
         Returns:
             农历信息字典，包含：
@@ -75,22 +74,19 @@ class LunarCalendar:
         if solar_date < cls.BASE_DATE:
             raise ValueError(f"日期不能早于{cls.BASE_DATE.strftime('%Y-%m-%d')}")
 
-        # 使用cnlunar进行转换
-        lunar = Lunar(solar_date, godType='8char')
+        record = lookup_lunar_day(solar_date)
 
-        # 提取农历信息
-        lunar_year = lunar.lunarYear
-        lunar_month = lunar.lunarMonth
-        lunar_day = lunar.lunarDay
-        is_leap_month = lunar.isLunarLeapMonth
+        lunar_year = record.year
+        lunar_month = record.month
+        lunar_day = record.day
+        is_leap_month = record.is_leap_month
 
-        # 干支信息（cnlunar提供）
-        year_gan_zhi = lunar.year8Char
-        month_gan_zhi = lunar.month8Char
-        day_gan_zhi = lunar.day8Char
+        year_gan_zhi = ganzhi_name(record.year_gan_zhi)
+        month_gan_zhi = ganzhi_name(record.month_gan_zhi)
+        day_gan_zhi = ganzhi_name(record.day_gan_zhi + cls._day_shift(solar_date))
 
-        # 生肖
-        zodiac = lunar.chineseYearZodiac
+        # 生肖随年干支
+        zodiac = cls.ZODIAC_ANIMALS[record.year_gan_zhi % 12]
 
         # 月份和日期名称
         month_name = ("闰" if is_leap_month else "") + cls.LUNAR_MONTHS[lunar_month - 1] + "月"
@@ -110,8 +106,6 @@ class LunarCalendar:
         }
 
     @classmethod
-    @cached(cache_name="lunar_to_solar", max_size=200, ttl=86400)
-    @performance_monitor(log_threshold_ms=100.0)
     def lunar_to_solar(
         cls,
         year: int,
@@ -120,7 +114,7 @@ class LunarCalendar:
         is_leap_month: bool = False
     ) -> datetime:
         """
-        农历转阳历（带缓存）
+        农历转阳历（按农历月索引定位）
 
         Args:
             year: 农历年
@@ -131,23 +125,13 @@ class LunarCalendar:
         Returns:
             阳历日期
         """
-        # cnlunar没有直接的农历转阳历方法，使用遍历查找
-        # 从农历年的春节开始，通常在1-2月
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year + 1, 3, 1)
-
-        # 二分查找优化
-        current_date = start_date
-        while current_date < end_date:
-            lunar = Lunar(current_date, godType='8char')
-            if (lunar.lunarYear == year and
-                lunar.lunarMonth == month and
-                lunar.lunarDay == day and
-                lunar.isLunarLeapMonth == is_leap_month):
-                return current_date
-            current_date += timedelta(days=1)
-
-        raise ValueError(f"无法找到对应的阳历日期：农历{year}年{month}月{day}日")
+        solar = get_lunar_table().to_solar(year, month, day, is_leap_month)
+        return datetime(solar.year, solar.month, solar.day)
+
+    @staticmethod
+    def _day_shift(solar_date: datetime) -> int:
+        """23点（子时）起日柱换到次日"""
+        return 1 if solar_date.hour == 23 else 0
 
     @classmethod
     def _get_year_gan_zhi(cls, year: int) -> str:
@@ -177,8 +161,7 @@ class LunarCalendar:
         Returns:
             月干支
         """
-        lunar = Lunar(solar_date, godType='8char')
-        return lunar.month8Char
+        return ganzhi_name(lookup_lunar_day(solar_date).month_gan_zhi)
 
     @classmethod
     def _get_day_gan_zhi(cls, solar_date: datetime) -> str:
@@ -191,8 +174,7 @@ class LunarCalendar:
         Returns:
             日干支
         """
-        lunar = Lunar(solar_date, godType='8char')
-        return lunar.day8Char
+        return ganzhi_name(lookup_lunar_day(solar_date).day_gan_zhi + cls._day_shift(solar_date))
 
     @classmethod
     def _get_hour_gan_zhi(cls, day_gan_zhi: str, hour: int) -> str:
@@ -206,17 +188,11 @@ class LunarCalendar:
         Returns:
             时干支
         """
-        # 时辰地支（每两小时一个时辰）
-        zhi_index = ((hour + 1) // 2) % 12
-
-        # 时干根据日干推算（五鼠遁日诀）
-        day_gan = day_gan_zhi[0]
-        day_gan_index = cls.HEAVENLY_STEMS.index(day_gan)
-
-        # 五鼠遁日起时诀
-        hour_gan_index = (day_gan_index * 2 + zhi_index) % 10
+        # 时辰地支（每两小时一个时辰），时干由日干按五鼠遁日起时诀推算
+        zhi_index = ganzhi.hour_zhi(hour)
+        hour_gan_index = ganzhi.hour_gan(ganzhi.GAN_INDEX[day_gan_zhi[0]], zhi_index)
 
-        return cls.HEAVENLY_STEMS[hour_gan_index] + cls.EARTHLY_BRANCHES[zhi_index]
+        return ganzhi.GAN_NAMES[hour_gan_index] + ganzhi.ZHI_NAMES[zhi_index]
 
     @classmethod
     def get_full_info(cls, solar_date: datetime, hour: Optional[int] = None) -> Dict[str, Any]:
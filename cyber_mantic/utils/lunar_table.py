@@ -0,0 +1,243 @@
+"""
+农历日表模块 - 内存映射的定长农历日表（1900-01-31 至 2100-02-08）
+
+每个公历日一条6字节记录：农历年偏移、农历月（最高位为闰月标志）、农历日、
+年/月/日干支序号（0-59，0=甲子）。记录按公历日顺序排列，运行时用 mmap 映射
+（data/constants/lunar_days.bin），按距起始日的天数直接定位，O(1) 完成阳历转农历。
+
+表尾附带农历月索引（每个农历月的初一所在记录位置和月长），
+按农历年分组后用于农历转阳历，无需逐日遍历。
+
+干支语义与 cnlunar 一致：年柱、月柱以节气所在日切换，日柱以0点切换
+（23点换日由 utils.lunar_calendar 处理）。
+
+表文件由 tools/generate_lunar_table.py 用 cnlunar 生成，运行时不依赖 cnlunar；
+文件缺失或损坏时回退为用 cnlunar 在内存中现算（约20秒）。
+"""
+import mmap
+import struct
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from utils.ganzhi import ZODIAC_NAMES, jiazi_name, parse_jiazi
+from utils.logger import get_logger
+
+
+TABLE_START_DATE = date(1900, 1, 31)  # 农历1900年正月初一
+TABLE_END_DATE = date(2100, 2, 8)     # 农历2099年腊月三十（cnlunar 支持的最后一天）
+TABLE_BASE_YEAR = 1899                # 农历年偏移的基准
+
+TABLE_PATH = Path(__file__).resolve().parent.parent / "data" / "constants" / "lunar_days.bin"
+_TABLE_MAGIC = b"LNRD"
+_TABLE_HEADER = struct.Struct("<4sHIII")  # 魔数, 基准年, 起始日序数, 日记录数, 月记录数
+_DAY_RECORD = struct.Struct("<6B")        # 年偏移, 月|闰月标志, 日, 年干支, 月干支, 日干支
+_MONTH_RECORD = struct.Struct("<HBBI")    # 农历年, 月|闰月标志, 月长, 初一的日记录位置
+_LEAP_FLAG = 0x80
+
+# 干支序号与 utils.ganzhi 的六十甲子编码一致（0=甲子）
+ganzhi_name = jiazi_name
+ganzhi_index = parse_jiazi
+
+
+class LunarDay(NamedTuple):
+    """某个公历日的农历信息"""
+    year: int             # 农历年
+    month: int            # 农历月
+    day: int              # 农历日
+    is_leap_month: bool   # 是否闰月
+    year_gan_zhi: int     # 年干支序号
+    month_gan_zhi: int    # 月干支序号
+    day_gan_zhi: int      # 日干支序号
+
+
+class LunarMonth(NamedTuple):
+    """农历月索引项"""
+    month: int
+    is_leap_month: bool
+    length: int           # 月长（29或30天）
+    start: int            # 初一的日记录位置
+
+
+class LunarDayTable:
+    """
+    农历日表
+
+    数据可以是 bytes 或只读 mmap；日记录按位置随取随解，不整体展开到内存。
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        try:
+            magic, base_year, start_ordinal, day_count, month_count = _TABLE_HEADER.unpack_from(buffer)
+        except struct.error:
+            raise ValueError("农历日表格式错误")
+        expected_size = _TABLE_HEADER.size + day_count * _DAY_RECORD.size + month_count * _MONTH_RECORD.size
+        if magic != _TABLE_MAGIC or len(buffer) != expected_size:
+            raise ValueError("农历日表格式错误")
+
+        self._buffer = buffer
+        self.base_year = base_year
+        self.start_date = date.fromordinal(start_ordinal)
+        self.end_date = self.start_date + timedelta(days=day_count - 1)
+        self.day_count = day_count
+        self._months = self._read_month_index(month_count)
+
+    def _read_month_index(self, month_count: int) -> Dict[int, List[LunarMonth]]:
+        """读取农历月索引，按农历年分组"""
+        months: Dict[int, List[LunarMonth]] = {}
+        offset = _TABLE_HEADER.size + self.day_count * _DAY_RECORD.size
+        for year, month, length, start in _MONTH_RECORD.iter_unpack(
+                self._buffer[offset:offset + month_count * _MONTH_RECORD.size]):
+            months.setdefault(year, []).append(
+                LunarMonth(month & ~_LEAP_FLAG, bool(month & _LEAP_FLAG), length, start)
+            )
+        return months
+
+    @classmethod
+    def build(cls, start: date = TABLE_START_DATE, end: date = TABLE_END_DATE) -> "LunarDayTable":
+        """用 cnlunar 逐日计算农历日表（仅生成工具和回退路径使用）"""
+        return cls(cls.build_bytes(start, end))
+
+    @staticmethod
+    def build_bytes(start: date = TABLE_START_DATE, end: date = TABLE_END_DATE) -> bytes:
+        """用 cnlunar 逐日计算，序列化为二进制表"""
+        from cnlunar import Lunar
+
+        days = bytearray()
+        months = bytearray()
+        current = start
+        position = 0
+        while current <= end:
+            lunar = Lunar(datetime(current.year, current.month, current.day), godType='8char')
+            year_gz = ganzhi_index(lunar.year8Char)
+            if ZODIAC_NAMES[year_gz % 12] != lunar.chineseYearZodiac:
+                raise ValueError(f"{current} 生肖与年干支不一致")
+            month = lunar.lunarMonth | (_LEAP_FLAG if lunar.isLunarLeapMonth else 0)
+            days += _DAY_RECORD.pack(
+                lunar.lunarYear - TABLE_BASE_YEAR, month, lunar.lunarDay,
+                year_gz, ganzhi_index(lunar.month8Char), ganzhi_index(lunar.day8Char)
+            )
+            if lunar.lunarDay == 1:
+                months += _MONTH_RECORD.pack(lunar.lunarYear, month, 0, position)
+            current += timedelta(days=1)
+            position += 1
+
+        # 回填月长：下一个月初一的位置之差，最后一个月截止到表尾
+        month_count = len(months) // _MONTH_RECORD.size
+        for i in range(month_count):
+            year, month, _, first = _MONTH_RECORD.unpack_from(months, i * _MONTH_RECORD.size)
+            if i + 1 < month_count:
+                length = _MONTH_RECORD.unpack_from(months, (i + 1) * _MONTH_RECORD.size)[3] - first
+            else:
+                length = position - first
+            _MONTH_RECORD.pack_into(months, i * _MONTH_RECORD.size, year, month, length, first)
+
+        header = _TABLE_HEADER.pack(_TABLE_MAGIC, TABLE_BASE_YEAR, start.toordinal(), position, month_count)
+        return header + bytes(days) + bytes(months)
+
+    def covers(self, day: date) -> bool:
+        """日期是否在表范围内"""
+        return self.start_date <= day <= self.end_date
+
+    def record(self, position: int) -> LunarDay:
+        """第 position 条日记录"""
+        year, month, day, year_gz, month_gz, day_gz = _DAY_RECORD.unpack_from(
+            self._buffer, _TABLE_HEADER.size + position * _DAY_RECORD.size
+        )
+        return LunarDay(
+            self.base_year + year, month & ~_LEAP_FLAG, day, bool(month & _LEAP_FLAG),
+            year_gz, month_gz, day_gz
+        )
+
+    def lookup(self, day: date) -> LunarDay:
+        """
+        阳历日期查农历
+
+        Args:
+            day: 公历日期
+
+        Returns:
+            农历日记录
+        """
+        if not self.covers(day):
+            raise ValueError(
+                f"日期超出农历表范围（{self.start_date:%Y-%m-%d} 至 {self.end_date:%Y-%m-%d}）"
+            )
+        return self.record(day.toordinal() - self.start_date.toordinal())
+
+    def months(self, year: int) -> List[LunarMonth]:
+        """某农历年的全部月份（按顺序，含闰月）"""
+        return list(self._months.get(year, []))
+
+    def find_month(self, year: int, month: int, is_leap_month: bool = False) -> Optional[LunarMonth]:
+        """查找某农历年的某个月"""
+        for entry in self._months.get(year, []):
+            if entry.month == month and entry.is_leap_month == is_leap_month:
+                return entry
+        return None
+
+    def to_solar(self, year: int, month: int, day: int, is_leap_month: bool = False) -> date:
+        """
+        农历转阳历
+
+        Args:
+            year: 农历年
+            month: 农历月
+            day: 农历日
+            is_leap_month: 是否闰月
+
+        Returns:
+            公历日期
+        """
+        entry = self.find_month(year, month, is_leap_month)
+        if entry is not None and 1 <= day <= entry.length:
+            position = entry.start + day - 1
+            if self.record(position).day == day:
+                return self.start_date + timedelta(days=position)
+            # cnlunar 个别月份（如1900年冬月）日序不连续，在该月范围内查找
+            for position in range(entry.start, entry.start + entry.length):
+                if self.record(position).day == day:
+                    return self.start_date + timedelta(days=position)
+        leap = "闰" if is_leap_month else ""
+        raise ValueError(f"无法找到对应的阳历日期：农历{year}年{leap}{month}月{day}日")
+
+
+_table: Optional[LunarDayTable] = None
+_table_lock = threading.Lock()
+
+
+def _map_table_file(path: Path) -> mmap.mmap:
+    """只读映射表文件（映射建立后即可关闭文件）"""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def get_lunar_table() -> LunarDayTable:
+    """获取农历日表（首次调用时映射表文件，缺失时用 cnlunar 现算）"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                try:
+                    _table = LunarDayTable(_map_table_file(TABLE_PATH))
+                except (OSError, ValueError) as e:
+                    get_logger().warning(f"农历日表加载失败（{e}），使用cnlunar现算")
+                    _table = LunarDayTable.build()
+    return _table
+
+
+def lookup_lunar_day(day: Union[date, datetime]) -> LunarDay:
+    """
+    阳历日期查农历（只取日期部分）
+
+    Args:
+        day: 公历日期或时刻
+
+    Returns:
+        农历日记录
+    """
+    if isinstance(day, datetime):
+        day = day.date()
+    return get_lunar_table().lookup(day)
+
@@ -4,7 +4,9 @@ QuestionClassifier - 问题类型智能识别工具
 从用户问题描述中识别问题类型（事业/财运/感情等）
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from utils.keyword_matcher import KeywordMatcher
 
 
 class QuestionClassifier:
@@ -66,6 +68,15 @@ class QuestionClassifier:
         ]
     }
 
+    # 关键词自动机（首次分类时构建）
+    _keyword_matcher: Optional[KeywordMatcher] = None
+
+    @classmethod
+    def _get_keyword_matcher(cls) -> KeywordMatcher:
+        if cls._keyword_matcher is None:
+            cls._keyword_matcher = KeywordMatcher.from_groups(cls.KEYWORDS_MAP, ignore_case=True)
+        return cls._keyword_matcher
+
     @classmethod
     def classify(cls, question: str) -> str:
         """
@@ -80,29 +91,17 @@ class QuestionClassifier:
         if not question:
             return "综合运势"
 
-        question_lower = question.lower()
-
-        # 计算每个类型的匹配分数
-        scores: Dict[str, int] = {}
-
-        for qtype, keywords in cls.KEYWORDS_MAP.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in question_lower:
-                    # 关键词越长，权重越高（更精确）
-                    score += len(keyword)
-            scores[qtype] = score
-
-        # 找出最高分
-        max_score = max(scores.values())
+        # 计算每个类型的匹配分数（关键词越长，权重越高）
+        scores = cls._get_keyword_matcher().scores(question)
 
         # 如果没有任何匹配，返回综合运势
-        if max_score == 0:
+        if not scores:
             return "综合运势"
 
-        # 返回得分最高的类型
-        for qtype, score in scores.items():
-            if score == max_score:
+        # 返回得分最高的类型（同分时按 KEYWORDS_MAP 顺序）
+        max_score = max(scores.values())
+        for qtype in cls.KEYWORDS_MAP:
+            if scores.get(qtype) == max_score:
                 return qtype
 
         return "综合运势"
@@ -121,28 +120,17 @@ class QuestionClassifier:
         if not question:
             return "综合运势", 0.0
 
-        question_lower = question.lower()
-
         # 计算每个类型的匹配分数
-        scores: Dict[str, int] = {}
-        total_keywords_count = 0
-
-        for qtype, keywords in cls.KEYWORDS_MAP.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in question_lower:
-                    score += len(keyword)
-                    total_keywords_count += 1
-            scores[qtype] = score
+        scores = cls._get_keyword_matcher().scores(question)
 
         # 如果没有任何匹配
-        if total_keywords_count == 0:
+        if not scores:
             return "综合运势", 0.0
 
-        # 找出最高分和次高分
-        sorted_scores = sorted(scores.values(), reverse=True)
+        # 找出最高分和次高分（未命中的类型记0分）
+        sorted_scores = sorted(scores.values(), reverse=True) + [0]
         max_score = sorted_scores[0]
-        second_max_score = sorted_scores[1] if len(sorted_scores) > 1 else 0
+        second_max_score = sorted_scores[1]
 
         # 计算置信度：最高分与次高分的差距越大，置信度越高
         if max_score == 0:
@@ -154,8 +142,8 @@ class QuestionClassifier:
             confidence = max(0.3, confidence)
 
         # 返回得分最高的类型
-        for qtype, score in scores.items():
-            if score == max_score:
+        for qtype in cls.KEYWORDS_MAP:
+            if scores.get(qtype) == max_score:
                 return qtype, confidence
 
         return "综合运势", 0.0
@@ -0,0 +1,417 @@
+"""
+节气模块 - 精确节气时刻表（1900-2100）
+
+节气时刻由本地天文算法计算（VSOP87截断级数求太阳视黄经，含章动、光行差和ΔT修正，
+牛顿迭代求黄经为15°整数倍的时刻），精度约1分钟。计算结果预先生成为紧凑的二进制表
+（data/constants/solar_terms.bin，每个节气一个uint32，表示距表起点的分钟数，北京时间），
+运行时加载后用二分查找在 O(log n) 内回答"当前节气、节气开始时刻、下一个节气"。
+
+表文件由 tools/generate_solar_terms.py 生成；文件缺失或损坏时在内存中现算（约1-2秒）。
+表范围之外的年份按需现算。
+
+节气序号从小寒开始：0=小寒, 1=大寒, 2=立春, ..., 23=冬至；
+偶数序号为"节"（换月），奇数序号为"中气"。
+"""
+import bisect
+import math
+import struct
+import sys
+import threading
+from array import array
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from utils.logger import get_logger
+
+
+SOLAR_TERM_NAMES = [
+    "小寒", "大寒", "立春", "雨水", "惊蛰", "春分",
+    "清明", "谷雨", "立夏", "小满", "芒种", "夏至",
+    "小暑", "大暑", "立秋", "处暑", "白露", "秋分",
+    "寒露", "霜降", "立冬", "小雪", "大雪", "冬至"
+]
+SOLAR_TERM_INDEX = {name: i for i, name in enumerate(SOLAR_TERM_NAMES)}
+
+# 表范围（首尾各多一年，保证1900年初和2100年末也能找到前后节气）
+TABLE_START_YEAR = 1899
+TABLE_END_YEAR = 2101
+SUPPORTED_START_YEAR = 1900
+SUPPORTED_END_YEAR = 2100
+
+TABLE_PATH = Path(__file__).resolve().parent.parent / "data" / "constants" / "solar_terms.bin"
+_TABLE_MAGIC = b"SLTM"
+_TABLE_HEADER = struct.Struct("<4sHHI")  # 魔数, 起始年, 结束年, 节气数
+
+BEIJING_UTC_OFFSET = timedelta(hours=8)
+_J2000 = 2451545.0
+_J2000_DATETIME = datetime(2000, 1, 1, 12)  # J2000.0 对应的UT时刻
+_MINUTE = timedelta(minutes=1)
+
+
+class SolarTermInfo(NamedTuple):
+    """节气查询结果（时刻均为北京时间）"""
+    index: int            # 当前节气序号（0=小寒）
+    name: str             # 当前节气名称
+    start: datetime       # 当前节气开始时刻
+    next_name: str        # 下一个节气名称
+    next_start: datetime  # 下一个节气开始时刻
+
+    @property
+    def is_jie(self) -> bool:
+        """当前节气是否为"节"（换月节气）"""
+        return self.index % 2 == 0
+
+
+# ============ 天文算法 ============
+
+# VSOP87 地球日心黄经级数（Meeus《天文算法》附录截断版），每项 (A, B, C)：A·cos(B + C·τ)，A单位1e-8弧度
+_VSOP87_L = [
+    [
+        (175347046, 0, 0), (3341656, 4.6692568, 6283.07585), (34894, 4.6261, 12566.1517),
+        (3497, 2.7441, 5753.3849), (3418, 2.8289, 3.5231), (3136, 3.6277, 77713.7715),
+        (2676, 4.4181, 7860.4194), (2343, 6.1352, 3930.2097), (1324, 0.7425, 11506.7698),
+        (1273, 2.0371, 529.691), (1199, 1.1096, 1577.3435), (990, 5.233, 5884.927),
+        (902, 2.045, 26.298), (857, 3.508, 398.149), (780, 1.179, 5223.694),
+        (753, 2.533, 5507.553), (505, 4.583, 18849.228), (492, 4.205, 775.523),
+        (357, 2.92, 0.067), (317, 5.849, 11790.629), (284, 1.899, 796.298),
+        (271, 0.315, 10977.079), (243, 0.345, 5486.778), (206, 4.806, 2544.314),
+        (205, 1.869, 5573.143), (202, 2.458, 6069.777), (156, 0.833, 213.299),
+        (132, 3.411, 2942.463), (126, 1.083, 20.775), (115, 0.645, 0.98),
+        (103, 0.636, 4694.003), (102, 0.976, 15720.839), (102, 4.267, 7.114),
+        (99, 6.21, 2146.17), (98, 0.68, 155.42), (86, 5.98, 161000.69),
+        (85, 1.3, 6275.96), (85, 3.67, 71430.7), (80, 1.81, 17260.15),
+        (79, 3.04, 12036.46), (75, 1.76, 5088.63), (74, 3.5, 3154.69),
+        (74, 4.68, 801.82), (70, 0.83, 9437.76), (62, 3.98, 8827.39),
+        (61, 1.82, 7084.9), (57, 2.78, 6286.6), (56, 4.39, 14143.5),
+        (56, 3.47, 6279.55), (52, 0.19, 12139.55), (52, 1.33, 1748.02),
+        (51, 0.28, 5856.48), (49, 0.49, 1194.45), (41, 5.37, 8429.24),
+        (41, 2.4, 19651.05), (39, 6.17, 10447.39), (37, 6.04, 10213.29),
+        (37, 2.57, 1059.38), (36, 1.71, 2352.87), (36, 1.78, 6812.77),
+        (33, 0.59, 17789.85), (30, 0.44, 83996.85), (30, 2.74, 1349.87),
+        (25, 3.16, 4690.48),
+    ],
+    [
+        (628331966747, 0, 0), (206059, 2.678235, 6283.07585), (4303, 2.6351, 12566.1517),
+        (425, 1.59, 3.523), (119, 5.796, 26.298), (109, 2.966, 1577.344),
+        (93, 2.59, 18849.23), (72, 1.14, 529.69), (68, 1.87, 398.15),
+        (67, 4.41, 5507.55), (59, 2.89, 5223.69), (56, 2.17, 155.42),
+        (45, 0.4, 796.3), (36, 0.47, 775.52), (29, 2.65, 7.11),
+        (21, 5.34, 0.98), (19, 1.85, 5486.78), (19, 4.97, 213.3),
+        (17, 2.99, 6275.96), (16, 0.03, 2544.31), (16, 1.43, 2146.17),
+        (15, 1.21, 10977.08), (12, 2.83, 1748.02), (12, 3.26, 5088.63),
+        (12, 5.27, 1194.45), (12, 2.08, 4694.0), (11, 0.77, 553.57),
+        (10, 1.3, 6286.6), (10, 4.24, 1349.87), (9, 2.7, 242.73),
+        (9, 5.64, 951.72), (8, 5.3, 2352.87), (6, 2.65, 9437.76),
+        (6, 4.67, 4690.48),
+    ],
+    [
+        (52919, 0, 0), (8720, 1.0721, 6283.0758), (309, 0.867, 12566.152),
+        (27, 0.05, 3.52), (16, 5.19, 26.3), (16, 3.68, 155.42),
+        (10, 0.76, 18849.23), (9, 2.06, 77713.77), (7, 0.83, 775.52),
+        (5, 4.66, 1577.34), (4, 1.03, 7.11), (4, 3.44, 5573.14),
+        (3, 5.14, 796.3), (3, 6.05, 5507.55), (3, 1.19, 242.73),
+        (3, 6.12, 529.69), (3, 0.31, 398.15), (3, 2.28, 553.57),
+        (2, 4.38, 5223.69), (2, 3.75, 0.98),
+    ],
+    [
+        (289, 5.844, 6283.076), (35, 0, 0), (17, 5.49, 12566.15),
+        (3, 5.2, 155.42), (1, 4.72, 3.52), (1, 5.3, 18849.23),
+        (1, 5.97, 242.73),
+    ],
+    [
+        (114, 3.142, 0), (8, 4.13, 6283.08), (1, 3.84, 12566.15),
+    ],
+    [
+        (1, 3.14, 0),
+    ],
+]
+
+
+def _delta_t_seconds(year: float) -> float:
+    """ΔT = TT - UT（秒），Espenak-Meeus 多项式"""
+    if year < 1900:
+        t = year - 1860
+        return 7.62 + 0.5737 * t - 0.251754 * t ** 2 + 0.01680668 * t ** 3 - 0.0004473624 * t ** 4 + t ** 5 / 233174
+    if year < 1920:
+        t = year - 1900
+        return -2.79 + 1.494119 * t - 0.0598939 * t ** 2 + 0.0061966 * t ** 3 - 0.000197 * t ** 4
+    if year < 1941:
+        t = year - 1920
+        return 21.20 + 0.84493 * t - 0.0761 * t ** 2 + 0.0020936 * t ** 3
+    if year < 1961:
+        t = year - 1950
+        return 29.07 + 0.407 * t - t ** 2 / 233 + t ** 3 / 2547
+    if year < 1986:
+        t = year - 1975
+        return 45.45 + 1.067 * t - t ** 2 / 260 - t ** 3 / 718
+    if year < 2005:
+        t = year - 2000
+        return (63.86 + 0.3345 * t - 0.060374 * t ** 2 + 0.0017275 * t ** 3
+                + 0.000651814 * t ** 4 + 0.00002373599 * t ** 5)
+    if year < 2050:
+        t = year - 2000
+        return 62.92 + 0.32217 * t + 0.005589 * t ** 2
+    u = (year - 1820) / 100
+    return -20 + 32 * u ** 2 - 0.5628 * (2150 - year)
+
+
+def _apparent_solar_longitude(jde: float) -> float:
+    """
+    太阳视黄经（度，0-360）
+
+    Args:
+        jde: 儒略历书日（力学时）
+    """
+    tau = (jde - _J2000) / 365250
+    heliocentric = 0.0
+    power = 1.0
+    for series in _VSOP87_L:
+        heliocentric += power * sum(a * math.cos(b + c * tau) for a, b, c in series)
+        power *= tau
+    longitude = math.degrees(heliocentric / 1e8) + 180.0  # 地心黄经
+
+    t = tau * 10  # 儒略世纪数
+    # FK5 修正
+    longitude -= 0.09033 / 3600
+    # 章动（低精度）
+    omega = math.radians(125.04452 - 1934.136261 * t)
+    sun_mean = math.radians(280.4665 + 36000.7698 * t)
+    moon_mean = math.radians(218.3165 + 481267.8813 * t)
+    nutation = (-17.20 * math.sin(omega) - 1.32 * math.sin(2 * sun_mean)
+                - 0.23 * math.sin(2 * moon_mean) + 0.21 * math.sin(2 * omega))
+    # 光行差（日地距离取近似值）
+    anomaly = math.radians(357.52911 + 35999.05029 * t)
+    distance = 1.000140 - 0.016708 * math.cos(anomaly) - 0.000139 * math.cos(2 * anomaly)
+    aberration = -20.4898 / distance
+
+    return (longitude + (nutation + aberration) / 3600) % 360
+
+
+def _julian_day_to_beijing(jd_ut: float) -> datetime:
+    """儒略日（UT）转北京时间"""
+    return _J2000_DATETIME + timedelta(days=jd_ut - _J2000) + BEIJING_UTC_OFFSET
+
+
+def compute_solar_term(year: int, index: int) -> datetime:
+    """
+    用天文算法计算某年第 index 个节气的时刻
+
+    Args:
+        year: 公历年
+        index: 节气序号（0=小寒 ... 23=冬至）
+
+    Returns:
+        节气时刻（北京时间，精确到秒）
+    """
+    target = (285 + 15 * index) % 360
+    # 初值：小寒约在1月5日，之后每个节气约隔15.22天
+    jd_year_start = _J2000 + (datetime(year, 1, 1) - _J2000_DATETIME).total_seconds() / 86400
+    jde = jd_year_start + 4.5 + 15.2184 * index
+    for _ in range(20):
+        diff = (target - _apparent_solar_longitude(jde) + 180) % 360 - 180
+        step = diff * 365.2422 / 360
+        jde += step
+        if abs(step) < 1e-6:
+            break
+    jd_ut = jde - _delta_t_seconds(year + (index + 0.5) / 24) / 86400
+    return _julian_day_to_beijing(jd_ut)
+
+
+def compute_year_terms(year: int) -> List[datetime]:
+    """计算一年24个节气的时刻（小寒到冬至）"""
+    return [compute_solar_term(year, i) for i in range(24)]
+
+
+# ============ 节气表 ============
+
+class SolarTermTable:
+    """
+    节气时刻表
+
+    每个节气存为距起始年1月1日0时（北京时间）的分钟数，按时间递增排列，
+    第 n 项对应 start_year + n // 24 年的第 n % 24 个节气。
+    """
+
+    def __init__(self, start_year: int, minutes: array):
+        self.start_year = start_year
+        self.end_year = start_year + len(minutes) // 24 - 1
+        self.epoch = datetime(start_year, 1, 1)
+        self._minutes = minutes
+
+    @classmethod
+    def build(cls, start_year: int = TABLE_START_YEAR, end_year: int = TABLE_END_YEAR) -> "SolarTermTable":
+        """用天文算法计算节气表"""
+        epoch = datetime(start_year, 1, 1)
+        minutes = array("I")
+        for year in range(start_year, end_year + 1):
+            for instant in compute_year_terms(year):
+                minutes.append((instant - epoch) // _MINUTE)
+        return cls(start_year, minutes)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SolarTermTable":
+        """从二进制表解析"""
+        magic, start_year, end_year, count = _TABLE_HEADER.unpack_from(data)
+        if magic != _TABLE_MAGIC or count != (end_year - start_year + 1) * 24:
+            raise ValueError("节气表格式错误")
+        minutes = array("I")
+        minutes.frombytes(data[_TABLE_HEADER.size:_TABLE_HEADER.size + count * 4])
+        if sys.byteorder == "big":
+            minutes.byteswap()
+        if len(minutes) != count:
+            raise ValueError("节气表数据不完整")
+        return cls(start_year, minutes)
+
+    def to_bytes(self) -> bytes:
+        """序列化为二进制表（小端序）"""
+        minutes = array("I", self._minutes)
+        if sys.byteorder == "big":
+            minutes.byteswap()
+        header = _TABLE_HEADER.pack(_TABLE_MAGIC, self.start_year, self.end_year, len(minutes))
+        return header + minutes.tobytes()
+
+    def __len__(self) -> int:
+        return len(self._minutes)
+
+    def minutes(self) -> array:
+        """全部节气距表起点的分钟数（按时间递增，只读，供批量计算直接使用）"""
+        return self._minutes
+
+    def instant(self, position: int) -> datetime:
+        """第 position 项节气的时刻"""
+        return self.epoch + timedelta(minutes=self._minutes[position])
+
+    def covers(self, dt: datetime) -> bool:
+        """时刻是否落在表内两个节气之间"""
+        return self.instant(0) <= dt < self.instant(len(self._minutes) - 1)
+
+    def position(self, dt: datetime) -> int:
+        """dt 所在节气在表中的位置（二分查找）"""
+        if not self.covers(dt):
+            raise ValueError(f"{dt} 超出节气表范围（{self.start_year}-{self.end_year}年）")
+        return bisect.bisect_right(self._minutes, (dt - self.epoch) // _MINUTE) - 1
+
+    def locate(self, dt: datetime) -> SolarTermInfo:
+        """
+        查询时刻所在的节气
+
+        Args:
+            dt: 时刻（北京时间）
+
+        Returns:
+            当前节气、开始时刻和下一个节气
+        """
+        pos = self.position(dt)
+        index = pos % 24
+        return SolarTermInfo(
+            index=index,
+            name=SOLAR_TERM_NAMES[index],
+            start=self.instant(pos),
+            next_name=SOLAR_TERM_NAMES[(index + 1) % 24],
+            next_start=self.instant(pos + 1)
+        )
+
+    def term_instant(self, year: int, name: str) -> datetime:
+        """某年某节气的时刻"""
+        if not self.start_year <= year <= self.end_year:
+            raise ValueError(f"{year} 超出节气表范围（{self.start_year}-{self.end_year}年）")
+        return self.instant((year - self.start_year) * 24 + SOLAR_TERM_INDEX[name])
+
+
+_table: Optional[SolarTermTable] = None
+_table_lock = threading.Lock()
+
+
+def get_solar_term_table() -> SolarTermTable:
+    """获取节气表（首次调用时加载二进制表，缺失时现算）"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                try:
+                    _table = SolarTermTable.from_bytes(TABLE_PATH.read_bytes())
+                except (OSError, ValueError, struct.error) as e:
+                    get_logger().warning(f"节气表加载失败（{e}），使用天文算法现算")
+                    _table = SolarTermTable.build()
+    return _table
+
+
+@lru_cache(maxsize=32)
+def _out_of_range_table(year: int) -> SolarTermTable:
+    """表范围之外的年份：现算前后各一年的节气"""
+    return SolarTermTable.build(year - 1, year + 1)
+
+
+def _table_for(dt: datetime) -> SolarTermTable:
+    table = get_solar_term_table()
+    return table if table.covers(dt) else _out_of_range_table(dt.year)
+
+
+def find_solar_term(dt: datetime) -> SolarTermInfo:
+    """
+    查询时刻所在的节气（当前节气、开始时刻、下一个节气）
+
+    Args:
+        dt: 时刻（北京时间）
+
+    Returns:
+        节气信息
+    """
+    return _table_for(dt).locate(dt)
+
+
+def get_solar_term_instant(year: int, name: str) -> datetime:
+    """
+    某年某节气的精确时刻
+
+    Args:
+        year: 公历年
+        name: 节气名称
+
+    Returns:
+        节气时刻（北京时间）
+    """
+    table = get_solar_term_table()
+    if table.start_year <= year <= table.end_year:
+        return table.term_instant(year, name)
+    return compute_solar_term(year, SOLAR_TERM_INDEX[name])
+
+
+def get_jie_month(dt: datetime) -> Tuple[int, int]:
+    """
+    按节气换月，返回 (干支纪年的年份, 月序号)
+
+    干支纪年以立春换年；月序号 0=寅月（立春-惊蛰）... 11=丑月（小寒-立春）。
+
+    Args:
+        dt: 时刻（北京时间）
+
+    Returns:
+        (年份, 月序号)
+    """
+    table = _table_for(dt)
+    pos = table.position(dt)
+    index = pos % 24
+    year = table.start_year + pos // 24
+    if index < 2:  # 小寒、大寒属于上一年的丑月
+        year -= 1
+    return year, ((index - 2) // 2) % 12
+
+
+def get_last_zhongqi(dt: datetime) -> Tuple[str, datetime]:
+    """
+    最近一个中气（月将按中气更换）
+
+    Args:
+        dt: 时刻（北京时间）
+
+    Returns:
+        (中气名称, 开始时刻)
+    """
+    table = _table_for(dt)
+    pos = table.position(dt)
+    if pos % 2 == 0:
+        pos -= 1
+    return SOLAR_TERM_NAMES[pos % 24], table.instant(pos)
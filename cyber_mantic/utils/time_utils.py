@@ -5,6 +5,8 @@ from datetime import datetime, timedelta
 from typing import Tuple, Optional
 import math
 
+from utils.solar_terms import SolarTermInfo, find_solar_term
+
 
 class TimeUtils:
     """时间工具类"""
@@ -102,57 +104,29 @@ class TimeUtils:
     @staticmethod
     def get_solar_term(date: datetime) -> Tuple[str, datetime]:
         """
-        获取指定日期所在的节气
+        获取指定时刻所在的节气（最近一个已开始的节气）
 
         Args:
-            date: 日期
+            date: 时刻（北京时间）
 
         Returns:
-            (节气名称, 节气时间)
-        """
-        # 简化实现，使用近似日期
-        # 实际应使用精确的天文算法
-
-        year = date.year
-        month = date.month
-
-        # 二十四节气近似日期（每年可能有1-2天偏差）
-        solar_terms_dates = [
-            ("小寒", (1, 6)), ("大寒", (1, 20)),
-            ("立春", (2, 4)), ("雨水", (2, 19)),
-            ("惊蛰", (3, 6)), ("春分", (3, 21)),
-            ("清明", (4, 5)), ("谷雨", (4, 20)),
-            ("立夏", (5, 6)), ("小满", (5, 21)),
-            ("芒种", (6, 6)), ("夏至", (6, 21)),
-            ("小暑", (7, 7)), ("大暑", (7, 23)),
-            ("立秋", (8, 8)), ("处暑", (8, 23)),
-            ("白露", (9, 8)), ("秋分", (9, 23)),
-            ("寒露", (10, 8)), ("霜降", (10, 24)),
-            ("立冬", (11, 8)), ("小雪", (11, 22)),
-            ("大雪", (12, 7)), ("冬至", (12, 22)),
-        ]
-
-        # 找到最近的节气
-        current_term = None
-        min_diff = float('inf')
-
-        for term_name, (term_month, term_day) in solar_terms_dates:
-            term_date = datetime(year, term_month, term_day)
-            diff = abs((date - term_date).days)
+            (节气名称, 节气开始时刻)
+        """
+        info = find_solar_term(date)
+        return info.name, info.start
 
-            if diff < min_diff:
-                min_diff = diff
-                current_term = (term_name, term_date)
+    @staticmethod
+    def get_solar_term_info(date: datetime) -> SolarTermInfo:
+        """
+        获取指定时刻的节气信息（当前节气、开始时刻、下一个节气及其时刻）
 
-            # 如果是跨年的情况，也检查去年的节气
-            if month == 1:
-                term_date_prev = datetime(year - 1, term_month, term_day)
-                diff_prev = abs((date - term_date_prev).days)
-                if diff_prev < min_diff:
-                    min_diff = diff_prev
-                    current_term = (term_name, term_date_prev)
+        Args:
+            date: 时刻（北京时间）
 
-        return current_term
+        Returns:
+            节气信息
+        """
+        return find_solar_term(date)
 
     @staticmethod
     def get_current_solar_term(date: datetime) -> str:
@@ -165,15 +139,7 @@ class TimeUtils:
         Returns:
             节气名称
         """
-        term_name, term_date = TimeUtils.get_solar_term(date)
-
-        # 判断是在节气前还是节气后
-        if date >= term_date:
-            return term_name
-        else:
-            # 返回上一个节气
-            # 简化处理
-            return term_name
+        return find_solar_term(date).name
 
     @staticmethod
     def get_shi_chen(hour: int, minute: int = 0) -> Tuple[str, int]:
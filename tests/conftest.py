@@ -3,11 +3,14 @@ Pytest配置文件
 
 配置测试环境，包括mock PyQt6组件以支持无头环境测试
 """
+import asyncio
 import sys
 import os
 from pathlib import Path
 from unittest.mock import MagicMock
 
+import pytest
+
 # 添加cyber_mantic目录到Python路径
 project_root = Path(__file__).parent.parent
 cyber_mantic_path = project_root / "cyber_mantic"
@@ -34,11 +37,68 @@ sys.modules['PyQt6.QtGui'] = MockQtModule()
 # Pytest配置
 def pytest_configure(config):
     """Pytest启动配置"""
-    import os
     # 设置Qt平台为offscreen
     os.environ['QT_QPA_PLATFORM'] = 'offscreen'
     # 禁用Qt插件警告
     os.environ['QT_LOGGING_RULES'] = '*.debug=false;qt.qpa.*=false'
+    config.addinivalue_line("markers", "api_manager_config(**config): api_manager 夹具的额外配置")
+
+
+# APIManager 集成测试的基础配置（只用于构造，不会真正请求API）
+API_MANAGER_BASE_CONFIG = {
+    "claude_api_key": "test_claude_key",
+    "deepseek_api_key": "test_deepseek_key",
+    "primary_api": "claude",
+    "max_retries": 1,
+    "enable_dual_verification": False,
+}
+
+
+@pytest.fixture
+def api_manager(request):
+    """
+    APIManager 工厂
+
+    在基础配置上依次叠加测试类（或模块、用例）的 api_manager_config 标记和调用时的关键字参数：
+
+        @pytest.mark.api_manager_config(enable_hedging=True)
+        class TestXxx:
+            def test_xxx(self, api_manager):
+                manager = api_manager(max_retries=2)
+    """
+    from api.manager import APIManager
+
+    base = dict(API_MANAGER_BASE_CONFIG)
+    for marker in reversed(list(request.node.iter_markers("api_manager_config"))):
+        base.update(marker.kwargs)
+
+    def factory(task_router=None, **extra):
+        return APIManager({**base, **extra}, task_router=task_router)
+    return factory
+
+
+@pytest.fixture
+def fake_api_call():
+    """
+    替换 APIManager._call_api_by_name 的假调用工厂
+
+    按 delays[api] 等待后返回 responses[api]（异常则抛出），未指定时返回 default 或 "<api>回答"；
+    被取消的 API 记入 cancelled。
+    """
+    def factory(delays, responses=None, cancelled=None, default=None):
+        async def fake_call(api, prompt, **kwargs):
+            try:
+                await asyncio.sleep(delays[api])
+            except asyncio.CancelledError:
+                if cancelled is not None:
+                    cancelled.append(api)
+                raise
+            response = (responses or {}).get(api, default if default is not None else f"{api}回答")
+            if isinstance(response, Exception):
+                raise response
+            return response
+        return fake_call
+    return factory
 
 
 def pytest_collection_modifyitems(items):
@@ -282,5 +282,84 @@ class TestAPIManagerCallAPI:
             assert result == "测试响应"
 
 
+class TestAPIManagerStream:
+    """流式调用测试"""
+
+    def _manager(self):
+        return APIManager({
+            "claude_api_key": "test_claude_key",
+            "deepseek_api_key": "test_deepseek_key",
+            "primary_api": "claude",
+            "max_retries": 1,
+            "enable_dual_verification": False
+        })
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas(self):
+        """逐段返回文本"""
+        manager = self._manager()
+
+        async def fake_stream(api_name, prompt, **kwargs):
+            for chunk in ["你好", "，", "世界"]:
+                yield chunk
+
+        with patch.object(manager, '_stream_api_by_name', side_effect=fake_stream):
+            chunks = [c async for c in manager.call_api_stream("快速交互问答", "测试")]
+
+        assert chunks == ["你好", "，", "世界"]
+
+    @pytest.mark.asyncio
+    async def test_failover_before_first_token(self):
+        """首段文本前失败时切换到下一个API"""
+        manager = self._manager()
+        called = []
+
+        async def fake_stream(api_name, prompt, **kwargs):
+            called.append(api_name)
+            if api_name == "claude":
+                raise Exception("Claude失败")
+            yield "deepseek回答"
+
+        with patch.object(manager, '_stream_api_by_name', side_effect=fake_stream):
+            chunks = [c async for c in manager.call_api_stream("快速交互问答", "测试")]
+
+        assert called == ["claude", "deepseek"]
+        assert chunks == ["deepseek回答"]
+
+    @pytest.mark.asyncio
+    async def test_no_failover_after_first_token(self):
+        """开始输出后出错不再切换API，错误抛给调用方"""
+        manager = self._manager()
+        called = []
+
+        async def fake_stream(api_name, prompt, **kwargs):
+            called.append(api_name)
+            yield "部分"
+            raise Exception("中途断开")
+
+        chunks = []
+        with patch.object(manager, '_stream_api_by_name', side_effect=fake_stream):
+            with pytest.raises(Exception, match="中途断开"):
+                async for chunk in manager.call_api_stream("快速交互问答", "测试"):
+                    chunks.append(chunk)
+
+        assert called == ["claude"]
+        assert chunks == ["部分"]
+
+    @pytest.mark.asyncio
+    async def test_all_apis_fail(self):
+        """所有API首段前失败时抛出异常"""
+        manager = self._manager()
+
+        async def fake_stream(api_name, prompt, **kwargs):
+            raise Exception(f"{api_name}失败")
+            yield  # pragma: no cover
+
+        with patch.object(manager, '_stream_api_by_name', side_effect=fake_stream):
+            with pytest.raises(Exception, match="所有API流式调用都失败了"):
+                async for _ in manager.call_api_stream("快速交互问答", "测试"):
+                    pass
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,159 @@
+"""
+异步双模型验证测试
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from core.decision_engine import DecisionEngine
+from models import TheoryAnalysisResult
+
+
+# 两个模型回答一致时的默认回复
+AGREED_ANSWER = "此事大吉，建议积极行动"
+
+
+@pytest.mark.api_manager_config(enable_dual_verification=True, dual_verification_mode="async")
+class TestAPIManagerAsyncVerification:
+    """APIManager 异步验证模式测试"""
+
+    @pytest.mark.asyncio
+    async def test_primary_returned_before_secondary(self, api_manager, fake_api_call):
+        """主模型返回后立即返回，不等待副模型"""
+        manager = api_manager()
+        verifications = []
+        delays = {"claude": 0.0, "deepseek": 0.2}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays, default=AGREED_ANSWER)):
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            result = await manager.call_api(
+                task_type="单理论解读", prompt="问题", verification_callback=verifications.append
+            )
+            assert loop.time() - start < 0.15
+            assert result == AGREED_ANSWER
+            assert "【双模型验证】" not in result
+            assert verifications == []
+
+            assert await manager.wait_for_background_verifications() == 1
+
+        assert len(verifications) == 1
+        verification = verifications[0]
+        assert verification["primary_api"] == "claude"
+        assert verification["secondary_api"] == "deepseek"
+        assert verification["consistency_level"] == "高"
+        assert "【双模型验证】" in verification["note"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_mode_unchanged(self, api_manager, fake_api_call):
+        """默认阻塞模式仍在返回文本中附带验证信息"""
+        manager = api_manager(dual_verification_mode="blocking")
+        verifications = []
+        delays = {"claude": 0.0, "deepseek": 0.0}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays, default=AGREED_ANSWER)):
+            result = await manager.call_api(
+                task_type="单理论解读", prompt="问题", verification_callback=verifications.append
+            )
+
+        assert "【双模型验证】" in result
+        assert verifications == []
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_uses_secondary(self, api_manager, fake_api_call):
+        """主模型失败时等待副模型结果，不再触发验证回调"""
+        manager = api_manager()
+        verifications = []
+        delays = {"claude": 0.0, "deepseek": 0.05}
+        responses = {"claude": Exception("invalid response"), "deepseek": "副模型回答"}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays, responses)):
+            result = await manager.call_api(
+                task_type="单理论解读", prompt="问题", verification_callback=verifications.append
+            )
+            await manager.wait_for_background_verifications()
+
+        assert result == "副模型回答"
+        assert verifications == []
+
+    @pytest.mark.asyncio
+    async def test_secondary_failure_skips_callback(self, api_manager, fake_api_call):
+        """副模型失败时不调用回调"""
+        manager = api_manager()
+        verifications = []
+        delays = {"claude": 0.0, "deepseek": 0.01}
+        responses = {"claude": "主模型回答", "deepseek": Exception("invalid response")}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays, responses)):
+            result = await manager.call_api(
+                task_type="单理论解读", prompt="问题", verification_callback=verifications.append
+            )
+            await manager.wait_for_background_verifications()
+
+        assert result == "主模型回答"
+        assert verifications == []
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_pending_verification(self, api_manager, fake_api_call):
+        """关闭时取消未完成的后台验证"""
+        manager = api_manager()
+        verifications = []
+        delays = {"claude": 0.0, "deepseek": 10.0}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays, default=AGREED_ANSWER)):
+            await manager.call_api(
+                task_type="单理论解读", prompt="问题", verification_callback=verifications.append
+            )
+            assert len(manager._background_tasks) == 1
+            await manager.aclose()
+
+        assert verifications == []
+        assert not manager._background_tasks
+
+
+class TestVerificationBinder:
+    """验证结果写入结果对象"""
+
+    def _engine(self):
+        config = {
+            "api": {
+                "claude_api_key": "test_claude_key",
+                "deepseek_api_key": "test_deepseek_key",
+            }
+        }
+        return DecisionEngine(config)
+
+    @staticmethod
+    def _result():
+        return TheoryAnalysisResult(
+            theory_name="八字",
+            calculation_data={},
+            interpretation="解读",
+            judgment="吉",
+            judgment_level=0.7
+        )
+
+    def test_verification_after_bind(self):
+        """结果对象创建后完成的验证直接写入并通知调用方"""
+        engine = self._engine()
+        notified = []
+        on_verified, bind = engine._make_verification_binder("八字", lambda name, v: notified.append((name, v)))
+
+        result = self._result()
+        bind(result)
+        on_verified({"consistency_level": "高"})
+
+        assert result.verification == {"consistency_level": "高"}
+        assert result.to_dict()["verification"] == {"consistency_level": "高"}
+        assert notified == [("八字", {"consistency_level": "高"})]
+
+    def test_verification_before_bind(self):
+        """结果对象创建前完成的验证在绑定时写入"""
+        engine = self._engine()
+        on_verified, bind = engine._make_verification_binder("八字")
+
+        on_verified({"consistency_level": "低"})
+        result = self._result()
+        bind(result)
+
+        assert result.verification == {"consistency_level": "低"}
@@ -0,0 +1,82 @@
+"""
+批量四柱计算测试
+"""
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from theories.bazi.batch import calculate_pillars_batch, iter_pillars_range
+from theories.bazi.calculator import BaZiCalculator
+from utils import ganzhi
+from utils.solar_terms import get_jie_month, get_solar_term_instant
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return BaZiCalculator()
+
+
+def _random_hours(count, seed):
+    rng = random.Random(seed)
+    return [
+        datetime(rng.randint(1900, 2099), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23))
+        for _ in range(count)
+    ]
+
+
+def test_matches_full_bazi_on_whole_hours(calculator):
+    moments = _random_hours(300, seed=16)
+    batch = calculator.calculate_pillars_batch(moments)
+    assert len(batch) == len(moments)
+
+    for row, moment in enumerate(moments):
+        result = calculator.calculate_full_bazi(moment.year, moment.month, moment.day, moment.hour)
+        assert batch.names(row) == result["四柱"]
+        assert dict(zip(ganzhi.WUXING_NAMES, batch.wuxing[row].tolist())) == result["五行统计"]["统计"]
+        assert [ganzhi.TEN_GOD_NAMES[i] for i in batch.ten_gods[row]] == list(result["十神"].values())
+
+
+def test_switches_at_exact_solar_term_minute():
+    start_of_spring = get_solar_term_instant(2024, "立春")
+    moments = [start_of_spring - timedelta(minutes=1), start_of_spring]
+    batch = calculate_pillars_batch(moments)
+
+    for row, moment in enumerate(moments):
+        year, month_index = get_jie_month(moment)
+        assert batch.year[row] == ganzhi.year_jiazi(year)
+        assert batch.month[row] % 12 == ganzhi.month_zhi(month_index)
+    assert batch.names(0)[0] == "癸卯"
+    assert batch.names(1)[0] == "甲辰"
+
+
+def test_accepts_datetime64_arrays():
+    moments = _random_hours(50, seed=7)
+    from_objects = calculate_pillars_batch(moments)
+    from_array = calculate_pillars_batch(np.array(moments, dtype="datetime64[m]"))
+    assert (from_objects.pillars() == from_array.pillars()).all()
+
+
+def test_range_chunks_match_single_batch():
+    start, end = datetime(2023, 12, 30), datetime(2024, 1, 3, 5, 30)
+    step = timedelta(minutes=7)
+
+    chunks = list(iter_pillars_range(start, end, step=step, chunk_size=100))
+    assert [offset for offset, _ in chunks] == list(range(0, len(chunks) * 100, 100))
+    pillars = np.concatenate([batch.pillars() for _, batch in chunks])
+
+    moments = []
+    moment = start
+    while moment < end:
+        moments.append(moment)
+        moment += step
+    assert (pillars == calculate_pillars_batch(moments).pillars()).all()
+
+
+def test_empty_and_invalid_input():
+    assert len(calculate_pillars_batch([])) == 0
+    with pytest.raises(ValueError):
+        calculate_pillars_batch([datetime(1800, 1, 1)])
+    with pytest.raises(ValueError):
+        next(iter_pillars_range(datetime(2024, 1, 1), datetime(2024, 1, 2), step=timedelta(seconds=30)))
@@ -0,0 +1,69 @@
+"""
+候选时辰共享计算测试
+"""
+import pytest
+
+from core.shichen_handler import ShichenHandler
+from theories.bazi.calculator import BaZiCalculator
+from theories.bazi.candidates import BaZiCandidateSet
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return BaZiCalculator()
+
+
+def full_bazi(calculator, *args):
+    """绕过结果缓存直接计算"""
+    return BaZiCalculator.calculate_full_bazi.__wrapped__.__wrapped__(calculator, *args)
+
+
+@pytest.mark.parametrize("day", [(1990, 5, 15), (2024, 2, 4), (1985, 12, 7)])  # 后两个为节气当天
+@pytest.mark.parametrize("gender", [None, "male", "female"])
+def test_candidates_match_full_bazi(calculator, day, gender):
+    candidate_set = BaZiCandidateSet(calculator, *day, gender)
+    for hour in [None] + list(range(24)):
+        assert candidate_set.calculate(hour) == full_bazi(calculator, *day, hour, gender)
+
+
+def test_jie_day_builds_separate_contexts(calculator):
+    # 2024年立春在2月4日16时27分，当天年柱、月柱随时辰变化
+    candidate_set = BaZiCandidateSet(calculator, 2024, 2, 4)
+    assert candidate_set.calculate(10)["年柱"]["天干"] == "癸"
+    assert candidate_set.calculate(20)["年柱"]["天干"] == "甲"
+
+    ordinary = BaZiCandidateSet(calculator, 2024, 6, 10)
+    assert ordinary.context_for(0) is ordinary.context_for(23)
+
+
+def test_lunar_conversion_and_errors(calculator):
+    results = calculator.calculate_candidates(1990, 4, 21, [8, 24], "male", "lunar")
+    assert results[0] == dict(full_bazi(calculator, 1990, 4, 21, 8, "male", "lunar"), candidate_hour=8)
+    assert results[1]["candidate_hour"] == 24 and "error" in results[1]
+
+    results = calculator.calculate_candidates(1990, 13, 1, [8], calendar_type="lunar")
+    assert "error" in results[0]
+
+
+def test_results_do_not_share_state(calculator):
+    first, second = calculator.calculate_candidates(1990, 5, 15, [0, 2], "male")
+    first["大运"][0]["大运"] = "测试"
+    first["神煞"]["贵人"].append({})
+    assert second["大运"][0]["大运"] != "测试"
+    assert {} not in second["神煞"]["贵人"]
+
+
+def test_parallel_bazi_marks_candidates(calculator):
+    result = calculator.calculate_parallel_bazi(1990, 5, 15, [0, 13, 23], "male")
+    assert [r["hour_zhi"] for r in result["results"]] == ["子", "未", "子"]
+    assert result["candidate_count"] == 3
+
+
+def test_shichen_candidates_carry_bazi():
+    handler = ShichenHandler()
+    info = handler.parse_time_input(time_text="不知道")
+    candidates = handler.generate_candidate_analyses(
+        info, max_candidates=12, birth_date=(1990, 5, 15), gender="male"
+    )
+    assert len(candidates) == 12
+    assert all(c["bazi"]["时柱"]["地支"] == c["dizhi"] for c in candidates)
@@ -0,0 +1,78 @@
+"""
+四柱反查测试
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from theories.bazi.batch import calculate_pillars_batch
+from theories.bazi.calculator import BaZiCalculator
+from theories.bazi.pillar_index import SEARCH_END, SEARCH_START, find_datetimes, parse_pillars
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return BaZiCalculator()
+
+
+def test_parse_pillars_formats():
+    expected = [6, 17, 38, 43]  # 庚午 辛巳 壬寅 丁未
+    assert parse_pillars("庚午 辛巳 壬寅 丁未") == expected
+    assert parse_pillars("庚午年辛巳月壬寅日丁未时") == expected
+    assert parse_pillars(["庚午", "辛巳", "壬寅", "丁未"]) == expected
+    assert parse_pillars("庚午，辛巳，壬寅") == expected[:3]
+    with pytest.raises(ValueError):
+        parse_pillars("庚午 辛巳")
+    with pytest.raises(ValueError):
+        parse_pillars("庚午 辛巳 壬寅 丁丑丑")
+
+
+def test_known_chart(calculator):
+    windows = calculator.find_datetimes("庚午 辛巳 壬寅 丁未")
+    assert [(w.start, w.end) for w in windows] == [
+        (datetime(1930, 5, 30, 13), datetime(1930, 5, 30, 15)),
+        (datetime(1990, 5, 15, 13), datetime(1990, 5, 15, 15))
+    ]
+
+
+def test_zi_hour_has_two_windows_per_day():
+    moment = datetime(2024, 6, 10, 23, 30)
+    names = calculate_pillars_batch([moment]).names(0)
+    day_windows = [w for w in find_datetimes(names) if w.start.date() == moment.date()]
+    assert [(w.start.hour, w.end - w.start) for w in day_windows] == [
+        (0, timedelta(hours=1)), (23, timedelta(hours=1))
+    ]
+
+
+def test_windows_round_trip_through_batch():
+    rng = random.Random(17)
+    for _ in range(200):
+        moment = datetime(rng.randint(1900, 2100), rng.randint(1, 12), rng.randint(1, 28),
+                          rng.randint(0, 23), rng.randint(0, 59))
+        names = calculate_pillars_batch([moment]).names(0)
+        windows = find_datetimes(names)
+        assert any(w.start <= moment < w.end for w in windows)
+
+        edges = [w.start for w in windows] + [w.end - timedelta(minutes=1) for w in windows]
+        batch = calculate_pillars_batch(edges)
+        assert all(batch.names(row) == names for row in range(len(edges)))
+
+        for window in windows:
+            for outside in (window.start - timedelta(minutes=1), window.end):
+                if not SEARCH_START <= outside < SEARCH_END:
+                    continue
+                if any(w.start <= outside < w.end for w in windows):
+                    continue
+                assert calculate_pillars_batch([outside]).names(0) != names
+
+
+def test_three_pillars_cover_whole_day():
+    windows = find_datetimes("庚午 辛巳 壬寅")
+    assert windows[-1].start == datetime(1990, 5, 15)
+    assert windows[-1].end == datetime(1990, 5, 16)
+
+
+def test_impossible_combinations_are_empty():
+    assert find_datetimes("甲子 甲子 甲子 甲子") == []  # 甲年无甲子月
+    assert find_datetimes("甲子 丙寅 甲子 丙子") == []  # 甲日子时为甲子
@@ -0,0 +1,82 @@
+"""
+提供商客户端池测试
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from api.client_pool import ProviderClientPool
+from api.manager import APIManager
+
+
+class TestProviderClientPool:
+    """客户端池测试"""
+
+    @pytest.mark.asyncio
+    async def test_client_reused_per_provider_and_base_url(self):
+        """同一base_url复用客户端，不同base_url创建新客户端"""
+        pytest.importorskip("openai")
+        pool = ProviderClientPool()
+
+        a = pool.get_openai_client("key", "https://api.deepseek.com")
+        b = pool.get_openai_client("key", "https://api.deepseek.com")
+        c = pool.get_openai_client("key", "https://api.moonshot.cn/v1")
+
+        assert a is b
+        assert a is not c
+        await pool.aclose()
+
+    def test_clients_scoped_to_event_loop(self):
+        """不同事件循环使用各自的客户端，已关闭循环的客户端被清理"""
+        pytest.importorskip("openai")
+        pool = ProviderClientPool()
+
+        async def get_client():
+            return pool.get_openai_client("key", "https://api.deepseek.com")
+
+        loop1 = asyncio.new_event_loop()
+        client1 = loop1.run_until_complete(get_client())
+        loop1.close()
+
+        loop2 = asyncio.new_event_loop()
+        try:
+            client2 = loop2.run_until_complete(get_client())
+            assert client1 is not client2
+            assert loop1 not in pool._pools
+            loop2.run_until_complete(pool.aclose())
+        finally:
+            loop2.close()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self):
+        """aclose关闭当前循环中的客户端，之后重新创建"""
+        pytest.importorskip("anthropic")
+        pool = ProviderClientPool()
+        client = pool.get_anthropic_client("key")
+
+        with patch.object(client, "close", AsyncMock()) as mock_close:
+            await pool.aclose()
+            mock_close.assert_awaited_once()
+
+        assert pool.get_anthropic_client("key") is not client
+        await pool.aclose()
+
+
+class TestAPIManagerUsesPool:
+    """APIManager通过客户端池调用"""
+
+    @pytest.mark.asyncio
+    async def test_kimi_call_uses_native_async_client(self):
+        """Kimi调用使用池中的异步客户端"""
+        manager = APIManager({"kimi_api_key": "test-key", "enable_dual_verification": False})
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "Kimi响应"
+        client = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=response)
+
+        with patch.object(manager.client_pool, "get_openai_client", return_value=client) as get_client:
+            result = await manager._call_kimi("测试")
+
+        assert result == "Kimi响应"
+        get_client.assert_called_once_with("test-key", "https://api.moonshot.cn/v1")
+        client.chat.completions.create.assert_awaited_once()
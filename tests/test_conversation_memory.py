@@ -0,0 +1,140 @@
+"""
+对话记忆测试
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+from api.manager import APIManager
+from api.rate_limiter import estimate_tokens
+from models import UserInput
+from services.conversation.context import ConversationContext
+from services.conversation.memory import PROMPT_TOKEN_BUDGET, ConversationMemory, truncate_to_tokens
+from services.conversation.qa_handler import QAHandler
+from theories.daliuren.theory import DaLiuRenTheory
+from theories.qimen.theory import QiMenTheory
+from theories.ziwei.theory import ZiWeiTheory
+
+
+def _chat(context, turns, start=0):
+    for i in range(start, start + turns):
+        context.add_message("user", f"第{i}个问题：今年事业怎么样？")
+        context.add_message("assistant", "# 回答\n\n今年事业平稳。" + "具体展开" * 300)
+
+
+def test_truncate_to_tokens():
+    assert truncate_to_tokens("八字", 10) == "八字"
+    text = truncate_to_tokens("八字命盘" * 100, 20)
+    assert text.endswith("…") and estimate_tokens(text) <= 20
+    assert estimate_tokens(truncate_to_tokens("abc " * 200, 15)) <= 15
+
+
+def test_rolling_summary_is_incremental_and_bounded():
+    context = ConversationContext()
+    memory = ConversationMemory(recent_messages=4, summary_max_tokens=100)
+
+    _chat(context, 3)
+    recent = memory.update(context)
+    assert recent == context.conversation_history[-4:]
+    assert memory.summary.splitlines() == ["用户：第0个问题：今年事业怎么样？", "咨询师：回答 今年事业平稳。"]
+
+    _chat(context, 60, start=3)
+    memory.update(context)
+    assert estimate_tokens(memory.summary) <= 120
+    assert memory.summary.startswith("（更早的")
+    # 最近4条（第61、62轮）保留原文，之前的并入摘要
+    assert "第60个问题" in memory.summary and "第61个问题" not in memory.summary
+
+
+def test_duplicate_answers_counted_once():
+    context = ConversationContext()
+    memory = ConversationMemory(recent_messages=2)
+    for content in ["问题", "回答", "回答", "追问", "再答", "再答"]:
+        context.add_message("user" if "问" in content else "assistant", content)
+    assert [m["content"] for m in memory.update(context)] == ["再答"]
+    assert memory.summary.splitlines() == ["用户：问题", "咨询师：回答", "用户：追问"]
+
+
+def test_new_context_or_replaced_history_resets_summary():
+    memory = ConversationMemory(recent_messages=2)
+    context = ConversationContext()
+    _chat(context, 3)
+    memory.update(context)
+
+    context.conversation_history = [{"role": "user", "content": "新会话"}] * 1
+    memory.update(context)
+    assert memory.summary == ""
+
+    other = ConversationContext()
+    assert memory.update(other) == []
+    assert memory.summary == ""
+
+
+def test_render_fits_budget_and_includes_digest():
+    context = ConversationContext()
+    context.xiaoliu_result = {"时落宫": "大安", "judgment": "吉", "advice": "宜主动出击。"}
+    context.bazi_result = {"日主": "甲木", "用神分析": {"日主强弱": "身弱"}}
+    memory = ConversationMemory()
+    sizes = []
+    for turn in range(40):
+        _chat(context, 1, start=turn)
+        block = memory.render(context, 500)
+        sizes.append(estimate_tokens(block))
+    assert max(sizes) <= 500
+    assert "- 小六壬：大安，判断吉，建议：宜主动出击。" in block
+    assert "- 八字：甲木，身弱" in block
+    assert "第39个问题" in block.split("【最近对话】")[1]
+
+
+def test_digest_from_calculator_results():
+    """奇门、紫微、大六壬的真实排盘结果都能提取出要点"""
+    user_input = UserInput(
+        question_type="事业",
+        question_description="事业如何",
+        birth_year=1990,
+        birth_month=5,
+        birth_day=15,
+        birth_hour=14,
+        gender="男",
+        calendar_type="solar",
+        current_time=datetime(2024, 6, 15, 14, 30)
+    )
+    context = ConversationContext()
+    context.qimen_result = QiMenTheory().calculate(user_input)
+    context.ziwei_result = ZiWeiTheory().calculate(user_input)
+    context.liuren_result = DaLiuRenTheory().calculate(user_input)
+
+    lines = dict(line[2:].split("：", 1) for line in ConversationMemory().theory_digest(context).splitlines())
+    qimen = context.qimen_result
+    assert lines["奇门遁甲"].startswith(f"值符宫{qimen['值符宫']}，格局{qimen['格局'][0]['格局']}")
+    score = f"{qimen['综合评分']:.2f}".rstrip("0").rstrip(".")
+    assert f"综合评分{score}" in lines["奇门遁甲"]
+    assert f"时机{qimen['时机建议']['当前时辰']} {qimen['时机建议']['时机']}" in lines["奇门遁甲"]
+
+    ziwei = context.ziwei_result
+    assert lines["紫微斗数"] == f"命宫{ziwei['命宫']}，{ziwei['五局']}，命主{ziwei['命主']}"
+
+    liuren = context.liuren_result
+    san_chuan = "、".join(dict.fromkeys(item["地支"] for item in liuren["三传"]))
+    assert lines["大六壬"] == (
+        f"课体{liuren['课体']['名称']}，三传{san_chuan}，判断{liuren['吉凶判断']}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_qa_prompt_size_stays_flat():
+    api_manager = Mock(spec=APIManager)
+    api_manager.call_api = AsyncMock(return_value="好的")
+    context = ConversationContext()
+    context.comprehensive_analysis = "综合分析" * 1000
+    handler = QAHandler(api_manager, context)
+
+    sizes = []
+    for turn in range(30):
+        _chat(context, 1, start=turn)
+        await handler.handle("今年事业怎么样")
+        sizes.append(estimate_tokens(api_manager.call_api.call_args.kwargs["prompt"]))
+
+    assert max(sizes) <= PROMPT_TOKEN_BUDGET
+    # 摘要达到上限后每轮prompt大小不再增长
+    assert max(sizes[15:]) - min(sizes[15:]) < 20
@@ -3,6 +3,9 @@ ConversationService测试
 
 注意：部分QA相关方法已迁移至qa_handler.py，这里只测试ConversationService核心功能
 """
+import asyncio
+import threading
+
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from services.conversation_service import (
@@ -292,3 +295,135 @@ class TestQAHandler:
         response = qa_handler.generate_fallback_response("bazi_details")
         assert isinstance(response, str)
         assert len(response) > 0
+
+
+class TestQAHandlerStreaming:
+    """QAHandler流式回答测试"""
+
+    def setup_method(self):
+        """设置测试"""
+        self.mock_api_manager = Mock(spec=APIManager)
+        self.mock_api_manager.call_api = AsyncMock()
+        self.service = ConversationService(self.mock_api_manager)
+
+    @pytest.mark.asyncio
+    async def test_handle_streams_answer(self):
+        """提供stream_callback时逐段回调，返回完整回答"""
+        async def fake_stream(task_type, prompt, **kwargs):
+            for chunk in ["您的", "八字", "偏旺"]:
+                yield chunk
+
+        self.mock_api_manager.call_api_stream = fake_stream
+        deltas = []
+
+        answer = await self.service.qa_handler.handle("我的八字怎么样？", stream_callback=deltas.append)
+
+        assert deltas == ["您的", "八字", "偏旺"]
+        assert answer == "您的八字偏旺"
+        self.mock_api_manager.call_api.assert_not_called()
+        assert self.service.context.conversation_history[-1]["content"] == answer
+
+    @pytest.mark.asyncio
+    async def test_handle_stream_failure_uses_fallback(self):
+        """未输出任何内容就失败时使用降级回答"""
+        async def fake_stream(task_type, prompt, **kwargs):
+            raise Exception("网络错误")
+            yield  # pragma: no cover
+
+        self.mock_api_manager.call_api_stream = fake_stream
+
+        answer = await self.service.qa_handler.handle("我的八字怎么样？", stream_callback=lambda d: None)
+
+        assert answer == self.service.qa_handler.generate_fallback_response("bazi_details")
+
+
+class TestStage3Pipeline:
+    """阶段3流水线测试"""
+
+    def setup_method(self):
+        self.mock_api_manager = Mock(spec=APIManager)
+        self.mock_api_manager.call_api = AsyncMock()
+        self.service = ConversationService(self.mock_api_manager)
+        self.service.context.question_category = "事业"
+        self.birth_info = {"year": 1990, "month": 5, "day": 15, "hour": 14,
+                           "gender": "male", "time_certainty": "certain"}
+
+    def _fake_theories(self, release: threading.Event, calc_threads: list):
+        """快理论立即返回；慢理论等待 release（由验证问题生成触发）"""
+        def make_theory(wait):
+            class FakeTheory:
+                def calculate(self, user_input):
+                    calc_threads.append(threading.current_thread())
+                    return {"released": release.wait(timeout=2) if wait else None}
+            return FakeTheory
+
+        def config(name, wait):
+            return {
+                "display_name": name, "progress_name": name, "progress_text": "",
+                "progress_value": 90, "theory_class": make_theory(wait),
+                "context_attr": "bazi_result" if wait else "ziwei_result",
+                "has_summary": False, "has_judgment": False,
+            }
+
+        return {"慢理论": config("慢理论", True), "快理论": config("快理论", False)}
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap(self):
+        parse_started, validation_started = asyncio.Event(), asyncio.Event()
+        release, calc_threads, question_inputs, events = threading.Event(), [], [], []
+
+        async def fake_validate(message, stage):
+            validation_started.set()
+            await asyncio.wait_for(parse_started.wait(), timeout=2)
+            return Mock(status=None)
+
+        async def fake_parse(message):
+            parse_started.set()
+            await asyncio.wait_for(validation_started.wait(), timeout=2)
+            return dict(self.birth_info)
+
+        async def fake_questions(user_info, analysis_results, question_count):
+            question_inputs.append(dict(analysis_results))
+            release.set()
+            return []
+
+        async def fake_fitness(theory_callback=None):
+            self.service.context.selected_theories = ["慢理论", "快理论"]
+
+        self.service.nlp_parser.parse_birth_info = fake_parse
+        self.service.verification_generator.generate_questions = fake_questions
+        self.service._calculate_theory_fitness = fake_fitness
+
+        # flow_guard 为全局单例，只在本测试内替换
+        with patch.object(self.service.flow_guard, "validate_input_with_ai", fake_validate), \
+                patch.dict(ConversationService.THEORY_CONFIGS,
+                           self._fake_theories(release, calc_threads), clear=True):
+            await self.service._handle_stage3_collect(
+                "1990年5月15日14点，男", None,
+                lambda status, name, data: events.append((status, name))
+            )
+
+        # 验证问题在慢理论完成前就已开始，只带上快理论的结果
+        assert self.service.context.bazi_result == {"released": True}
+        assert list(question_inputs[0]) == ["快理论"]
+        assert events.index(("completed", "快理论")) < events.index(("completed", "慢理论"))
+        assert all(t is not threading.current_thread() for t in calc_threads)
+        assert self.service.context.stage == ConversationStage.STAGE4_VERIFY
+
+    @pytest.mark.asyncio
+    async def test_invalid_birth_info_waits_for_validation(self):
+        validated = []
+
+        async def fake_validate(message, stage):
+            await asyncio.sleep(0)
+            validated.append(stage)
+            return Mock(status=None)
+
+        self.service.nlp_parser.parse_birth_info = AsyncMock(return_value={"error": "无法解析"})
+
+        with patch.object(self.service.flow_guard, "validate_input_with_ai", fake_validate):
+            response = await self.service._handle_stage3_collect("不知道", None)
+
+        assert validated == ["STAGE3_COLLECT"]
+        assert response == self.service._retry_msg("stage3")
+        assert self.service.context.birth_info is None
@@ -0,0 +1,86 @@
+"""
+大六壬课表测试
+"""
+import pytest
+
+from theories.daliuren.calculator_v2 import DaLiuRenCalculatorV2
+from theories.daliuren.ke_table import (
+    KE_COUNT,
+    TABLE_PATH,
+    DaLiuRenKeTable,
+    get_ke_table,
+    ke_index,
+    ke_key
+)
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return DaLiuRenCalculatorV2()
+
+
+class TestKeIndex:
+    """课序号"""
+
+    def test_round_trip(self):
+        """序号与 (日干, 日支, 时支, 月将) 互转"""
+        assert [ke_index(*ke_key(i)) for i in range(KE_COUNT)] == list(range(KE_COUNT))
+        assert ke_key(0) == ("甲", "子", "子", "子")
+
+    def test_invalid_day_ganzhi(self):
+        """阴阳不配的干支无效"""
+        with pytest.raises(ValueError):
+            ke_index("甲", "丑", "子", "子")
+
+
+class TestKeTable:
+    """课表与参考实现一致"""
+
+    def test_shipped_table_matches_reference(self, calculator):
+        """随包发布的课表逐课（全部8640课）与参考实现一致"""
+        shipped = DaLiuRenKeTable.from_bytes(TABLE_PATH.read_bytes())
+        for index in range(KE_COUNT):
+            key = ke_key(index)
+            assert shipped.lookup(*key) == calculator._calculate_ke_reference(*key), key
+
+    def test_round_trip_bytes(self):
+        """序列化后可以还原"""
+        table = get_ke_table()
+        restored = DaLiuRenKeTable.from_bytes(table.to_bytes())
+        assert restored.lookup("丙", "午", "酉", "亥") == table.lookup("丙", "午", "酉", "亥")
+
+    def test_corrupt_or_outdated_table_rejected(self):
+        """格式错误或版本不符的课表抛出ValueError"""
+        data = TABLE_PATH.read_bytes()
+        with pytest.raises(ValueError):
+            DaLiuRenKeTable.from_bytes(b"XXXX" + data[4:])
+        with pytest.raises(ValueError):
+            DaLiuRenKeTable.from_bytes(data[:4] + b"\xff\xff" + data[6:])
+        with pytest.raises(ValueError):
+            DaLiuRenKeTable.from_bytes(data[:-1])
+
+    def test_lookup_returns_fresh_objects(self):
+        """每次取课返回新对象"""
+        table = get_ke_table()
+        first = table.lookup("甲", "子", "午", "亥")
+        first["四课"][0]["上"] = "改"
+        assert table.lookup("甲", "子", "午", "亥")["四课"][0]["上"] != "改"
+
+
+class TestCalculatorUsesTable:
+    """calculate_daliuren 查表结果与逐步起课一致"""
+
+    def test_every_hour_matches_reference(self, calculator):
+        """一天24个小时（含昼夜切换）的课与参考实现一致"""
+        for hour in range(24):
+            result = calculator.calculate_daliuren(2024, 3, 15, hour)
+            day_ganzhi = result["日干支"]
+            reference = calculator._calculate_ke_reference(
+                day_ganzhi[0], day_ganzhi[1], result["时支"], result["月将"]
+            )
+            for field in ("四课", "三传", "发用方法", "课体"):
+                assert result[field] == reference[field]
+            direct = calculator._configure_tian_jiang_complete(
+                reference["三传"], day_ganzhi[0], result["时支"], hour
+            )
+            assert result["天将"] == direct
@@ -96,5 +96,135 @@ class TestDecisionEngine:
         assert engine.config["analysis"]["max_theories"] == 5
 
 
+class TestConcurrentTheoryPipeline:
+    """理论并发流水线测试"""
+
+    def _make_engine(self, concurrent=True, max_concurrent=3):
+        return DecisionEngine({
+            "api": {"claude_api_key": "test_key"},
+            "analysis": {
+                "concurrent_theories": concurrent,
+                "max_concurrent_interpretations": max_concurrent
+            }
+        })
+
+    def _fake_theory(self, judgment="吉", error=None):
+        theory = Mock()
+        if error:
+            theory.calculate.side_effect = error
+        else:
+            theory.calculate.return_value = {"judgment": judgment, "confidence": 0.7}
+        return theory
+
+    @pytest.mark.asyncio
+    async def test_concurrent_results_in_completion_order(self):
+        """并发模式按完成顺序收集结果"""
+        import asyncio
+        engine = self._make_engine()
+        delays = {"八字": 0.15, "六爻": 0.01, "梅花易数": 0.05}
+
+        async def fake_interpretation(theory_name, calculation_data, user_input, on_verified=None):
+            await asyncio.sleep(delays[theory_name])
+            return f"{theory_name}解读"
+
+        with patch("core.decision_engine.TheoryRegistry.get_theory", side_effect=lambda n: self._fake_theory()), \
+                patch.object(engine, "_get_interpretation", side_effect=fake_interpretation):
+            results, failed = await engine._run_theory_analyses(
+                ["八字", "六爻", "梅花易数"],
+                UserInput(question_type="事业", question_description="测试")
+            )
+
+        assert [r.theory_name for r in results] == ["六爻", "梅花易数", "八字"]
+        assert failed == []
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_respected(self):
+        """解读并发数不超过配置上限"""
+        import asyncio
+        engine = self._make_engine(max_concurrent=2)
+        state = {"running": 0, "peak": 0}
+
+        async def fake_interpretation(theory_name, calculation_data, user_input, on_verified=None):
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            await asyncio.sleep(0.02)
+            state["running"] -= 1
+            return "解读"
+
+        with patch("core.decision_engine.TheoryRegistry.get_theory", side_effect=lambda n: self._fake_theory()), \
+                patch.object(engine, "_get_interpretation", side_effect=fake_interpretation):
+            results, _ = await engine._run_theory_analyses(
+                ["八字", "六爻", "梅花易数", "小六壬", "测字"],
+                UserInput(question_type="事业", question_description="测试")
+            )
+
+        assert len(results) == 5
+        assert state["peak"] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("concurrent", [True, False])
+    async def test_failed_theories_and_progress(self, concurrent):
+        """失败记录与进度回调在两种模式下一致"""
+        from core.exceptions import TheoryCalculationError
+        engine = self._make_engine(concurrent=concurrent)
+        theories = {
+            "八字": self._fake_theory(),
+            "六爻": self._fake_theory(error=TheoryCalculationError("六爻", "排盘失败")),
+        }
+        callback = Mock()
+
+        with patch("core.decision_engine.TheoryRegistry.get_theory", side_effect=theories.get), \
+                patch.object(engine, "_get_interpretation", AsyncMock(return_value="解读")):
+            results, failed = await engine._run_theory_analyses(
+                ["八字", "六爻"],
+                UserInput(question_type="事业", question_description="测试"),
+                callback
+            )
+
+        assert [r.theory_name for r in results] == ["八字"]
+        assert len(failed) == 1
+        assert failed[0]["theory"] == "六爻"
+        assert failed[0]["error_type"] == "calculation_error"
+        statuses = [c.args[1] for c in callback.call_args_list]
+        assert "分析完成" in statuses
+        assert "计算失败" in statuses
+
+
+class TestComprehensiveReportSections:
+    """综合报告章节并行生成测试"""
+
+    @pytest.mark.asyncio
+    async def test_sections_generated_with_fallbacks(self):
+        """各章节结果写入报告，失败章节使用降级方案"""
+        from models import ConflictInfo
+        engine = DecisionEngine({"api": {"claude_api_key": "test_key"}})
+        user_input = UserInput(question_type="事业", question_description="是否跳槽")
+        theory_results = [TheoryAnalysisResult(
+            theory_name="八字", calculation_data={}, interpretation="八字解读",
+            judgment="吉", judgment_level=0.7
+        )]
+
+        engine.api_manager.call_api = AsyncMock(return_value="综合报告正文")
+        engine.ai_assistant.generate_executive_summary = AsyncMock(return_value="摘要")
+        engine.ai_assistant.generate_actionable_advice = AsyncMock(side_effect=Exception("失败"))
+        engine.ai_assistant.generate_retrospective_analysis = AsyncMock(return_value="回顾")
+        engine.ai_assistant.generate_predictive_analysis = AsyncMock(return_value="预测")
+        engine.ai_assistant.generate_detailed_analysis = AsyncMock(return_value="详细解答")
+
+        report = await engine._generate_comprehensive_report(
+            user_input, [{"theory": "八字"}], theory_results,
+            ConflictInfo(has_conflict=False, conflicts=[])
+        )
+
+        assert report.executive_summary == "摘要"
+        assert report.detailed_analysis == "详细解答"
+        assert report.retrospective_analysis == "回顾"
+        assert report.predictive_analysis == "预测"
+        # 行动建议失败 -> 默认建议，且预测分析看到的是降级后的建议
+        assert len(report.comprehensive_advice) == 2
+        predictive_report = engine.ai_assistant.generate_predictive_analysis.call_args.kwargs["report"]
+        assert predictive_report.comprehensive_advice == report.comprehensive_advice
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
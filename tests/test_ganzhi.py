@@ -0,0 +1,95 @@
+"""
+干支整数编码核心测试
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from utils import ganzhi
+from utils.ganzhi import (
+    CHONG,
+    GAN_NAMES,
+    JIAZI_NAMES,
+    LIU_HAI,
+    LIU_HE,
+    SAN_HE_GROUP,
+    TEN_GOD,
+    TEN_GOD_NAMES,
+    ZHI_INDEX,
+    ZHI_NAMES
+)
+from theories.bazi.calculator import BaZiCalculator
+from theories.bazi.constants import HOUR_GAN_BASE, JIA_ZI_60, MONTH_GAN_BASE, SHI_SHEN
+
+
+def test_jiazi_names_match_sixty_jiazi_table():
+    assert list(JIAZI_NAMES) == JIA_ZI_60
+
+
+def test_ten_god_matrix_matches_shi_shen_table():
+    for me, row in SHI_SHEN.items():
+        for other, name in row.items():
+            assert TEN_GOD_NAMES[TEN_GOD[ganzhi.GAN_INDEX[me]][ganzhi.GAN_INDEX[other]]] == name
+
+
+def test_relation_tables():
+    pairs = lambda table: {frozenset((ZHI_NAMES[z], ZHI_NAMES[table[z]])) for z in range(12)}
+    assert pairs(LIU_HE) == {frozenset(p) for p in ("子丑", "寅亥", "卯戌", "辰酉", "巳申", "午未")}
+    assert pairs(CHONG) == {frozenset(p) for p in ("子午", "丑未", "寅申", "卯酉", "辰戌", "巳亥")}
+    assert pairs(LIU_HAI) == {frozenset(p) for p in ("子未", "丑午", "寅巳", "卯辰", "申亥", "酉戌")}
+
+    groups = {}
+    for z in range(12):
+        groups.setdefault(SAN_HE_GROUP[z], set()).add(ZHI_NAMES[z])
+    assert sorted("".join(sorted(g)) for g in groups.values()) == sorted(
+        "".join(sorted(g)) for g in ("申子辰", "巳酉丑", "寅午戌", "亥卯未")
+    )
+
+
+def test_jiazi_round_trip():
+    for index in range(60):
+        assert ganzhi.jiazi(*ganzhi.split_jiazi(index)) == index
+        assert ganzhi.parse_jiazi(ganzhi.jiazi_name(index)) == index
+
+
+def test_jiazi_rejects_mismatched_yin_yang():
+    with pytest.raises(ValueError):
+        ganzhi.jiazi(0, 1)  # 甲丑
+    with pytest.raises(ValueError):
+        ganzhi.parse_jiazi("甲丑")
+
+
+def test_day_and_year_jiazi():
+    assert ganzhi.jiazi_name(ganzhi.day_jiazi(date(2000, 1, 1))) == "庚辰"
+    assert ganzhi.day_jiazi(date(2000, 1, 1) + timedelta(days=60)) == ganzhi.day_jiazi(date(2000, 1, 1))
+    assert ganzhi.jiazi_name(ganzhi.year_jiazi(1984)) == "甲子"
+    assert ganzhi.jiazi_name(ganzhi.year_jiazi(2024)) == "甲辰"
+
+
+def test_hour_zhi():
+    assert [ZHI_NAMES[ganzhi.hour_zhi(h)] for h in (23, 0, 1, 11, 12, 22)] == ["子", "子", "丑", "午", "午", "亥"]
+
+
+def test_month_and_hour_gan_match_formula_tables():
+    for gan_index, gan in enumerate(GAN_NAMES):
+        assert GAN_NAMES[ganzhi.month_gan(gan_index, 0)] == MONTH_GAN_BASE[gan]
+        assert GAN_NAMES[ganzhi.hour_gan(gan_index, 0)] == HOUR_GAN_BASE[gan]
+    assert ZHI_NAMES[ganzhi.month_zhi(0)] == "寅"
+    assert ZHI_NAMES[ganzhi.month_zhi(11)] == "丑"
+
+
+def test_count_wuxing():
+    counts = ganzhi.count_wuxing([0, 2], [ZHI_INDEX["子"], ZHI_INDEX["辰"]])
+    assert counts == [1, 1, 1, 0, 1]
+
+
+def test_pillar_indices_match_full_bazi():
+    calculator = BaZiCalculator()
+    rng = random.Random(15)
+    for _ in range(50):
+        year, month, day = rng.randint(1901, 2099), rng.randint(1, 12), rng.randint(1, 28)
+        hour = rng.randint(0, 23)
+        indices = calculator.calculate_pillar_indices(year, month, day, hour)
+        result = calculator.calculate_full_bazi(year, month, day, hour)
+        assert [ganzhi.jiazi_name(i) for i in indices] == result["四柱"]
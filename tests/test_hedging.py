@@ -0,0 +1,104 @@
+"""
+对冲请求测试
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+
+@pytest.mark.api_manager_config(enable_hedging=True, hedge_default_delay=0.05)
+class TestAPIManagerHedging:
+    """APIManager 对冲请求测试"""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, api_manager, fake_api_call):
+        """主API及时返回时不发出对冲请求"""
+        manager = api_manager()
+        delays = {"claude": 0.0, "deepseek": 0.0}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays)) as mock_call:
+            result = await manager.call_api(task_type="快速交互问答", prompt="问题")
+
+        assert result == "claude回答"
+        assert mock_call.call_count == 1
+        hedging = manager.get_metrics()["hedging"]
+        assert hedging["requests"] == 1
+        assert hedging["hedged"] == 0
+        assert hedging["primary_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self, api_manager, fake_api_call):
+        """主API超时未返回时对冲，先返回者胜出，另一个被取消"""
+        manager = api_manager()
+        cancelled = []
+        delays = {"claude": 5.0, "deepseek": 0.0}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays, cancelled=cancelled)):
+            result = await manager.call_api(task_type="快速交互问答", prompt="问题")
+            await asyncio.sleep(0)
+
+        assert result == "deepseek回答"
+        assert cancelled == ["claude"]
+        hedging = manager.get_metrics()["hedging"]
+        assert hedging["hedged"] == 1
+        assert hedging["hedge_wins"] == 1
+        assert hedging["hedge_rate"] == 1.0
+        # 被取消的主API请求计入延迟样本
+        assert manager.provider_health.get("claude").p50("快速交互问答") is not None
+
+    @pytest.mark.asyncio
+    async def test_primary_can_still_win_after_hedge(self, api_manager, fake_api_call):
+        """对冲后主API先返回则主API胜出"""
+        manager = api_manager()
+        delays = {"claude": 0.08, "deepseek": 5.0}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays)):
+            result = await manager.call_api(task_type="快速交互问答", prompt="问题")
+
+        assert result == "claude回答"
+        hedging = manager.get_metrics()["hedging"]
+        assert hedging["hedged"] == 1
+        assert hedging["primary_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_other_task_types_not_hedged(self, api_manager, fake_api_call):
+        """非延迟敏感的任务类型不对冲"""
+        manager = api_manager()
+        delays = {"claude": 0.1, "deepseek": 0.0}
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_api_call(delays)) as mock_call:
+            result = await manager.call_api(task_type="综合报告解读", prompt="问题")
+
+        assert result == "claude回答"
+        assert mock_call.call_count == 1
+        assert manager.get_metrics()["hedging"]["requests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_delay_uses_latency_percentile(self, api_manager):
+        """对冲等待时间取主API最近延迟的百分位"""
+        manager = api_manager(hedge_percentile=90)
+        health = manager.provider_health.get("claude")
+        for latency in [1.0] * 8 + [4.0] * 2:
+            health.record_success(latency, "快速交互问答")
+
+        assert manager._get_hedge_delay("claude", "快速交互问答") == 4.0
+        assert manager._get_hedge_delay("deepseek", "快速交互问答") == 0.05
+
+    @pytest.mark.asyncio
+    async def test_both_fail_falls_back_to_failover(self, api_manager):
+        """两个请求都失败时降级到故障转移"""
+        manager = api_manager()
+        attempts = []
+
+        async def fake_call(api, prompt, **kwargs):
+            attempts.append(api)
+            if len(attempts) <= 2:
+                await asyncio.sleep(0.1 if api == "claude" else 0)
+                raise Exception("invalid response")
+            return f"{api}回答"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call):
+            result = await manager.call_api(task_type="快速交互问答", prompt="问题")
+
+        assert result == "claude回答"
+        assert attempts == ["claude", "deepseek", "claude"]
@@ -0,0 +1,101 @@
+"""
+卦象整数编码核心测试
+"""
+from collections import Counter
+
+import pytest
+
+from models import UserInput
+from theories.liuyao.theory import LiuYaoTheory
+from theories.meihua.theory import MeiHuaTheory
+from utils import hexagram
+from utils.ganzhi import JIAZI_NAMES
+
+
+def gua(name: str) -> int:
+    return hexagram.HEXAGRAM_INDEX[name]
+
+
+def test_trigram_encoding_and_xiantian_numbers():
+    assert hexagram.from_lines([1, 1, 1]) == hexagram.QIAN
+    assert hexagram.from_lines([1, 0, 0]) == hexagram.ZHEN  # 初爻为阳
+    assert hexagram.from_lines([0, 0, 1]) == hexagram.GEN
+    assert [hexagram.TRIGRAM_NAMES[hexagram.trigram_from_number(n)] for n in range(1, 10)] == \
+        ["乾", "兑", "离", "震", "巽", "坎", "艮", "坤", "乾"]
+
+
+def test_names_are_complete():
+    assert len(set(hexagram.HEXAGRAM_NAMES)) == 64
+    assert hexagram.name(hexagram.make(hexagram.QIAN, hexagram.KUN)) == "天地否"
+    assert hexagram.name(hexagram.make(hexagram.KAN, hexagram.LI)) == "水火既济"
+
+
+def test_derived_hexagrams():
+    assert hexagram.name(hexagram.mutual(gua("天地否"))) == "风山渐"
+    assert hexagram.name(hexagram.mutual(gua("水火既济"))) == "火水未济"
+    assert hexagram.name(hexagram.inverted(gua("水雷屯"))) == "山水蒙"
+    assert hexagram.name(hexagram.opposite(gua("水雷屯"))) == "火风鼎"
+    assert hexagram.name(hexagram.changed(gua("乾为天"), hexagram.line_mask([1]))) == "天风姤"
+
+    for h in range(64):
+        assert hexagram.inverted(hexagram.inverted(h)) == h
+        assert hexagram.opposite(hexagram.opposite(h)) == h
+
+
+@pytest.mark.parametrize("name,palace,generation,shi", [
+    ("乾为天", "乾", "本宫", 6),
+    ("天风姤", "乾", "一世", 1),
+    ("风地观", "乾", "四世", 4),
+    ("火地晋", "乾", "游魂", 4),
+    ("火天大有", "乾", "归魂", 3),
+    ("地天泰", "坤", "三世", 3),
+    ("泽风大过", "震", "游魂", 4),
+    ("雷泽归妹", "兑", "归魂", 3),
+])
+def test_palaces_and_shi_ying(name, palace, generation, shi):
+    h = gua(name)
+    assert hexagram.TRIGRAM_NAMES[hexagram.PALACE[h]] == palace
+    assert hexagram.GENERATION_NAMES[hexagram.GENERATION[h]] == generation
+    assert hexagram.SHI[h] == shi
+    assert abs(hexagram.SHI[h] - hexagram.YING[h]) == 3
+
+
+def test_each_palace_has_eight_hexagrams():
+    assert Counter(hexagram.PALACE) == {trigram: 8 for trigram in range(8)}
+
+
+def test_na_jia_and_liu_qin():
+    h = gua("天风姤")
+    assert [JIAZI_NAMES[i] for i in hexagram.NA_JIA[h]] == ["辛丑", "辛亥", "辛酉", "壬午", "壬申", "壬戌"]
+    assert [hexagram.LIU_QIN_NAMES[i] for i in hexagram.LIU_QIN[h]] == \
+        ["父母", "子孙", "兄弟", "官鬼", "兄弟", "父母"]
+
+
+def test_liuyao_uses_hexagram_tables():
+    # 6 6 6 6 6 1：初爻至五爻静阳，上爻动阳 -> 乾为天，变泽天夬
+    result = LiuYaoTheory().calculate(
+        UserInput(question_type="事业", question_description="测试", numbers=[6, 6, 6, 6, 6, 1])
+    )
+    assert result["本卦"]["名称"] == "乾为天"
+    assert result["变卦"]["名称"] == "泽天夬"
+    assert (result["世爻"], result["应爻"]) == (6, 3)
+    assert [yao["纳甲"] for yao in result["六爻详情"]] == ["甲子", "甲寅", "甲辰", "壬午", "壬申", "壬戌"]
+    assert result["六爻详情"][0]["六亲"] == "子孙"
+
+
+def test_meihua_mutual_and_changed_hexagrams():
+    # 上卦乾(1)、下卦坤(8)、动爻4 -> 天地否，互风山渐，变风地观
+    result = MeiHuaTheory().calculate(
+        UserInput(question_type="事业", question_description="测试", numbers=[1, 8, 4])
+    )
+    assert result["本卦"]["名称"] == "天地否"
+    assert result["互卦"]["名称"] == "风山渐"
+    assert result["变卦"]["名称"] == "风地观"
+    assert result["动爻"] == 4
+
+    # 动爻数按6取余
+    result = MeiHuaTheory().calculate(
+        UserInput(question_type="事业", question_description="测试", numbers=[1, 8, 10])
+    )
+    assert result["起卦数字"] == [1, 8, 10]
+    assert result["动爻"] == 4
@@ -0,0 +1,133 @@
+"""
+本地规则解析器测试
+"""
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from core.flow_guard import FlowGuard, InputStatus
+from services.conversation.nlp_parser import NLPParser
+from utils.input_parser import LocalInputParser, chinese_to_int
+
+
+@pytest.fixture
+def parser():
+    return LocalInputParser()
+
+
+def test_chinese_numbers():
+    assert [chinese_to_int(t) for t in ["十五", "廿三", "三十", "初八", "一九九〇", "15"]] == [15, 23, 30, 8, 1990, 15]
+    assert chinese_to_int("甲") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1990年5月15日下午3点半，男", dict(year=1990, month=5, day=15, hour=15, minute=30,
+                                     time_certainty="certain", gender="male")),
+    ("1985-12-07 15:30 女 intj", dict(year=1985, month=12, day=7, hour=15, minute=30,
+                                     gender="female", mbti="INTJ")),
+    ("农历一九九〇年八月十五 子时 女", dict(year=1990, month=8, day=15, hour=0,
+                                         calendar_type="lunar", time_certainty="certain")),
+    ("90年正月初三，早上大概8点多，男", dict(year=1990, month=1, day=3, hour=8,
+                                          calendar_type="lunar", time_certainty="uncertain")),
+    ("19900515 晚上12点 男生", dict(year=1990, month=5, day=15, hour=0)),
+    ("我是1990年5月15日出生的，男，时辰不太记得了", dict(hour=None, time_certainty="unknown")),
+    ("1992年3月8日，女，出生在上午", dict(hour=10, time_certainty="uncertain")),
+])
+def test_birth_info_confident(parser, text, expected):
+    result = parser.parse_birth_info(text)
+    assert parser.is_confident(result)
+    assert {key: result.data[key] for key in expected} == expected
+
+
+@pytest.mark.parametrize("text", [
+    "我1990年5月15日出生",            # 缺性别
+    "2000/2/30 男",                   # 日期不存在
+    "我男朋友1990年5月15日生",        # "男朋友"不是本人性别
+    "1990年5月15日或者1991年6月1日，男",  # 两个日期
+    "农历1990年8月15日，阳历生日记不清，男",  # 历法矛盾
+    "大概九十年代出生",
+])
+def test_birth_info_defers_to_llm(parser, text):
+    assert not parser.is_confident(parser.parse_birth_info(text))
+
+
+@pytest.mark.parametrize("text", [
+    "1990年5月15日下午3点到5点之间，男",
+    "1990年5月15日，3点至5点，女",
+    "1990年5月15日子时到丑时，男",
+    "1990年5月15日下午三点～五点，女",
+])
+def test_birth_time_range_is_uncertain(parser, text):
+    result = parser.parse_birth_info(text)
+    assert result.data["time_certainty"] == "uncertain"
+    assert not parser.is_confident(result)
+
+
+def test_icebreak(parser):
+    result = parser.parse_icebreak("想问感情 七三五")
+    assert parser.is_confident(result)
+    assert result.data == {"category": "感情", "description": "想问感情", "numbers": [7, 3, 5]}
+
+    # 连写数字、多个类别、数字不足都交给AI
+    for text in ["事业，357", "工作和感情，3、5、7", "随便 1 2"]:
+        assert not parser.is_confident(parser.parse_icebreak(text))
+
+
+def test_character(parser):
+    assert parser.parse_character("测'变'字").data["character"] == "变"
+    assert parser.parse_character("想到的字是望").confidence >= 0.8
+    assert parser.parse_character("升官发财，望").confidence < 0.8
+
+
+def test_stats(parser):
+    parser.record("出生信息", True)
+    parser.record("出生信息", True)
+    parser.record("出生信息", False)
+    stats = parser.get_stats()["出生信息"]
+    assert (stats["local_hits"], stats["llm_fallbacks"]) == (2, 1)
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    parser.reset_stats()
+    assert parser.get_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_nlp_parser_skips_llm_when_confident():
+    api_manager = Mock()
+    api_manager.call_api = AsyncMock(return_value='{"category": "事业", "description": "x", "numbers": [1, 2, 3]}')
+    nlp = NLPParser(api_manager)
+
+    birth_info = await nlp.parse_birth_info("1990年5月15日下午3点，男")
+    assert birth_info["hour"] == 15
+    assert (await nlp.parse_icebreak_input("事业，3 5 7"))["numbers"] == [3, 5, 7]
+    api_manager.call_api.assert_not_called()
+
+    assert (await nlp.parse_icebreak_input("事业，357"))["numbers"] == [1, 2, 3]
+    api_manager.call_api.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_flow_guard_skips_llm_when_confident():
+    api_manager = Mock()
+    api_manager.call_api = AsyncMock(return_value="{}")
+    guard = FlowGuard(api_manager)
+
+    result = await guard.validate_input_with_ai("1990年5月15日下午3点，男，喜欢蓝色", "STAGE3_COLLECT")
+    assert result.status == InputStatus.VALID
+    assert result.extracted_data["birth_hour"] == 15
+    assert result.extracted_data["favorite_color"] == "蓝"
+    api_manager.call_api.assert_not_called()
+
+    await guard.validate_input_with_ai("大概是九零年代吧", "STAGE3_COLLECT")
+    api_manager.call_api.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text, category", [
+    ("想问股票 3 5 7", "财运"),
+    ("考研能上岸吗 2 4 6", "学业"),
+    ("最近想去医院体检 1 2 3", "健康"),
+])
+async def test_flow_guard_low_confidence_icebreak_uses_code_validators(text, category):
+    guard = FlowGuard(None)
+
+    result = await guard.validate_input_with_ai(text, "STAGE1_ICEBREAK")
+    assert result.extracted_data["question_category"] == category
@@ -0,0 +1,82 @@
+"""
+关键词多模式匹配器测试
+"""
+import random
+
+import pytest
+
+from core.flow_guard import FlowGuard
+from core.timeline_analyzer import TimelineAnalyzer, TimeSpan
+from services.conversation.qa_handler import QAHandler
+from utils.keyword_matcher import KeywordMatcher
+from utils.question_classifier import QuestionClassifier
+
+
+class AutomatonMatcher(KeywordMatcher):
+    """关键词再少也走自动机扫描"""
+    AUTOMATON_MIN_KEYWORDS = 0
+
+
+@pytest.fixture(params=[KeywordMatcher, AutomatonMatcher], ids=["auto", "automaton"])
+def matcher_cls(request):
+    return request.param
+
+
+def test_overlapping_and_repeated_hits(matcher_cls):
+    matcher = matcher_cls([("he", "a", 1), ("she", "b", 1), ("his", "c", 1), ("hers", "d", 1)])
+    hits = [(m.keyword, m.start) for m in matcher.find_all("ushers she")]
+    assert hits == [("she", 1), ("he", 2), ("hers", 2), ("she", 7), ("he", 8)]
+    # 每个关键词只计一次，按加入顺序排列，位置取首次出现
+    assert [(m.keyword, m.start) for m in matcher.matched_keywords("ushers she")] == [
+        ("he", 2), ("she", 1), ("hers", 2)
+    ]
+
+
+def test_scores_labels_and_priority(matcher_cls):
+    matcher = matcher_cls.from_groups({"事业": ["工作", "跳槽"], "财运": ["投资", "工作"]})
+    assert matcher.scores("想跳槽去做投资工作，工作") == {"事业": 4, "财运": 4}
+    assert matcher.labels("找工作") == {"事业", "财运"}
+    assert matcher.first_label("找工作", ["财运", "事业"]) == "财运"
+    assert matcher.first_label("找工作", ["其他"]) is None
+    assert not matcher.contains_any("今天天气不错")
+    assert matcher.scores("") == {}
+
+
+def test_ignore_case_and_longest(matcher_cls):
+    matcher = matcher_cls.from_groups({"MBTI": ["INTJ"], "颜色": ["红", "粉红色"]}, ignore_case=True)
+    assert matcher.labels("我是intj") == {"MBTI"}
+    assert matcher.longest("喜欢粉红色").keyword == "粉红色"
+    assert matcher.longest("没有") is None
+
+
+def test_matches_substring_semantics(matcher_cls):
+    """与逐词 `kw in text` 的结果一致"""
+    rng = random.Random(0)
+    keywords = ["".join(rng.choice("甲乙丙丁") for _ in range(rng.randint(1, 4))) for _ in range(120)]
+    matcher = matcher_cls((keyword, i % 5, 1) for i, keyword in enumerate(keywords))
+    for _ in range(200):
+        text = "".join(rng.choice("甲乙丙丁戊") for _ in range(rng.randint(0, 30)))
+        expected = [i for i, keyword in enumerate(keywords) if keyword and keyword in text]
+        assert [m.order for m in matcher.matched_keywords(text)] == expected
+        assert matcher.contains_any(text) == bool(expected)
+        first = next((label for label in range(5) if any(i % 5 == label for i in expected)), None)
+        assert matcher.first_label(text, range(5)) == first
+
+
+def test_ported_classifiers():
+    assert QuestionClassifier.classify("最近想跳槽换工作") == "事业"
+    assert QuestionClassifier.classify("") == "综合运势"
+    assert QuestionClassifier.classify_with_confidence("今天天气不错") == ("综合运势", 0.0)
+
+    qa = QAHandler(None, None)
+    assert qa.identify_question_type("我的八字和他合不合") == "bazi_details"
+    assert qa.identify_question_type("你好") == "general"
+
+    assert TimelineAnalyzer().analyze_question_timespan("今年的运势和这辈子的事业") == TimeSpan.LIFE_LONG
+
+    guard = FlowGuard()
+    assert guard.validate_color("我喜欢粉红色") == "粉"
+    assert guard.validate_direction("面向东南") == "东南"
+    assert guard.validate_direction("朝南方") == "南"
+    assert guard.validate_category("想问问感情") == "感情"
+    assert guard.detect_modification_intent("刚才写错了") is True
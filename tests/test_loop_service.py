@@ -0,0 +1,100 @@
+"""
+后台事件循环服务测试
+"""
+import asyncio
+import concurrent.futures
+import threading
+
+import pytest
+
+from theories.cezi.ai_validator import CeZiAIValidator
+from utils.loop_service import EventLoopService, get_loop_service, shutdown_loop_service
+
+
+@pytest.fixture
+def service():
+    service = EventLoopService(name="test-loop")
+    yield service
+    service.shutdown()
+
+
+def test_submissions_share_one_loop(service):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = service.submit(current_loop()).result(timeout=5)
+    second = service.run(current_loop(), timeout=5)
+    assert first is second is service.loop
+    assert service.is_running() and not service.in_loop_thread()
+
+
+def test_exceptions_propagate(service):
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        service.run(fail())
+
+
+def test_run_inside_loop_thread_raises(service):
+    async def nested():
+        coro = asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            service.run(coro)
+        return service.in_loop_thread()
+
+    assert service.run(nested(), timeout=5) is True
+
+
+def test_timeout_cancels_coroutine(service):
+    cancelled = threading.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        service.run(slow(), timeout=0.05)
+    assert cancelled.wait(timeout=5)
+
+
+def test_shutdown_runs_cleanup_and_restarts(service):
+    cleaned = []
+
+    async def cleanup():
+        cleaned.append(asyncio.get_running_loop())
+
+    first_loop = service.loop
+    pending = service.submit(asyncio.sleep(10))
+    service.shutdown(cleanup)
+
+    assert cleaned == [first_loop]
+    assert pending.cancelled()
+    assert not service.is_running()
+
+    # 再次使用时重新启动
+    assert service.run(asyncio.sleep(0, result=1), timeout=5) == 1
+    assert service.loop is not first_loop
+
+
+def test_cezi_validation_offloaded_from_shared_loop():
+    """问道流程在共享事件循环上经 run_in_executor 调用测字，AI验证照常执行"""
+    validator = CeZiAIValidator(api_manager=object())
+
+    async def fake_validate(character, stroke_count, structure):
+        return {"validation_success": True, "final_stroke_count": stroke_count}
+
+    validator.validate_character_async = fake_validate
+
+    async def stage2():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, validator.validate_character, "变", 8, "上下结构")
+
+    try:
+        result = get_loop_service().run(stage2(), timeout=10)
+    finally:
+        shutdown_loop_service()
+    assert result == {"validation_success": True, "final_stroke_count": 8}
@@ -0,0 +1,139 @@
+"""
+农历日表测试
+"""
+import random
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from utils.lunar_calendar import LunarCalendar
+from utils.lunar_table import (
+    TABLE_END_DATE,
+    TABLE_PATH,
+    TABLE_START_DATE,
+    LunarDayTable,
+    ganzhi_index,
+    ganzhi_name,
+    get_lunar_table,
+    lookup_lunar_day
+)
+
+
+class TestGanZhiIndex:
+    """干支序号换算"""
+
+    def test_round_trip(self):
+        """60个干支序号与名称互转"""
+        names = [ganzhi_name(i) for i in range(60)]
+        assert names[0] == "甲子" and names[59] == "癸亥"
+        assert len(set(names)) == 60
+        assert [ganzhi_index(name) for name in names] == list(range(60))
+
+
+class TestLunarDayTable:
+    """农历日表测试"""
+
+    def test_shipped_table_range(self):
+        """随包发布的表覆盖完整范围"""
+        table = get_lunar_table()
+        assert table.start_date == TABLE_START_DATE
+        assert table.end_date == TABLE_END_DATE
+        assert table.day_count == (TABLE_END_DATE - TABLE_START_DATE).days + 1
+
+    def test_known_dates(self):
+        """已知日期查表"""
+        spring = lookup_lunar_day(date(2024, 2, 10))
+        assert (spring.year, spring.month, spring.day, spring.is_leap_month) == (2024, 1, 1, False)
+        assert ganzhi_name(spring.year_gan_zhi) == "甲辰"
+        assert ganzhi_name(spring.month_gan_zhi) == "丙寅"
+
+        leap = lookup_lunar_day(datetime(2023, 3, 22, 15))
+        assert (leap.year, leap.month, leap.day, leap.is_leap_month) == (2023, 2, 1, True)
+
+    def test_month_index(self):
+        """农历月索引含闰月，月长为29或30天"""
+        months = get_lunar_table().months(2023)
+        assert [(m.month, m.is_leap_month) for m in months][:4] == [(1, False), (2, False), (2, True), (3, False)]
+        assert len(months) == 13
+        assert all(m.length in (29, 30) for m in months)
+
+    def test_to_solar_rejects_missing_day(self):
+        """不存在的农历日期抛出ValueError"""
+        table = get_lunar_table()
+        with pytest.raises(ValueError):
+            table.to_solar(2024, 2, 1, is_leap_month=True)
+        with pytest.raises(ValueError):
+            table.to_solar(2024, 1, 31)
+
+    def test_out_of_range(self):
+        """表范围之外抛出ValueError"""
+        with pytest.raises(ValueError):
+            lookup_lunar_day(TABLE_END_DATE + timedelta(days=1))
+
+    def test_corrupt_table_rejected(self):
+        """格式错误的表抛出ValueError"""
+        with pytest.raises(ValueError):
+            LunarDayTable(b"XXXX" + bytes(20))
+        with pytest.raises(ValueError):
+            LunarDayTable(TABLE_PATH.read_bytes()[:-1])
+
+    def test_build_matches_shipped_slice(self):
+        """用 cnlunar 现算的表与随包发布的表逐条一致"""
+        pytest.importorskip("cnlunar")
+        start = date(2023, 1, 1)
+        built = LunarDayTable.build(start, date(2023, 12, 31))
+        offset = (start - TABLE_START_DATE).days
+        shipped = get_lunar_table()
+        assert all(built.record(i) == shipped.record(offset + i) for i in range(built.day_count))
+
+
+class TestLunarCalendarUsesTable:
+    """LunarCalendar 查表结果"""
+
+    def test_no_cnlunar_import_at_runtime(self):
+        """运行时不导入 cnlunar"""
+        code = (
+            "import sys; from datetime import datetime; from utils.lunar_calendar import LunarCalendar; "
+            "LunarCalendar.solar_to_lunar(datetime(2024, 1, 1)); "
+            "LunarCalendar.lunar_to_solar(2024, 1, 1); "
+            "print('cnlunar' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=TABLE_PATH.parents[2], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_day_pillar_switches_at_23(self):
+        """23点起日柱换到次日"""
+        evening = LunarCalendar.solar_to_lunar(datetime(2024, 2, 4, 23))
+        morning = LunarCalendar.solar_to_lunar(datetime(2024, 2, 5, 1))
+        assert evening["day_gan_zhi"] == morning["day_gan_zhi"] == "己亥"
+        assert evening["day"] == LunarCalendar.solar_to_lunar(datetime(2024, 2, 4))["day"]
+
+    def test_matches_cnlunar(self):
+        """随机抽样与 cnlunar 结果一致"""
+        cnlunar = pytest.importorskip("cnlunar")
+        rng = random.Random(20240210)
+        span = (TABLE_END_DATE - TABLE_START_DATE).days
+        for _ in range(300):
+            solar = datetime(1900, 1, 31) + timedelta(days=rng.randrange(span + 1), hours=rng.choice([0, 12, 23]))
+            lunar = cnlunar.Lunar(solar, godType='8char')
+            info = LunarCalendar.solar_to_lunar(solar)
+            assert (info["year"], info["month"], info["day"], info["is_leap_month"]) == (
+                lunar.lunarYear, lunar.lunarMonth, lunar.lunarDay, lunar.isLunarLeapMonth
+            )
+            assert (info["year_gan_zhi"], info["month_gan_zhi"], info["day_gan_zhi"], info["zodiac"]) == (
+                lunar.year8Char, lunar.month8Char, lunar.day8Char, lunar.chineseYearZodiac
+            )
+
+    def test_lunar_to_solar_round_trip(self):
+        """农历转阳历与阳历转农历互逆"""
+        day = datetime(1901, 2, 19)
+        while day < datetime(2100, 1, 1):
+            info = LunarCalendar.solar_to_lunar(day)
+            assert LunarCalendar.lunar_to_solar(
+                info["year"], info["month"], info["day"], info["is_leap_month"]
+            ) == day
+            day += timedelta(days=97)
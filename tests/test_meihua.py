@@ -152,13 +152,6 @@ class TestMeiHuaTheory:
         assert result1["体卦"] == result2["体卦"]
         assert result1["用卦"] == result2["用卦"]
 
-    def test_number_to_gua_conversion(self):
-        """测试数字转卦"""
-        # 测试1-8的数字都能正确转换为八卦
-        for num in range(1, 9):
-            gua = self.theory._number_to_gua(num)
-            assert gua in ["乾", "兑", "离", "震", "巽", "坎", "艮", "坤"]
-
     def test_number_modulo(self):
         """测试数字取模"""
         # 测试大于8的数字会正确取模
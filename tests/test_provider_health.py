@@ -0,0 +1,201 @@
+"""
+提供商健康度与熔断器测试
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from api.provider_health import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CircuitOpenError,
+    CircuitState,
+    ProviderHealth
+)
+
+
+def _expire_cooldown(health: ProviderHealth):
+    """让熔断器冷却时间立即结束"""
+    health._open_until = 0.0
+
+
+class TestProviderHealth:
+    """单个提供商健康状态测试"""
+
+    def test_latency_stats(self):
+        """EWMA与按任务类型的p50"""
+        health = ProviderHealth("claude")
+        for latency in (1.0, 2.0, 3.0):
+            health.record_success(latency, task_type="单理论解读")
+        health.record_success(10.0, task_type="综合报告解读")
+
+        assert health.p50("单理论解读") == 2.0
+        assert health.p50("综合报告解读") == 10.0
+        assert health.p50("未知任务") == 2.5  # 无样本时使用全部样本
+        assert health.latency_ewma is not None
+        assert health.latency_percentile(100) == 10.0
+
+    def test_consecutive_failures_open_circuit(self):
+        """连续失败达到阈值后熔断"""
+        health = ProviderHealth("claude")
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+            health.record_failure()
+        assert health.state == CircuitState.CLOSED
+
+        health.record_failure()
+        assert health.state == CircuitState.OPEN
+        assert not health.is_available()
+        assert not health.allow_request()
+        assert health.retry_in() > 0
+
+    def test_half_open_single_probe(self):
+        """冷却结束后只放行一个探测请求"""
+        health = ProviderHealth("claude")
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            health.record_failure()
+        _expire_cooldown(health)
+
+        assert health.is_available()
+        assert health.allow_request()
+        assert health.state == CircuitState.HALF_OPEN
+        assert not health.allow_request()
+
+        health.record_success(0.5)
+        assert health.state == CircuitState.CLOSED
+        assert health.allow_request()
+
+    def test_failed_probe_reopens_with_longer_cooldown(self):
+        """探测失败后以更长冷却时间重新熔断"""
+        health = ProviderHealth("claude")
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            health.record_failure()
+        first_cooldown = health._open_seconds
+        _expire_cooldown(health)
+
+        assert health.allow_request()
+        health.record_failure()
+
+        assert health.state == CircuitState.OPEN
+        assert health._open_seconds == first_cooldown * 2
+
+    def test_release_probe(self):
+        """探测被取消时归还探测名额"""
+        health = ProviderHealth("claude")
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            health.record_failure()
+        _expire_cooldown(health)
+
+        assert health.allow_request()
+        health.release_probe()
+        assert health.allow_request()
+
+
+@pytest.mark.api_manager_config(kimi_api_key="test_kimi_key", max_retries=3)
+class TestAPIManagerHealthRouting:
+    """APIManager 健康度路由测试"""
+
+    def _open_circuit(self, manager, api):
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            manager.provider_health.get(api).record_failure()
+
+    def test_get_api_for_task_skips_open_circuit(self, api_manager):
+        """主API熔断时选择下一个健康的API"""
+        manager = api_manager()
+        assert manager.get_api_for_task("快速交互问答") == "claude"
+
+        self._open_circuit(manager, "claude")
+        assert manager.get_api_for_task("快速交互问答") == "deepseek"
+
+    def test_all_open_falls_back_to_default_order(self, api_manager):
+        """全部熔断时仍返回默认选择"""
+        manager = api_manager()
+        for api in manager.available_apis:
+            self._open_circuit(manager, api)
+        assert manager.get_api_for_task("单理论解读") == "claude"
+
+    def test_prefer_fastest_provider(self, api_manager):
+        """启用后选择该任务类型p50最低的提供商"""
+        manager = api_manager(prefer_fastest_provider=True)
+        manager.provider_health.get("claude").record_success(5.0, "快速交互问答")
+        manager.provider_health.get("kimi").record_success(1.0, "快速交互问答")
+        manager.provider_health.get("deepseek").record_success(0.5, "单理论解读")
+
+        assert manager.get_api_for_task("快速交互问答") == "kimi"
+        assert manager.get_api_for_task("单理论解读") == "deepseek"
+
+        # 未启用时保持默认顺序
+        manager.prefer_fastest_provider = False
+        assert manager.get_api_for_task("快速交互问答") == "claude"
+
+    def test_open_circuit_moves_to_end_of_failover_order(self, api_manager):
+        """熔断中的提供商排在故障转移顺序最后"""
+        manager = api_manager()
+        self._open_circuit(manager, "deepseek")
+        assert manager._get_apis_by_priority("claude") == ["claude", "kimi", "deepseek"]
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_rejects_without_network_call(self, api_manager):
+        """熔断中的提供商不发出请求"""
+        manager = api_manager()
+        self._open_circuit(manager, "claude")
+
+        with patch.object(manager, '_call_api_by_name') as mock_call:
+            with pytest.raises(CircuitOpenError):
+                await manager._call_api_limited("claude", "问题")
+        mock_call.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_dead_primary_stops_retrying_once_circuit_opens(self, api_manager):
+        """主API持续失败时熔断，之后的请求不再重试它"""
+        manager = api_manager()
+        calls = []
+
+        async def fake_call(api, prompt, **kwargs):
+            calls.append(api)
+            if api == "claude":
+                raise Exception("503 service unavailable")
+            return "备用回答"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call), \
+                patch("api.manager.asyncio.sleep", return_value=None):
+            for i in range(4):
+                assert await manager.call_api(task_type="单理论解读", prompt=f"问题{i}") == "备用回答"
+
+        # 前两次请求各重试claude 3次后熔断，之后直接使用deepseek
+        assert calls.count("claude") == CIRCUIT_FAILURE_THRESHOLD
+        assert manager.get_metrics()["provider_health"]["claude"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_does_not_trip_breaker(self, api_manager):
+        """429只触发限流暂停，不计入熔断失败"""
+        manager = api_manager(max_retries=1)
+
+        async def fake_call(api, prompt, **kwargs):
+            if api == "claude":
+                raise Exception("Error code: 429 - rate limit")
+            return "回答"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call):
+            for i in range(CIRCUIT_FAILURE_THRESHOLD + 1):
+                await manager.call_api(task_type="单理论解读", prompt=f"问题{i}")
+                manager.rate_limiters.get("claude")._cooldown_until = 0.0
+
+        assert manager.provider_health.get("claude").state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self, api_manager):
+        """探测请求被取消时归还探测名额"""
+        manager = api_manager()
+        self._open_circuit(manager, "claude")
+        _expire_cooldown(manager.provider_health.get("claude"))
+
+        async def slow_call(api, prompt, **kwargs):
+            await asyncio.sleep(10)
+
+        with patch.object(manager, '_call_api_by_name', side_effect=slow_call):
+            task = asyncio.create_task(manager._call_api_limited("claude", "问题"))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert manager.provider_health.get("claude").allow_request()
@@ -0,0 +1,73 @@
+"""
+奇门排盘表测试
+"""
+from datetime import datetime, timedelta
+
+from theories.qimen.calculator_v2 import QiMenCalculatorV2
+from theories.qimen.chart_table import (
+    CHART_TABLE_VERSION,
+    QiMenChartTable,
+    copy_chart,
+    get_chart_table,
+    iter_chart_keys
+)
+
+
+class TestQiMenChartTable:
+    """排盘表测试"""
+
+    def test_build_all_covers_every_combination(self):
+        """全部组合为 2 遁 × 9 局 × 60 时干支"""
+        table = QiMenChartTable(QiMenCalculatorV2()._build_chart)
+        assert table.version == CHART_TABLE_VERSION
+        assert table.build_all() == 1080
+        assert len(list(iter_chart_keys())) == 1080
+
+    def test_chart_built_once(self):
+        """同一组合只排一次盘"""
+        calls = []
+        calculator = QiMenCalculatorV2()
+
+        def builder(*key):
+            calls.append(key)
+            return calculator._build_chart(*key)
+
+        table = QiMenChartTable(builder)
+        first = table.get("阳遁", 3, "甲子")
+        assert table.get("阳遁", 3, "甲子") is first
+        assert calls == [("阳遁", 3, "甲", "子")]
+
+    def test_copy_is_independent(self):
+        """修改副本不影响表内盘面"""
+        chart = get_chart_table().get("阴遁", 9, "癸亥")
+        copied = copy_chart(chart)
+        copied["九宫"][0]["宫位"] = "改"
+        copied["格局"].append({"格局": "测试"})
+        assert chart["九宫"][0]["宫位"] != "改"
+        assert {"格局": "测试"} not in chart["格局"]
+
+
+class TestCalculateQimenUsesTable:
+    """calculate_qimen 查表结果与逐步排盘一致"""
+
+    def test_matches_direct_arrangement(self):
+        """多个时段的盘面与直接排盘一致"""
+        calculator = QiMenCalculatorV2()
+        start = datetime(2024, 1, 1, 0, 30)
+        for step in range(0, 24 * 40, 7):
+            result = calculator.calculate_qimen(start + timedelta(hours=step), use_true_solar_time=False)
+            hour_ganzhi = result["时干支"]
+            expected = calculator._build_chart(result["阴阳遁"], result["局数"], hour_ganzhi[0], hour_ganzhi[1])
+            for field, value in expected.items():
+                assert result[field] == value
+
+    def test_results_do_not_share_state(self):
+        """同一盘面的两次结果互不影响"""
+        calculator = QiMenCalculatorV2()
+        moment = datetime(2024, 6, 1, 10)
+        first = calculator.calculate_qimen(moment, event_category="事业", use_true_solar_time=False)
+        first["九宫"][5]["九星_天盘"] = "已修改"
+        first["用神宫位"]["方位"] = "已修改"
+        second = calculator.calculate_qimen(moment, event_category="事业", use_true_solar_time=False)
+        assert second["九宫"][5]["九星_天盘"] != "已修改"
+        assert second["用神宫位"]["方位"] != "已修改"
@@ -0,0 +1,245 @@
+"""
+提供商限流器测试
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock, patch, AsyncMock
+
+from api.rate_limiter import (
+    ProviderLimiter,
+    RateLimitConfig,
+    RateLimiterRegistry,
+    TokenBucket,
+    estimate_tokens,
+    extract_retry_after,
+    is_rate_limit_error
+)
+from api.task_router import TaskRouter
+from core.exceptions import APIRateLimitError
+
+
+class TestRateLimitHelpers:
+    """辅助函数测试"""
+
+    def test_estimate_tokens(self):
+        """中文按字计，英文约4字符一个token"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens(None) == 0
+        assert estimate_tokens("八字命理") == 4
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("八字abcd") == 3
+
+    def test_extract_retry_after_from_exception_attr(self):
+        """APIRateLimitError.retry_after"""
+        assert extract_retry_after(APIRateLimitError("claude", retry_after=7)) == 7.0
+
+    def test_extract_retry_after_from_headers(self):
+        """SDK异常携带的响应头"""
+        error = Exception("429")
+        error.response = Mock(headers={"retry-after": "3"})
+        assert extract_retry_after(error) == 3.0
+
+        error.response = Mock(headers={"retry-after-ms": "1500"})
+        assert extract_retry_after(error) == 1.5
+
+    def test_extract_retry_after_missing(self):
+        """没有相关信息时返回None"""
+        assert extract_retry_after(Exception("boom")) is None
+
+    def test_is_rate_limit_error(self):
+        """429识别"""
+        assert is_rate_limit_error(APIRateLimitError("claude"))
+        assert is_rate_limit_error(Exception("Error code: 429 - Too Many Requests"))
+        assert not is_rate_limit_error(Exception("invalid api key"))
+
+
+class TestTokenBucket:
+    """令牌桶测试"""
+
+    def test_reserve_within_capacity(self):
+        """容量内不等待"""
+        bucket = TokenBucket(60)
+        assert bucket.reserve(60) == 0.0
+
+    def test_reserve_over_capacity_returns_wait(self):
+        """透支时返回等待时间（60 RPM = 每秒1个）"""
+        bucket = TokenBucket(60)
+        bucket.reserve(60)
+        assert bucket.reserve(2) == pytest.approx(2.0, abs=0.05)
+
+
+class TestProviderLimiter:
+    """单个提供商限流器测试"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """并发数不超过配置"""
+        limiter = ProviderLimiter("claude", RateLimitConfig(max_concurrent=2))
+        active = 0
+        peak = 0
+
+        async def request():
+            nonlocal active, peak
+            await limiter.acquire()
+            try:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+            finally:
+                limiter.release()
+
+        await asyncio.gather(*[request() for _ in range(6)])
+
+        assert peak == 2
+        stats = limiter.get_stats()
+        assert stats["requests"] == 6
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_sets_cooldown_and_halves_rpm(self):
+        """被限流后暂停并降低RPM，成功后逐步恢复"""
+        limiter = ProviderLimiter("deepseek", RateLimitConfig(rpm=100))
+
+        limiter.record_rate_limited(retry_after=5)
+        assert limiter.cooldown_remaining() == pytest.approx(5, abs=0.1)
+        assert limiter.effective_rpm == 50
+
+        limiter.record_success()
+        assert limiter.effective_rpm == 60
+        assert limiter.get_stats()["rate_limited"] == 1
+
+    def test_backoff_without_retry_after_grows(self):
+        """没有Retry-After时按指数退避"""
+        limiter = ProviderLimiter("kimi")
+        limiter.record_rate_limited()
+        first = limiter.cooldown_remaining()
+        limiter.record_rate_limited()
+        assert limiter.cooldown_remaining() > first
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_cooldown(self):
+        """暂停期间获取许可需要等待"""
+        limiter = ProviderLimiter("claude")
+        limiter.record_rate_limited(retry_after=0.05)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await limiter.acquire()
+        limiter.release()
+
+        assert loop.time() - start >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_cancelled_acquire_returns_slot(self):
+        """等待速率令牌时被取消，并发名额被归还"""
+        limiter = ProviderLimiter("claude", RateLimitConfig(max_concurrent=1, rpm=1))
+        await limiter.acquire()
+        limiter.release()
+
+        waiter = asyncio.create_task(limiter.acquire())  # 需要等待约60秒
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert not limiter._semaphore().locked()
+
+    def test_registry_uses_default_and_overrides(self):
+        """未单独配置的提供商使用默认配置"""
+        registry = RateLimiterRegistry({"deepseek": RateLimitConfig(max_concurrent=1, rpm=30)})
+        assert registry.get("deepseek").config.rpm == 30
+        assert registry.get("claude").config.rpm is None
+
+        registry.configure("claude", RateLimitConfig(rpm=10))
+        assert registry.get("claude").config.rpm == 10
+        assert set(registry.get_stats()) == {"deepseek", "claude"}
+
+
+@pytest.mark.api_manager_config(max_retries=2)
+class TestAPIManagerRateLimits:
+    """APIManager 限流集成测试"""
+
+    def test_rate_limits_from_config(self, api_manager):
+        """支持 rate_limits 字典和扁平键两种写法"""
+        manager = api_manager(
+            rate_limits={"claude": {"max_concurrent": 2, "rpm": 50}},
+            deepseek_tpm=20000
+        )
+        assert manager.rate_limiters.get("claude").config.max_concurrent == 2
+        assert manager.rate_limiters.get("claude").config.rpm == 50
+        assert manager.rate_limiters.get("deepseek").config.tpm == 20000
+
+    @pytest.mark.asyncio
+    async def test_provider_concurrency_enforced(self, api_manager):
+        """同一提供商的并发调用受限"""
+        manager = api_manager(claude_max_concurrent=1)
+        active = 0
+        peak = 0
+
+        async def fake_call(api, prompt, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return f"回答:{prompt}"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call):
+            await asyncio.gather(*[
+                manager.call_api(task_type="单理论解读", prompt=f"问题{i}") for i in range(3)
+            ])
+
+        assert peak == 1
+        assert manager.get_metrics()["rate_limits"]["claude"]["requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_fails_over_immediately(self, api_manager):
+        """Retry-After过长时不等待，直接切换下一个API"""
+        manager = api_manager()
+
+        async def fake_call(api, prompt, **kwargs):
+            if api == "claude":
+                raise APIRateLimitError("claude", retry_after=120)
+            return "备用回答"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call) as mock_call, \
+                patch("api.manager.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await manager.call_api(task_type="单理论解读", prompt="问题")
+
+        assert result == "备用回答"
+        assert [c.args[0] for c in mock_call.call_args_list] == ["claude", "deepseek"]
+        mock_sleep.assert_not_called()
+        assert manager.rate_limiters.get("claude").cooldown_remaining() > 100
+
+    @pytest.mark.asyncio
+    async def test_task_router_rate_limits_applied(self, tmp_path, api_manager):
+        """TaskRouter 中保存的限流在创建 APIManager 时生效，之后的修改即时生效"""
+        router = TaskRouter(config_dir=str(tmp_path))
+        router.set_rate_limit("claude", max_concurrent=1)
+        router.save_config()
+
+        reloaded = TaskRouter(config_dir=str(tmp_path))
+        assert reloaded.global_config.rate_limits == {"claude": {"max_concurrent": 1}}
+        manager = api_manager(task_router=reloaded)
+        active = 0
+        peak = 0
+
+        async def fake_call(api, prompt, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return f"回答:{prompt}"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call):
+            await asyncio.gather(*[
+                manager.call_api(task_type="单理论解读", prompt=f"问题{i}") for i in range(3)
+            ])
+        assert peak == 1
+
+        reloaded.set_rate_limit("claude", rpm=30)
+        reloaded.set_global_config(rate_limits={"deepseek": {"tpm": 5000}})
+        assert manager.rate_limiters.get("claude").config.rpm == 30
+        assert manager.rate_limiters.get("deepseek").config.tpm == 5000
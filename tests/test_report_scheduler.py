@@ -0,0 +1,106 @@
+"""
+报告章节调度器测试
+"""
+import asyncio
+import time
+import pytest
+from core.report_scheduler import ReportSectionScheduler
+
+
+def _delayed(value, delay=0.05, log=None, name=None):
+    async def run(deps):
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return value
+    return run
+
+
+class TestReportSectionScheduler:
+    """报告章节调度器测试"""
+
+    def test_execution_levels(self):
+        """按依赖关系分层"""
+        scheduler = ReportSectionScheduler()
+        scheduler.add_section("报告", _delayed("r"))
+        scheduler.add_section("详细", _delayed("d"))
+        scheduler.add_section("摘要", _delayed("s"), depends_on=("报告",))
+        scheduler.add_section("建议", _delayed("a"), depends_on=("摘要",))
+        scheduler.add_section("回顾", _delayed("b"), depends_on=("摘要",))
+
+        levels = scheduler.execution_levels()
+        assert sorted(levels[0]) == ["报告", "详细"]
+        assert levels[1] == ["摘要"]
+        assert sorted(levels[2]) == ["回顾", "建议"]
+
+    def test_duplicate_section_rejected(self):
+        """重复章节名报错"""
+        scheduler = ReportSectionScheduler()
+        scheduler.add_section("报告", _delayed("r"))
+        with pytest.raises(ValueError):
+            scheduler.add_section("报告", _delayed("r"))
+
+    def test_unknown_and_cyclic_dependencies(self):
+        """未注册依赖和循环依赖报错"""
+        scheduler = ReportSectionScheduler()
+        scheduler.add_section("摘要", _delayed("s"), depends_on=("报告",))
+        with pytest.raises(ValueError):
+            scheduler.execution_levels()
+
+        scheduler = ReportSectionScheduler()
+        scheduler.add_section("甲", _delayed(1), depends_on=("乙",))
+        scheduler.add_section("乙", _delayed(2), depends_on=("甲",))
+        with pytest.raises(ValueError):
+            scheduler.execution_levels()
+
+    @pytest.mark.asyncio
+    async def test_independent_sections_run_concurrently(self):
+        """互不依赖的章节并行执行，依赖结果正确传递"""
+        scheduler = ReportSectionScheduler()
+
+        async def summary(deps):
+            return deps["报告"] + "-摘要"
+
+        scheduler.add_section("报告", _delayed("报告", 0.1))
+        scheduler.add_section("详细", _delayed("详细", 0.1))
+        scheduler.add_section("摘要", summary, depends_on=("报告",))
+
+        start = time.perf_counter()
+        results = await scheduler.run()
+        elapsed = time.perf_counter() - start
+
+        assert results == {"报告": "报告", "详细": "详细", "摘要": "报告-摘要"}
+        assert elapsed < 0.18
+
+    @pytest.mark.asyncio
+    async def test_timeout_uses_fallback(self):
+        """超时章节使用降级值，不影响其他章节"""
+        scheduler = ReportSectionScheduler()
+        errors = []
+
+        def fallback(deps, error):
+            errors.append(error)
+            return "降级"
+
+        scheduler.add_section("报告", _delayed("报告", 0.01))
+        scheduler.add_section("摘要", _delayed("摘要", 1.0), depends_on=("报告",),
+                              timeout=0.05, fallback=fallback)
+        results = await scheduler.run()
+
+        assert results["摘要"] == "降级"
+        assert isinstance(errors[0], asyncio.TimeoutError)
+
+    @pytest.mark.asyncio
+    async def test_failure_without_fallback_propagates(self):
+        """没有降级方案的章节失败时抛出异常"""
+        scheduler = ReportSectionScheduler()
+
+        async def broken(deps):
+            raise RuntimeError("报告失败")
+
+        scheduler.add_section("报告", broken)
+        scheduler.add_section("摘要", _delayed("摘要"), depends_on=("报告",), fallback=lambda d, e: "")
+        with pytest.raises(RuntimeError):
+            await scheduler.run()
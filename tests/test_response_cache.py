@@ -0,0 +1,182 @@
+"""
+LLM响应缓存测试
+"""
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from api.manager import APIManager
+from api.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """响应缓存基础功能测试"""
+
+    def setup_method(self):
+        """每个测试前创建新缓存"""
+        self.cache = ResponseCache(":memory:", ttl_seconds=None, max_bytes=1024)
+
+    def teardown_method(self):
+        self.cache.close()
+
+    def test_key_is_content_addressed(self):
+        """相同内容生成相同的键，任一字段不同则键不同"""
+        key = ResponseCache.make_key("claude", "m1", "问题", system="系统", max_tokens=100)
+        assert key == ResponseCache.make_key("claude", "m1", "问题", system="系统", max_tokens=100)
+        assert key != ResponseCache.make_key("deepseek", "m1", "问题", system="系统", max_tokens=100)
+        assert key != ResponseCache.make_key("claude", "m2", "问题", system="系统", max_tokens=100)
+        assert key != ResponseCache.make_key("claude", "m1", "问题2", system="系统", max_tokens=100)
+        assert key != ResponseCache.make_key("claude", "m1", "问题", system="系统2", max_tokens=100)
+        assert key != ResponseCache.make_key("claude", "m1", "问题", system="系统", max_tokens=200)
+
+    def test_set_get_and_stats(self):
+        """写入后命中，统计命中率"""
+        assert self.cache.get("k1", task_type="单理论解读") is None
+        self.cache.set("k1", "回答", provider="claude", task_type="单理论解读")
+        assert self.cache.get("k1", task_type="单理论解读") == "回答"
+
+        stats = self.cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+        assert stats["total_bytes"] == len("回答".encode("utf-8"))
+        assert stats["by_task_type"]["单理论解读"] == {"hits": 1, "misses": 1}
+
+    def test_ttl_expiration(self):
+        """过期条目视为未命中并被删除"""
+        cache = ResponseCache(":memory:", ttl_seconds=10)
+        with patch("api.response_cache.time.time", return_value=1000.0):
+            cache.set("k1", "回答")
+        with patch("api.response_cache.time.time", return_value=1005.0):
+            assert cache.get("k1") == "回答"
+        with patch("api.response_cache.time.time", return_value=1011.0):
+            assert cache.get("k1") is None
+        assert cache.get_stats()["entries"] == 0
+        cache.close()
+
+    def test_lru_eviction_by_bytes(self):
+        """超出字节上限时淘汰最久未使用的条目"""
+        cache = ResponseCache(":memory:", ttl_seconds=None, max_bytes=30)
+        with patch("api.response_cache.time.time", return_value=1.0):
+            cache.set("k1", "a" * 10)
+        with patch("api.response_cache.time.time", return_value=2.0):
+            cache.set("k2", "b" * 10)
+        with patch("api.response_cache.time.time", return_value=3.0):
+            cache.set("k3", "c" * 10)
+        # 访问k1，使其成为最近使用
+        with patch("api.response_cache.time.time", return_value=4.0):
+            assert cache.get("k1") is not None
+        with patch("api.response_cache.time.time", return_value=5.0):
+            cache.set("k4", "d" * 10)
+
+        assert cache.get("k2") is None  # 最久未使用，被淘汰
+        assert cache.get("k1") is not None
+        assert cache.get("k3") is not None
+        assert cache.get("k4") is not None
+        stats = cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["total_bytes"] <= 30
+        cache.close()
+
+    def test_oversized_response_not_cached(self):
+        """单条超过上限的响应不写入"""
+        self.cache.set("big", "x" * 2048)
+        assert self.cache.get("big") is None
+
+    def test_task_type_filter(self):
+        """按任务类型开关"""
+        cache = ResponseCache(":memory:", task_types=["单理论解读"])
+        assert cache.is_enabled_for("单理论解读")
+        assert not cache.is_enabled_for("快速交互问答")
+        assert self.cache.is_enabled_for("任意任务")
+        cache.close()
+
+    def test_persistence(self, tmp_path):
+        """缓存写入磁盘，重新打开后仍可命中"""
+        db_path = str(tmp_path / "cache" / "llm_cache.db")
+        cache = ResponseCache(db_path)
+        cache.set("k1", "持久化回答")
+        cache.close()
+
+        reopened = ResponseCache(db_path)
+        assert reopened.get("k1") == "持久化回答"
+        reopened.close()
+
+
+@pytest.mark.api_manager_config(response_cache_enabled=True, response_cache_path=":memory:")
+class TestAPIManagerResponseCache:
+    """APIManager 响应缓存集成测试"""
+
+    def test_cache_disabled_by_default(self):
+        """默认不启用缓存"""
+        manager = APIManager({"claude_api_key": "test_key"})
+        assert manager.response_cache is None
+        assert manager.get_cache_stats() is None
+
+    @pytest.mark.asyncio
+    async def test_repeated_call_hits_cache(self, api_manager):
+        """相同请求第二次不再调用API"""
+        manager = api_manager()
+        with patch.object(manager, '_call_api_by_name', new_callable=AsyncMock) as mock_call:
+            mock_call.return_value = "解读结果"
+
+            first = await manager.call_api(task_type="单理论解读", prompt="同一个问题")
+            second = await manager.call_api(task_type="单理论解读", prompt="同一个问题")
+
+        assert first == second == "解读结果"
+        assert mock_call.await_count == 1
+        assert manager.get_cache_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_different_params_miss_cache(self, api_manager):
+        """max_tokens或system不同则不命中"""
+        manager = api_manager()
+        with patch.object(manager, '_call_api_by_name', new_callable=AsyncMock) as mock_call:
+            mock_call.return_value = "解读结果"
+
+            await manager.call_api(task_type="单理论解读", prompt="问题", max_tokens=100)
+            await manager.call_api(task_type="单理论解读", prompt="问题", max_tokens=200)
+            await manager.call_api(task_type="单理论解读", prompt="问题", max_tokens=200, system="自定义")
+
+        assert mock_call.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_forces_refresh(self, api_manager):
+        """use_cache=False 时重新调用并刷新缓存"""
+        manager = api_manager()
+        with patch.object(manager, '_call_api_by_name', new_callable=AsyncMock) as mock_call:
+            mock_call.side_effect = ["旧结果", "新结果"]
+
+            await manager.call_api(task_type="单理论解读", prompt="问题")
+            refreshed = await manager.call_api(task_type="单理论解读", prompt="问题", use_cache=False)
+            cached = await manager.call_api(task_type="单理论解读", prompt="问题")
+
+        assert refreshed == "新结果"
+        assert cached == "新结果"
+        assert mock_call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_task_type_not_enabled_bypasses_cache(self, api_manager):
+        """未启用缓存的任务类型每次都调用API"""
+        manager = api_manager(response_cache_task_types=["单理论解读"])
+        with patch.object(manager, '_call_api_by_name', new_callable=AsyncMock) as mock_call:
+            mock_call.return_value = "回答"
+
+            await manager.call_api(task_type="快速交互问答", prompt="问题")
+            await manager.call_api(task_type="快速交互问答", prompt="问题")
+
+        assert mock_call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_dual_verification_uses_cache_per_provider(self, api_manager):
+        """双模型验证时主副模型各自命中缓存"""
+        manager = api_manager(enable_dual_verification=True)
+        with patch.object(manager, '_call_api_by_name', new_callable=AsyncMock) as mock_call:
+            mock_call.side_effect = lambda api, prompt, **kw: f"{api} 结论：吉，建议行动"
+
+            first = await manager.call_api(task_type="单理论解读", prompt="问题")
+            second = await manager.call_api(task_type="单理论解读", prompt="问题")
+
+        assert first == second
+        assert mock_call.await_count == 2  # 只有第一次调用了主副两个模型
+        assert manager.get_cache_stats()["hits"] == 2
@@ -0,0 +1,173 @@
+"""
+单飞请求合并测试
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from api.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """请求合并器测试"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_same_key_shares_one_call(self):
+        """相同键的并发调用只执行一次"""
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "结果"
+
+        waiters = [asyncio.create_task(flights.do("k", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        stats = flights.get_stats()
+        assert stats["in_flight"] == 1
+        assert stats["waiters"] == 3
+
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert results == ["结果"] * 3
+        assert calls == 1
+        stats = flights.get_stats()
+        assert stats["in_flight"] == 0
+        assert stats["waiters"] == 0
+        assert stats["leaders"] == 1
+        assert stats["coalesced"] == 2
+        assert stats["max_waiters"] == 3
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """不同键互不合并"""
+        flights = SingleFlight()
+        results = await asyncio.gather(
+            flights.do("a", lambda: asyncio.sleep(0, result="A")),
+            flights.do("b", lambda: asyncio.sleep(0, result="B")),
+        )
+        assert results == ["A", "B"]
+        assert flights.get_stats()["coalesced"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        """完成后的请求不再复用"""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("k", work) == 1
+        assert await flights.do("k", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_waiters(self):
+        """共享请求失败时所有等待者收到同一异常"""
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("API错误")
+
+        results = await asyncio.gather(
+            flights.do("k", fail), flights.do("k", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_one_waiter_cancel_keeps_shared_call(self):
+        """单个等待者取消不影响其他等待者"""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return "结果"
+
+        first = asyncio.create_task(flights.do("k", work))
+        second = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "结果"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_all_waiters_cancel_cancels_shared_call(self):
+        """所有等待者都取消时共享请求被取消"""
+        flights = SingleFlight()
+        finished = False
+
+        async def work():
+            nonlocal finished
+            await asyncio.sleep(10)
+            finished = True
+
+        waiter = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0)
+
+        assert not finished
+        assert flights.get_stats()["in_flight"] == 0
+
+
+class TestAPIManagerSingleFlight:
+    """APIManager 请求合并集成测试"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_concurrent_calls_coalesced(self, api_manager):
+        """双击等场景的重复并发请求只调用一次API"""
+        manager = api_manager()
+        calls = 0
+
+        async def fake_call(api, prompt, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "解读结果"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call):
+            results = await asyncio.gather(
+                manager.call_api(task_type="单理论解读", prompt="同一问题"),
+                manager.call_api(task_type="单理论解读", prompt="同一问题"),
+                manager.call_api(task_type="单理论解读", prompt="其他问题"),
+            )
+
+        assert results == ["解读结果"] * 3
+        assert calls == 2
+        metrics = manager.get_metrics()["single_flight"]
+        assert metrics["coalesced"] == 1
+        assert metrics["max_waiters"] == 2
+
+    @pytest.mark.asyncio
+    async def test_single_flight_can_be_disabled(self, api_manager):
+        """关闭后每次调用都独立执行"""
+        manager = api_manager(enable_single_flight=False)
+        calls = 0
+
+        async def fake_call(api, prompt, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "解读结果"
+
+        with patch.object(manager, '_call_api_by_name', side_effect=fake_call):
+            await asyncio.gather(
+                manager.call_api(task_type="单理论解读", prompt="同一问题"),
+                manager.call_api(task_type="单理论解读", prompt="同一问题"),
+            )
+
+        assert calls == 2
@@ -0,0 +1,128 @@
+"""
+节气表测试
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from theories.bazi.calculator import BaZiCalculator
+from theories.daliuren.calculator_v2 import DaLiuRenCalculatorV2
+from utils.solar_terms import (
+    TABLE_PATH,
+    SolarTermTable,
+    compute_solar_term,
+    find_solar_term,
+    get_jie_month,
+    get_last_zhongqi,
+    get_solar_term_instant,
+    get_solar_term_table
+)
+from utils.time_utils import TimeUtils
+
+
+class TestSolarTermAlgorithm:
+    """天文算法精度测试（对照紫金山天文台公布的节气时刻）"""
+
+    @pytest.mark.parametrize("year,index,expected", [
+        (2024, 2, datetime(2024, 2, 4, 16, 27)),    # 立春
+        (2024, 5, datetime(2024, 3, 20, 11, 6)),    # 春分
+        (2000, 23, datetime(2000, 12, 21, 21, 37)),  # 冬至
+        (2023, 23, datetime(2023, 12, 22, 11, 27)),  # 冬至
+    ])
+    def test_known_instants(self, year, index, expected):
+        """与公布时刻相差不超过2分钟"""
+        assert abs(compute_solar_term(year, index) - expected) <= timedelta(minutes=2)
+
+
+class TestSolarTermTable:
+    """节气表测试"""
+
+    def test_shipped_table_matches_algorithm(self):
+        """随包发布的二进制表与算法结果一致"""
+        shipped = SolarTermTable.from_bytes(TABLE_PATH.read_bytes())
+        assert shipped.start_year <= 1900 and shipped.end_year >= 2100
+        assert shipped.term_instant(2024, "立春") == datetime(2024, 2, 4, 16, 27)
+        rebuilt = SolarTermTable.build(2024, 2024)
+        assert [rebuilt.instant(i) for i in range(24)] == [
+            shipped.term_instant(2024, name) for name in
+            ["小寒", "大寒", "立春", "雨水", "惊蛰", "春分", "清明", "谷雨", "立夏", "小满", "芒种", "夏至",
+             "小暑", "大暑", "立秋", "处暑", "白露", "秋分", "寒露", "霜降", "立冬", "小雪", "大雪", "冬至"]
+        ]
+
+    def test_round_trip_bytes(self):
+        """序列化后可以还原"""
+        table = SolarTermTable.build(2030, 2031)
+        restored = SolarTermTable.from_bytes(table.to_bytes())
+        assert len(restored) == 48
+        assert restored.instant(47) == table.instant(47)
+
+    def test_corrupt_table_rejected(self):
+        """格式错误的表抛出ValueError"""
+        with pytest.raises(ValueError):
+            SolarTermTable.from_bytes(b"XXXX" + bytes(8))
+
+    def test_locate_boundary(self):
+        """节气开始前后一分钟分属不同节气"""
+        start = get_solar_term_table().term_instant(2024, "立春")
+
+        before = find_solar_term(start - timedelta(minutes=1))
+        assert before.name == "大寒"
+        assert before.next_name == "立春"
+        assert before.next_start == start
+
+        after = find_solar_term(start)
+        assert after.name == "立春"
+        assert after.start == start
+        assert after.is_jie
+
+    def test_january_belongs_to_previous_winter_solstice(self):
+        """元旦前后仍在上一年冬至之后"""
+        info = find_solar_term(datetime(2024, 1, 1))
+        assert info.name == "冬至"
+        assert info.start.year == 2023
+        assert info.next_name == "小寒"
+
+    def test_out_of_range_year_computed(self):
+        """表范围之外的年份现算"""
+        info = find_solar_term(datetime(2150, 6, 30))
+        assert info.name == "夏至"
+        assert get_solar_term_instant(2150, "夏至").month == 6
+
+
+class TestSolarTermMonths:
+    """节气换年换月与月将"""
+
+    def test_jie_month(self):
+        """立春换年，节换月"""
+        lichun = get_solar_term_instant(2024, "立春")
+        assert get_jie_month(lichun - timedelta(minutes=1)) == (2023, 11)  # 丑月
+        assert get_jie_month(lichun) == (2024, 0)  # 寅月
+        assert get_jie_month(datetime(2023, 12, 25)) == (2023, 10)  # 子月
+
+    def test_last_zhongqi(self):
+        """节之后取上一个中气"""
+        assert get_last_zhongqi(datetime(2024, 2, 10))[0] == "大寒"
+        assert get_last_zhongqi(datetime(2024, 2, 25))[0] == "雨水"
+
+    def test_time_utils_uses_exact_terms(self):
+        """TimeUtils 返回已开始的节气"""
+        name, start = TimeUtils.get_solar_term(datetime(2024, 3, 20, 12))
+        assert name == "春分"
+        assert start == datetime(2024, 3, 20, 11, 6)
+        assert TimeUtils.get_current_solar_term(datetime(2024, 3, 20, 10)) == "惊蛰"
+        assert TimeUtils.get_solar_term_info(datetime(2024, 3, 20, 10)).next_name == "春分"
+
+    def test_bazi_pillars_switch_at_lichun(self):
+        """八字年柱月柱在立春时刻切换"""
+        calculator = BaZiCalculator()
+        assert calculator.calculate_year_pillar(2024, 2, 4, 15) == ("癸", "卯")
+        assert calculator.calculate_month_pillar(2024, 2, 4, 15) == ("乙", "丑")
+        assert calculator.calculate_year_pillar(2024, 2, 4, 17) == ("甲", "辰")
+        assert calculator.calculate_month_pillar(2024, 2, 4, 17) == ("丙", "寅")
+        assert calculator.calculate_month_pillar(1990, 5, 15) == ("辛", "巳")
+
+    def test_daliuren_month_jiang_by_zhongqi(self):
+        """大六壬月将按中气过宫"""
+        calculator = DaLiuRenCalculatorV2()
+        assert calculator._calculate_month_jiang(datetime(2024, 2, 10, 12)) == "子"
+        assert calculator._calculate_month_jiang(datetime(2024, 2, 25, 12)) == "亥"
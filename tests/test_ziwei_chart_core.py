@@ -0,0 +1,100 @@
+"""
+紫微斗数命盘核心缓存测试
+"""
+import json
+
+import pytest
+
+from theories.ziwei.calculator import ZiWeiCalculator
+from theories.ziwei.chart_core import (
+    CHART_CORE_VERSION, ChartCoreCache, build_chart_core, configure_chart_core_cache,
+    get_chart_core_cache, make_chart_key
+)
+
+
+def test_same_hour_branch_shares_key():
+    # 23点与0点同为子时
+    assert make_chart_key("甲子", 5, 12, 23, "male") == make_chart_key("甲子", 5, 12, 0, "male")
+    assert make_chart_key("甲子", 5, 12, 1, "male") != make_chart_key("甲子", 5, 12, 0, "male")
+
+
+def test_core_is_immutable():
+    core = build_chart_core(make_chart_key("庚午", 4, 21, 14, "male"))
+    assert len(core.palaces) == 12
+    assert core.palaces[0].is_ming and core.palaces[0].dizhi == core.ming_gong
+    assert sum(palace.is_shen for palace in core.palaces) == 1
+    assert sum(len(palace.main_stars) for palace in core.palaces) == 12
+    with pytest.raises(AttributeError):
+        core.palaces[0].main_stars.append("天府")
+
+
+def test_lru_eviction_and_stats():
+    cache = ChartCoreCache(max_size=2)
+    keys = [make_chart_key("甲子", month, 1, 0, "male") for month in (1, 2, 3)]
+    first = cache.get(keys[0])
+    assert cache.get(keys[0]) is first
+    cache.get(keys[1])
+    cache.get(keys[2])
+    stats = cache.get_stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (2, 1, 3)
+    assert cache.get(keys[0]) is not first  # 已被淘汰，重新排盘
+
+
+def test_disk_persistence(tmp_path):
+    path = tmp_path / "charts.json"
+    cache = ChartCoreCache(persist_path=str(path))
+    key = make_chart_key("癸卯", 11, 30, 9, "female")
+    core = cache.get(key)
+    cache.save()
+
+    reloaded = ChartCoreCache(persist_path=str(path))
+    assert reloaded.get_stats()["size"] == 1
+    assert reloaded.get(key) == core
+    assert reloaded.get_stats()["hits"] == 1
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "charts.json"
+    path.write_text("not json", encoding="utf-8")
+    assert ChartCoreCache(persist_path=str(path)).get_stats()["size"] == 0
+
+
+def test_version_mismatch_is_ignored(tmp_path):
+    path = tmp_path / "charts.json"
+    cache = ChartCoreCache(persist_path=str(path))
+    cache.get(make_chart_key("癸卯", 11, 30, 9, "female"))
+    cache.save()
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["version"] == CHART_CORE_VERSION
+    data["version"] = CHART_CORE_VERSION + 1
+    path.write_text(json.dumps(data), encoding="utf-8")
+    assert ChartCoreCache(persist_path=str(path)).get_stats()["size"] == 0
+
+    # 无版本头的旧格式
+    path.write_text(json.dumps(data["cores"]), encoding="utf-8")
+    assert ChartCoreCache(persist_path=str(path)).get_stats()["size"] == 0
+
+
+def test_calculator_uses_current_global_cache():
+    calculator = ZiWeiCalculator()
+    replaced = configure_chart_core_cache(max_size=8)
+    try:
+        calculator.calculate_ziwei(1990, 5, 15, 14, "male")
+        assert replaced.get_stats()["misses"] == 1
+    finally:
+        configure_chart_core_cache()
+
+
+def test_calculator_results_do_not_share_lists():
+    calculator = ZiWeiCalculator()
+    first = calculator.calculate_ziwei(1990, 5, 15, 14, "male")
+    first["十二宫"][0]["主星"].append("测试")
+    first["分析"]["命宫主星"].append("测试")
+
+    hits = get_chart_core_cache().get_stats()["hits"]
+    second = calculator.calculate_ziwei(1990, 5, 15, 13, "male")  # 同一未时
+    assert get_chart_core_cache().get_stats()["hits"] == hits + 1
+    assert "测试" not in second["十二宫"][0]["主星"]
+    assert "测试" not in second["分析"]["命宫主星"]
+    assert second["十二宫"] == ZiWeiCalculator().calculate_ziwei(1990, 5, 15, 14, "male")["十二宫"]